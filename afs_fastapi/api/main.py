@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
@@ -397,6 +398,31 @@ async def get_completed_segments() -> list[FieldSegment]:
     return field_allocation_crdt.get_completed_segments()
 
 
+@app.get(
+    "/crdt/segments/nearby",
+    response_model=list[FieldSegment],
+    tags=["crdt"],
+    summary="Get field segments within a radius of a position, nearest first",
+)
+async def get_nearby_segments(
+    latitude: float,
+    longitude: float,
+    radius_m: float = 200.0,
+    status: Literal["unassigned", "assigned", "completed"] | None = None,
+) -> list[FieldSegment]:
+    return field_allocation_crdt.get_segments_within(latitude, longitude, radius_m, status)
+
+
+@app.get(
+    "/crdt/segments/containing",
+    response_model=list[FieldSegment],
+    tags=["crdt"],
+    summary="Get the field segments containing a GPS position",
+)
+async def get_containing_segments(latitude: float, longitude: float) -> list[FieldSegment]:
+    return field_allocation_crdt.get_segments_containing(latitude, longitude)
+
+
 @app.post(
     "/crdt/merge",
     tags=["crdt"],
@@ -13,16 +13,24 @@ from __future__ import annotations
 # Configure logging for CAN codec
 import logging
 import struct
+import time
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
 
 try:
     import can
 except ImportError:
     can = None  # type: ignore
 
+if TYPE_CHECKING:
+    from afs_fastapi.core.j1939_registry import J1939Registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -127,7 +135,7 @@ class DecodedPGN:
     priority: int
     timestamp: datetime
     spn_values: list[DecodedSPN]
-    raw_data: bytes
+    raw_data: bytes | bytearray
     data_length: int
     is_multi_frame: bool = False
     frame_count: int = 1
@@ -149,271 +157,1090 @@ class TransportProtocolFrame:
     data_bytes: bytes = b""
 
 
-class J1939Decoder:
-    """J1939/ISOBUS message decoder for agricultural equipment."""
+@dataclass
+class DecodedSPNColumn:
+    """Columnar decoded values of one SPN across a batch of frames."""
 
-    def __init__(self) -> None:
-        """Initialize J1939 decoder with agricultural PGN definitions."""
-        self.pgn_definitions: dict[int, PGNDefinition] = {}
-        self.spn_definitions: dict[int, SPNDefinition] = {}
-        self.transport_sessions: dict[tuple[int, int, int], list[TransportProtocolFrame]] = {}
+    spn: int
+    name: str
+    units: str
+    values: npt.NDArray[np.float64]  # NaN where not available, error or outside payload
+    raw_values: npt.NDArray[np.int64]
+    is_valid: npt.NDArray[np.bool_]
+    is_not_available: npt.NDArray[np.bool_]
+    is_error: npt.NDArray[np.bool_]
 
-        # Load standard agricultural PGN definitions
-        self._load_agricultural_pgns()
-
-    def _load_agricultural_pgns(self) -> None:
-        """Load standard agricultural/ISOBUS PGN and SPN definitions."""
-
-        # Electronic Engine Controller 1 (EEC1) - PGN 61444 (0xF004)
-        eec1_spns: list[SPNDefinition] = [
-            SPNDefinition(
-                spn=190,
-                name="Engine Speed",
-                description="Actual engine speed",
-                data_type=J1939DataType.RPM,
-                start_bit=24,
-                bit_length=16,
-                scale=0.125,
-                units="rpm",
-                min_value=0,
-                max_value=8031.875,
-                not_available_value=0xFFFF,
-                error_value=0xFFFE,
-            ),
-            SPNDefinition(
-                spn=102,
-                name="Engine Intake Manifold #1 Pressure",
-                description="Gauge pressure",
-                data_type=J1939DataType.PRESSURE,
-                start_bit=8,
-                bit_length=8,
-                scale=2.0,
-                units="kPa",
-                min_value=0,
-                max_value=500,
-                not_available_value=0xFF,
-                error_value=0xFE,
-            ),
-            SPNDefinition(
-                spn=61,
-                name="Engine Percent Torque At Current Speed",
-                description="Current output torque",
-                data_type=J1939DataType.PERCENTAGE,
-                start_bit=16,
-                bit_length=8,
-                scale=1.0,
-                offset=-125,
-                units="%",
-                min_value=-125,
-                max_value=125,
-                not_available_value=0xFF,
-                error_value=0xFE,
-            ),
-        ]
-
-        eec1_pgn: PGNDefinition = PGNDefinition(
-            pgn=0xF004,
-            name="Electronic Engine Controller 1",
-            description="Engine parameters",
-            data_length=8,
-            transmission_rate=50,
-            spn_definitions=eec1_spns,
+
+@dataclass
+class DecodedPGNBatch:
+    """Columnar decode result for all frames of one PGN within a batch."""
+
+    pgn: int
+    name: str
+    row_indices: npt.NDArray[np.intp]  # Positions of the frames in the input arrays
+    source_addresses: npt.NDArray[np.uint8]
+    destination_addresses: npt.NDArray[np.uint8]
+    priorities: npt.NDArray[np.uint8]
+    timestamps: npt.NDArray[np.float64]
+    spn_columns: dict[int, DecodedSPNColumn] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        """Return number of frames in the group."""
+        return len(self.row_indices)
+
+
+@dataclass
+class DecodedFrameBatch:
+    """Columnar decode result for a batch of CAN frames grouped by PGN."""
+
+    frame_count: int
+    pgn_batches: dict[int, DecodedPGNBatch] = field(default_factory=dict)
+    undecoded_indices: npt.NDArray[np.intp] = field(
+        default_factory=lambda: np.empty(0, dtype=np.intp)
+    )
+
+    def get_spn_column(self, spn: int) -> DecodedSPNColumn | None:
+        """Get the decoded column of an SPN from whichever PGN group carries it.
+
+        Parameters
+        ----------
+        spn : int
+            Suspect Parameter Number
+
+        Returns
+        -------
+        DecodedSPNColumn | None
+            Decoded SPN column or None if no frame in the batch carried the SPN
+        """
+        for pgn_batch in self.pgn_batches.values():
+            column = pgn_batch.spn_columns.get(spn)
+            if column is not None:
+                return column
+        return None
+
+
+# J1939-21 Transport Protocol PDU formats
+TP_CM_PDU_FORMAT = 0xEC  # Connection Management, PGN 60416
+TP_DT_PDU_FORMAT = 0xEB  # Data Transfer, PGN 60160
+
+# Data types carried as two's-complement integers on the wire
+SIGNED_DATA_TYPES: frozenset[J1939DataType] = frozenset(
+    {
+        J1939DataType.INT8,
+        J1939DataType.INT16,
+        J1939DataType.INT32,
+        J1939DataType.LATITUDE,
+        J1939DataType.LONGITUDE,
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSPN:
+    """Precomputed extraction constants for a single SPN.
+
+    Everything that only depends on the SPN definition (bit shift, mask,
+    sign-extension constants, scaling and sentinel values) is resolved once
+    so the per-frame decode loop is reduced to integer arithmetic.
+    """
+
+    definition: SPNDefinition
+    shift: int
+    mask: int
+    end_bit: int
+    sign_bit: int
+    sign_adjust: int
+    scale: float
+    offset: float
+    not_available_value: int | None
+    error_value: int | None
+    min_value: float | None
+    max_value: float | None
+    raw_min: int
+    raw_max: int
+
+    @classmethod
+    def from_definition(cls, spn_def: SPNDefinition) -> CompiledSPN:
+        """Compile an SPN definition into extraction constants.
+
+        Parameters
+        ----------
+        spn_def : SPNDefinition
+            SPN definition to compile
+
+        Returns
+        -------
+        CompiledSPN
+            Compiled SPN extraction constants
+        """
+        sign_bit = 0
+        sign_adjust = 0
+        raw_min = 0
+        raw_max = (1 << spn_def.bit_length) - 1
+        if spn_def.data_type in SIGNED_DATA_TYPES:
+            # Sign extension follows the containing integer width (8/16/32 bits)
+            for width in (8, 16, 32):
+                if spn_def.bit_length <= width:
+                    sign_bit = 1 << (width - 1)
+                    sign_adjust = 1 << width
+                    raw_min = -sign_bit
+                    raw_max = sign_bit - 1
+                    break
+
+        return cls(
+            definition=spn_def,
+            shift=spn_def.start_bit,
+            mask=(1 << spn_def.bit_length) - 1,
+            end_bit=spn_def.start_bit + spn_def.bit_length,
+            sign_bit=sign_bit,
+            sign_adjust=sign_adjust,
+            scale=spn_def.scale,
+            offset=spn_def.offset,
+            not_available_value=spn_def.not_available_value,
+            error_value=spn_def.error_value,
+            min_value=spn_def.min_value,
+            max_value=spn_def.max_value,
+            raw_min=raw_min,
+            raw_max=raw_max,
         )
 
-        # Wheel-Based Vehicle Speed (WVS) - PGN 65265 (0xFEF1)
-        wvs_spns: list[SPNDefinition] = [
-            SPNDefinition(
-                spn=84,
-                name="Wheel-Based Vehicle Speed",
-                description="Speed over ground",
-                data_type=J1939DataType.SPEED,
-                start_bit=8,
-                bit_length=16,
-                scale=0.00390625,
-                units="km/h",
-                min_value=0,
-                max_value=250.996,
-                not_available_value=0xFFFF,
-                error_value=0xFFFE,
-            ),
-        ]
-
-        wvs_pgn: PGNDefinition = PGNDefinition(
-            pgn=0xFEF1,
-            name="Wheel-Based Vehicle Speed",
-            description="Vehicle speed information",
-            data_length=8,
-            transmission_rate=100,
-            spn_definitions=wvs_spns,
+    def encode(self, value: Any) -> int | None:
+        """Encode an engineering value into this SPN's unsigned bit field.
+
+        Parameters
+        ----------
+        value : Any
+            Value to encode (None encodes the not-available value)
+
+        Returns
+        -------
+        int | None
+            Raw field value already masked to the SPN width, or None if the
+            value cannot be encoded
+        """
+        if value is None:
+            return self.not_available_value
+
+        try:
+            raw_value = round((value - self.offset) / self.scale)
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.error(f"Failed to encode SPN {self.definition.spn} value {value}: {e}")
+            return None
+
+        if raw_value < self.raw_min:
+            raw_value = self.raw_min
+        elif raw_value > self.raw_max:
+            raw_value = self.raw_max
+        # Two's complement for negative values of signed SPNs
+        return int(raw_value) & self.mask
+
+    def decode(self, bit_array: int) -> DecodedSPN:
+        """Decode this SPN from a payload packed as a little-endian integer.
+
+        Parameters
+        ----------
+        bit_array : int
+            Frame payload as returned by ``int.from_bytes(data, "little")``
+
+        Returns
+        -------
+        DecodedSPN
+            Decoded SPN value
+        """
+        spn_def = self.definition
+        raw_value = (bit_array >> self.shift) & self.mask
+        is_not_available = raw_value == self.not_available_value
+        is_error = not is_not_available and raw_value == self.error_value
+
+        if is_not_available or is_error:
+            value: float | None = None
+            is_valid = False
+        else:
+            if raw_value & self.sign_bit:
+                raw_value -= self.sign_adjust
+            value = raw_value * self.scale + self.offset
+            is_valid = (self.min_value is None or value >= self.min_value) and (
+                self.max_value is None or value <= self.max_value
+            )
+
+        return DecodedSPN(
+            spn=spn_def.spn,
+            name=spn_def.name,
+            value=value,
+            units=spn_def.units,
+            raw_value=raw_value,
+            is_valid=is_valid,
+            is_not_available=is_not_available,
+            is_error=is_error,
+        )
+
+    def decode_column(
+        self, words: npt.NDArray[np.uint64], data_bits: npt.NDArray[np.int64]
+    ) -> DecodedSPNColumn:
+        """Decode this SPN for many frames at once.
+
+        Parameters
+        ----------
+        words : npt.NDArray[np.uint64]
+            Little-endian payloads packed as one 64-bit word per frame
+        data_bits : npt.NDArray[np.int64]
+            Payload length in bits per frame
+
+        Returns
+        -------
+        DecodedSPNColumn
+            Decoded SPN values with validity masks
+        """
+        spn_def = self.definition
+        in_payload = data_bits >= self.end_bit
+        unsigned = (words >> np.uint64(self.shift)) & np.uint64(self.mask)
+
+        no_match = np.zeros(len(words), dtype=np.bool_)
+        is_not_available = in_payload & (
+            unsigned == self.not_available_value
+            if self.not_available_value is not None
+            else no_match
+        )
+        is_error = (
+            in_payload
+            & ~is_not_available
+            & (unsigned == self.error_value if self.error_value is not None else no_match)
+        )
+
+        raw_values = unsigned.astype(np.int64)
+        if self.sign_bit:
+            negative = ((raw_values & self.sign_bit) != 0) & ~is_not_available & ~is_error
+            raw_values = np.where(negative, raw_values - self.sign_adjust, raw_values)
+
+        # Integer scale/offset would keep an int dtype that cannot hold NaN
+        values = raw_values.astype(np.float64) * self.scale + self.offset
+        is_valid = in_payload & ~is_not_available & ~is_error
+        if self.min_value is not None:
+            is_valid &= values >= self.min_value
+        if self.max_value is not None:
+            is_valid &= values <= self.max_value
+        values[~in_payload | is_not_available | is_error] = np.nan
+
+        return DecodedSPNColumn(
+            spn=spn_def.spn,
+            name=spn_def.name,
+            units=spn_def.units,
+            values=values,
+            raw_values=raw_values,
+            is_valid=is_valid,
+            is_not_available=is_not_available,
+            is_error=is_error,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PGNDecodePlan:
+    """Decode plan compiled once per PGN definition at registration time."""
+
+    definition: PGNDefinition
+    spns: tuple[CompiledSPN, ...]
+    spn_index: dict[int, CompiledSPN]
+
+    @classmethod
+    def from_definition(cls, pgn_def: PGNDefinition) -> PGNDecodePlan:
+        """Compile a PGN definition into a decode plan.
+
+        Parameters
+        ----------
+        pgn_def : PGNDefinition
+            PGN definition to compile
+
+        Returns
+        -------
+        PGNDecodePlan
+            Decode plan for the PGN
+        """
+        spns = tuple(CompiledSPN.from_definition(spn) for spn in pgn_def.spn_definitions)
+        return cls(
+            definition=pgn_def,
+            spns=spns,
+            spn_index={compiled.definition.spn: compiled for compiled in spns},
+        )
+
+    def decode(self, data: bytes | bytearray | memoryview) -> list[DecodedSPN]:
+        """Decode all SPNs of the PGN from a frame payload.
+
+        Parameters
+        ----------
+        data : bytes | bytearray | memoryview
+            Message data bytes
+
+        Returns
+        -------
+        list[DecodedSPN]
+            Decoded SPN values (SPNs outside the payload are skipped)
+        """
+        bit_array = int.from_bytes(data, "little")
+        data_bits = len(data) * 8
+        decoded_spns: list[DecodedSPN] = []
+
+        for compiled in self.spns:
+            if compiled.end_bit > data_bits:
+                logger.error(
+                    f"Failed to decode SPN {compiled.definition.spn}: "
+                    "Bit range exceeds data length"
+                )
+                continue
+            decoded_spns.append(compiled.decode(bit_array))
+
+        return decoded_spns
+
+
+@dataclass(frozen=True, slots=True)
+class PGNEncodeTemplate:
+    """Encode template compiled once per (PGN, priority, source, destination).
+
+    Caches the 29-bit arbitration identifier and the SPN packing constants so
+    periodic transmitters (EEC1, vehicle speed, position) only pay for value
+    scaling and a few integer shifts per frame.
+    """
+
+    definition: PGNDefinition
+    arbitration_id: int
+    data_length: int
+    spn_index: dict[int, CompiledSPN]
+
+    @classmethod
+    def from_definition(cls, pgn_def: PGNDefinition, arbitration_id: int) -> PGNEncodeTemplate:
+        """Compile a PGN definition into an encode template.
+
+        Parameters
+        ----------
+        pgn_def : PGNDefinition
+            PGN definition to compile
+        arbitration_id : int
+            29-bit CAN identifier used for every frame of this template
+
+        Returns
+        -------
+        PGNEncodeTemplate
+            Encode template for the PGN
+        """
+        return cls(
+            definition=pgn_def,
+            arbitration_id=arbitration_id,
+            data_length=pgn_def.data_length,
+            spn_index={
+                spn_def.spn: CompiledSPN.from_definition(spn_def)
+                for spn_def in pgn_def.spn_definitions
+            },
         )
 
-        # Vehicle Position (VP) - PGN 65267 (0xFEF3)
-        vp_spns: list[SPNDefinition] = [
-            SPNDefinition(
-                spn=584,
-                name="Latitude",
-                description="Latitude coordinate",
-                data_type=J1939DataType.LATITUDE,
-                start_bit=0,
-                bit_length=32,
-                scale=1e-7,
-                units="degrees",
-                min_value=-180,
-                max_value=180,
-                not_available_value=0xFFFFFFFF,
-                error_value=0xFFFFFFFE,
-            ),
-            SPNDefinition(
-                spn=585,
-                name="Longitude",
-                description="Longitude coordinate",
-                data_type=J1939DataType.LONGITUDE,
-                start_bit=32,
-                bit_length=32,
-                scale=1e-7,
-                units="degrees",
-                min_value=-180,
-                max_value=180,
-                not_available_value=0xFFFFFFFF,
-                error_value=0xFFFFFFFE,
-            ),
-        ]
-
-        vp_pgn: PGNDefinition = PGNDefinition(
-            pgn=0xFEF3,
-            name="Vehicle Position",
-            description="GPS coordinates",
-            data_length=8,
-            transmission_rate=1000,
-            spn_definitions=vp_spns,
+    def pack_word(self, spn_values: dict[int, Any]) -> int:
+        """Pack SPN values into the payload as a little-endian integer.
+
+        Parameters
+        ----------
+        spn_values : dict[int, Any]
+            SPN values to encode {spn: value}; unknown SPNs are ignored
+
+        Returns
+        -------
+        int
+            Payload bits, convertible with ``int.to_bytes(data_length, "little")``
+
+        Raises
+        ------
+        ValueError
+            If a provided SPN lies outside the PGN data length
+        """
+        data_bits = self.data_length * 8
+        word = 0
+        spn_index = self.spn_index
+
+        for spn, value in spn_values.items():
+            compiled = spn_index.get(spn)
+            if compiled is None:
+                continue
+            if compiled.end_bit > data_bits:
+                raise ValueError("Bit range exceeds data length")
+            raw_value = compiled.encode(value)
+            if raw_value is not None:
+                field_mask = compiled.mask << compiled.shift
+                word = (word & ~field_mask) | (raw_value << compiled.shift)
+
+        return word
+
+    def pack(self, spn_values: dict[int, Any]) -> bytes:
+        """Pack SPN values into payload bytes.
+
+        Parameters
+        ----------
+        spn_values : dict[int, Any]
+            SPN values to encode {spn: value}
+
+        Returns
+        -------
+        bytes
+            Frame payload of ``data_length`` bytes
+        """
+        return self.pack_word(spn_values).to_bytes(self.data_length, "little")
+
+    def encode(self, spn_values: dict[int, Any], timestamp: float | None = None) -> can.Message:
+        """Encode SPN values into a CAN message.
+
+        Parameters
+        ----------
+        spn_values : dict[int, Any]
+            SPN values to encode {spn: value}
+        timestamp : float | None
+            Message timestamp
+
+        Returns
+        -------
+        can.Message
+            Encoded CAN message
+        """
+        return can.Message(
+            arbitration_id=self.arbitration_id,
+            data=self.pack(spn_values),
+            is_extended_id=True,
+            timestamp=timestamp or 0.0,
         )
 
-        # Fuel Economy (LFE) - PGN 65266 (0xFEF2)
-        lfe_spns: list[SPNDefinition] = [
-            SPNDefinition(
-                spn=183,
-                name="Engine Fuel Rate",
-                description="Current fuel consumption rate",
-                data_type=J1939DataType.FUEL_RATE,
-                start_bit=0,
-                bit_length=16,
-                scale=0.05,
-                units="L/h",
-                min_value=0,
-                max_value=3212.75,
-                not_available_value=0xFFFF,
-                error_value=0xFFFE,
-            ),
-            SPNDefinition(
-                spn=184,
-                name="Engine Instantaneous Fuel Economy",
-                description="Instantaneous fuel economy",
-                data_type=J1939DataType.SPEED,
-                start_bit=16,
-                bit_length=16,
-                scale=0.00390625,
-                units="km/L",
-                min_value=0,
-                max_value=125.5,
-                not_available_value=0xFFFF,
-                error_value=0xFFFE,
-            ),
-        ]
-
-        lfe_pgn: PGNDefinition = PGNDefinition(
-            pgn=0xFEF2,
-            name="Fuel Economy",
-            description="Fuel consumption data",
-            data_length=8,
-            transmission_rate=1000,
-            spn_definitions=lfe_spns,
+    def encode_batch(
+        self,
+        values: Sequence[dict[int, Any]],
+        out: npt.NDArray[np.uint8] | None = None,
+    ) -> npt.NDArray[np.uint8]:
+        """Encode many SPN value dicts into a payload matrix.
+
+        Parameters
+        ----------
+        values : Sequence[dict[int, Any]]
+            One SPN value dict per frame
+        out : npt.NDArray[np.uint8] | None
+            Preallocated uint8 buffer of shape (N, >= data_length) that is
+            filled in place; a zero padded (N, 8) matrix is allocated if None
+
+        Returns
+        -------
+        npt.NDArray[np.uint8]
+            Payload matrix (``out`` when given), row i holding frame i
+        """
+        frame_count = len(values)
+        length = self.data_length
+        if out is None:
+            out = np.zeros((frame_count, max(length, 8)), dtype=np.uint8)
+        elif out.ndim != 2 or out.shape[0] < frame_count or out.shape[1] < length:
+            raise ValueError(f"out must have shape ({frame_count}, >={length}), got {out.shape}")
+
+        packed = b"".join(
+            self.pack_word(spn_values).to_bytes(length, "little") for spn_values in values
+        )
+        out[:frame_count, :length] = np.frombuffer(packed, dtype=np.uint8).reshape(
+            frame_count, length
         )
+        return out
+
+
+class DecodedPGNView:
+    """Lazily evaluated, slotted view of a decoded single-frame PGN.
+
+    Holds the frame payload without copying it and decodes an SPN only when
+    it is accessed, so consumers that only need the identifier fields (PGN,
+    addresses, priority) never pay for SPN decoding or per-SPN allocations.
+    Exposes the same read interface as ``DecodedPGN``; call ``materialize``
+    to obtain a ``DecodedPGN`` dataclass.
+    """
+
+    __slots__ = (
+        "pgn",
+        "source_address",
+        "destination_address",
+        "priority",
+        "raw_data",
+        "raw_timestamp",
+        "_plan",
+        "_bit_array",
+        "_spn_values",
+        "_metadata",
+    )
+
+    is_multi_frame = False
+    frame_count = 1
+
+    def __init__(
+        self,
+        plan: PGNDecodePlan,
+        source_address: int,
+        destination_address: int,
+        priority: int,
+        raw_data: bytes | bytearray | memoryview,
+        raw_timestamp: float,
+    ) -> None:
+        """Initialize decoded PGN view.
 
-        # Electronic Transmission Controller 1 (ETC1) - PGN 61445 (0xF005)
-        etc1_spns: list[SPNDefinition] = [
-            SPNDefinition(
-                spn=191,
-                name="Transmission Output Shaft Speed",
-                description="Output shaft RPM",
-                data_type=J1939DataType.RPM,
-                start_bit=8,
-                bit_length=16,
-                scale=0.125,
-                units="rpm",
-                min_value=0,
-                max_value=8031.875,
-                not_available_value=0xFFFF,
-                error_value=0xFFFE,
-            ),
-            SPNDefinition(
-                spn=127,
-                name="Transmission Current Gear",
-                description="Currently selected gear",
-                data_type=J1939DataType.UINT8,
-                start_bit=40,
-                bit_length=8,
-                scale=1.0,
-                offset=-125,
-                units="",
-                min_value=-125,
-                max_value=125,
-                not_available_value=0xFF,
-                error_value=0xFE,
-            ),
-        ]
-
-        etc1_pgn: PGNDefinition = PGNDefinition(
-            pgn=0xF005,
-            name="Electronic Transmission Controller 1",
-            description="Transmission data",
-            data_length=8,
-            transmission_rate=100,
-            spn_definitions=etc1_spns,
+        Parameters
+        ----------
+        plan : PGNDecodePlan
+            Compiled decode plan of the PGN
+        source_address : int
+            Source address
+        destination_address : int
+            Destination address
+        priority : int
+            J1939 priority
+        raw_data : bytes | bytearray | memoryview
+            Frame payload (referenced, not copied)
+        raw_timestamp : float
+            Reception timestamp in seconds since the epoch
+        """
+        self._plan = plan
+        self.pgn = plan.definition.pgn
+        self.source_address = source_address
+        self.destination_address = destination_address
+        self.priority = priority
+        self.raw_data = raw_data
+        self.raw_timestamp = raw_timestamp
+        self._bit_array: int | None = None
+        self._spn_values: list[DecodedSPN] | None = None
+        self._metadata: dict[str, Any] | None = None
+
+    @property
+    def name(self) -> str:
+        """PGN name."""
+        return self._plan.definition.name
+
+    @property
+    def data_length(self) -> int:
+        """Payload length in bytes."""
+        return len(self.raw_data)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Reception time as a datetime (created on access)."""
+        return datetime.fromtimestamp(self.raw_timestamp)
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """Free-form metadata (allocated on first access)."""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @property
+    def spn_values(self) -> list[DecodedSPN]:
+        """All decoded SPNs (decoded once on first access)."""
+        if self._spn_values is None:
+            self._spn_values = self._plan.decode(self.raw_data)
+        return self._spn_values
+
+    def get_spn(self, spn: int) -> DecodedSPN | None:
+        """Decode a single SPN of the frame.
+
+        Parameters
+        ----------
+        spn : int
+            Suspect Parameter Number
+
+        Returns
+        -------
+        DecodedSPN | None
+            Decoded SPN or None if the PGN does not carry it or the payload is too short
+        """
+        compiled = self._plan.spn_index.get(spn)
+        if compiled is None or compiled.end_bit > len(self.raw_data) * 8:
+            return None
+        if self._bit_array is None:
+            self._bit_array = int.from_bytes(self.raw_data, "little")
+        return compiled.decode(self._bit_array)
+
+    def get_value(self, spn: int) -> float | None:
+        """Get the scaled value of a single SPN.
+
+        Parameters
+        ----------
+        spn : int
+            Suspect Parameter Number
+
+        Returns
+        -------
+        float | None
+            Scaled value or None if not available, erroneous or not carried
+        """
+        decoded_spn = self.get_spn(spn)
+        return decoded_spn.value if decoded_spn is not None else None
+
+    def materialize(self) -> DecodedPGN:
+        """Build the equivalent ``DecodedPGN`` dataclass.
+
+        Returns
+        -------
+        DecodedPGN
+            Fully decoded PGN
+        """
+        return DecodedPGN(
+            pgn=self.pgn,
+            name=self.name,
+            source_address=self.source_address,
+            destination_address=self.destination_address,
+            priority=self.priority,
+            timestamp=self.timestamp,
+            spn_values=list(self.spn_values),
+            raw_data=bytes(self.raw_data),
+            data_length=self.data_length,
+            metadata=dict(self.metadata),
         )
 
-        # Dash Display (DD) - PGN 65276 (0xFEFC) - Fuel Level
-        dd_spns: list[SPNDefinition] = [
-            SPNDefinition(
-                spn=96,
-                name="Fuel Level",
-                description="Fuel tank level percentage",
-                data_type=J1939DataType.PERCENTAGE,
-                start_bit=8,
-                bit_length=8,
-                scale=0.4,
-                units="%",
-                min_value=0,
-                max_value=100,
-                not_available_value=0xFF,
-                error_value=0xFE,
-            ),
-        ]
-
-        dd_pgn: PGNDefinition = PGNDefinition(
-            pgn=0xFEFC,
-            name="Dash Display",
-            description="Dashboard display information including fuel level",
-            data_length=8,
-            transmission_rate=1000,
-            spn_definitions=dd_spns,
+
+class CANFrameEnvelope:
+    """Received CAN frame with parsed J1939 identifier and a decode-once cache.
+
+    Created once at reception and handed through routing, buffering, data
+    handlers and safety validation, so the identifier is parsed a single time
+    and the payload is decoded at most once per frame no matter how many
+    consumers look at it. Decoding once also matters for correctness:
+    Transport Protocol frames feed a stateful reassembler and must not be
+    decoded twice.
+    """
+
+    __slots__ = (
+        "message",
+        "interface_id",
+        "arbitration_id",
+        "is_extended_id",
+        "priority",
+        "pgn",
+        "pdu_format",
+        "source_address",
+        "destination_address",
+        "decode_count",
+        "_codec",
+        "_decoded",
+    )
+
+    def __init__(self, message: can.Message, codec: CANFrameCodec, interface_id: str = "") -> None:
+        """Initialize frame envelope.
+
+        Parameters
+        ----------
+        message : can.Message
+            Received CAN message (referenced, not copied)
+        codec : CANFrameCodec
+            Codec used for the deferred decode
+        interface_id : str, default ""
+            Interface that received the message
+        """
+        self.message = message
+        self.interface_id = interface_id
+        self._codec = codec
+        self._decoded: DecodedPGN | None = None
+        self.decode_count = 0
+
+        can_id = message.arbitration_id
+        self.arbitration_id = can_id
+        self.is_extended_id = bool(message.is_extended_id)
+
+        if self.is_extended_id:
+            pdu_format = (can_id >> 16) & 0xFF
+            pdu_specific = (can_id >> 8) & 0xFF
+            pgn = (((can_id >> 24) & 0x01) << 16) | (pdu_format << 8)
+            if pdu_format >= 240:
+                self.pgn = pgn | pdu_specific
+                self.destination_address = 255  # Global
+            else:
+                self.pgn = pgn
+                self.destination_address = pdu_specific
+            self.priority = (can_id >> 26) & 0x07
+            self.pdu_format = pdu_format
+            self.source_address = can_id & 0xFF
+        else:
+            # Standard frames carry no J1939 identifier fields
+            self.pgn = 0
+            self.destination_address = 0
+            self.priority = 0
+            self.pdu_format = 0
+            self.source_address = 0
+
+    @property
+    def data(self) -> bytes | bytearray:
+        """Frame payload."""
+        return self.message.data
+
+    @property
+    def timestamp(self) -> float:
+        """Reception timestamp in seconds since the epoch."""
+        return self.message.timestamp
+
+    @property
+    def is_transport_protocol(self) -> bool:
+        """Whether the frame is a J1939 TP.CM or TP.DT frame."""
+        return self.is_extended_id and self.pdu_format in (TP_CM_PDU_FORMAT, TP_DT_PDU_FORMAT)
+
+    @property
+    def is_decoded(self) -> bool:
+        """Whether the payload has already been decoded."""
+        return self.decode_count > 0
+
+    def decode(self) -> DecodedPGN | None:
+        """Decode the frame, reusing the cached result on later calls.
+
+        Returns
+        -------
+        DecodedPGN | None
+            Decoded PGN data or None if not decodable
+        """
+        if self.decode_count == 0:
+            self.decode_count = 1
+            self._decoded = self._codec.decode_message(self.message)
+        return self._decoded
+
+
+class TransportProtocolSession:
+    """Reassembly state of one J1939 Transport Protocol connection."""
+
+    __slots__ = (
+        "pgn",
+        "source_address",
+        "destination_address",
+        "total_size",
+        "total_packets",
+        "data_buffer",
+        "next_sequence",
+        "is_bam",
+        "deadline",
+    )
+
+    def __init__(
+        self,
+        pgn: int,
+        source_address: int,
+        destination_address: int,
+        total_size: int,
+        total_packets: int,
+        is_bam: bool,
+        deadline: float,
+    ) -> None:
+        """Initialize transport protocol session.
+
+        Parameters
+        ----------
+        pgn : int
+            PGN of the transported message
+        source_address : int
+            Originator address
+        destination_address : int
+            Responder address (255 for BAM)
+        total_size : int
+            Announced message size in bytes
+        total_packets : int
+            Announced number of TP.DT packets
+        is_bam : bool
+            True for Broadcast Announce Message sessions
+        deadline : float
+            Monotonic time after which the session is timed out
+        """
+        self.pgn = pgn
+        self.source_address = source_address
+        self.destination_address = destination_address
+        self.total_size = total_size
+        self.total_packets = total_packets
+        self.data_buffer = bytearray(total_size)  # Preallocated reassembly buffer
+        self.next_sequence = 1
+        self.is_bam = is_bam
+        self.deadline = deadline
+
+
+class TransportProtocolReassembler:
+    """Bounded J1939-21 Transport Protocol (BAM and RTS/CTS) reassembly table.
+
+    Sessions are keyed by (source, destination): J1939-21 allows only one
+    connection per address pair (and one BAM per source), and TP.DT frames
+    do not carry the PGN, so this key gives O(1) lookup for every packet.
+    The table holds at most ``max_sessions`` preallocated buffers of at most
+    1785 bytes each, so a flood of bogus RTS/BAM frames cannot grow memory.
+    """
+
+    # J1939-21 timeouts in seconds
+    T1 = 0.75  # Between data packets
+    T2 = 1.25  # After CTS, waiting for data
+    T3 = 1.25  # After last data packet of a window, waiting for CTS
+    T4 = 1.05  # After CTS(0) hold, waiting for the next CTS
+
+    MAX_MESSAGE_SIZE = 1785  # 255 packets * 7 bytes
+    MIN_MESSAGE_SIZE = 9
+
+    RTS = 16
+    CTS = 17
+    EOM_ACK = 19
+    BAM = 32
+    ABORT = 255
+
+    def __init__(self, max_sessions: int = 32, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize transport protocol reassembler.
+
+        Parameters
+        ----------
+        max_sessions : int, default 32
+            Maximum number of concurrent sessions
+        clock : Callable[[], float], default time.monotonic
+            Monotonic time source in seconds
+        """
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self.sessions: dict[tuple[int, int], TransportProtocolSession] = {}
+        self.statistics: dict[str, int] = {
+            "sessions_started": 0,
+            "messages_completed": 0,
+            "sessions_aborted": 0,
+            "sessions_timed_out": 0,
+            "sessions_rejected": 0,
+            "sequence_errors": 0,
+        }
+
+    def handle_connection_management(
+        self, data: bytes | bytearray, source_address: int, destination_address: int
+    ) -> None:
+        """Process a TP.CM frame (RTS, CTS, EOM acknowledgement, BAM or abort).
+
+        Parameters
+        ----------
+        data : bytes | bytearray
+            TP.CM payload
+        source_address : int
+            Source address of the frame
+        destination_address : int
+            Destination address of the frame
+        """
+        if len(data) < 8:
+            return
+
+        control_byte = data[0]
+        pgn = data[5] | (data[6] << 8) | (data[7] << 16)
+        now = self.clock()
+
+        if control_byte == self.RTS or control_byte == self.BAM:
+            is_bam = control_byte == self.BAM
+            total_size = data[1] | (data[2] << 8)
+            total_packets = data[3]
+            if (
+                not self.MIN_MESSAGE_SIZE <= total_size <= self.MAX_MESSAGE_SIZE
+                or total_packets != (total_size + 6) // 7
+                or is_bam != (destination_address == 255)
+            ):
+                self.statistics["sessions_rejected"] += 1
+                logger.debug(f"Rejected TP.CM {control_byte} from {source_address:02X}")
+                return
+
+            key = (source_address, destination_address)
+            if key in self.sessions:
+                # A new announcement on the same connection replaces the old one
+                self.statistics["sessions_aborted"] += 1
+            elif len(self.sessions) >= self.max_sessions:
+                self.expire_sessions(now)
+                if len(self.sessions) >= self.max_sessions:
+                    self.statistics["sessions_rejected"] += 1
+                    logger.warning(
+                        f"TP session table full, rejecting PGN {pgn:04X} from {source_address:02X}"
+                    )
+                    return
+
+            self.sessions[key] = TransportProtocolSession(
+                pgn,
+                source_address,
+                destination_address,
+                total_size,
+                total_packets,
+                is_bam,
+                now + (self.T1 if is_bam else self.T3),
+            )
+            self.statistics["sessions_started"] += 1
+
+        elif control_byte == self.CTS:
+            # CTS is sent by the responder back to the originator
+            session = self.sessions.get((destination_address, source_address))
+            if session is None or session.is_bam or session.pgn != pgn:
+                return
+            packets_allowed = data[1]
+            if packets_allowed == 0:
+                session.deadline = now + self.T4
+            else:
+                if 1 <= data[2] <= session.total_packets:
+                    session.next_sequence = data[2]
+                session.deadline = now + self.T2
+
+        elif control_byte == self.ABORT:
+            for key in (
+                (source_address, destination_address),
+                (destination_address, source_address),
+            ):
+                session = self.sessions.get(key)
+                if session is not None and session.pgn == pgn:
+                    del self.sessions[key]
+                    self.statistics["sessions_aborted"] += 1
+                    logger.debug(f"TP session aborted: PGN={pgn:04X}")
+
+    def handle_data_transfer(
+        self, data: bytes | bytearray, source_address: int, destination_address: int
+    ) -> TransportProtocolSession | None:
+        """Process a TP.DT frame.
+
+        Parameters
+        ----------
+        data : bytes | bytearray
+            TP.DT payload (sequence number followed by up to 7 data bytes)
+        source_address : int
+            Source address of the frame
+        destination_address : int
+            Destination address of the frame
+
+        Returns
+        -------
+        TransportProtocolSession | None
+            The completed session once its last packet arrived, otherwise None
+        """
+        key = (source_address, destination_address)
+        session = self.sessions.get(key)
+        if session is None or len(data) < 2:
+            return None
+
+        now = self.clock()
+        if now > session.deadline:
+            del self.sessions[key]
+            self.statistics["sessions_timed_out"] += 1
+            return None
+
+        sequence_number = data[0]
+        if sequence_number != session.next_sequence:
+            self.statistics["sequence_errors"] += 1
+            if session.is_bam:
+                # BAM has no retransmission, the message is lost
+                del self.sessions[key]
+                self.statistics["sessions_aborted"] += 1
+            return None
+
+        offset = (sequence_number - 1) * 7
+        chunk_length = min(7, session.total_size - offset)
+        if len(data) - 1 < chunk_length:
+            self.statistics["sequence_errors"] += 1
+            return None
+        session.data_buffer[offset : offset + chunk_length] = data[1 : 1 + chunk_length]
+
+        session.next_sequence += 1
+        session.deadline = now + self.T1
+
+        if session.next_sequence > session.total_packets:
+            del self.sessions[key]
+            self.statistics["messages_completed"] += 1
+            return session
+        return None
+
+    def expire_sessions(self, now: float | None = None) -> int:
+        """Drop sessions whose timeout has elapsed.
+
+        Parameters
+        ----------
+        now : float | None
+            Current monotonic time (defaults to the reassembler clock)
+
+        Returns
+        -------
+        int
+            Number of sessions dropped
+        """
+        current = self.clock() if now is None else now
+        expired = [key for key, session in self.sessions.items() if current > session.deadline]
+        for key in expired:
+            del self.sessions[key]
+        self.statistics["sessions_timed_out"] += len(expired)
+        return len(expired)
+
+
+class J1939Decoder:
+    """J1939/ISOBUS message decoder for agricultural equipment."""
+
+    def __init__(self, registry: J1939Registry | None = None) -> None:
+        """Initialize J1939 decoder with agricultural PGN definitions.
+
+        Parameters
+        ----------
+        registry : J1939Registry | None
+            PGN/SPN registry to load; the shared default registry if None
+        """
+        from afs_fastapi.core.j1939_registry import get_default_registry
+
+        self.pgn_definitions: dict[int, PGNDefinition] = {}
+        self.spn_definitions: dict[int, SPNDefinition] = {}
+        self.decode_plans: dict[int, PGNDecodePlan] = {}
+        self.transport_reassembler = TransportProtocolReassembler()
+        self.transport_sessions: dict[tuple[int, int], TransportProtocolSession] = (
+            self.transport_reassembler.sessions
         )
 
-        # Register all PGN definitions
-        pgn_definitions: list[PGNDefinition] = [
-            eec1_pgn,
-            wvs_pgn,
-            vp_pgn,
-            lfe_pgn,
-            etc1_pgn,
-            dd_pgn,
-        ]
-
-        for pgn_def in pgn_definitions:
-            # Register PGN definition
-            self.pgn_definitions[pgn_def.pgn] = pgn_def
-            # Register SPN definitions
-            for spn_def in pgn_def.spn_definitions:
-                self.spn_definitions[spn_def.spn] = spn_def
+        # Load standard agricultural PGN definitions
+        self._load_registry(registry or get_default_registry())
+
+    def _load_registry(self, registry: J1939Registry) -> None:
+        """Load PGN/SPN definitions and compiled plans from a registry.
+
+        Only the lookup dictionaries are copied; definitions and decode plans
+        are shared with every other decoder using the same registry.
+
+        Parameters
+        ----------
+        registry : J1939Registry
+            Registry to load
+        """
+        self.registry = registry
+        self.pgn_definitions.update(registry.pgn_definitions)
+        self.spn_definitions.update(registry.spn_definitions)
+        self.decode_plans.update(registry.decode_plans)
+
+    def register_pgn(self, pgn_def: PGNDefinition) -> PGNDecodePlan:
+        """Register a PGN definition and compile its decode plan.
+
+        Must be called again if the SPN list of a registered definition is
+        modified in place, so that the compiled plan stays in sync.
+
+        Parameters
+        ----------
+        pgn_def : PGNDefinition
+            PGN definition to register
+
+        Returns
+        -------
+        PGNDecodePlan
+            Compiled decode plan for the PGN
+        """
+        self.pgn_definitions[pgn_def.pgn] = pgn_def
+        for spn_def in pgn_def.spn_definitions:
+            self.spn_definitions[spn_def.spn] = spn_def
+
+        plan = PGNDecodePlan.from_definition(pgn_def)
+        self.decode_plans[pgn_def.pgn] = plan
+        return plan
+
+    def get_decode_plan(self, pgn: int) -> PGNDecodePlan | None:
+        """Get the compiled decode plan for a PGN.
+
+        Definitions assigned directly into ``pgn_definitions`` are compiled
+        on first use.
+
+        Parameters
+        ----------
+        pgn : int
+            Parameter Group Number
+
+        Returns
+        -------
+        PGNDecodePlan | None
+            Decode plan or None if the PGN is unknown
+        """
+        pgn_def = self.pgn_definitions.get(pgn)
+        if pgn_def is None:
+            return None
+
+        plan = self.decode_plans.get(pgn)
+        if plan is None or plan.definition is not pgn_def:
+            plan = PGNDecodePlan.from_definition(pgn_def)
+            self.decode_plans[pgn] = plan
+        return plan
 
     def decode_can_message(self, message: can.Message) -> DecodedPGN | None:
         """Decode a CAN message into structured J1939 data.
@@ -451,32 +1278,27 @@ class J1939Decoder:
                 destination_address = pdu_specific
 
             # Check for Transport Protocol messages
-            if pdu_format == 0xEC:  # TP.DT (Transport Protocol Data Transfer)
+            if pdu_format == TP_DT_PDU_FORMAT:
                 return self._handle_transport_protocol_dt(
                     message, source_address, destination_address
                 )
-            elif pdu_format == 0xEB:  # TP.CM (Transport Protocol Connection Management)
+            elif pdu_format == TP_CM_PDU_FORMAT:
                 return self._handle_transport_protocol_cm(
                     message, source_address, destination_address
                 )
 
-            # Look up PGN definition
-            if pgn not in self.pgn_definitions:
+            # Look up compiled decode plan
+            plan: PGNDecodePlan | None = self.get_decode_plan(pgn)
+            if plan is None:
                 logger.debug(f"Unknown PGN: {pgn:04X}")
                 return None
 
-            pgn_def: PGNDefinition = self.pgn_definitions[pgn]
-
             # Decode SPNs
-            decoded_spns: list[DecodedSPN] = []
-            for spn_def in pgn_def.spn_definitions:
-                decoded_spn: DecodedSPN | None = self._decode_spn(spn_def, message.data)
-                if decoded_spn:
-                    decoded_spns.append(decoded_spn)
+            decoded_spns: list[DecodedSPN] = plan.decode(message.data)
 
             return DecodedPGN(
                 pgn=pgn,
-                name=pgn_def.name,
+                name=plan.definition.name,
                 source_address=source_address,
                 destination_address=destination_address,
                 priority=priority,
@@ -490,6 +1312,163 @@ class J1939Decoder:
             logger.error(f"Failed to decode CAN message {message.arbitration_id:08X}: {e}")
             return None
 
+    def decode_can_message_view(self, message: can.Message) -> DecodedPGNView | DecodedPGN | None:
+        """Decode a CAN message into a lazily evaluated view.
+
+        Only the identifier fields are resolved up front; SPNs are decoded on
+        access. Transport Protocol frames are delegated to
+        ``decode_can_message`` since they require session state.
+
+        Parameters
+        ----------
+        message : can.Message
+            CAN message to decode
+
+        Returns
+        -------
+        DecodedPGNView | DecodedPGN | None
+            Lazy view of the PGN, a reassembled multi-frame DecodedPGN, or None
+        """
+        can_id: int = message.arbitration_id
+        if not message.is_extended_id or can_id > 0x1FFFFFFF:
+            return None
+
+        pdu_format: int = (can_id >> 16) & 0xFF
+        if pdu_format == TP_DT_PDU_FORMAT or pdu_format == TP_CM_PDU_FORMAT:
+            return self.decode_can_message(message)
+
+        if pdu_format >= 240:
+            pgn: int = (can_id >> 8) & 0x1FFFF
+            destination_address: int = 255
+        else:
+            pgn = (can_id >> 8) & 0x1FF00
+            destination_address = (can_id >> 8) & 0xFF
+
+        plan: PGNDecodePlan | None = self.decode_plans.get(pgn)
+        if plan is None or plan.definition is not self.pgn_definitions.get(pgn):
+            plan = self.get_decode_plan(pgn)
+            if plan is None:
+                logger.debug(f"Unknown PGN: {pgn:04X}")
+                return None
+
+        return DecodedPGNView(
+            plan,
+            can_id & 0xFF,
+            destination_address,
+            (can_id >> 26) & 0x07,
+            message.data,
+            message.timestamp or 0.0,
+        )
+
+    def decode_batch(
+        self,
+        arbitration_ids: npt.ArrayLike,
+        payloads: npt.ArrayLike,
+        timestamps: npt.ArrayLike | None = None,
+        dlcs: npt.ArrayLike | None = None,
+        is_extended_id: npt.ArrayLike | None = None,
+    ) -> DecodedFrameBatch:
+        """Decode a batch of single-frame CAN messages with NumPy column operations.
+
+        Rows are grouped by PGN and every SPN of a group is extracted, sign
+        extended and scaled as one array operation. Transport Protocol frames,
+        standard frames and unknown PGNs are reported in ``undecoded_indices``.
+
+        Parameters
+        ----------
+        arbitration_ids : npt.ArrayLike
+            CAN identifiers, shape (N,)
+        payloads : npt.ArrayLike
+            Payload matrix, shape (N, 8), dtype uint8 (short frames zero padded)
+        timestamps : npt.ArrayLike | None
+            Reception timestamps in seconds, shape (N,); zeros if None
+        dlcs : npt.ArrayLike | None
+            Payload lengths in bytes, shape (N,); 8 for every frame if None
+        is_extended_id : npt.ArrayLike | None
+            Extended (29-bit) identifier flags, shape (N,); all True if None
+
+        Returns
+        -------
+        DecodedFrameBatch
+            Columnar decode result grouped by PGN
+        """
+        ids = np.asarray(arbitration_ids, dtype=np.int64).reshape(-1)
+        frame_count = len(ids)
+
+        payload_matrix = np.ascontiguousarray(payloads, dtype=np.uint8)
+        if payload_matrix.shape != (frame_count, 8):
+            raise ValueError(
+                f"payloads must have shape ({frame_count}, 8), got {payload_matrix.shape}"
+            )
+        words = payload_matrix.view("<u8").reshape(frame_count).astype(np.uint64)
+
+        times = (
+            np.zeros(frame_count, dtype=np.float64)
+            if timestamps is None
+            else np.asarray(timestamps, dtype=np.float64).reshape(-1)
+        )
+        data_bits = (
+            np.full(frame_count, 64, dtype=np.int64)
+            if dlcs is None
+            else np.asarray(dlcs, dtype=np.int64).reshape(-1) * 8
+        )
+        extended = (
+            np.ones(frame_count, dtype=np.bool_)
+            if is_extended_id is None
+            else np.asarray(is_extended_id, dtype=np.bool_).reshape(-1)
+        )
+
+        # Vectorized J1939 identifier parsing
+        priority = (ids >> 26) & 0x07
+        data_page = (ids >> 24) & 0x01
+        pdu_format = (ids >> 16) & 0xFF
+        pdu_specific = (ids >> 8) & 0xFF
+        source_address = ids & 0xFF
+        is_pdu2 = pdu_format >= 240
+        pgns = (data_page << 16) | (pdu_format << 8) | np.where(is_pdu2, pdu_specific, 0)
+        destination_address = np.where(is_pdu2, 255, pdu_specific)
+
+        # Transport Protocol frames need session state and go through decode_can_message
+        eligible = (
+            extended
+            & (ids >= 0)
+            & (ids <= 0x1FFFFFFF)
+            & (pdu_format != TP_CM_PDU_FORMAT)
+            & (pdu_format != TP_DT_PDU_FORMAT)
+        )
+
+        result = DecodedFrameBatch(frame_count=frame_count)
+        decoded_mask = np.zeros(frame_count, dtype=np.bool_)
+        eligible_indices = np.flatnonzero(eligible)
+        unique_pgns, group_ids = np.unique(pgns[eligible_indices], return_inverse=True)
+
+        for group_id, pgn in enumerate(unique_pgns.tolist()):
+            plan = self.get_decode_plan(pgn)
+            if plan is None:
+                continue
+
+            rows = eligible_indices[group_ids == group_id]
+            decoded_mask[rows] = True
+            group_words = words[rows]
+            group_bits = data_bits[rows]
+
+            result.pgn_batches[pgn] = DecodedPGNBatch(
+                pgn=pgn,
+                name=plan.definition.name,
+                row_indices=rows,
+                source_addresses=source_address[rows].astype(np.uint8),
+                destination_addresses=destination_address[rows].astype(np.uint8),
+                priorities=priority[rows].astype(np.uint8),
+                timestamps=times[rows],
+                spn_columns={
+                    compiled.definition.spn: compiled.decode_column(group_words, group_bits)
+                    for compiled in plan.spns
+                },
+            )
+
+        result.undecoded_indices = np.flatnonzero(~decoded_mask)
+        return result
+
     def _parse_j1939_id(self, can_id: int) -> tuple[int, int, int, int, int] | None:
         """Parse J1939 components from 29-bit CAN ID.
 
@@ -518,6 +1497,9 @@ class J1939Decoder:
     def _decode_spn(self, spn_def: SPNDefinition, data: bytes) -> DecodedSPN | None:
         """Decode a single SPN from message data.
 
+        Uncompiled reference implementation; ``decode_can_message`` uses the
+        compiled ``PGNDecodePlan`` instead.
+
         Parameters
         ----------
         spn_def : SPNDefinition
@@ -640,18 +1622,32 @@ class J1939Decoder:
         DecodedPGN | None
             Assembled multi-frame message or None if incomplete
         """
-        if len(message.data) < 1:
+        session = self.transport_reassembler.handle_data_transfer(
+            message.data, source_address, destination_address
+        )
+        if session is None:
             return None
 
-        sequence_number = message.data[0]
-        # data_bytes = message.data[1:]  # Will be used when multi-frame assembly is implemented
+        data = bytes(session.data_buffer)
+        plan: PGNDecodePlan | None = self.get_decode_plan(session.pgn)
 
-        # Find active transport session
-        # session_key = (source_address, destination_address, 0)  # Will be used for multi-frame sessions
-
-        # For now, return None as multi-frame assembly requires more complex state management
-        logger.debug(f"TP.DT message received: seq={sequence_number}, from={source_address:02X}")
-        return None
+        logger.debug(
+            f"TP message reassembled: PGN={session.pgn:04X}, size={session.total_size}, "
+            f"from={source_address:02X}"
+        )
+        return DecodedPGN(
+            pgn=session.pgn,
+            name=plan.definition.name if plan else f"Unknown PGN {session.pgn:04X}",
+            source_address=session.source_address,
+            destination_address=session.destination_address,
+            priority=(message.arbitration_id >> 26) & 0x07,
+            timestamp=datetime.fromtimestamp(message.timestamp or 0),
+            spn_values=plan.decode(data) if plan else [],
+            raw_data=data,
+            data_length=len(data),
+            is_multi_frame=True,
+            frame_count=session.total_packets,
+        )
 
     def _handle_transport_protocol_cm(
         self, message: can.Message, source_address: int, destination_address: int
@@ -672,31 +1668,112 @@ class J1939Decoder:
         DecodedPGN | None
             None (CM messages don't contain data)
         """
-        if len(message.data) < 8:
-            return None
+        self.transport_reassembler.handle_connection_management(
+            message.data, source_address, destination_address
+        )
+        return None
 
-        control_byte = message.data[0]
 
-        if control_byte == 16:  # RTS (Request to Send)
-            total_message_size = struct.unpack("<H", message.data[1:3])[0]
-            total_packets = message.data[3]
-            # maximum_packets = message.data[4]  # Will be used when implementing flow control
-            pgn = struct.unpack("<I", message.data[5:8] + b"\x00")[0]
+class J1939Encoder:
+    """J1939/ISOBUS message encoder for agricultural equipment."""
 
-            logger.debug(
-                f"TP.CM RTS: PGN={pgn:04X}, size={total_message_size}, packets={total_packets}"
-            )
+    def __init__(self, decoder: J1939Decoder | None = None) -> None:
+        """Initialize J1939 encoder.
 
-        # For now, just log and return None
-        return None
+        Parameters
+        ----------
+        decoder : J1939Decoder | None
+            Decoder whose PGN definitions are reused; a decoder over the
+            shared default registry if None
+        """
+        self.decoder = decoder or J1939Decoder()  # Reuse PGN definitions
+        # (pgn, priority, source, destination) -> compiled template
+        self.encode_templates: dict[tuple[int, int, int, int], PGNEncodeTemplate] = {}
 
+    def get_encode_template(
+        self,
+        pgn: int,
+        source_address: int,
+        priority: int = 6,
+        destination_address: int = 255,
+    ) -> PGNEncodeTemplate | None:
+        """Get the compiled encode template for a PGN and addressing.
 
-class J1939Encoder:
-    """J1939/ISOBUS message encoder for agricultural equipment."""
+        Templates are compiled on first use and recompiled if the PGN
+        definition was replaced.
+
+        Parameters
+        ----------
+        pgn : int
+            Parameter Group Number
+        source_address : int
+            Source address (0-255)
+        priority : int, default 6
+            Message priority (0-7)
+        destination_address : int, default 255
+            Destination address (255 for broadcast)
 
-    def __init__(self) -> None:
-        """Initialize J1939 encoder."""
-        self.decoder = J1939Decoder()  # Reuse PGN definitions
+        Returns
+        -------
+        PGNEncodeTemplate | None
+            Encode template or None if the PGN is unknown
+        """
+        pgn_def = self.decoder.pgn_definitions.get(pgn)
+        if pgn_def is None:
+            return None
+
+        key = (pgn, priority, source_address, destination_address)
+        template = self.encode_templates.get(key)
+        if template is None or template.definition is not pgn_def:
+            can_id = self._construct_j1939_id(pgn, priority, source_address, destination_address)
+            template = PGNEncodeTemplate.from_definition(pgn_def, can_id)
+            self.encode_templates[key] = template
+        return template
+
+    def encode_batch(
+        self,
+        pgn: int,
+        source_address: int,
+        values: Sequence[dict[int, Any]],
+        priority: int = 6,
+        destination_address: int = 255,
+        out: npt.NDArray[np.uint8] | None = None,
+    ) -> npt.NDArray[np.uint8] | None:
+        """Encode many frames of one PGN into a payload matrix.
+
+        All frames share the template's arbitration identifier
+        (``get_encode_template(...).arbitration_id``).
+
+        Parameters
+        ----------
+        pgn : int
+            Parameter Group Number
+        source_address : int
+            Source address (0-255)
+        values : Sequence[dict[int, Any]]
+            One SPN value dict per frame
+        priority : int, default 6
+            Message priority (0-7)
+        destination_address : int, default 255
+            Destination address (255 for broadcast)
+        out : npt.NDArray[np.uint8] | None
+            Preallocated uint8 buffer of shape (N, >= data_length)
+
+        Returns
+        -------
+        npt.NDArray[np.uint8] | None
+            Payload matrix or None if encoding fails
+        """
+        template = self.get_encode_template(pgn, source_address, priority, destination_address)
+        if template is None:
+            logger.error(f"Unknown PGN for encoding: {pgn:04X}")
+            return None
+
+        try:
+            return template.encode_batch(values, out)
+        except Exception as e:
+            logger.error(f"Failed to batch encode PGN {pgn:04X}: {e}")
+            return None
 
     def encode_pgn_message(
         self,
@@ -730,35 +1807,13 @@ class J1939Encoder:
             Encoded CAN message or None if encoding fails
         """
         try:
-            # Look up PGN definition
-            if pgn not in self.decoder.pgn_definitions:
+            # Look up the compiled template (PGN definition + cached CAN ID)
+            template = self.get_encode_template(pgn, source_address, priority, destination_address)
+            if template is None:
                 logger.error(f"Unknown PGN for encoding: {pgn:04X}")
                 return None
 
-            pgn_def = self.decoder.pgn_definitions[pgn]
-
-            # Initialize data buffer
-            data = bytearray(pgn_def.data_length)
-
-            # Encode each SPN
-            for spn_def in pgn_def.spn_definitions:
-                if spn_def.spn in spn_values:
-                    value = spn_values[spn_def.spn]
-                    encoded_value = self._encode_spn_value(spn_def, value)
-                    if encoded_value is not None:
-                        self._insert_bits(
-                            data, spn_def.start_bit, spn_def.bit_length, encoded_value
-                        )
-
-            # Construct J1939 CAN ID
-            can_id = self._construct_j1939_id(pgn, priority, source_address, destination_address)
-
-            return can.Message(
-                arbitration_id=can_id,
-                data=bytes(data),
-                is_extended_id=True,
-                timestamp=timestamp or 0.0,
-            )
+            return template.encode(spn_values, timestamp)
 
         except Exception as e:
             logger.error(f"Failed to encode PGN {pgn:04X}: {e}")
@@ -997,10 +2052,34 @@ class J1939Encoder:
 class CANFrameCodec:
     """Complete CAN frame codec for ISOBUS agricultural systems."""
 
-    def __init__(self) -> None:
-        """Initialize CAN frame codec."""
-        self.decoder = J1939Decoder()
-        self.encoder = J1939Encoder()
+    def __init__(self, registry: J1939Registry | None = None) -> None:
+        """Initialize CAN frame codec.
+
+        Parameters
+        ----------
+        registry : J1939Registry | None
+            PGN/SPN registry; the shared default registry if None
+        """
+        self.decoder = J1939Decoder(registry)
+        self.encoder = J1939Encoder(self.decoder)
+        self.messages_decoded = 0  # decode_message calls (one per frame with envelopes)
+
+    def create_envelope(self, message: can.Message, interface_id: str = "") -> CANFrameEnvelope:
+        """Wrap a received message in a decode-once envelope.
+
+        Parameters
+        ----------
+        message : can.Message
+            Received CAN message
+        interface_id : str, default ""
+            Interface that received the message
+
+        Returns
+        -------
+        CANFrameEnvelope
+            Envelope with parsed identifier fields
+        """
+        return CANFrameEnvelope(message, self, interface_id)
 
     def decode_message(self, message: can.Message) -> DecodedPGN | None:
         """Decode a CAN message.
@@ -1015,8 +2094,85 @@ class CANFrameCodec:
         DecodedPGN | None
             Decoded message data
         """
+        self.messages_decoded += 1
         return self.decoder.decode_can_message(message)
 
+    def decode_message_view(self, message: can.Message) -> DecodedPGNView | DecodedPGN | None:
+        """Decode a CAN message into a lazily evaluated view.
+
+        Parameters
+        ----------
+        message : can.Message
+            Message to decode
+
+        Returns
+        -------
+        DecodedPGNView | DecodedPGN | None
+            Lazy view (or reassembled multi-frame message), None if not decodable
+        """
+        return self.decoder.decode_can_message_view(message)
+
+    def decode_batch(
+        self,
+        arbitration_ids: npt.ArrayLike,
+        payloads: npt.ArrayLike,
+        timestamps: npt.ArrayLike | None = None,
+        dlcs: npt.ArrayLike | None = None,
+        is_extended_id: npt.ArrayLike | None = None,
+    ) -> DecodedFrameBatch:
+        """Decode a batch of frames given as parallel arrays.
+
+        Parameters
+        ----------
+        arbitration_ids : npt.ArrayLike
+            CAN identifiers, shape (N,)
+        payloads : npt.ArrayLike
+            Payload matrix, shape (N, 8), dtype uint8
+        timestamps : npt.ArrayLike | None
+            Reception timestamps in seconds, shape (N,)
+        dlcs : npt.ArrayLike | None
+            Payload lengths in bytes, shape (N,)
+        is_extended_id : npt.ArrayLike | None
+            Extended identifier flags, shape (N,)
+
+        Returns
+        -------
+        DecodedFrameBatch
+            Columnar decode result grouped by PGN
+        """
+        return self.decoder.decode_batch(
+            arbitration_ids, payloads, timestamps, dlcs, is_extended_id
+        )
+
+    def decode_messages_batch(self, messages: list[can.Message]) -> DecodedFrameBatch:
+        """Decode a list of CAN messages in one vectorized pass.
+
+        Parameters
+        ----------
+        messages : list[can.Message]
+            Messages to decode (e.g. a buffer flush batch or replayed log)
+
+        Returns
+        -------
+        DecodedFrameBatch
+            Columnar decode result; ``row_indices`` refer to positions in ``messages``
+        """
+        count = len(messages)
+        payloads = np.zeros((count, 8), dtype=np.uint8)
+        dlcs = np.empty(count, dtype=np.int64)
+        for row, message in enumerate(messages):
+            data = bytes(message.data)[:8]
+            payloads[row, : len(data)] = np.frombuffer(data, dtype=np.uint8)
+            dlcs[row] = len(data)
+
+        return self.decoder.decode_batch(
+            np.fromiter((m.arbitration_id for m in messages), dtype=np.int64, count=count),
+            payloads,
+            np.fromiter((m.timestamp or 0.0 for m in messages), dtype=np.float64, count=count),
+            dlcs,
+            np.fromiter((m.is_extended_id for m in messages), dtype=np.bool_, count=count),
+        )
+
     def encode_message(
         self, pgn: int, source_address: int, spn_values: dict[int, Any], **kwargs
     ) -> can.Message | None:
@@ -0,0 +1,259 @@
+"""Process-wide J1939/ISOBUS PGN and SPN definition registry.
+
+PGN and SPN definitions are loaded from a compact JSON data file and compiled
+into decode plans once per process. Every ``J1939Decoder``, ``J1939Encoder``
+and ``CANFrameCodec`` built without an explicit registry shares the default
+registry, so constructing codecs per interface (or per test) only copies a few
+dictionaries instead of rebuilding the definition tables.
+
+The bundled file ``data/j1939_pgns.json`` covers the agricultural PGN subset.
+Set ``AFS_J1939_REGISTRY_PATH`` to load a larger table (for example an export
+of the SAE J1939-71 digital annex) without code changes.
+
+Data file layout::
+
+    {
+      "format_version": 1,
+      "pgns": [
+        {
+          "pgn": 61444,
+          "name": "Electronic Engine Controller 1",
+          "description": "Engine parameters",
+          "data_length": 8,
+          "transmission_rate": 50,
+          "spns": [
+            {"spn": 190, "name": "Engine Speed", "data_type": "rpm",
+             "start_bit": 24, "bit_length": 16, "scale": 0.125, "units": "rpm",
+             "not_available_value": 65535, "error_value": 65534}
+          ]
+        }
+      ]
+    }
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from afs_fastapi.core.can_frame_codec import (
+    J1939DataType,
+    PGNDecodePlan,
+    PGNDefinition,
+    SPNDefinition,
+)
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_FORMAT_VERSION = 1
+REGISTRY_PATH_ENV = "AFS_J1939_REGISTRY_PATH"
+DEFAULT_REGISTRY_PATH = Path(__file__).parent / "data" / "j1939_pgns.json"
+
+
+class J1939RegistryError(ValueError):
+    """Raised when a PGN/SPN registry data file is malformed."""
+
+
+@dataclass(frozen=True)
+class J1939Registry:
+    """Immutable table of PGN/SPN definitions with precompiled decode plans.
+
+    Definitions are shared between every codec using the registry and must be
+    treated as read-only; register per-decoder extensions with
+    ``J1939Decoder.register_pgn`` instead.
+    """
+
+    pgn_definitions: Mapping[int, PGNDefinition]
+    spn_definitions: Mapping[int, SPNDefinition]
+    decode_plans: Mapping[int, PGNDecodePlan]
+    source: str
+
+    @classmethod
+    def from_definitions(
+        cls, pgn_definitions: list[PGNDefinition], source: str = "<memory>"
+    ) -> J1939Registry:
+        """Build a registry and compile decode plans for PGN definitions.
+
+        Parameters
+        ----------
+        pgn_definitions : list[PGNDefinition]
+            PGN definitions (later duplicates replace earlier ones)
+        source : str, default "<memory>"
+            Description of where the definitions came from
+
+        Returns
+        -------
+        J1939Registry
+            Registry holding the definitions and compiled plans
+        """
+        pgns: dict[int, PGNDefinition] = {}
+        spns: dict[int, SPNDefinition] = {}
+        plans: dict[int, PGNDecodePlan] = {}
+
+        for pgn_def in pgn_definitions:
+            pgns[pgn_def.pgn] = pgn_def
+            for spn_def in pgn_def.spn_definitions:
+                spns[spn_def.spn] = spn_def
+            plans[pgn_def.pgn] = PGNDecodePlan.from_definition(pgn_def)
+
+        return cls(
+            pgn_definitions=MappingProxyType(pgns),
+            spn_definitions=MappingProxyType(spns),
+            decode_plans=MappingProxyType(plans),
+            source=source,
+        )
+
+    @classmethod
+    def from_dict(cls, document: dict[str, Any], source: str = "<memory>") -> J1939Registry:
+        """Build a registry from a parsed data file document.
+
+        Parameters
+        ----------
+        document : dict[str, Any]
+            Parsed registry document
+        source : str, default "<memory>"
+            Description of where the document came from
+
+        Returns
+        -------
+        J1939Registry
+            Registry holding the document's definitions
+
+        Raises
+        ------
+        J1939RegistryError
+            If the document is malformed or uses an unsupported format version
+        """
+        version = document.get("format_version")
+        if version != REGISTRY_FORMAT_VERSION:
+            raise J1939RegistryError(
+                f"Unsupported J1939 registry format version {version!r} in {source}"
+            )
+
+        try:
+            pgn_definitions = [_parse_pgn(entry) for entry in document["pgns"]]
+        except (KeyError, TypeError, ValueError) as e:
+            raise J1939RegistryError(f"Invalid J1939 registry entry in {source}: {e!r}") from e
+
+        return cls.from_definitions(pgn_definitions, source=source)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> J1939Registry:
+        """Load a registry from a JSON data file.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to the registry data file
+
+        Returns
+        -------
+        J1939Registry
+            Registry holding the file's definitions
+
+        Raises
+        ------
+        J1939RegistryError
+            If the file cannot be read or is malformed
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                document = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise J1939RegistryError(f"Failed to load J1939 registry {path}: {e}") from e
+
+        registry = cls.from_dict(document, source=str(path))
+        logger.info(
+            f"Loaded J1939 registry from {path}: {len(registry.pgn_definitions)} PGNs, "
+            f"{len(registry.spn_definitions)} SPNs"
+        )
+        return registry
+
+    def get_pgn_name(self, pgn: int) -> str | None:
+        """Get the name of a registered PGN.
+
+        Parameters
+        ----------
+        pgn : int
+            Parameter Group Number
+
+        Returns
+        -------
+        str | None
+            PGN name or None if the PGN is not registered
+        """
+        pgn_def = self.pgn_definitions.get(pgn)
+        return pgn_def.name if pgn_def is not None else None
+
+
+def _parse_spn(entry: dict[str, Any]) -> SPNDefinition:
+    """Convert a data file SPN entry into an SPN definition."""
+    return SPNDefinition(
+        spn=int(entry["spn"]),
+        name=entry["name"],
+        description=entry.get("description", ""),
+        data_type=J1939DataType(entry["data_type"]),
+        start_bit=int(entry["start_bit"]),
+        bit_length=int(entry["bit_length"]),
+        scale=float(entry.get("scale", 1.0)),
+        offset=float(entry.get("offset", 0.0)),
+        units=entry.get("units", ""),
+        min_value=entry.get("min_value"),
+        max_value=entry.get("max_value"),
+        not_available_value=entry.get("not_available_value"),
+        error_value=entry.get("error_value"),
+        metadata=dict(entry.get("metadata", {})),
+    )
+
+
+def _parse_pgn(entry: dict[str, Any]) -> PGNDefinition:
+    """Convert a data file PGN entry into a PGN definition."""
+    return PGNDefinition(
+        pgn=int(entry["pgn"]),
+        name=entry["name"],
+        description=entry.get("description", ""),
+        data_length=int(entry.get("data_length", 8)),
+        transmission_rate=entry.get("transmission_rate"),
+        spn_definitions=[_parse_spn(spn) for spn in entry.get("spns", [])],
+        is_proprietary=bool(entry.get("is_proprietary", False)),
+        source_address_specific=bool(entry.get("source_address_specific", False)),
+        destination_specific=bool(entry.get("destination_specific", False)),
+        metadata=dict(entry.get("metadata", {})),
+    )
+
+
+@cache
+def load_registry(path: str) -> J1939Registry:
+    """Load a registry data file once per process.
+
+    Parameters
+    ----------
+    path : str
+        Path to the registry data file
+
+    Returns
+    -------
+    J1939Registry
+        Cached registry for the path
+    """
+    return J1939Registry.from_file(path)
+
+
+def get_default_registry() -> J1939Registry:
+    """Get the process-wide default registry.
+
+    Returns
+    -------
+    J1939Registry
+        Registry loaded from ``AFS_J1939_REGISTRY_PATH`` if set, otherwise
+        from the bundled agricultural PGN table
+    """
+    path = os.environ.get(REGISTRY_PATH_ENV) or str(DEFAULT_REGISTRY_PATH)
+    return load_registry(path)
@@ -4,9 +4,11 @@ from .agricultural_archiving import (
     ArchivalManager,
     ArchivalResult,
     ArchivalStatus,
+    ArchiveBlockIndex,
     ComplianceCheck,
     DataLifecycleStage,
     DataRetentionPolicy,
+    LocalArchiveStore,
     RecoveryResult,
     RecoveryStatus,
     RetentionPeriod,
@@ -66,6 +68,8 @@ __all__ = [
     "ComplianceCheck",
     "RecoveryResult",
     "RecoveryStatus",
+    "LocalArchiveStore",
+    "ArchiveBlockIndex",
     "create_retention_policies",
     "apply_retention_policy",
     "archive_expired_data",
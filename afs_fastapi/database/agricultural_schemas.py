@@ -24,10 +24,20 @@ from sqlalchemy import (
     Text,
     create_engine,
     event,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.types import TypeDecorator
 
+from .time_partitioning import (
+    PARTITIONED_TABLES,
+    PartitionMode,
+    PostgresPartitionManager,
+    detect_partition_mode,
+    partition_end,
+    partition_start,
+)
+
 
 class Base(DeclarativeBase):
     """Base model for type-safe SQLAlchemy 2.0 models."""
@@ -392,16 +402,47 @@ def get_database_engine(database_url: str = "sqlite:///agricultural_data.db") ->
     return engine
 
 
-def create_agricultural_tables(engine: Any) -> None:
+def create_agricultural_tables(
+    engine: Any, partition_interval: str = "1 day", premake_partitions: int = 3
+) -> None:
     """Create all agricultural database tables with proper indexes.
 
+    On PostgreSQL the time-series tables are range partitioned by timestamp
+    (TimescaleDB hypertables when the extension is installed) and the
+    partitions for the next ``premake_partitions`` intervals are created.
+
     Parameters
     ----------
     engine : sqlalchemy.engine.Engine
         Database engine for table creation
+    partition_interval : str, default "1 day"
+        Partition interval of the time-series tables on PostgreSQL
+    premake_partitions : int, default 3
+        Number of future partitions to create ahead of time
     """
-    # Create all tables defined in Base metadata
-    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        mode = detect_partition_mode(connection)
+        if mode is PartitionMode.NONE:
+            # Create all tables defined in Base metadata
+            Base.metadata.create_all(connection)
+        else:
+            partitions = PostgresPartitionManager(
+                mode,
+                {
+                    name: column
+                    for name, column in PARTITIONED_TABLES.items()
+                    if name in Base.metadata.tables
+                },
+                partition_interval,
+            )
+            partitions.create_schema(connection, Base.metadata)
+
+            now = datetime.now(UTC)
+            ahead = partition_start(now, partition_interval)
+            for _ in range(premake_partitions):
+                ahead = partition_end(ahead, partition_interval)
+            for table_name in partitions.tables:
+                partitions.ensure_partitions(connection, table_name, now, ahead)
 
     # Additional index creation for time-series optimization
     with engine.connect() as connection:
@@ -409,22 +450,30 @@ def create_agricultural_tables(engine: Any) -> None:
         if "postgresql" in str(engine.url):
             # Create time-series specific indexes for PostgreSQL
             connection.execute(
+                text(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_isobus_messages_time_bucket
+                    ON isobus_messages USING BTREE (date_trunc('minute', timestamp))
                 """
-                CREATE INDEX IF NOT EXISTS idx_isobus_messages_time_bucket
-                ON isobus_messages USING BTREE (date_trunc('minute', timestamp))
-            """
+                )
             )
             connection.execute(
+                text(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_sensor_data_time_bucket
+                    ON agricultural_sensor_data USING BTREE (date_trunc('hour', timestamp))
                 """
-                CREATE INDEX IF NOT EXISTS idx_sensor_data_time_bucket
-                ON agricultural_sensor_data USING BTREE (date_trunc('hour', timestamp))
-            """
+                )
             )
             connection.commit()
 
 
 def get_time_series_partition_info(
-    table_name: str, start_date: datetime, end_date: datetime
+    table_name: str,
+    start_date: datetime,
+    end_date: datetime,
+    connection: Any | None = None,
+    partition_interval: str = "1 day",
 ) -> dict[str, Any]:
     """Get time-series partition information for large agricultural datasets.
 
@@ -436,6 +485,11 @@ def get_time_series_partition_info(
         Start date for partition analysis
     end_date : datetime
         End date for partition analysis
+    connection : sqlalchemy.engine.Connection, optional
+        PostgreSQL connection; when given, the table's existing partitions
+        overlapping the date range are reported
+    partition_interval : str, default "1 day"
+        Partition interval the tables were created with
 
     Returns
     -------
@@ -457,6 +511,19 @@ def get_time_series_partition_info(
         }.get(table_name, 1000),
     }
 
+    if connection is not None:
+        mode = detect_partition_mode(connection)
+        partition_strategy["partition_mode"] = mode.value
+        if mode is not PartitionMode.NONE:
+            start = start_date if start_date.tzinfo else start_date.replace(tzinfo=UTC)
+            end = end_date if end_date.tzinfo else end_date.replace(tzinfo=UTC)
+            partitions = PostgresPartitionManager(mode, interval=partition_interval)
+            partition_strategy["partitions"] = [
+                partition.name
+                for partition in partitions.list_partitions(connection, table_name)
+                if partition.start < end and partition.end > start
+            ]
+
     return partition_strategy
 
 
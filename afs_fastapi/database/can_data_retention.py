@@ -11,17 +11,45 @@ Implementation follows Test-First Development (TDD) GREEN phase.
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import lzma
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from enum import Enum
+from itertools import groupby
 from pathlib import Path
-from typing import Any, TypedDict, cast
-
-import pandas as pd
-from sqlalchemy import text
-
+from typing import IO, Any, TypedDict, cast
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    ColumnElement,
+    DateTime,
+    Float,
+    Integer,
+    LargeBinary,
+    MetaData,
+    Row,
+    String,
+    Table,
+    TextClause,
+    delete,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from afs_fastapi.database.can_time_series_schema import TimeSeriesBase
 from afs_fastapi.database.can_time_series_storage import CANTimeSeriesStorage
+from afs_fastapi.database.time_partitioning import SQLiteDayShardRouter, as_utc
 
 # Configure logging for data retention
 logger = logging.getLogger(__name__)
@@ -105,6 +133,7 @@ class RetentionRule:
 
     # Performance settings
     batch_size: int = 10000
+    pages_per_archive_file: int = 16  # Archived rows are deleted as each file completes
     parallel_workers: int = 2
 
     # Metadata
@@ -112,6 +141,100 @@ class RetentionRule:
     enabled: bool = True
 
 
+_ARCHIVE_SUFFIXES = {
+    CompressionFormat.PARQUET: ".parquet",
+    CompressionFormat.GZIP_CSV: ".csv.gz",
+    CompressionFormat.ZSTD: ".csv.zst",
+    CompressionFormat.LZMA: ".csv.xz",
+}
+
+
+def _partition_date(timestamp: datetime) -> date:
+    """Return the UTC day a row timestamp belongs to (naive values are UTC)."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(UTC)
+    return timestamp.date()
+
+
+def _arrow_type(column_type: Any) -> pa.DataType:
+    """Map a SQLAlchemy column type to the Arrow type it is archived as."""
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer | BigInteger):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column_type, LargeBinary):
+        return pa.binary()
+    # JSON documents and everything else are archived as text
+    return pa.string()
+
+
+def _arrow_schema(table: Table) -> pa.Schema:
+    """Return the Arrow schema archive files of a table are written with."""
+    return pa.schema([pa.field(column.name, _arrow_type(column.type)) for column in table.columns])
+
+
+def _rows_to_arrow(rows: Sequence[Row[Any]], table: Table, schema: pa.Schema) -> pa.Table:
+    """Convert a page of rows to an Arrow table column by column."""
+    arrays = []
+    for index, (column, field) in enumerate(zip(table.columns, schema, strict=True)):
+        values = [row[index] for row in rows]
+        if isinstance(column.type, JSON):
+            values = [
+                value if value is None or isinstance(value, str) else json.dumps(value)
+                for value in values
+            ]
+        elif field.type == pa.string() and not isinstance(column.type, String):
+            values = [None if value is None else str(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class _ArchiveFileWriter:
+    """Streams Arrow row groups into one archive file."""
+
+    __slots__ = ("path", "rows", "_sink", "_writer")
+
+    def __init__(
+        self, path: Path, compression_format: CompressionFormat, schema: pa.Schema
+    ) -> None:
+        self.path = path
+        self.rows = 0
+        self._sink: IO[bytes] | pa.NativeFile | None = None
+        self._writer: pq.ParquetWriter | pa_csv.CSVWriter
+
+        if compression_format == CompressionFormat.PARQUET:
+            self._writer = pq.ParquetWriter(path, schema, compression="snappy")
+            return
+
+        if compression_format == CompressionFormat.LZMA:
+            self._sink = lzma.open(path, "wb")
+        else:
+            codec = "gzip" if compression_format == CompressionFormat.GZIP_CSV else "zstd"
+            self._sink = pa.CompressedOutputStream(str(path), codec)
+        self._writer = pa_csv.CSVWriter(self._sink, schema)
+
+    def write(self, table: pa.Table) -> None:
+        """Append a page of rows (one Parquet row group)."""
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self) -> None:
+        """Finish the file."""
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+    def discard(self) -> None:
+        """Close and remove an unfinished file."""
+        with suppress(Exception):
+            self.close()
+        self.path.unlink(missing_ok=True)
+
+
 class CANDataRetentionManager:
     """Automated data retention and archival management for CAN time-series data."""
 
@@ -404,9 +527,15 @@ class CANDataRetentionManager:
                     """
                     SELECT tablename FROM pg_tables
                     WHERE schemaname = 'public'
-                    AND tablename LIKE 'can_%'
-                    OR tablename LIKE 'agricultural_%'
-                    OR tablename LIKE 'equipment_%'
+                    AND (
+                        tablename LIKE 'can_%'
+                        OR tablename LIKE 'agricultural_%'
+                        OR tablename LIKE 'equipment_%'
+                    )
+                    AND tablename NOT IN (
+                        SELECT child.relname FROM pg_inherits
+                        JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+                    )
                 """
                 )
             else:
@@ -417,6 +546,10 @@ class CANDataRetentionManager:
                     SELECT tablename FROM pg_tables
                     WHERE schemaname = 'public'
                     AND tablename LIKE :pattern
+                    AND tablename NOT IN (
+                        SELECT child.relname FROM pg_inherits
+                        JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+                    )
                 """
                 )
 
@@ -432,7 +565,21 @@ class CANDataRetentionManager:
         archive_cutoff: datetime,
         deletion_cutoff: datetime,
     ) -> int:
-        """Archive data from a table.
+        """Archive data from a table and remove the archived rows.
+
+        Rows are read in pages with keyset pagination on (timestamp, primary
+        key) and written as row groups into archive files per day partition;
+        a partition gets a new file every ``pages_per_archive_file`` pages.
+        Once a file is complete, exactly the rows it holds are deleted by
+        primary key, and rows inserted meanwhile are left for the next run.
+        A file that fails before its rows are deleted is removed, so the
+        next run archives those rows once. Memory use is therefore bounded
+        by the rule's batch size and pages per file, not by the size of a
+        partition.
+
+        In SQLite shard mode the shards overlapping the archive range are
+        archived after the main table, so their rows are archived before the
+        shard files expire.
 
         Parameters
         ----------
@@ -448,120 +595,231 @@ class CANDataRetentionManager:
         Returns
         -------
         int
-            Number of records archived
+            Number of records archived, including the files completed before
+            an error
         """
+        writer: _ArchiveFileWriter | None = None
+        total_archived = 0
         try:
-            async with self.storage._get_async_session() as session:
-                # Build query for data to archive
-                base_query = f"""
-                    SELECT * FROM {table}
-                    WHERE timestamp < :archive_cutoff
-                    AND timestamp >= :deletion_cutoff
-                """
-
+            main_table = await self._get_table(table)
+            if not main_table.primary_key.columns:
+                logger.error(f"Cannot archive {table}: no primary key for keyset pagination")
+                return 0
+
+            sources: list[tuple[Table, datetime | None]] = [(main_table, None)]
+            shards = self.storage._raw_shards
+            if shards is not None and table == shards.table.name:
+                sources += [
+                    (shards.shard_table(shard.start), shard.start)
+                    for shard in shards.shards()
+                    if shard.end > as_utc(deletion_cutoff) and shard.start < as_utc(archive_cutoff)
+                ]
+
+            schema = _arrow_schema(main_table)
+            # Files already written per partition; shards share day partitions
+            # with the main table
+            partition_files: dict[date, int] = {}
+
+            for source, shard_start in sources:
+                key_columns = [source.c.timestamp, *source.primary_key.columns]
+                conditions: list[ColumnElement[bool] | TextClause] = [
+                    source.c.timestamp < archive_cutoff,
+                    source.c.timestamp >= deletion_cutoff,
+                ]
                 if rule.where_clause:
-                    base_query += f" AND ({rule.where_clause})"
-
-                base_query += " ORDER BY timestamp"
+                    conditions.append(text(f"({rule.where_clause})"))
 
-                # Execute query in batches
-                total_archived = 0
-                offset = 0
+                archive_key = tuple_(*key_columns)
+                last_key: tuple[Any, ...] | None = None
+                partition: date | None = None
+                pending_keys: list[list[tuple[Any, ...]]] = []
 
                 while True:
-                    query = text(base_query + f" LIMIT {rule.batch_size} OFFSET {offset}")
-                    result = await session.execute(
-                        query,
-                        {
-                            "archive_cutoff": archive_cutoff,
-                            "deletion_cutoff": deletion_cutoff,
-                        },
-                    )
+                    query = select(source).where(*conditions)
+                    if last_key is not None:
+                        query = query.where(archive_key > tuple_(*last_key))
+                    query = query.order_by(*key_columns).limit(rule.batch_size)
 
-                    rows = result.fetchall()
+                    async with self._source_session(shard_start) as session:
+                        rows = (await session.execute(query)).all()
                     if not rows:
                         break
 
-                    # Convert to DataFrame for efficient archival
-                    df = pd.DataFrame([dict(row._mapping) for row in rows])
-
-                    # Archive the batch
-                    archive_success = await self._archive_dataframe(df, table, rule, archive_cutoff)
+                    keys = [tuple(row._mapping[column] for column in key_columns) for row in rows]
+                    last_key = keys[-1]
+
+                    # Rows are ordered by timestamp, so each partition is a contiguous run
+                    start = 0
+                    for run_partition, run in groupby(
+                        keys, key=lambda key: _partition_date(key[0])
+                    ):
+                        run_length = sum(1 for _ in run)
+                        file_full = len(pending_keys) >= rule.pages_per_archive_file
+                        if run_partition != partition or file_full:
+                            if writer is not None:
+                                total_archived += await self._close_archive_file(
+                                    writer, source, pending_keys, shard_start
+                                )
+                                writer = None
+                            partition = run_partition
+                            part = partition_files.get(run_partition, 0)
+                            partition_files[run_partition] = part + 1
+                            writer = _ArchiveFileWriter(
+                                self._archive_file_path(
+                                    table, rule, run_partition, archive_cutoff, part
+                                ),
+                                rule.compression_format,
+                                schema,
+                            )
+
+                        assert writer is not None  # Assert for mypy
+                        run_rows = rows[start : start + run_length]
+                        await asyncio.to_thread(
+                            writer.write, _rows_to_arrow(run_rows, source, schema)
+                        )
+                        # Keys without the leading timestamp are the primary key
+                        pending_keys.append([key[1:] for key in keys[start : start + run_length]])
+                        start += run_length
 
-                    if archive_success:
-                        total_archived += len(df)
-                        offset += rule.batch_size
-                    else:
-                        logger.error(f"Failed to archive batch for table {table}")
-                        break
+                if writer is not None:
+                    total_archived += await self._close_archive_file(
+                        writer, source, pending_keys, shard_start
+                    )
+                    writer = None
 
-                return total_archived
+            return total_archived
 
         except Exception as e:
             logger.error(f"Failed to archive data from {table}: {e}")
-            return 0
+            if writer is not None:
+                # Its rows are still in the table and are archived by the next run
+                writer.discard()
+            return total_archived
 
-    async def _archive_dataframe(
+    @asynccontextmanager
+    async def _source_session(self, shard_start: datetime | None) -> AsyncIterator[AsyncSession]:
+        """Open a session with the shard of an archived source attached.
+
+        Parameters
+        ----------
+        shard_start : datetime | None
+            Partition start of the SQLite shard being archived; None for the
+            main table
+
+        Yields
+        ------
+        AsyncSession
+            Database session
+        """
+        async with self.storage._get_async_session() as session:
+            if shard_start is not None:
+                shards = cast(SQLiteDayShardRouter, self.storage._raw_shards)
+                await shards.attach(await session.connection(), [shard_start])
+            yield session
+
+    async def _get_table(self, table: str) -> Table:
+        """Return the SQLAlchemy table for a table name.
+
+        Parameters
+        ----------
+        table : str
+            Table name
+
+        Returns
+        -------
+        Table
+            Time-series schema table, or the table reflected from the database
+        """
+        known = TimeSeriesBase.metadata.tables.get(table)
+        if known is not None:
+            return known
+
+        async with self.storage._get_async_session() as session:
+            connection = await session.connection()
+            return await connection.run_sync(
+                lambda sync_connection: Table(table, MetaData(), autoload_with=sync_connection)
+            )
+
+    def _archive_file_path(
         self,
-        df: pd.DataFrame,
         table: str,
         rule: RetentionRule,
+        partition: date,
         archive_date: datetime,
-    ) -> bool:
-        """Archive a DataFrame to storage.
+        part: int = 0,
+    ) -> Path:
+        """Return an archive file of a table's day partition for one archival run.
 
         Parameters
         ----------
-        df : pd.DataFrame
-            Data to archive
         table : str
             Source table name
         rule : RetentionRule
             Retention rule
+        partition : date
+            Day the archived rows belong to
         archive_date : datetime
-            Archive date for file naming
+            Archive cutoff of the run, keeping files of different runs apart
+        part : int, default 0
+            Sequence number of the file within the partition and run
 
         Returns
         -------
-        bool
-            True if archival was successful
+        Path
+            Archive file path (parent directories are created)
         """
-        try:
-            # Create archive directory structure
-            archive_dir = (
-                self.base_archive_path / rule.policy.value / table / archive_date.strftime("%Y/%m")
-            )
-            archive_dir.mkdir(parents=True, exist_ok=True)
-
-            # Generate filename
-            filename = f"{table}_{archive_date.strftime('%Y%m%d_%H%M%S')}"
-
-            if rule.compression_format == CompressionFormat.PARQUET:
-                filepath = archive_dir / f"{filename}.parquet"
-                df.to_parquet(filepath, compression="snappy", index=False)
-
-            elif rule.compression_format == CompressionFormat.GZIP_CSV:
-                filepath = archive_dir / f"{filename}.csv.gz"
-                df.to_csv(filepath, compression="gzip", index=False)
+        archive_dir = (
+            self.base_archive_path / rule.policy.value / table / partition.strftime("%Y/%m")
+        )
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{table}_{partition:%Y%m%d}_{archive_date:%Y%m%dT%H%M%S}"
+        if part:
+            filename += f"_{part}"
+        return archive_dir / f"{filename}{_ARCHIVE_SUFFIXES[rule.compression_format]}"
+
+    async def _close_archive_file(
+        self,
+        writer: _ArchiveFileWriter,
+        source: Table,
+        keys: list[list[tuple[Any, ...]]],
+        shard_start: datetime | None = None,
+    ) -> int:
+        """Complete an archive file and delete the rows it holds.
 
-            elif rule.compression_format == CompressionFormat.ZSTD:
-                filepath = archive_dir / f"{filename}.csv.zst"
-                df.to_csv(filepath, compression="zstd", index=False)
+        Rows are deleted by primary key, so rows inserted after they were
+        read are never deleted unarchived. Each statement deletes one page,
+        and all pages of the file are committed together, so a failure
+        leaves every row of the file in the table.
 
-            elif rule.compression_format == CompressionFormat.LZMA:
-                filepath = archive_dir / f"{filename}.csv.xz"
-                df.to_csv(filepath, compression="xz", index=False)
+        Parameters
+        ----------
+        writer : _ArchiveFileWriter
+            Writer of the partition file
+        source : Table
+            Archived table
+        keys : list[list[tuple[Any, ...]]]
+            Primary keys of every page run written to the file (cleared)
+        shard_start : datetime | None
+            Partition start of the SQLite shard the rows are read from
 
-            # Update statistics
-            file_size_mb = filepath.stat().st_size / (1024 * 1024)
-            self.stats["archive_size_mb"] += file_size_mb
+        Returns
+        -------
+        int
+            Number of records archived to the file
+        """
+        await asyncio.to_thread(writer.close)
+        file_size_mb = writer.path.stat().st_size / (1024 * 1024)
+        self.stats["archive_size_mb"] += file_size_mb
+        logger.debug(f"Archived {writer.rows} records to {writer.path} ({file_size_mb:.2f} MB)")
 
-            logger.debug(f"Archived {len(df)} records to {filepath} ({file_size_mb:.2f} MB)")
-            return True
+        primary_key = tuple_(*source.primary_key.columns)
+        async with self._source_session(shard_start) as session:
+            for page_keys in keys:
+                await session.execute(delete(source).where(primary_key.in_(page_keys)))
+            await session.commit()
+        keys.clear()
 
-        except Exception as e:
-            logger.error(f"Failed to archive DataFrame: {e}")
-            return False
+        return writer.rows
 
     async def _delete_old_data(
         self,
@@ -571,6 +829,11 @@ class CANDataRetentionManager:
     ) -> int:
         """Delete old data from a table.
 
+        Whole expired time partitions (PostgreSQL partitions, TimescaleDB
+        chunks or SQLite shards) are dropped first; only rows of the
+        partition containing the cutoff are deleted row by row. Rules with a
+        ``where_clause`` expire part of a partition and always delete rows.
+
         Parameters
         ----------
         table : str
@@ -586,6 +849,12 @@ class CANDataRetentionManager:
             Number of records deleted
         """
         try:
+            dropped_count = 0
+            if not rule.where_clause:
+                dropped_count = (
+                    await self.storage.drop_expired_partitions(table, deletion_cutoff) or 0
+                )
+
             async with self.storage._get_async_session() as session:
                 # Build deletion query
                 base_query = f"""
@@ -605,7 +874,7 @@ class CANDataRetentionManager:
                 )
 
                 await session.commit()
-                deleted_count = cast(Any, result).rowcount or 0
+                deleted_count = dropped_count + (cast(Any, result).rowcount or 0)
 
                 if deleted_count > 0:
                     logger.debug(f"Deleted {deleted_count} records from {table}")
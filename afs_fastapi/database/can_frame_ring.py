@@ -0,0 +1,581 @@
+"""Columnar ring storage for buffered CAN frames.
+
+Frames are stored in preallocated NumPy columns (timestamp, arbitration ID,
+DLC, flags, interface index, priority and a fixed-width payload block) instead
+of one Python object per frame. A classic CAN frame costs 25 bytes of buffer
+memory, so the ring capacity can be derived from a byte budget and enforced
+exactly. ``peek`` returns zero-copy views of the oldest frames; a flush
+copies them out and releases their slots before writing, and a failed batch
+is put back in front of the newer frames with ``prepend``. Per-priority frame
+counts are kept up to date so priority eviction never scans the whole ring.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import can
+import numpy as np
+import numpy.typing as npt
+
+from afs_fastapi.core.can_frame_codec import CANFrameCodec, DecodedFrameBatch
+from afs_fastapi.database.can_time_series_schema import CANMessagePriority
+
+# Frame flag bits stored in the flags column
+FLAG_EXTENDED_ID = 0x01
+FLAG_REMOTE_FRAME = 0x02
+FLAG_ERROR_FRAME = 0x04
+FLAG_FD = 0x08
+FLAG_BITRATE_SWITCH = 0x10
+FLAG_ERROR_STATE_INDICATOR = 0x20
+
+CLASSIC_PAYLOAD_BYTES = 8
+FD_PAYLOAD_BYTES = 64
+
+# Fixed column bytes per frame: timestamp, arbitration ID, DLC, flags,
+# interface index and priority
+_FIXED_COLUMN_BYTES = 8 + 4 + 1 + 1 + 2 + 1
+
+_PRIORITY_LEVELS = len(CANMessagePriority)
+
+# Frames compared per step while looking for an eviction victim
+_SCAN_CHUNK = 64
+
+
+@dataclass(frozen=True, slots=True)
+class CANFrameBatch:
+    """Contiguous run of buffered frames as column views.
+
+    The arrays are views into the ring and stay valid until the batch is
+    consumed; copy them if they must outlive the flush callback.
+    """
+
+    timestamps: npt.NDArray[np.float64]
+    arbitration_ids: npt.NDArray[np.uint32]
+    dlcs: npt.NDArray[np.uint8]
+    flags: npt.NDArray[np.uint8]
+    interface_indices: npt.NDArray[np.uint16]
+    priorities: npt.NDArray[np.uint8]
+    payloads: npt.NDArray[np.uint8]
+    interface_names: tuple[str, ...]
+
+    def __len__(self) -> int:
+        """Return the number of frames in the batch."""
+        return len(self.arbitration_ids)
+
+    def copy(self) -> CANFrameBatch:
+        """Copy the batch out of the ring so its slots can be reused.
+
+        Returns
+        -------
+        CANFrameBatch
+            Batch owning its column arrays
+        """
+        return CANFrameBatch(
+            timestamps=self.timestamps.copy(),
+            arbitration_ids=self.arbitration_ids.copy(),
+            dlcs=self.dlcs.copy(),
+            flags=self.flags.copy(),
+            interface_indices=self.interface_indices.copy(),
+            priorities=self.priorities.copy(),
+            payloads=self.payloads.copy(),
+            interface_names=self.interface_names,
+        )
+
+    def take(self, rows: npt.ArrayLike) -> CANFrameBatch:
+        """Copy selected frames into a new batch.
+
+        Parameters
+        ----------
+        rows : npt.ArrayLike
+            Frame positions to keep, in the order they are kept
+
+        Returns
+        -------
+        CANFrameBatch
+            Batch owning its column arrays
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        return CANFrameBatch(
+            timestamps=self.timestamps[rows],
+            arbitration_ids=self.arbitration_ids[rows],
+            dlcs=self.dlcs[rows],
+            flags=self.flags[rows],
+            interface_indices=self.interface_indices[rows],
+            priorities=self.priorities[rows],
+            payloads=self.payloads[rows],
+            interface_names=self.interface_names,
+        )
+
+    @property
+    def is_extended_id(self) -> npt.NDArray[np.bool_]:
+        """Extended (29-bit) identifier flags, shape (N,)."""
+        return (self.flags & FLAG_EXTENDED_ID).astype(np.bool_)
+
+    def interface_id(self, row: int) -> str:
+        """Get the receiving interface of a frame.
+
+        Parameters
+        ----------
+        row : int
+            Frame position in the batch
+
+        Returns
+        -------
+        str
+            Interface identifier
+        """
+        return self.interface_names[int(self.interface_indices[row])]
+
+    def priority(self, row: int) -> CANMessagePriority:
+        """Get the buffering priority of a frame.
+
+        Parameters
+        ----------
+        row : int
+            Frame position in the batch
+
+        Returns
+        -------
+        CANMessagePriority
+            Priority assigned when the frame was buffered
+        """
+        return CANMessagePriority(int(self.priorities[row]))
+
+    def message(self, row: int) -> can.Message:
+        """Rebuild the CAN message of a frame.
+
+        Parameters
+        ----------
+        row : int
+            Frame position in the batch
+
+        Returns
+        -------
+        can.Message
+            Message equivalent to the buffered frame
+        """
+        flags = int(self.flags[row])
+        dlc = int(self.dlcs[row])
+        return can.Message(
+            timestamp=float(self.timestamps[row]),
+            arbitration_id=int(self.arbitration_ids[row]),
+            is_extended_id=bool(flags & FLAG_EXTENDED_ID),
+            is_remote_frame=bool(flags & FLAG_REMOTE_FRAME),
+            is_error_frame=bool(flags & FLAG_ERROR_FRAME),
+            is_fd=bool(flags & FLAG_FD),
+            bitrate_switch=bool(flags & FLAG_BITRATE_SWITCH),
+            error_state_indicator=bool(flags & FLAG_ERROR_STATE_INDICATOR),
+            channel=self.interface_id(row),
+            dlc=dlc,
+            data=self.payloads[row, :dlc].tobytes(),
+        )
+
+    def reception_time(self, row: int) -> datetime:
+        """Get the reception time of a frame as a datetime.
+
+        Parameters
+        ----------
+        row : int
+            Frame position in the batch
+
+        Returns
+        -------
+        datetime
+            Local reception time
+        """
+        return datetime.fromtimestamp(float(self.timestamps[row]))
+
+    def decode(self, codec: CANFrameCodec) -> DecodedFrameBatch:
+        """Decode the classic CAN frames of the batch in one vectorized pass.
+
+        Parameters
+        ----------
+        codec : CANFrameCodec
+            Codec providing the PGN definitions
+
+        Returns
+        -------
+        DecodedFrameBatch
+            Columnar decode result; ``row_indices`` refer to batch positions
+        """
+        return codec.decode_batch(
+            self.arbitration_ids,
+            self.payloads[:, :CLASSIC_PAYLOAD_BYTES],
+            self.timestamps,
+            np.minimum(self.dlcs, CLASSIC_PAYLOAD_BYTES),
+            self.is_extended_id,
+        )
+
+
+class CANFrameRing:
+    """Preallocated FIFO ring of CAN frames in columnar arrays."""
+
+    def __init__(self, capacity: int, payload_bytes: int = CLASSIC_PAYLOAD_BYTES) -> None:
+        """Initialize frame ring.
+
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of frames held
+        payload_bytes : int, default 8
+            Payload block width (8 for classic CAN, 64 for CAN FD)
+        """
+        if capacity < 1:
+            raise ValueError(f"Ring capacity must be positive, got {capacity}")
+        if payload_bytes not in (CLASSIC_PAYLOAD_BYTES, FD_PAYLOAD_BYTES):
+            raise ValueError(f"Payload width must be 8 or 64 bytes, got {payload_bytes}")
+
+        self.capacity = capacity
+        self.payload_bytes = payload_bytes
+
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._arbitration_ids = np.zeros(capacity, dtype=np.uint32)
+        self._dlcs = np.zeros(capacity, dtype=np.uint8)
+        self._flags = np.zeros(capacity, dtype=np.uint8)
+        self._interface_indices = np.zeros(capacity, dtype=np.uint16)
+        self._priorities = np.zeros(capacity, dtype=np.uint8)
+        self._payloads = np.zeros((capacity, payload_bytes), dtype=np.uint8)
+        self._columns: tuple[npt.NDArray[np.generic], ...] = (
+            self._timestamps,
+            self._arbitration_ids,
+            self._dlcs,
+            self._flags,
+            self._interface_indices,
+            self._priorities,
+            self._payloads,
+        )
+
+        self._interface_names: list[str] = []
+        self._interface_lookup: dict[str, int] = {}
+
+        self._head = 0  # Oldest frame
+        self._size = 0
+
+        # Frames per priority, and per priority the absolute position (frames
+        # released so far plus ring offset) before which it has no frames
+        self._priority_counts = np.zeros(_PRIORITY_LEVELS, dtype=np.int64)
+        self._priority_scan = [0] * _PRIORITY_LEVELS
+        self._released = 0  # Absolute position of the oldest frame
+
+    @staticmethod
+    def frame_bytes(payload_bytes: int = CLASSIC_PAYLOAD_BYTES) -> int:
+        """Get the buffer memory used per frame.
+
+        Parameters
+        ----------
+        payload_bytes : int, default 8
+            Payload block width
+
+        Returns
+        -------
+        int
+            Bytes per frame across all columns
+        """
+        return _FIXED_COLUMN_BYTES + payload_bytes
+
+    @classmethod
+    def for_memory_budget(
+        cls,
+        max_bytes: int,
+        max_frames: int | None = None,
+        payload_bytes: int = CLASSIC_PAYLOAD_BYTES,
+    ) -> CANFrameRing:
+        """Create the largest ring that fits a byte budget.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Memory budget for the frame columns
+        max_frames : int | None
+            Optional cap on the number of frames
+        payload_bytes : int, default 8
+            Payload block width
+
+        Returns
+        -------
+        CANFrameRing
+            Ring whose columns use at most ``max_bytes``
+        """
+        capacity = max_bytes // cls.frame_bytes(payload_bytes)
+        if max_frames is not None:
+            capacity = min(capacity, max_frames)
+        return cls(capacity, payload_bytes)
+
+    def __len__(self) -> int:
+        """Return the number of buffered frames."""
+        return self._size
+
+    @property
+    def is_full(self) -> bool:
+        """True when no free slot is left."""
+        return self._size == self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for the frame columns."""
+        return self.capacity * self.frame_bytes(self.payload_bytes)
+
+    def append(
+        self,
+        message: can.Message,
+        interface_id: str,
+        priority: CANMessagePriority,
+        timestamp: float | None = None,
+    ) -> bool:
+        """Store a frame in the next free slot.
+
+        Parameters
+        ----------
+        message : can.Message
+            Frame to store
+        interface_id : str
+            Interface that received the frame
+        priority : CANMessagePriority
+            Buffering priority
+        timestamp : float | None
+            Reception timestamp overriding ``message.timestamp``
+
+        Returns
+        -------
+        bool
+            False if the ring is full or the payload is wider than the ring
+        """
+        data = message.data
+        length = len(data)
+        if self._size == self.capacity or length > self.payload_bytes:
+            return False
+
+        slot = self._head + self._size
+        if slot >= self.capacity:
+            slot -= self.capacity
+
+        interface_index = self._interface_lookup.get(interface_id)
+        if interface_index is None:
+            interface_index = len(self._interface_names)
+            self._interface_names.append(interface_id)
+            self._interface_lookup[interface_id] = interface_index
+
+        flags = 0
+        if message.is_extended_id:
+            flags |= FLAG_EXTENDED_ID
+        if message.is_remote_frame:
+            flags |= FLAG_REMOTE_FRAME
+        if message.is_error_frame:
+            flags |= FLAG_ERROR_FRAME
+        if message.is_fd:
+            flags |= FLAG_FD
+        if message.bitrate_switch:
+            flags |= FLAG_BITRATE_SWITCH
+        if message.error_state_indicator:
+            flags |= FLAG_ERROR_STATE_INDICATOR
+
+        self._timestamps[slot] = message.timestamp if timestamp is None else timestamp
+        self._arbitration_ids[slot] = message.arbitration_id
+        self._dlcs[slot] = length
+        self._flags[slot] = flags
+        self._interface_indices[slot] = interface_index
+        self._priorities[slot] = priority.value
+        payload = self._payloads[slot]
+        payload[:length] = np.frombuffer(bytes(data), dtype=np.uint8)
+        payload[length:] = 0
+
+        self._priority_counts[priority.value] += 1
+        self._size += 1
+        return True
+
+    def prepend(self, batch: CANFrameBatch) -> int:
+        """Store the frames of a batch taken from this ring before its oldest frame.
+
+        Used to give a failed flush batch back to the ring in time order.
+        Interface indices are kept as-is, so the batch must come from this
+        ring.
+
+        Parameters
+        ----------
+        batch : CANFrameBatch
+            Frames to store
+
+        Returns
+        -------
+        int
+            Number of frames stored (limited by free slots); the newest
+            frames of the batch are kept
+        """
+        count = min(len(batch), self.capacity - self._size)
+        skipped = len(batch) - count
+        start = self._head - count
+        stored = 0
+        while stored < count:
+            slot = (start + stored) % self.capacity
+            run = min(count - stored, self.capacity - slot)
+            rows = slice(slot, slot + run)
+            source = slice(skipped + stored, skipped + stored + run)
+            self._timestamps[rows] = batch.timestamps[source]
+            self._arbitration_ids[rows] = batch.arbitration_ids[source]
+            self._dlcs[rows] = batch.dlcs[source]
+            self._flags[rows] = batch.flags[source]
+            self._interface_indices[rows] = batch.interface_indices[source]
+            self._priorities[rows] = batch.priorities[source]
+            self._payloads[rows] = batch.payloads[source]
+            stored += run
+
+        self._head = start % self.capacity
+        self._size += count
+        self._released -= count
+
+        restored = batch.priorities[skipped:]
+        self._priority_counts += np.bincount(restored, minlength=_PRIORITY_LEVELS)
+        values, first_rows = np.unique(restored, return_index=True)
+        for value, row in zip(values.tolist(), first_rows.tolist(), strict=True):
+            self._priority_scan[value] = self._released + row
+        return count
+
+    def peek(self, max_count: int) -> CANFrameBatch:
+        """Get the oldest frames as zero-copy column views.
+
+        Only the contiguous run up to the end of the arrays is returned, so a
+        batch may be shorter than ``max_count`` when the ring wraps. The views
+        are overwritten once the frames are consumed and the slots reused, so
+        callers keeping a batch past ``consume`` must ``copy`` it first.
+
+        Parameters
+        ----------
+        max_count : int
+            Maximum frames in the batch
+
+        Returns
+        -------
+        CANFrameBatch
+            Views over the oldest frames (empty if the ring is empty)
+        """
+        count = min(max_count, self._size, self.capacity - self._head)
+        rows = slice(self._head, self._head + count)
+        return CANFrameBatch(
+            timestamps=self._timestamps[rows],
+            arbitration_ids=self._arbitration_ids[rows],
+            dlcs=self._dlcs[rows],
+            flags=self._flags[rows],
+            interface_indices=self._interface_indices[rows],
+            priorities=self._priorities[rows],
+            payloads=self._payloads[rows],
+            interface_names=tuple(self._interface_names),
+        )
+
+    def consume(self, count: int) -> None:
+        """Release the oldest frames.
+
+        Parameters
+        ----------
+        count : int
+            Number of frames to release (clamped to the buffered count)
+        """
+        count = min(count, self._size)
+        for rows in self._segments(0, count):
+            self._priority_counts -= np.bincount(self._priorities[rows], minlength=_PRIORITY_LEVELS)
+        self._head = (self._head + count) % self.capacity
+        self._size -= count
+        self._released += count
+
+    def evict_lowest_priority(self, incoming: CANMessagePriority) -> bool:
+        """Release the oldest frame of the lowest buffered priority.
+
+        The oldest buffered frame is moved into the released slot instead of
+        shifting every older frame up, so eviction copies one row. That frame
+        is flushed after the frames between the two slots; each frame keeps
+        its own timestamp.
+
+        Parameters
+        ----------
+        incoming : CANMessagePriority
+            Priority of the frame that needs the slot; nothing is evicted if
+            every buffered frame outranks it
+
+        Returns
+        -------
+        bool
+            True if a frame was released
+        """
+        buffered = np.flatnonzero(self._priority_counts)
+        if not buffered.size:
+            return False
+        # Larger values are lower priorities
+        lowest = int(buffered[-1])
+        if lowest < incoming.value:
+            return False
+
+        offset = self._find_priority(lowest)
+        if offset:
+            victim = (self._head + offset) % self.capacity
+            for column in self._columns:
+                column[victim] = column[self._head]
+        self._priority_counts[lowest] -= 1
+        self._priority_scan[lowest] = self._released + offset + 1
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+        self._released += 1
+        return True
+
+    def _find_priority(self, priority: int) -> int:
+        """Find the oldest buffered frame of a priority.
+
+        The search resumes where the previous one for the priority stopped,
+        so each frame is compared at most once per priority between prepends.
+
+        Parameters
+        ----------
+        priority : int
+            Priority value with at least one buffered frame
+
+        Returns
+        -------
+        int
+            Offset of the frame from the oldest buffered frame
+        """
+        offset = max(self._priority_scan[priority] - self._released, 0)
+        while offset < self._size:
+            start = (self._head + offset) % self.capacity
+            run = min(_SCAN_CHUNK, self._size - offset, self.capacity - start)
+            hits = np.flatnonzero(self._priorities[start : start + run] == priority)
+            if hits.size:
+                return offset + int(hits[0])
+            offset += run
+            self._priority_scan[priority] = self._released + offset
+        raise RuntimeError(f"No buffered frame of priority {priority}")
+
+    def _segments(self, offset: int, count: int) -> tuple[slice, ...]:
+        """Get the array slices holding a run of buffered frames.
+
+        Parameters
+        ----------
+        offset : int
+            Offset of the first frame from the oldest buffered frame
+        count : int
+            Number of frames in the run
+
+        Returns
+        -------
+        tuple[slice, ...]
+            One slice, or two when the run wraps around the end of the arrays
+        """
+        start = (self._head + offset) % self.capacity
+        end = start + count
+        if end <= self.capacity:
+            return (slice(start, end),)
+        return (slice(start, self.capacity), slice(0, end - self.capacity))
+
+    def count_priority(self, priority: CANMessagePriority) -> int:
+        """Count buffered frames of a priority.
+
+        Parameters
+        ----------
+        priority : CANMessagePriority
+            Priority to count
+
+        Returns
+        -------
+        int
+            Number of buffered frames with the priority
+        """
+        return int(self._priority_counts[priority.value])
@@ -10,22 +10,32 @@ Implementation follows Test-First Development (TDD) GREEN phase.
 from __future__ import annotations
 
 import asyncio
+import heapq
+import inspect
+import itertools
 import logging
 import time
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum
+from operator import attrgetter
+from typing import cast
 
 import can
 
-from afs_fastapi.core.can_frame_codec import CANFrameCodec, DecodedPGN
+from afs_fastapi.core.can_frame_codec import CANFrameCodec, CANFrameEnvelope, DecodedPGN
+from afs_fastapi.database.can_frame_ring import CANFrameBatch, CANFrameRing
 from afs_fastapi.database.can_time_series_schema import CANMessagePriority
 
 # Configure logging for message buffer
 logger = logging.getLogger(__name__)
 
+# Flush writers may be plain functions or coroutines (e.g. storage writes)
+type FlushCallback = Callable[[list[BufferedCANMessage]], bool | Awaitable[bool]]
+type FrameBatchCallback = Callable[[CANFrameBatch], bool | Awaitable[bool]]
+
 
 class BufferStrategy(Enum):
     """Buffer management strategies for different use cases."""
@@ -36,6 +46,13 @@ class BufferStrategy(Enum):
     ADAPTIVE = "adaptive"  # Adapt based on system load
 
 
+class BufferStorageMode(Enum):
+    """In-memory layout of buffered frames."""
+
+    OBJECTS = "objects"  # One BufferedCANMessage per frame
+    COLUMNAR_RING = "columnar_ring"  # Preallocated column arrays within max_memory_mb
+
+
 class CompressionLevel(Enum):
     """Message compression levels for storage optimization."""
 
@@ -61,8 +78,15 @@ class BufferConfiguration:
     batch_size: int = 1000  # Messages per batch write
     max_batch_size: int = 5000  # Maximum batch size
 
+    # Background writes
+    max_inflight_flushes: int = 2  # Batches being written concurrently
+    flush_retry_attempts: int = 3  # Write attempts per batch before requeueing
+    flush_retry_backoff: float = 0.5  # Seconds before the first retry (doubles each retry)
+
     # Buffer strategy
     strategy: BufferStrategy = BufferStrategy.ADAPTIVE
+    storage_mode: BufferStorageMode = BufferStorageMode.OBJECTS
+    ring_payload_bytes: int = 8  # Payload block per frame (8 classic CAN, 64 CAN FD)
     priority_weights: dict[CANMessagePriority, float] = field(
         default_factory=lambda: {
             CANMessagePriority.CRITICAL: 1.0,
@@ -96,10 +120,13 @@ class BufferedCANMessage:
     buffer_time: datetime = field(default_factory=lambda: datetime.now(UTC))
     priority: CANMessagePriority = CANMessagePriority.NORMAL
     processing_attempts: int = 0
+    sequence: int = 0  # Buffering order, kept when a failed batch is requeued
+    is_stored: bool = False  # Committed by a write that failed for the rest of its batch
 
     # Decoded data (cached)
     decoded_message: DecodedPGN | None = None
     decoding_error: str | None = None
+    envelope: CANFrameEnvelope | None = None  # Decode-once envelope shared with other consumers
 
     # Quality indicators
     is_valid: bool = True
@@ -119,6 +146,7 @@ class BufferStatistics:
     total_buffered: int = 0
     total_flushed: int = 0
     total_dropped: int = 0
+    total_duplicates: int = 0
 
     # Buffer state
     current_buffer_size: int = 0
@@ -144,6 +172,109 @@ class BufferStatistics:
     validation_failures: int = 0
     flush_failures: int = 0
 
+    # Write pipeline
+    inflight_flushes: int = 0  # Batches currently being written
+    inflight_messages: int = 0  # Messages in those batches
+    flush_retries: int = 0
+    total_requeued: int = 0  # Messages returned to the buffer after failed writes
+    backpressure_events: int = 0  # Flushes deferred because all write slots were busy
+
+
+class DeduplicationIndex:
+    """Sliding-window duplicate detector with O(1) insert, lookup and expiry.
+
+    Keys are kept in two generations, each spanning one dedup window. Lookups
+    check the current generation and, with a timestamp comparison, the previous
+    one; when the current generation ages out the previous one is discarded as
+    a whole, so expiry never scans individual entries.
+    """
+
+    __slots__ = (
+        "window",
+        "lookups",
+        "duplicates",
+        "_current",
+        "_previous",
+        "_generation_start",
+    )
+
+    def __init__(self, window: float) -> None:
+        """Initialize deduplication index.
+
+        Parameters
+        ----------
+        window : float
+            Seconds during which a repeated key counts as a duplicate
+        """
+        self.window = window
+        self.lookups = 0
+        self.duplicates = 0
+        self._current: dict[int, float] = {}
+        self._previous: dict[int, float] = {}
+        self._generation_start = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys (including not yet discarded ones)."""
+        return len(self._current) + len(self._previous)
+
+    @property
+    def duplicate_rate(self) -> float:
+        """Percentage of lookups that were duplicates."""
+        return self.duplicates / self.lookups * 100 if self.lookups else 0.0
+
+    @staticmethod
+    def message_key(message: can.Message) -> int:
+        """Calculate an integer deduplication key from CAN ID and payload.
+
+        Parameters
+        ----------
+        message : can.Message
+            CAN message
+
+        Returns
+        -------
+        int
+            Key combining the arbitration ID with a 64-bit payload hash
+        """
+        return (message.arbitration_id << 64) | (hash(bytes(message.data)) & 0xFFFFFFFFFFFFFFFF)
+
+    def check_and_add(self, key: int, now: float) -> bool:
+        """Check whether a key was seen within the window and record it if not.
+
+        Parameters
+        ----------
+        key : int
+            Deduplication key
+        now : float
+            Current monotonic time in seconds
+
+        Returns
+        -------
+        bool
+            True if the key is a duplicate
+        """
+        self.lookups += 1
+        window = self.window
+
+        if now - self._generation_start >= window:
+            # Rotate: entries older than the previous generation are all expired
+            if now - self._generation_start < 2 * window:
+                self._previous = self._current
+            else:
+                self._previous = {}
+            self._current = {}
+            self._generation_start = now
+
+        seen = self._current.get(key)
+        if seen is None:
+            seen = self._previous.get(key)
+        if seen is not None and now - seen < window:
+            self.duplicates += 1
+            return True
+
+        self._current[key] = now
+        return False
+
 
 class CANMessageBuffer:
     """High-performance CAN message buffer with adaptive batch processing."""
@@ -152,7 +283,8 @@ class CANMessageBuffer:
         self,
         config: BufferConfiguration,
         codec: CANFrameCodec,
-        flush_callback: Callable[[list[BufferedCANMessage]], bool],
+        flush_callback: FlushCallback,
+        frame_batch_callback: FrameBatchCallback | None = None,
     ) -> None:
         """Initialize CAN message buffer.
 
@@ -162,22 +294,37 @@ class CANMessageBuffer:
             Buffer configuration
         codec : CANFrameCodec
             CAN frame codec for message decoding
-        flush_callback : Callable[[list[BufferedCANMessage]], bool]
-            Callback function for batch writes (returns success status)
+        flush_callback : FlushCallback
+            Callback function or coroutine for batch writes (returns success
+            status), e.g. ``CANTimeSeriesStorage.store_messages_batch``; a
+            writer that fails after storing part of a batch sets
+            ``is_stored`` on those messages, so only the rest is retried and
+            requeued
+        frame_batch_callback : FrameBatchCallback | None
+            Columnar batch writer used instead of ``flush_callback`` in
+            columnar ring mode
         """
         self.config = config
         self.codec = codec
         self.flush_callback = flush_callback
+        self.frame_batch_callback = frame_batch_callback
 
         # Buffer storage
         self._buffer: deque[BufferedCANMessage] = deque()
         self._priority_buffers: dict[CANMessagePriority, deque[BufferedCANMessage]] = {
             priority: deque() for priority in CANMessagePriority
         }
+        self._sequence = itertools.count()
+        self._ring: CANFrameRing | None = None
+        if config.storage_mode == BufferStorageMode.COLUMNAR_RING:
+            self._ring = CANFrameRing.for_memory_budget(
+                config.max_memory_mb * 1024 * 1024,
+                max_frames=config.max_buffer_size,
+                payload_bytes=config.ring_payload_bytes,
+            )
 
         # Deduplication tracking
-        self._message_hashes: dict[str, datetime] = {}
-        self._dedup_cleanup_interval = 60.0  # seconds
+        self._dedup_index = DeduplicationIndex(config.dedup_window_seconds)
 
         # Statistics and monitoring
         self.stats = BufferStatistics()
@@ -189,6 +336,7 @@ class CANMessageBuffer:
         self._stats_task: asyncio.Task | None = None
         self._running = False
         self._lock = asyncio.Lock()
+        self._write_tasks: set[asyncio.Task[bool]] = set()
 
     async def start(self) -> None:
         """Start the buffer processing tasks."""
@@ -217,25 +365,26 @@ class CANMessageBuffer:
         if self._stats_task:
             self._stats_task.cancel()
 
-        # Final flush
-        await self._flush_all_buffers()
+        # Final flush (waits for in-flight writes first)
+        await self.force_flush()
 
         logger.info("CAN message buffer stopped")
 
     async def add_message(
         self,
-        message: can.Message,
-        interface_id: str,
+        message: can.Message | CANFrameEnvelope,
+        interface_id: str | None = None,
         priority: CANMessagePriority | None = None,
     ) -> bool:
         """Add a CAN message to the buffer.
 
         Parameters
         ----------
-        message : can.Message
-            CAN message to buffer
-        interface_id : str
-            Interface that received the message
+        message : can.Message | CANFrameEnvelope
+            CAN message to buffer, or the envelope created at reception so
+            the buffer shares its single decode
+        interface_id : str | None
+            Interface that received the message (taken from the envelope if None)
         priority : CANMessagePriority | None
             Message priority (auto-detected if None)
 
@@ -246,11 +395,21 @@ class CANMessageBuffer:
         """
         try:
             async with self._lock:
+                if self._ring is not None:
+                    return self._add_to_ring(message, interface_id, priority)
+
+                if isinstance(message, CANFrameEnvelope):
+                    envelope = message
+                else:
+                    envelope = self.codec.create_envelope(message, interface_id or "")
+                raw_message = envelope.message
+                priority = priority or self._detect_message_priority(envelope)
+
                 # Check buffer capacity
-                if len(self._buffer) >= self.config.max_buffer_size:
+                if self._buffered_count() >= self.config.max_buffer_size:
                     if self.config.strategy == BufferStrategy.PRIORITY_BASED:
                         # Drop lowest priority message
-                        if not await self._drop_lowest_priority():
+                        if not await self._drop_lowest_priority(priority):
                             self.stats.total_dropped += 1
                             return False
                     else:
@@ -259,16 +418,19 @@ class CANMessageBuffer:
 
                 # Create buffered message
                 buffered_msg = BufferedCANMessage(
-                    raw_message=message,
-                    interface_id=interface_id,
-                    reception_time=datetime.fromtimestamp(message.timestamp or time.time()),
-                    priority=priority or self._detect_message_priority(message),
+                    raw_message=raw_message,
+                    interface_id=interface_id or envelope.interface_id,
+                    reception_time=datetime.fromtimestamp(raw_message.timestamp or time.time()),
+                    priority=priority,
+                    envelope=envelope,
+                    sequence=next(self._sequence),
                 )
 
                 # Deduplication check
                 if self.config.enable_deduplication:
-                    msg_hash = self._calculate_message_hash(message)
+                    msg_hash = self._calculate_message_hash(raw_message)
                     if self._is_duplicate(msg_hash):
+                        self.stats.total_duplicates += 1
                         return True  # Silently drop duplicate
 
                 # Validation
@@ -291,9 +453,7 @@ class CANMessageBuffer:
                 # Update statistics
                 self.stats.total_received += 1
                 self.stats.total_buffered += 1
-                self.stats.current_buffer_size = len(self._buffer) + sum(
-                    len(pb) for pb in self._priority_buffers.values()
-                )
+                self.stats.current_buffer_size = self._buffered_count()
 
                 return True
 
@@ -301,16 +461,110 @@ class CANMessageBuffer:
             logger.error(f"Failed to add message to buffer: {e}")
             return False
 
+    def _add_to_ring(
+        self,
+        message: can.Message | CANFrameEnvelope,
+        interface_id: str | None,
+        priority: CANMessagePriority | None,
+    ) -> bool:
+        """Add a message to the columnar ring.
+
+        Parameters
+        ----------
+        message : can.Message | CANFrameEnvelope
+            CAN message or its reception envelope
+        interface_id : str | None
+            Interface that received the message
+        priority : CANMessagePriority | None
+            Message priority (auto-detected if None)
+
+        Returns
+        -------
+        bool
+            True if the message was buffered or dropped as a duplicate
+        """
+        ring = cast(CANFrameRing, self._ring)
+        if isinstance(message, CANFrameEnvelope):
+            raw_message = message.message
+            interface_id = interface_id or message.interface_id
+        else:
+            raw_message = message
+
+        if self.config.enable_deduplication:
+            if self._is_duplicate(self._calculate_message_hash(raw_message)):
+                self.stats.total_duplicates += 1
+                return True  # Silently drop duplicate
+
+        if self.config.enable_validation and self._validation_errors(raw_message):
+            self.stats.validation_failures += 1
+            if self.config.drop_invalid_messages:
+                return False
+
+        priority = priority or self._detect_message_priority(message)
+        if ring.is_full:
+            # Make room by evicting the oldest frame of the lowest priority,
+            # unless every buffered frame outranks the new one
+            if self.config.strategy != BufferStrategy.PRIORITY_BASED or (
+                not ring.evict_lowest_priority(priority)
+            ):
+                self.stats.total_dropped += 1
+                return False
+            self.stats.total_dropped += 1
+
+        if not ring.append(
+            raw_message,
+            interface_id or "",
+            priority,
+            timestamp=raw_message.timestamp or time.time(),
+        ):
+            # Payload wider than the ring's payload block
+            self.stats.total_dropped += 1
+            return False
+
+        self.stats.total_received += 1
+        self.stats.total_buffered += 1
+        self.stats.current_buffer_size = len(ring)
+        return True
+
+    def _buffered_count(self) -> int:
+        """Count messages currently held across all buffers."""
+        if self._ring is not None:
+            return len(self._ring)
+        return len(self._buffer) + sum(len(pb) for pb in self._priority_buffers.values())
+
     async def force_flush(self) -> bool:
         """Force immediate flush of all buffered messages.
 
+        Waits for in-flight background writes, then writes everything
+        buffered so far without retrying; a failed batch is requeued.
+
         Returns
         -------
         bool
             True if flush was successful
         """
-        async with self._lock:
-            return await self._flush_all_buffers()
+        await self.wait_for_flushes()
+
+        remaining = self._buffered_count()
+        while remaining > 0:
+            async with self._lock:
+                batch = self._take_flush_batch()
+            if batch is None:
+                break
+            remaining -= len(batch)
+            if not await self._write_batch(batch, attempts=1):
+                return False
+        return True
+
+    async def wait_for_flushes(self) -> None:
+        """Wait until all in-flight background writes have finished."""
+        while self._write_tasks:
+            await asyncio.gather(*self._write_tasks, return_exceptions=True)
+
+    @property
+    def is_backpressured(self) -> bool:
+        """True when every write slot is busy, i.e. storage is falling behind."""
+        return len(self._write_tasks) >= self.config.max_inflight_flushes
 
     def get_statistics(self) -> BufferStatistics:
         """Get current buffer statistics.
@@ -321,13 +575,18 @@ class CANMessageBuffer:
             Current statistics
         """
         # Update real-time stats
-        self.stats.current_buffer_size = len(self._buffer) + sum(
-            len(pb) for pb in self._priority_buffers.values()
-        )
+        self.stats.current_buffer_size = self._buffered_count()
         self.stats.uptime = datetime.now(UTC) - self._start_time
-        self.stats.buffer_utilization = (
-            self.stats.current_buffer_size / self.config.max_buffer_size * 100
-        )
+        if self._ring is not None:
+            self.stats.current_memory_usage = self._ring.nbytes / (1024 * 1024)
+            self.stats.buffer_utilization = (
+                self.stats.current_buffer_size / self._ring.capacity * 100
+            )
+        else:
+            self.stats.buffer_utilization = (
+                self.stats.current_buffer_size / self.config.max_buffer_size * 100
+            )
+        self.stats.deduplication_rate = self._dedup_index.duplicate_rate
 
         return self.stats
 
@@ -339,8 +598,7 @@ class CANMessageBuffer:
                 should_flush = await self._should_flush()
 
                 if should_flush:
-                    async with self._lock:
-                        await self._flush_all_buffers()
+                    await self._dispatch_flush()
 
                 # Adaptive sleep based on buffer load
                 sleep_time = self._calculate_sleep_time()
@@ -374,11 +632,12 @@ class CANMessageBuffer:
             return True
 
         # Priority-based flush (critical messages present)
-        if (
-            self.config.strategy == BufferStrategy.PRIORITY_BASED
-            and len(self._priority_buffers[CANMessagePriority.CRITICAL]) > 0
-        ):
-            return True
+        if self.config.strategy == BufferStrategy.PRIORITY_BASED:
+            if self._ring is not None:
+                if self._ring.count_priority(CANMessagePriority.CRITICAL) > 0:
+                    return True
+            elif len(self._priority_buffers[CANMessagePriority.CRITICAL]) > 0:
+                return True
 
         # Forced flush (maximum time exceeded)
         if time_since_last_flush >= self.config.max_flush_time:
@@ -386,71 +645,263 @@ class CANMessageBuffer:
 
         return False
 
-    async def _flush_all_buffers(self) -> bool:
-        """Flush all buffered messages to storage.
+    async def _dispatch_flush(self) -> bool:
+        """Swap out a batch under the lock and write it in the background.
 
         Returns
         -------
         bool
-            True if flush was successful
+            True if a write was started or nothing was buffered, False if all
+            write slots are busy (backpressure)
+        """
+        if self.is_backpressured:
+            self.stats.backpressure_events += 1
+            logger.debug(
+                f"Flush deferred: {len(self._write_tasks)} batches in flight, "
+                f"{self._buffered_count()} messages buffered"
+            )
+            return False
+
+        async with self._lock:
+            batch = self._take_flush_batch()
+        if batch is None:
+            return True
+
+        task = asyncio.create_task(self._write_batch(batch, self.config.flush_retry_attempts))
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+        return True
+
+    def _take_flush_batch(self) -> list[BufferedCANMessage] | CANFrameBatch | None:
+        """Remove the next batch of messages from the buffer.
+
+        Must be called with the buffer lock held. Ring batches are copied out
+        so their slots are free for new frames while the batch is written.
+
+        Returns
+        -------
+        list[BufferedCANMessage] | CANFrameBatch | None
+            Batch to write, or None if the buffer is empty
+        """
+        max_batch = self.config.max_batch_size
+
+        if self._ring is not None:
+            batch = self._ring.peek(max_batch)
+            if not len(batch):
+                return None
+            batch = batch.copy()
+            self._ring.consume(len(batch))
+            return batch
+
+        messages_to_flush: list[BufferedCANMessage] = []
+        if self.config.strategy == BufferStrategy.PRIORITY_BASED:
+            # Flush by priority order
+            for priority in CANMessagePriority:
+                buffer = self._priority_buffers[priority]
+                while buffer and len(messages_to_flush) < max_batch:
+                    messages_to_flush.append(buffer.popleft())
+        else:
+            # Flush main buffer
+            while self._buffer and len(messages_to_flush) < max_batch:
+                messages_to_flush.append(self._buffer.popleft())
+
+        return messages_to_flush or None
+
+    async def _write_batch(
+        self, batch: list[BufferedCANMessage] | CANFrameBatch, attempts: int
+    ) -> bool:
+        """Write a batch, retrying with exponential backoff.
+
+        Runs without the buffer lock, so ingestion continues during the write.
+        A batch that still fails after the last attempt is requeued, without
+        the messages a writer marked as already stored.
+
+        Parameters
+        ----------
+        batch : list[BufferedCANMessage] | CANFrameBatch
+            Batch taken from the buffer
+        attempts : int
+            Maximum write attempts
+
+        Returns
+        -------
+        bool
+            True if the batch was written
         """
         start_time = time.time()
+        count = len(batch)
+        self.stats.inflight_flushes += 1
+        self.stats.inflight_messages += count
 
         try:
-            # Collect messages from all buffers
-            messages_to_flush: list[BufferedCANMessage] = []
-
-            if self.config.strategy == BufferStrategy.PRIORITY_BASED:
-                # Flush by priority order
-                for priority in CANMessagePriority:
-                    buffer = self._priority_buffers[priority]
-                    while buffer and len(messages_to_flush) < self.config.max_batch_size:
-                        messages_to_flush.append(buffer.popleft())
-            else:
-                # Flush main buffer
-                while self._buffer and len(messages_to_flush) < self.config.max_batch_size:
-                    messages_to_flush.append(self._buffer.popleft())
+            # Ring batches for a message writer are materialized once, so the
+            # retries and the requeue see which messages a partial write stored
+            writer_batch: list[BufferedCANMessage] | CANFrameBatch = batch
+            rows: dict[int, int] = {}
+            if isinstance(batch, CANFrameBatch) and self.frame_batch_callback is None:
+                writer_batch = await self._materialize_batch(batch)
+                rows = {id(msg): row for row, msg in enumerate(writer_batch)}
+
+            for attempt in range(max(1, attempts)):
+                if attempt:
+                    self.stats.flush_retries += 1
+                    await asyncio.sleep(self.config.flush_retry_backoff * 2 ** (attempt - 1))
+                    if isinstance(writer_batch, list):
+                        writer_batch = [msg for msg in writer_batch if not msg.is_stored]
+
+                try:
+                    success = await self._call_writer(writer_batch)
+                except Exception as e:
+                    logger.error(f"Buffer flush error: {e}")
+                    success = False
+
+                if success:
+                    self.stats.total_flushed += count
+                    self.stats.last_flush_time = datetime.now(UTC)
+
+                    # Update performance metrics
+                    flush_time = time.time() - start_time
+                    self.stats.avg_flush_time = (self.stats.avg_flush_time * 0.9) + (
+                        flush_time * 0.1
+                    )
+                    self.stats.avg_batch_size = (self.stats.avg_batch_size * 0.9) + (count * 0.1)
+
+                    logger.debug(f"Flushed {count} messages in {flush_time:.3f}s")
+                    return True
 
-            if not messages_to_flush:
-                return True
+            self.stats.flush_failures += 1
+            logger.warning(f"Failed to flush {count} messages")
+            if isinstance(writer_batch, list):
+                unwritten = [msg for msg in writer_batch if not msg.is_stored]
+                if rows:
+                    if len(unwritten) < count:
+                        batch = cast(CANFrameBatch, batch).take(
+                            [rows[id(msg)] for msg in unwritten]
+                        )
+                else:
+                    batch = unwritten
+            async with self._lock:
+                self._requeue_batch(batch)
+            return False
+
+        finally:
+            self.stats.inflight_flushes -= 1
+            self.stats.inflight_messages -= count
 
+    async def _call_writer(self, batch: list[BufferedCANMessage] | CANFrameBatch) -> bool:
+        """Hand a batch to the configured writer.
+
+        Parameters
+        ----------
+        batch : list[BufferedCANMessage] | CANFrameBatch
+            Messages for ``flush_callback``, or a ring batch for
+            ``frame_batch_callback``
+
+        Returns
+        -------
+        bool
+            Success status reported by the writer
+        """
+        if isinstance(batch, CANFrameBatch):
+            result = cast(FrameBatchCallback, self.frame_batch_callback)(batch)
+        else:
             # Decode any remaining messages
-            for msg in messages_to_flush:
+            for msg in batch:
                 if msg.decoded_message is None and msg.decoding_error is None:
                     await self._decode_message(msg)
+            result = self.flush_callback(batch)
 
-            # Call flush callback
-            success = self.flush_callback(messages_to_flush)
+        if inspect.isawaitable(result):
+            result = await result
+        return bool(result)
 
-            if success:
-                self.stats.total_flushed += len(messages_to_flush)
-                self.stats.last_flush_time = datetime.now(UTC)
+    def _requeue_batch(self, batch: list[BufferedCANMessage] | CANFrameBatch) -> None:
+        """Return a failed batch to the front of the buffer.
 
-                # Update performance metrics
-                flush_time = time.time() - start_time
-                self.stats.avg_flush_time = (self.stats.avg_flush_time * 0.9) + (flush_time * 0.1)
-                self.stats.avg_batch_size = (self.stats.avg_batch_size * 0.9) + (
-                    len(messages_to_flush) * 0.1
-                )
+        Must be called with the buffer lock held, so messages stay in time
+        order. Ring batches go back into free slots only; the oldest frames
+        that no longer fit are dropped. Message batches are merged back by
+        sequence number, so batches failing out of order still requeue in
+        buffering order, and ``max_buffer_size`` is enforced afterwards with
+        the same overflow rule as ``add_message``.
 
-                logger.debug(f"Flushed {len(messages_to_flush)} messages in {flush_time:.3f}s")
-            else:
-                # Return messages to buffer on failure
-                if self.config.strategy == BufferStrategy.PRIORITY_BASED:
-                    for msg in reversed(messages_to_flush):
-                        self._priority_buffers[msg.priority].appendleft(msg)
-                else:
-                    self._buffer.extendleft(reversed(messages_to_flush))
+        Parameters
+        ----------
+        batch : list[BufferedCANMessage] | CANFrameBatch
+            Batch that could not be written
+        """
+        if isinstance(batch, CANFrameBatch):
+            ring = cast(CANFrameRing, self._ring)
+            restored = ring.prepend(batch)
+            self.stats.total_requeued += restored
+            self.stats.total_dropped += len(batch) - restored
+            return
 
-                self.stats.flush_failures += 1
-                logger.warning(f"Failed to flush {len(messages_to_flush)} messages")
+        if self.config.strategy == BufferStrategy.PRIORITY_BASED:
+            for priority, buffer in self._priority_buffers.items():
+                messages = [msg for msg in batch if msg.priority == priority]
+                if messages:
+                    self._merge_front(buffer, messages)
+        else:
+            self._merge_front(self._buffer, batch)
+
+        # Over the size limit, drop the lowest priority (PRIORITY_BASED) or
+        # the oldest messages, as the ring does
+        overflow = max(0, self._buffered_count() - self.config.max_buffer_size)
+        self.stats.total_requeued += len(batch) - overflow
+        self.stats.total_dropped += overflow
+        if self.config.strategy == BufferStrategy.PRIORITY_BASED:
+            for priority in reversed(list(CANMessagePriority)):
+                buffer = self._priority_buffers[priority]
+                while overflow and buffer:
+                    buffer.popleft()
+                    overflow -= 1
+        else:
+            for _ in range(overflow):
+                self._buffer.popleft()
+        self.stats.current_buffer_size = self._buffered_count()
 
-            return success
+    @staticmethod
+    def _merge_front(buffer: deque[BufferedCANMessage], messages: list[BufferedCANMessage]) -> None:
+        """Merge requeued messages into the front of a buffer by sequence number.
 
-        except Exception as e:
-            logger.error(f"Buffer flush error: {e}")
-            self.stats.flush_failures += 1
-            return False
+        Parameters
+        ----------
+        buffer : deque[BufferedCANMessage]
+            Buffer ordered by sequence number
+        messages : list[BufferedCANMessage]
+            Requeued messages ordered by sequence number
+        """
+        last = messages[-1].sequence
+        older: list[BufferedCANMessage] = []
+        while buffer and buffer[0].sequence < last:
+            older.append(buffer.popleft())
+        buffer.extendleft(reversed(list(heapq.merge(older, messages, key=attrgetter("sequence")))))
+
+    async def _materialize_batch(self, batch: CANFrameBatch) -> list[BufferedCANMessage]:
+        """Rebuild buffered messages from a columnar batch.
+
+        Parameters
+        ----------
+        batch : CANFrameBatch
+            Frames to rebuild
+
+        Returns
+        -------
+        list[BufferedCANMessage]
+            Decoded messages for ``flush_callback`` consumers
+        """
+        messages: list[BufferedCANMessage] = []
+        for row in range(len(batch)):
+            buffered_msg = BufferedCANMessage(
+                raw_message=batch.message(row),
+                interface_id=batch.interface_id(row),
+                reception_time=batch.reception_time(row),
+                priority=batch.priority(row),
+            )
+            await self._decode_message(buffered_msg)
+            messages.append(buffered_msg)
+        return messages
 
     async def _decode_message(self, buffered_msg: BufferedCANMessage) -> None:
         """Decode a buffered CAN message.
@@ -461,7 +912,10 @@ class CANMessageBuffer:
             Message to decode
         """
         try:
-            decoded = self.codec.decode_message(buffered_msg.raw_message)
+            if buffered_msg.envelope is not None:
+                decoded = buffered_msg.envelope.decode()
+            else:
+                decoded = self.codec.decode_message(buffered_msg.raw_message)
             if decoded:
                 buffered_msg.decoded_message = decoded
             else:
@@ -485,38 +939,58 @@ class CANMessageBuffer:
         bool
             True if message is valid
         """
+        errors = self._validation_errors(buffered_msg.raw_message)
+
+        buffered_msg.validation_errors = errors
+        buffered_msg.is_valid = len(errors) == 0
+
+        if not buffered_msg.is_valid:
+            self.stats.validation_failures += 1
+
+        return buffered_msg.is_valid
+
+    def _validation_errors(self, message: can.Message) -> list[str]:
+        """Check a CAN message for framing errors.
+
+        Parameters
+        ----------
+        message : can.Message
+            Message to check
+
+        Returns
+        -------
+        list[str]
+            Validation errors (empty if valid)
+        """
         errors = []
 
         # Basic CAN message validation
-        if buffered_msg.raw_message.dlc > 8:
-            errors.append("DLC exceeds 8 bytes")
+        max_dlc = 64 if message.is_fd else 8
+        if message.dlc > max_dlc:
+            errors.append(f"DLC exceeds {max_dlc} bytes")
 
-        if len(buffered_msg.raw_message.data) != buffered_msg.raw_message.dlc:
+        if len(message.data) != message.dlc:
             errors.append("Data length doesn't match DLC")
 
         # Extended validation for ISOBUS
-        if buffered_msg.raw_message.is_extended_id:
-            if buffered_msg.raw_message.arbitration_id > 0x1FFFFFFF:
+        if message.is_extended_id:
+            if message.arbitration_id > 0x1FFFFFFF:
                 errors.append("Invalid 29-bit CAN ID")
         else:
-            if buffered_msg.raw_message.arbitration_id > 0x7FF:
+            if message.arbitration_id > 0x7FF:
                 errors.append("Invalid 11-bit CAN ID")
 
-        buffered_msg.validation_errors = errors
-        buffered_msg.is_valid = len(errors) == 0
-
-        if not buffered_msg.is_valid:
-            self.stats.validation_failures += 1
-
-        return buffered_msg.is_valid
+        return errors
 
-    def _detect_message_priority(self, message: can.Message) -> CANMessagePriority:
+    def _detect_message_priority(
+        self, message: can.Message | CANFrameEnvelope
+    ) -> CANMessagePriority:
         """Detect message priority from CAN ID.
 
         Parameters
         ----------
-        message : can.Message
-            CAN message
+        message : can.Message | CANFrameEnvelope
+            CAN message or its envelope (identifier fields already parsed)
 
         Returns
         -------
@@ -526,11 +1000,15 @@ class CANMessageBuffer:
         if not message.is_extended_id:
             return CANMessagePriority.LOW
 
-        # Extract J1939 priority
-        j1939_priority = (message.arbitration_id >> 26) & 0x07
+        if isinstance(message, CANFrameEnvelope):
+            j1939_priority = message.priority
+            pdu_format = message.pdu_format
+        else:
+            # Extract J1939 priority
+            j1939_priority = (message.arbitration_id >> 26) & 0x07
 
-        # Extract PGN for content-based priority
-        pdu_format = (message.arbitration_id >> 16) & 0xFF
+            # Extract PGN for content-based priority
+            pdu_format = (message.arbitration_id >> 16) & 0xFF
 
         # Emergency and safety messages
         if pdu_format in [0xE0, 0xE1, 0xE2]:  # Emergency codes
@@ -548,7 +1026,7 @@ class CANMessageBuffer:
         else:
             return CANMessagePriority.LOW
 
-    def _calculate_message_hash(self, message: can.Message) -> str:
+    def _calculate_message_hash(self, message: can.Message) -> int:
         """Calculate hash for message deduplication.
 
         Parameters
@@ -558,19 +1036,17 @@ class CANMessageBuffer:
 
         Returns
         -------
-        str
-            Message hash
+        int
+            Integer key based on ID and data
         """
-        # Simple hash based on ID and data
-        data_hash = hash(bytes(message.data))
-        return f"{message.arbitration_id:08X}_{data_hash:016X}"
+        return DeduplicationIndex.message_key(message)
 
-    def _is_duplicate(self, msg_hash: str) -> bool:
+    def _is_duplicate(self, msg_hash: int) -> bool:
         """Check if message is a duplicate.
 
         Parameters
         ----------
-        msg_hash : str
+        msg_hash : int
             Message hash
 
         Returns
@@ -578,23 +1054,17 @@ class CANMessageBuffer:
         bool
             True if message is duplicate
         """
-        current_time = datetime.now(UTC)
-
-        # Clean old hashes
-        cutoff_time = current_time - timedelta(seconds=self.config.dedup_window_seconds)
-        self._message_hashes = {h: t for h, t in self._message_hashes.items() if t > cutoff_time}
-
-        # Check for duplicate
-        if msg_hash in self._message_hashes:
-            return True
-
-        # Store hash
-        self._message_hashes[msg_hash] = current_time
-        return False
+        return self._dedup_index.check_and_add(msg_hash, time.monotonic())
 
-    async def _drop_lowest_priority(self) -> bool:
+    async def _drop_lowest_priority(self, incoming: CANMessagePriority) -> bool:
         """Drop the lowest priority message from buffer.
 
+        Parameters
+        ----------
+        incoming : CANMessagePriority
+            Priority of the message that needs the space; nothing is dropped
+            if every buffered message outranks it
+
         Returns
         -------
         bool
@@ -602,6 +1072,8 @@ class CANMessageBuffer:
         """
         # Find lowest priority buffer with messages
         for priority in reversed(list(CANMessagePriority)):
+            if priority.value < incoming.value:
+                break
             buffer = self._priority_buffers[priority]
             if buffer:
                 buffer.popleft()
@@ -662,4 +1134,6 @@ class CANMessageBuffer:
                 (total_validated - self.stats.validation_failures) / total_validated * 100
             )
 
+        self.stats.deduplication_rate = self._dedup_index.duplicate_rate
+
         self._last_stats_update = current_time
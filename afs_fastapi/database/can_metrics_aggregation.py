@@ -0,0 +1,219 @@
+"""Incremental aggregation of agricultural metrics from stored CAN messages.
+
+Running aggregates (sample count, sum, min and max of engine speed, vehicle
+speed and fuel rate, plus message counts) are accumulated per source address
+and time window while batches are stored. The finest window is rolled up
+1min -> 5min -> 1hour -> 1day, and only the windows touched by a batch are
+merged into ``agricultural_metrics``, so metric queries never scan the raw
+message table.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from afs_fastapi.core.can_frame_codec import DecodedPGN
+
+# Aggregation windows in roll-up order (finest first), in seconds
+METRIC_WINDOWS: dict[str, int] = {
+    "1min": 60,
+    "5min": 300,
+    "1hour": 3600,
+    "1day": 86400,
+}
+
+# PGNs counted towards the message count of a metrics window
+METRIC_PGNS = frozenset({61444, 65265, 65266, 65267})
+
+ENGINE_SPEED_SPN = 190  # rpm (PGN 61444, EEC1)
+WHEEL_SPEED_SPN = 84  # km/h (PGN 65265, CCVS)
+FUEL_RATE_SPN = 183  # L/h (PGN 65266, LFE)
+
+# (time_window, source_address, window_start)
+type WindowKey = tuple[str, int, datetime]
+
+
+def window_start(timestamp: datetime, time_window: str) -> datetime:
+    """Return the UTC start of the window containing a timestamp.
+
+    Parameters
+    ----------
+    timestamp : datetime
+        Point in time; naive values are taken as UTC
+    time_window : str
+        Window name (1min, 5min, 1hour, 1day)
+
+    Returns
+    -------
+    datetime
+        Timezone-aware window start
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    seconds = METRIC_WINDOWS[time_window]
+    epoch = int(timestamp.timestamp()) // seconds * seconds
+    return datetime.fromtimestamp(epoch, UTC)
+
+
+@dataclass(slots=True)
+class RunningAggregate:
+    """Count, sum, min and max of one metric."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float | None = None
+    maximum: float | None = None
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: RunningAggregate) -> None:
+        """Merge another aggregate into this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        assert other.minimum is not None and other.maximum is not None  # Assert for mypy
+        if self.minimum is None or other.minimum < self.minimum:
+            self.minimum = other.minimum
+        if self.maximum is None or other.maximum > self.maximum:
+            self.maximum = other.maximum
+
+    @property
+    def mean(self) -> float | None:
+        """Return the sample mean, or None without samples."""
+        return self.total / self.count if self.count else None
+
+
+@dataclass(slots=True)
+class WindowAggregate:
+    """Running aggregates of one source address within one time window."""
+
+    message_count: int = 0
+    engine_rpm: RunningAggregate = field(default_factory=RunningAggregate)
+    speed: RunningAggregate = field(default_factory=RunningAggregate)
+    fuel_rate: RunningAggregate = field(default_factory=RunningAggregate)
+
+    def merge(self, other: WindowAggregate) -> None:
+        """Merge another window aggregate into this one."""
+        self.message_count += other.message_count
+        self.engine_rpm.merge(other.engine_rpm)
+        self.speed.merge(other.speed)
+        self.fuel_rate.merge(other.fuel_rate)
+
+
+# SPNs feeding the running aggregates, by WindowAggregate attribute
+_METRIC_SPNS = {
+    ENGINE_SPEED_SPN: "engine_rpm",
+    WHEEL_SPEED_SPN: "speed",
+    FUEL_RATE_SPN: "fuel_rate",
+}
+
+
+class AgriculturalMetricsAggregator:
+    """Accumulates per-(source_address, window) aggregates for a set of messages.
+
+    Messages are added to the base window only; ``rollup`` derives the coarser
+    windows by merging base windows, so adding a message costs one dictionary
+    update regardless of how many windows are maintained.
+    """
+
+    __slots__ = ("base_window", "_base_seconds", "_windows")
+
+    def __init__(self, base_window: str = "1min") -> None:
+        """Initialize the aggregator.
+
+        Parameters
+        ----------
+        base_window : str, default "1min"
+            Finest window messages are aggregated into
+
+        Raises
+        ------
+        ValueError
+            If the window name is unknown
+        """
+        if base_window not in METRIC_WINDOWS:
+            raise ValueError(f"Unknown metrics window: {base_window}")
+        self.base_window = base_window
+        self._base_seconds = METRIC_WINDOWS[base_window]
+        # Keyed by (source_address, window start as epoch seconds)
+        self._windows: dict[tuple[int, int], WindowAggregate] = {}
+
+    def __len__(self) -> int:
+        """Return the number of base windows touched."""
+        return len(self._windows)
+
+    def add(
+        self,
+        source_address: int | None,
+        timestamp: datetime,
+        pgn: int | None,
+        decoded: DecodedPGN | None,
+    ) -> None:
+        """Add one message to its base window.
+
+        Parameters
+        ----------
+        source_address : int | None
+            J1939 source address (messages without one are ignored)
+        timestamp : datetime
+            Message timestamp
+        pgn : int | None
+            Parameter Group Number of the message
+        decoded : DecodedPGN | None
+            Decoded message providing the metric SPN values
+        """
+        if source_address is None or pgn not in METRIC_PGNS:
+            return
+
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=UTC)
+        epoch = int(timestamp.timestamp())
+        key = (source_address, epoch - epoch % self._base_seconds)
+        aggregate = self._windows.get(key)
+        if aggregate is None:
+            aggregate = self._windows[key] = WindowAggregate()
+        aggregate.message_count += 1
+
+        if decoded is None:
+            return
+        for spn in decoded.spn_values:
+            attribute = _METRIC_SPNS.get(spn.spn)
+            if attribute is not None and spn.is_valid and spn.value is not None:
+                getattr(aggregate, attribute).add(float(spn.value))
+
+    def rollup(self) -> dict[WindowKey, WindowAggregate]:
+        """Return the base windows and every coarser window derived from them.
+
+        Returns
+        -------
+        dict[WindowKey, WindowAggregate]
+            Aggregates keyed by (time_window, source_address, window_start)
+        """
+        windows = list(METRIC_WINDOWS)
+        level = {
+            (self.base_window, source, datetime.fromtimestamp(start, UTC)): aggregate
+            for (source, start), aggregate in self._windows.items()
+        }
+        result = dict(level)
+
+        for time_window in windows[windows.index(self.base_window) + 1 :]:
+            coarser: dict[WindowKey, WindowAggregate] = {}
+            for (_, source, start), aggregate in level.items():
+                key = (time_window, source, window_start(start, time_window))
+                parent = coarser.get(key)
+                if parent is None:
+                    parent = coarser[key] = WindowAggregate()
+                parent.merge(aggregate)
+            result.update(coarser)
+            level = coarser
+
+        return result
@@ -0,0 +1,354 @@
+"""In-process CAN network health accumulation.
+
+Network health (message rate, distinct sources and PGNs, error frames,
+decoding failures and ingestion latency percentiles) is accumulated per
+interface as stored batches pass through, instead of being recomputed from
+the raw message table. Distinct counts use exact bitmaps over the 256 J1939
+source addresses and the 16-bit PGN space, latencies go into a fixed
+log-bucketed histogram, and every update is vectorized over the batch. A
+snapshot is emitted when a window closes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+import numpy as np
+import numpy.typing as npt
+
+from afs_fastapi.database.can_message_buffer import BufferedCANMessage
+from afs_fastapi.database.can_metrics_aggregation import METRIC_WINDOWS
+
+SOURCE_ADDRESS_COUNT = 256
+PGN_SPACE = 1 << 16  # PDU format and PDU specific bytes, as stored in can_messages_raw
+
+# Latency histogram bucket upper edges in ms: 10 us to 10 min, ~5% apart
+LATENCY_BUCKET_EDGES_MS = np.geomspace(0.01, 600_000.0, num=370)
+
+
+@dataclass(slots=True)
+class NetworkHealthSnapshot:
+    """Network health of one interface over one window."""
+
+    interface_id: str
+    time_window: str
+    window_start: datetime
+    duration_seconds: float  # Window length, or elapsed time for an open window
+    total_messages: int
+    unique_source_count: int
+    unique_pgn_count: int
+    error_frames: int
+    decoding_failures: int
+    latency_avg_ms: float | None
+    latency_max_ms: float | None
+    latency_p50_ms: float | None
+    latency_p95_ms: float | None
+    latency_p99_ms: float | None
+    active_devices: dict[str, dict[str, float | int]] = field(default_factory=dict)
+    new_devices: list[int] = field(default_factory=list)
+    offline_devices: list[int] = field(default_factory=list)
+
+    @property
+    def messages_per_second(self) -> float:
+        """Return the average message rate over the window."""
+        return self.total_messages / self.duration_seconds if self.duration_seconds else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Return error frames as a percentage of all messages."""
+        return self.error_frames / max(self.total_messages, 1) * 100
+
+    @property
+    def health_score(self) -> float:
+        """Return the overall health score (0-1)."""
+        return max(0.0, 1.0 - self.error_rate / 100.0)
+
+
+class _InterfaceHealthWindow:
+    """Accumulators of one interface for its current window."""
+
+    __slots__ = (
+        "start",
+        "last_seen",
+        "total_messages",
+        "error_frames",
+        "decoding_failures",
+        "source_counts",
+        "source_last_seen",
+        "pgn_seen",
+        "latency_histogram",
+        "latency_count",
+        "latency_sum",
+        "latency_max",
+        "previous_sources",
+    )
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.source_counts = np.zeros(SOURCE_ADDRESS_COUNT, dtype=np.int64)
+        self.source_last_seen = np.zeros(SOURCE_ADDRESS_COUNT, dtype=np.float64)
+        self.pgn_seen = np.zeros(PGN_SPACE, dtype=np.bool_)
+        self.latency_histogram = np.zeros(len(LATENCY_BUCKET_EDGES_MS) + 1, dtype=np.int64)
+        self.previous_sources: npt.NDArray[np.bool_] | None = None
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.last_seen = float(self.start)
+        self.total_messages = 0
+        self.error_frames = 0
+        self.decoding_failures = 0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+
+    def advance(self, start: int) -> None:
+        """Start a new window, remembering the sources seen in the closed one."""
+        self.previous_sources = self.source_counts > 0
+        self.start = start
+        self.source_counts.fill(0)
+        self.source_last_seen.fill(0.0)
+        self.pgn_seen.fill(False)
+        self.latency_histogram.fill(0)
+        self._reset_counters()
+
+    def add(
+        self,
+        timestamps: npt.NDArray[np.float64],
+        source_addresses: npt.NDArray[np.int64],
+        pgns: npt.NDArray[np.int64],
+        error_frames: npt.NDArray[np.bool_],
+        decoding_failures: npt.NDArray[np.bool_],
+        latencies_ms: npt.NDArray[np.float64],
+    ) -> None:
+        """Add a group of frames falling into the current window."""
+        self.total_messages += len(timestamps)
+        self.last_seen = max(self.last_seen, float(timestamps.max()))
+        self.error_frames += int(np.count_nonzero(error_frames))
+        self.decoding_failures += int(np.count_nonzero(decoding_failures))
+
+        has_address = source_addresses >= 0
+        addresses = source_addresses[has_address]
+        self.source_counts += np.bincount(addresses, minlength=SOURCE_ADDRESS_COUNT)
+        np.maximum.at(self.source_last_seen, addresses, timestamps[has_address])
+        self.pgn_seen[pgns[pgns >= 0]] = True
+
+        self.latency_histogram += np.bincount(
+            np.searchsorted(LATENCY_BUCKET_EDGES_MS, latencies_ms),
+            minlength=len(self.latency_histogram),
+        )
+        self.latency_count += len(latencies_ms)
+        self.latency_sum += float(latencies_ms.sum())
+        self.latency_max = max(self.latency_max, float(latencies_ms.max()))
+
+    def latency_percentile(self, quantile: float) -> float | None:
+        """Return the upper bucket edge of a latency quantile in ms."""
+        if not self.latency_count:
+            return None
+        cumulative = np.cumsum(self.latency_histogram)
+        bucket = int(np.searchsorted(cumulative, quantile * self.latency_count))
+        if bucket >= len(LATENCY_BUCKET_EDGES_MS):
+            return self.latency_max
+        return min(float(LATENCY_BUCKET_EDGES_MS[bucket]), self.latency_max)
+
+    def snapshot(
+        self, interface_id: str, time_window: str, duration_seconds: float
+    ) -> NetworkHealthSnapshot:
+        """Summarize the window."""
+        seen = self.source_counts > 0
+        addresses = np.flatnonzero(seen)
+        new_devices: list[int] = []
+        offline_devices: list[int] = []
+        if self.previous_sources is not None:
+            new_devices = np.flatnonzero(seen & ~self.previous_sources).tolist()
+            offline_devices = np.flatnonzero(self.previous_sources & ~seen).tolist()
+
+        return NetworkHealthSnapshot(
+            interface_id=interface_id,
+            time_window=time_window,
+            window_start=datetime.fromtimestamp(self.start, UTC),
+            duration_seconds=duration_seconds,
+            total_messages=self.total_messages,
+            unique_source_count=len(addresses),
+            unique_pgn_count=int(np.count_nonzero(self.pgn_seen)),
+            error_frames=self.error_frames,
+            decoding_failures=self.decoding_failures,
+            latency_avg_ms=(self.latency_sum / self.latency_count if self.latency_count else None),
+            latency_max_ms=self.latency_max if self.latency_count else None,
+            latency_p50_ms=self.latency_percentile(0.50),
+            latency_p95_ms=self.latency_percentile(0.95),
+            latency_p99_ms=self.latency_percentile(0.99),
+            active_devices={
+                str(address): {
+                    "message_count": int(self.source_counts[address]),
+                    "last_seen": float(self.source_last_seen[address]),
+                }
+                for address in addresses.tolist()
+            },
+            new_devices=new_devices,
+            offline_devices=offline_devices,
+        )
+
+
+class NetworkHealthAccumulator:
+    """Accumulates per-interface network health over fixed, aligned windows.
+
+    Frames are assigned to windows by reception time. A window closes when a
+    frame of a later window arrives or when ``close_expired`` is called after
+    the window has ended; late frames are counted in the current window.
+    """
+
+    __slots__ = ("time_window", "window_seconds", "_windows")
+
+    def __init__(self, time_window: str = "5min") -> None:
+        """Initialize the accumulator.
+
+        Parameters
+        ----------
+        time_window : str, default "5min"
+            Window length (1min, 5min, 1hour, 1day)
+
+        Raises
+        ------
+        ValueError
+            If the window name is unknown
+        """
+        if time_window not in METRIC_WINDOWS:
+            raise ValueError(f"Unknown network health window: {time_window}")
+        self.time_window = time_window
+        self.window_seconds = METRIC_WINDOWS[time_window]
+        self._windows: dict[str, _InterfaceHealthWindow] = {}
+
+    @property
+    def interfaces(self) -> list[str]:
+        """Return the interfaces with an open window."""
+        return list(self._windows)
+
+    def observe(
+        self, messages: Sequence[BufferedCANMessage], ingestion_time: datetime
+    ) -> list[NetworkHealthSnapshot]:
+        """Add a batch of stored messages.
+
+        Parameters
+        ----------
+        messages : Sequence[BufferedCANMessage]
+            Messages that were stored
+        ingestion_time : datetime
+            Time the batch was written, for ingestion latency
+
+        Returns
+        -------
+        list[NetworkHealthSnapshot]
+            Snapshots of the windows closed by this batch
+        """
+        count = len(messages)
+        if not count:
+            return []
+
+        timestamps = np.fromiter(
+            (msg.reception_time.timestamp() for msg in messages), dtype=np.float64, count=count
+        )
+        arbitration_ids = np.fromiter(
+            (msg.raw_message.arbitration_id for msg in messages), dtype=np.int64, count=count
+        )
+        extended = np.fromiter(
+            (msg.raw_message.is_extended_id for msg in messages), dtype=np.bool_, count=count
+        )
+        error_frames = np.fromiter(
+            (msg.raw_message.is_error_frame for msg in messages), dtype=np.bool_, count=count
+        )
+        decoding_failures = np.fromiter(
+            (msg.decoding_error is not None for msg in messages), dtype=np.bool_, count=count
+        )
+
+        # J1939 fields (-1 for standard frames)
+        source_addresses = np.where(extended, arbitration_ids & 0xFF, -1)
+        pdu_format = (arbitration_ids >> 16) & 0xFF
+        pgns = np.where(
+            extended,
+            np.where(pdu_format >= 240, (arbitration_ids >> 8) & 0xFFFF, pdu_format << 8),
+            -1,
+        )
+        latencies_ms = (ingestion_time.timestamp() - timestamps) * 1000.0
+        window_indices = (timestamps // self.window_seconds).astype(np.int64)
+
+        groups: dict[str, list[int]] = {}
+        for index, msg in enumerate(messages):
+            groups.setdefault(msg.interface_id, []).append(index)
+
+        closed: list[NetworkHealthSnapshot] = []
+        for interface_id, indices in groups.items():
+            rows = np.asarray(indices, dtype=np.intp)
+            starts = window_indices[rows] * self.window_seconds
+
+            window = self._windows.get(interface_id)
+            if window is None:
+                window = self._windows[interface_id] = _InterfaceHealthWindow(int(starts.min()))
+            # Late frames are counted in the current window
+            starts = np.maximum(starts, window.start)
+
+            for start in np.unique(starts).tolist():
+                if start > window.start:
+                    closed.append(
+                        window.snapshot(interface_id, self.time_window, self.window_seconds)
+                    )
+                    window.advance(start)
+                selected = rows[starts == start]
+                window.add(
+                    timestamps[selected],
+                    source_addresses[selected],
+                    pgns[selected],
+                    error_frames[selected],
+                    decoding_failures[selected],
+                    latencies_ms[selected],
+                )
+
+        return closed
+
+    def snapshot(self, interface_id: str) -> NetworkHealthSnapshot | None:
+        """Return the health of an interface's open window so far.
+
+        Parameters
+        ----------
+        interface_id : str
+            CAN interface identifier
+
+        Returns
+        -------
+        NetworkHealthSnapshot | None
+            Snapshot, or None if no frames were observed on the interface
+        """
+        window = self._windows.get(interface_id)
+        if window is None or not window.total_messages:
+            return None
+        elapsed = max(window.last_seen - window.start, 1.0)
+        return window.snapshot(interface_id, self.time_window, elapsed)
+
+    def close_expired(self, now: datetime) -> list[NetworkHealthSnapshot]:
+        """Close the windows of interfaces that ended before a point in time.
+
+        Parameters
+        ----------
+        now : datetime
+            Current time
+
+        Returns
+        -------
+        list[NetworkHealthSnapshot]
+            Snapshots of the closed windows
+        """
+        closed = []
+        current = int(now.timestamp()) // self.window_seconds * self.window_seconds
+        for interface_id, window in list(self._windows.items()):
+            if window.start >= current:
+                continue
+            had_sources = window.previous_sources is not None and window.previous_sources.any()
+            if window.total_messages or had_sources:
+                # An idle window is reported once, listing the devices that went offline
+                closed.append(window.snapshot(interface_id, self.time_window, self.window_seconds))
+            if window.total_messages:
+                window.advance(current)
+            else:
+                del self._windows[interface_id]
+        return closed
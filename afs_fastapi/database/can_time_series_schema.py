@@ -28,6 +28,9 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase
 
+# 64-bit surrogate keys; SQLite only auto-increments INTEGER PRIMARY KEY (rowid) columns
+TimeSeriesId = BigInteger().with_variant(Integer, "sqlite")
+
 
 class TimeSeriesBase(DeclarativeBase):
     """Base class for all time-series SQLAlchemy models using SQLAlchemy 2.0 API."""
@@ -53,7 +56,7 @@ class CANMessageRaw(TimeSeriesBase):  # type: ignore
     __tablename__ = "can_messages_raw"
 
     # Primary key and timestamp
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(TimeSeriesId, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime(timezone=True), nullable=False, index=True)
 
     # CAN message components
@@ -96,7 +99,7 @@ class CANMessageDecoded(TimeSeriesBase):  # type: ignore
     __tablename__ = "can_messages_decoded"
 
     # Primary key and references
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(TimeSeriesId, primary_key=True, autoincrement=True)
     raw_message_id = Column(BigInteger, nullable=False, index=True)
 
     # Timestamp information
@@ -141,7 +144,7 @@ class AgriculturalMetrics(TimeSeriesBase):  # type: ignore
     __tablename__ = "agricultural_metrics"
 
     # Primary key and time window
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(TimeSeriesId, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime(timezone=True), nullable=False, index=True)
     time_window = Column(String(20), nullable=False)  # 1min, 5min, 1hour, 1day
 
@@ -152,14 +155,18 @@ class AgriculturalMetrics(TimeSeriesBase):  # type: ignore
 
     # Engine metrics
     engine_rpm_avg = Column(Float, nullable=True)
+    engine_rpm_min = Column(Float, nullable=True)
     engine_rpm_max = Column(Float, nullable=True)
     engine_load_avg = Column(Float, nullable=True)
     fuel_consumption_total = Column(Float, nullable=True)  # liters
     fuel_rate_avg = Column(Float, nullable=True)  # L/h
+    fuel_rate_min = Column(Float, nullable=True)  # L/h
+    fuel_rate_max = Column(Float, nullable=True)  # L/h
 
     # Position and movement
     distance_traveled = Column(Float, nullable=True)  # meters
     avg_speed = Column(Float, nullable=True)  # km/h
+    min_speed = Column(Float, nullable=True)  # km/h
     max_speed = Column(Float, nullable=True)  # km/h
     working_time = Column(Float, nullable=True)  # hours
     idle_time = Column(Float, nullable=True)  # hours
@@ -174,6 +181,14 @@ class AgriculturalMetrics(TimeSeriesBase):  # type: ignore
     data_quality_score = Column(Float, nullable=True)  # 0-1
     uptime_percentage = Column(Float, nullable=True)
 
+    # Running sums and sample counts, so windows can be merged incrementally
+    engine_rpm_sum = Column(Float, nullable=True)
+    engine_rpm_samples = Column(Integer, nullable=False, default=0)
+    speed_sum = Column(Float, nullable=True)
+    speed_samples = Column(Integer, nullable=False, default=0)
+    fuel_rate_sum = Column(Float, nullable=True)
+    fuel_rate_samples = Column(Integer, nullable=False, default=0)
+
     # Computed timestamp
     computation_time = Column(
         DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC)
@@ -198,7 +213,7 @@ class CANNetworkHealth(TimeSeriesBase):  # type: ignore
     __tablename__ = "can_network_health"
 
     # Primary key and timestamp
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(TimeSeriesId, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime(timezone=True), nullable=False, index=True)
     time_window = Column(String(20), nullable=False)  # monitoring interval
 
@@ -233,6 +248,9 @@ class CANNetworkHealth(TimeSeriesBase):  # type: ignore
     overall_health_score = Column(Float, nullable=False, default=1.0)  # 0-1
     latency_avg = Column(Float, nullable=True)  # ms
     latency_max = Column(Float, nullable=True)  # ms
+    latency_p50 = Column(Float, nullable=True)  # ms
+    latency_p95 = Column(Float, nullable=True)  # ms
+    latency_p99 = Column(Float, nullable=True)  # ms
 
     # Alert status
     active_alerts = Column(JSONB, nullable=True)  # current system alerts
@@ -242,6 +260,9 @@ class CANNetworkHealth(TimeSeriesBase):  # type: ignore
     __table_args__ = (
         Index("idx_network_health_interface_time", "interface_id", "timestamp"),
         Index("idx_network_health_time_window", "timestamp", "time_window"),
+        UniqueConstraint(
+            "timestamp", "time_window", "interface_id", name="uq_network_health_window"
+        ),
     )
 
 
@@ -254,7 +275,7 @@ class EquipmentSession(TimeSeriesBase):  # type: ignore
     __tablename__ = "equipment_sessions"
 
     # Primary key and identification
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(TimeSeriesId, primary_key=True, autoincrement=True)
     session_id = Column(String(100), nullable=False, unique=True, index=True)
 
     # Equipment information
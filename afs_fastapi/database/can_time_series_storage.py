@@ -10,15 +10,31 @@ Implementation follows Test-First Development (TDD) GREEN phase.
 
 from __future__ import annotations
 
+import json
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Sequence
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, cast
 
 import can
-from sqlalchemy import Engine, create_engine, text
+from sqlalchemy import (
+    ColumnElement,
+    Engine,
+    Row,
+    Select,
+    Table,
+    create_engine,
+    delete,
+    func,
+    insert,
+    make_url,
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
@@ -26,8 +42,21 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import Session, sessionmaker
 
-from afs_fastapi.core.can_frame_codec import DecodedPGN, DecodedSPN
+from afs_fastapi.core.can_frame_codec import CANFrameCodec, DecodedPGN, DecodedSPN
 from afs_fastapi.database.can_message_buffer import BufferedCANMessage
+from afs_fastapi.database.can_metrics_aggregation import (
+    METRIC_PGNS,
+    METRIC_WINDOWS,
+    AgriculturalMetricsAggregator,
+    RunningAggregate,
+    WindowAggregate,
+    WindowKey,
+    window_start,
+)
+from afs_fastapi.database.can_network_health import (
+    NetworkHealthAccumulator,
+    NetworkHealthSnapshot,
+)
 from afs_fastapi.database.can_time_series_schema import (
     AgriculturalMetrics,
     CANMessageDecoded,
@@ -35,10 +64,50 @@ from afs_fastapi.database.can_time_series_schema import (
     CANNetworkHealth,
     TimeSeriesBase,
 )
+from afs_fastapi.database.time_partitioning import (
+    PARTITIONED_TABLES,
+    PartitionMode,
+    PostgresPartitionManager,
+    SQLiteDayShardRouter,
+    detect_partition_mode,
+    partition_end,
+    partition_start,
+)
 
 # Configure logging for time-series storage
 logger = logging.getLogger(__name__)
 
+# Age after which TimescaleDB chunks are compressed
+TIMESCALEDB_COMPRESS_AFTER = "7 days"
+
+# Core tables of the ORM models, for Core statements
+_RAW_TABLE = cast(Table, CANMessageRaw.__table__)
+_DECODED_TABLE = cast(Table, CANMessageDecoded.__table__)
+_METRICS_TABLE = cast(Table, AgriculturalMetrics.__table__)
+
+# Dialects with INSERT ... ON CONFLICT, needed to maintain metric windows
+_UPSERT_DIALECTS = frozenset({"postgresql", "sqlite"})
+
+# agricultural_metrics columns of each running aggregate:
+# (samples, sum, min, max, avg)
+_AGGREGATE_COLUMNS = {
+    "engine_rpm": (
+        "engine_rpm_samples",
+        "engine_rpm_sum",
+        "engine_rpm_min",
+        "engine_rpm_max",
+        "engine_rpm_avg",
+    ),
+    "speed": ("speed_samples", "speed_sum", "min_speed", "max_speed", "avg_speed"),
+    "fuel_rate": (
+        "fuel_rate_samples",
+        "fuel_rate_sum",
+        "fuel_rate_min",
+        "fuel_rate_max",
+        "fuel_rate_avg",
+    ),
+}
+
 
 class TimeSeriesStorageConfig:
     """Configuration for time-series database storage."""
@@ -54,6 +123,12 @@ class TimeSeriesStorageConfig:
         batch_size: int = 1000,
         max_batch_size: int = 5000,
         write_timeout: float = 60.0,
+        use_copy: bool = True,
+        enable_incremental_metrics: bool = True,
+        network_health_window: str = "5min",
+        partition_interval: str = "1 day",
+        premake_partitions: int = 3,
+        sqlite_shard_directory: str | None = None,
     ) -> None:
         """Initialize time-series storage configuration.
 
@@ -77,6 +152,23 @@ class TimeSeriesStorageConfig:
             Maximum batch size for writes
         write_timeout : float, default 60.0
             Write operation timeout in seconds
+        use_copy : bool, default True
+            Ingest batches with PostgreSQL ``COPY`` when the driver is asyncpg
+            (multi-row ``INSERT ... RETURNING`` otherwise)
+        enable_incremental_metrics : bool, default True
+            Merge agricultural metrics of every stored batch into
+            ``agricultural_metrics`` in the same transaction (skipped with a
+            warning on databases without upserts)
+        network_health_window : str, default "5min"
+            Window over which network health is accumulated in memory
+        partition_interval : str, default "1 day"
+            Time partition interval of ``can_messages_raw`` (PostgreSQL
+            partitions, TimescaleDB chunks or SQLite shards)
+        premake_partitions : int, default 3
+            Number of future PostgreSQL partitions created ahead of time
+        sqlite_shard_directory : str, optional
+            On SQLite, store ``can_messages_raw`` in one database file per
+            partition in this directory
         """
         self.database_url = database_url
         self.max_connections = max_connections
@@ -87,6 +179,12 @@ class TimeSeriesStorageConfig:
         self.batch_size = batch_size
         self.max_batch_size = max_batch_size
         self.write_timeout = write_timeout
+        self.use_copy = use_copy
+        self.enable_incremental_metrics = enable_incremental_metrics
+        self.network_health_window = network_health_window
+        self.partition_interval = partition_interval
+        self.premake_partitions = premake_partitions
+        self.sqlite_shard_directory = sqlite_shard_directory
 
 
 class CANTimeSeriesStorage:
@@ -107,6 +205,11 @@ class CANTimeSeriesStorage:
         self._sync_session_factory: sessionmaker[Session] | None = None
         self._connection_pool = None
         self._initialized = False
+        self._codec = CANFrameCodec()  # Decodes metric PGNs not decoded upstream
+        self._network_health = NetworkHealthAccumulator(config.network_health_window)
+        self._partitions: PostgresPartitionManager | None = None
+        self._raw_shards: SQLiteDayShardRouter | None = None
+        self._incremental_metrics = config.enable_incremental_metrics
 
     async def initialize(self) -> bool:
         """Initialize database connections and tables.
@@ -126,9 +229,9 @@ class CANTimeSeriesStorage:
                 echo=False,  # Set to True for SQL debugging
             )
 
-            # Create sync engine for schema operations
-            sync_url = self.config.database_url.replace("+asyncpg", "")
-            self._sync_engine = create_engine(sync_url)
+            # Create sync engine for schema operations (default driver of the backend)
+            url = make_url(self.config.database_url)
+            self._sync_engine = create_engine(url.set(drivername=url.get_backend_name()))
 
             # Create session factories
             self._async_session_factory = async_sessionmaker(
@@ -146,6 +249,14 @@ class CANTimeSeriesStorage:
             # Initialize database schema
             await self._initialize_schema()
 
+            dialect_name = self._async_engine.dialect.name
+            if self._incremental_metrics and dialect_name not in _UPSERT_DIALECTS:
+                logger.warning(
+                    f"Incremental metrics need upserts, which {dialect_name} lacks; "
+                    "storing raw messages without aggregation"
+                )
+                self._incremental_metrics = False
+
             # Setup TimescaleDB features
             if self.config.enable_timescaledb:
                 await self._setup_timescaledb()  # type: ignore
@@ -160,6 +271,15 @@ class CANTimeSeriesStorage:
 
     async def shutdown(self) -> None:
         """Shutdown database connections."""
+        if self._initialized:
+            # Persist the network health of the open windows
+            snapshots = [
+                snapshot
+                for interface_id in self._network_health.interfaces
+                if (snapshot := self._network_health.snapshot(interface_id)) is not None
+            ]
+            await self._write_network_health(snapshots)
+
         if self._async_engine:
             await self._async_engine.dispose()
         if self._sync_engine:
@@ -171,6 +291,19 @@ class CANTimeSeriesStorage:
     async def store_messages_batch(self, messages: list[BufferedCANMessage]) -> bool:
         """Store a batch of CAN messages to time-series tables.
 
+        Rows are written with bulk statements instead of ORM objects: PostgreSQL
+        uses ``COPY`` (asyncpg) or multi-row ``INSERT ... RETURNING``, SQLite
+        uses ``executemany``. Every decoded row references the id of the raw
+        row it was decoded from, also when some messages did not decode.
+        Missing PostgreSQL partitions of the batch are created first, and in
+        SQLite shard mode raw rows go to the database file of their day.
+
+        A transaction can only attach so many SQLite day shards, so a batch
+        spanning more is written in several transactions. If one of them
+        fails, the messages already committed get ``is_stored`` set before
+        returning False; such messages are skipped, so retrying or
+        requeueing the batch does not store them twice.
+
         Parameters
         ----------
         messages : list[BufferedCANMessage]
@@ -184,88 +317,324 @@ class CANTimeSeriesStorage:
         if not self._initialized or not messages:
             return False
 
+        messages = [msg for msg in messages if not msg.is_stored]
+        if not messages:
+            return True
+
+        if self._raw_shards is not None:
+            batches = self._raw_shards.split_batch(messages, lambda msg: msg.reception_time)
+            if len(batches) > 1:
+                for index, batch in enumerate(batches):
+                    if not await self.store_messages_batch(batch):
+                        for stored_batch in batches[:index]:
+                            for msg in stored_batch:
+                                msg.is_stored = True
+                        return False
+                return True
+
         try:
+            raw_rows, decoded_rows = self._build_ingest_rows(messages)
+
             async with self._get_async_session() as session:
-                # Prepare raw message records
-                raw_records = []
-                decoded_records = []
-
-                for msg in messages:
-                    # Raw message record
-                    raw_record = CANMessageRaw(
-                        timestamp=msg.reception_time,
-                        arbitration_id=msg.raw_message.arbitration_id,
-                        data=bytes(msg.raw_message.data),
-                        dlc=msg.raw_message.dlc,
-                        is_extended_id=msg.raw_message.is_extended_id,
-                        is_error_frame=msg.raw_message.is_error_frame,
-                        is_remote_frame=msg.raw_message.is_remote_frame,
-                        interface_id=msg.interface_id,
-                        source_address=self._extract_source_address(msg.raw_message),  # type: ignore
-                        pgn=self._extract_pgn(msg.raw_message),
-                        priority=self._extract_priority(msg.raw_message),
-                        retention_policy=msg.retention_policy,
-                    )
-                    raw_records.append(raw_record)
-
-                    # Decoded message record (if available)
-                    if msg.decoded_message:
-                        decoded_record = CANMessageDecoded(
-                            raw_message_id=0,  # Will be set after raw insert
-                            timestamp=msg.reception_time,
-                            pgn=msg.decoded_message.pgn,
-                            pgn_name=msg.decoded_message.name,
-                            source_address=msg.decoded_message.source_address,
-                            destination_address=msg.decoded_message.destination_address,
-                            spn_values=self._serialize_spn_values(msg.decoded_message.spn_values),
-                            message_data={
-                                "priority": msg.decoded_message.priority,
-                                "data_length": msg.decoded_message.data_length,
-                                "is_multi_frame": msg.decoded_message.is_multi_frame,
-                                "frame_count": msg.decoded_message.frame_count,
-                            },
-                            decoding_success=True,
-                            spn_count=len(msg.decoded_message.spn_values),
-                            valid_spn_count=len(
-                                [spn for spn in msg.decoded_message.spn_values if spn.is_valid]
-                            ),
-                            equipment_type=self._detect_equipment_type(msg.decoded_message),
-                        )
-                        decoded_records.append(decoded_record)
-
-                # Bulk insert raw messages
-                if raw_records:
-                    session.add_all(raw_records)
-                    await session.flush()  # Get IDs for decoded records
-
-                    # Update decoded records with raw message IDs
-                    for i, decoded_record in enumerate(decoded_records):
-                        if i < len(raw_records):
-                            decoded_record.raw_message_id = raw_records[i].id
-
-                # Bulk insert decoded messages
-                if decoded_records:
-                    session.add_all(decoded_records)
+                connection = await session.connection()
+                dialect = connection.dialect
+
+                if self._partitions is not None:
+                    await self._ensure_raw_partitions(connection, raw_rows)
+
+                raw_ids: Sequence[int]
+                if self._raw_shards is not None:
+                    raw_ids = await self._raw_shards.insert(connection, raw_rows)
+                elif dialect.name == "sqlite":
+                    raw_ids = await self._insert_raw_sqlite(connection, raw_rows)
+                elif dialect.name == "postgresql" and dialect.driver == "asyncpg":
+                    if self.config.use_copy:
+                        raw_ids = await self._copy_raw_postgresql(connection, raw_rows)
+                    else:
+                        raw_ids = await self._insert_raw_returning(connection, raw_rows)
+                else:
+                    raw_ids = await self._insert_raw_returning(connection, raw_rows)
+
+                # Link decoded rows to the raw rows they came from
+                for raw_index, decoded_row in decoded_rows:
+                    decoded_row["raw_message_id"] = raw_ids[raw_index]
+
+                if decoded_rows:
+                    rows = [row for _, row in decoded_rows]
+                    if dialect.name == "postgresql" and dialect.driver == "asyncpg":
+                        if self.config.use_copy:
+                            await self._copy_rows_postgresql(
+                                connection, CANMessageDecoded.__tablename__, rows
+                            )
+                        else:
+                            await connection.execute(insert(_DECODED_TABLE), rows)
+                    else:
+                        await connection.execute(insert(_DECODED_TABLE), rows)
+
+                if self._incremental_metrics:
+                    aggregator = AgriculturalMetricsAggregator()
+                    for msg, raw_row in zip(messages, raw_rows, strict=True):
+                        pgn = raw_row["pgn"]
+                        decoded = msg.decoded_message
+                        if decoded is None and pgn in METRIC_PGNS:
+                            decoded = self._codec.decode_message(msg.raw_message)
+                        aggregator.add(raw_row["source_address"], msg.reception_time, pgn, decoded)
+                    await self._upsert_metric_windows(connection, aggregator.rollup())
 
                 # Commit transaction
                 await session.commit()
 
-                logger.debug(
-                    f"Stored {len(raw_records)} raw and {len(decoded_records)} decoded messages"
-                )
-                return True
+                logger.debug(f"Stored {len(raw_rows)} raw and {len(decoded_rows)} decoded messages")
 
         except Exception as e:
             logger.error(f"Failed to store message batch: {e}")
             return False
 
+        # The batch is committed; network health problems must not report it as lost
+        try:
+            closed_windows = self._network_health.observe(messages, raw_rows[0]["ingestion_time"])
+        except Exception as e:
+            logger.error(f"Failed to update network health: {e}")
+            return True
+        if closed_windows:
+            await self._write_network_health(closed_windows)
+        return True
+
+    def _build_ingest_rows(
+        self, messages: list[BufferedCANMessage]
+    ) -> tuple[list[dict[str, Any]], list[tuple[int, dict[str, Any]]]]:
+        """Convert buffered messages to raw and decoded row parameters.
+
+        Parameters
+        ----------
+        messages : list[BufferedCANMessage]
+            Batch of messages to store
+
+        Returns
+        -------
+        tuple[list[dict[str, Any]], list[tuple[int, dict[str, Any]]]]
+            Raw rows, and decoded rows paired with the index of their raw row
+        """
+        ingestion_time = datetime.now(UTC)
+        raw_rows: list[dict[str, Any]] = []
+        decoded_rows: list[tuple[int, dict[str, Any]]] = []
+
+        for index, msg in enumerate(messages):
+            raw_message = msg.raw_message
+            raw_rows.append(
+                {
+                    "timestamp": msg.reception_time,
+                    "arbitration_id": raw_message.arbitration_id,
+                    "data": bytes(raw_message.data),
+                    "dlc": raw_message.dlc,
+                    "is_extended_id": raw_message.is_extended_id,
+                    "is_error_frame": raw_message.is_error_frame,
+                    "is_remote_frame": raw_message.is_remote_frame,
+                    "interface_id": msg.interface_id,
+                    "source_address": self._extract_source_address(raw_message),
+                    "pgn": self._extract_pgn(raw_message),
+                    "priority": self._extract_priority(raw_message),
+                    "ingestion_time": ingestion_time,
+                    "retention_policy": msg.retention_policy,
+                }
+            )
+
+            decoded = msg.decoded_message
+            if decoded:
+                decoded_rows.append(
+                    (
+                        index,
+                        {
+                            "raw_message_id": None,  # Set once raw ids are known
+                            "timestamp": msg.reception_time,
+                            "ingestion_time": ingestion_time,
+                            "pgn": decoded.pgn,
+                            "pgn_name": decoded.name,
+                            "source_address": decoded.source_address,
+                            "destination_address": decoded.destination_address,
+                            "spn_values": self._serialize_spn_values(decoded.spn_values),
+                            "message_data": {
+                                "priority": decoded.priority,
+                                "data_length": decoded.data_length,
+                                "is_multi_frame": decoded.is_multi_frame,
+                                "frame_count": decoded.frame_count,
+                            },
+                            "decoding_success": True,
+                            "spn_count": len(decoded.spn_values),
+                            "valid_spn_count": sum(1 for spn in decoded.spn_values if spn.is_valid),
+                            "equipment_type": self._detect_equipment_type(decoded),
+                            "operation_context": None,
+                        },
+                    )
+                )
+
+        return raw_rows, decoded_rows
+
+    async def _ensure_raw_partitions(
+        self, connection: AsyncConnection, raw_rows: list[dict[str, Any]]
+    ) -> None:
+        """Create the raw table partitions a batch needs, if not known to exist.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            Connection inside the ingest transaction
+        raw_rows : list[dict[str, Any]]
+            Raw row parameters
+        """
+        assert self._partitions is not None  # Assert for mypy
+        timestamps = [row["timestamp"] for row in raw_rows]
+        first, last = min(timestamps), max(timestamps)
+        if not self._partitions.is_covered(CANMessageRaw.__tablename__, first, last):
+            await connection.run_sync(
+                self._partitions.ensure_partitions, CANMessageRaw.__tablename__, first, last
+            )
+
+    async def drop_expired_partitions(self, table_name: str, cutoff: datetime) -> int | None:
+        """Drop the time partitions of a table that expired before a cutoff.
+
+        Parameters
+        ----------
+        table_name : str
+            Table to clean up
+        cutoff : datetime
+            Data older than this is expired
+
+        Returns
+        -------
+        int | None
+            Number of rows in the dropped partitions, or None if the table is
+            not partitioned (expired rows must then be deleted)
+        """
+        async with self._get_async_session() as session:
+            connection = await session.connection()
+            if self._partitions is not None and table_name in self._partitions.tables:
+                removed = await connection.run_sync(
+                    self._partitions.drop_partitions_before, table_name, cutoff
+                )
+            elif self._raw_shards is not None and table_name == self._raw_shards.table.name:
+                removed = await self._raw_shards.drop_before(connection, cutoff)
+            else:
+                return None
+            await session.commit()
+            return removed
+
+    async def _insert_raw_sqlite(
+        self, connection: AsyncConnection, raw_rows: list[dict[str, Any]]
+    ) -> Sequence[int]:
+        """Insert raw rows with ``executemany`` and recover their ids.
+
+        SQLite holds the write lock from the first insert until commit and
+        assigns rowids sequentially, so the batch occupies the ids ending at
+        ``last_insert_rowid()``.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            Connection inside the ingest transaction
+        raw_rows : list[dict[str, Any]]
+            Raw row parameters
+
+        Returns
+        -------
+        Sequence[int]
+            Raw row ids in input order
+        """
+        await connection.execute(insert(_RAW_TABLE), raw_rows)
+        result = await connection.execute(text("SELECT last_insert_rowid()"))
+        last_id = int(result.scalar_one())
+        return range(last_id - len(raw_rows) + 1, last_id + 1)
+
+    async def _insert_raw_returning(
+        self, connection: AsyncConnection, raw_rows: list[dict[str, Any]]
+    ) -> Sequence[int]:
+        """Insert raw rows with multi-row ``INSERT ... RETURNING``.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            Connection inside the ingest transaction
+        raw_rows : list[dict[str, Any]]
+            Raw row parameters
+
+        Returns
+        -------
+        Sequence[int]
+            Raw row ids in input order
+        """
+        result = await connection.execute(
+            insert(_RAW_TABLE).returning(_RAW_TABLE.c.id, sort_by_parameter_order=True), raw_rows
+        )
+        return [row.id for row in result]
+
+    async def _copy_raw_postgresql(
+        self, connection: AsyncConnection, raw_rows: list[dict[str, Any]]
+    ) -> Sequence[int]:
+        """Reserve raw row ids from the sequence and ``COPY`` the rows.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            asyncpg connection inside the ingest transaction
+        raw_rows : list[dict[str, Any]]
+            Raw row parameters (ids are added)
+
+        Returns
+        -------
+        Sequence[int]
+            Raw row ids in input order
+        """
+        result = await connection.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence(:table, 'id')) "
+                "FROM generate_series(1, :count)"
+            ),
+            {"table": CANMessageRaw.__tablename__, "count": len(raw_rows)},
+        )
+        raw_ids = [int(row[0]) for row in result]
+        for raw_id, row in zip(raw_ids, raw_rows, strict=True):
+            row["id"] = raw_id
+
+        await self._copy_rows_postgresql(connection, CANMessageRaw.__tablename__, raw_rows)
+        return raw_ids
+
+    async def _copy_rows_postgresql(
+        self, connection: AsyncConnection, table_name: str, rows: list[dict[str, Any]]
+    ) -> None:
+        """Bulk load rows with asyncpg's binary ``COPY``.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            asyncpg connection inside the ingest transaction
+        table_name : str
+            Target table
+        rows : list[dict[str, Any]]
+            Row parameters sharing the same keys
+        """
+        columns = list(rows[0])
+        records = [
+            tuple(json.dumps(value) if isinstance(value, dict) else value for value in row.values())
+            for row in rows
+        ]
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        assert driver_connection is not None  # Assert for mypy
+        await driver_connection.copy_records_to_table(table_name, records=records, columns=columns)
+
     async def compute_agricultural_metrics(
         self,
         start_time: datetime,
         end_time: datetime,
         time_window: str = "1hour",
     ) -> bool:
-        """Compute and store agricultural metrics for a time period.
+        """Recompute and store agricultural metrics for a time period.
+
+        Metrics are maintained incrementally as batches are stored; this
+        rebuilds the windows overlapping the period from the raw messages
+        (e.g. after a backfill) and replaces the stored rows of the period,
+        so repeated calls do not duplicate them and windows whose messages
+        were deleted disappear.
 
         Parameters
         ----------
@@ -282,152 +651,288 @@ class CANTimeSeriesStorage:
             True if computation was successful
         """
         try:
-            async with self._get_async_session() as session:
-                # Query for raw agricultural data
-                query = text(
-                    """
-                    SELECT
-                        source_address,
-                        date_trunc(:window, timestamp) as window_start,
-                        count(*) as message_count,
-                        avg(CASE WHEN pgn = 61444 AND (data[3] << 8 | data[2]) != 65535
-                            THEN (data[3] << 8 | data[2]) * 0.125 END) as avg_engine_rpm,
-                        max(CASE WHEN pgn = 61444 AND (data[3] << 8 | data[2]) != 65535
-                            THEN (data[3] << 8 | data[2]) * 0.125 END) as max_engine_rpm,
-                        avg(CASE WHEN pgn = 65265 AND (data[2] << 8 | data[1]) != 65535
-                            THEN (data[2] << 8 | data[1]) * 0.00390625 END) as avg_speed,
-                        max(CASE WHEN pgn = 65265 AND (data[2] << 8 | data[1]) != 65535
-                            THEN (data[2] << 8 | data[1]) * 0.00390625 END) as max_speed
-                    FROM can_messages_raw
-                    WHERE timestamp BETWEEN :start_time AND :end_time
-                        AND pgn IN (61444, 65265, 65266, 65267)  -- Key agricultural PGNs
-                    GROUP BY source_address, window_start
-                    ORDER BY source_address, window_start
-                """
-                )
+            aggregator = AgriculturalMetricsAggregator(base_window=time_window)
+            period_start = window_start(start_time, time_window)
+            period_end = window_start(end_time, time_window) + timedelta(
+                seconds=METRIC_WINDOWS[time_window]
+            )
 
-                result = await session.execute(
-                    query,
-                    {
-                        "window": time_window,
-                        "start_time": start_time,
-                        "end_time": end_time,
-                    },
+            def query(raw: Table) -> Select[Any]:
+                return select(
+                    raw.c.timestamp,
+                    raw.c.arbitration_id,
+                    raw.c.data,
+                    raw.c.is_extended_id,
+                    raw.c.source_address,
+                    raw.c.pgn,
+                ).where(
+                    raw.c.timestamp >= period_start,
+                    raw.c.timestamp < period_end,
+                    raw.c.pgn.in_(METRIC_PGNS),
                 )
 
-                metrics_records = []
-                for row in result:
-                    metric_record = AgriculturalMetrics(
-                        timestamp=row.window_start,
-                        time_window=time_window,
-                        source_address=row.source_address,
-                        equipment_type=self._map_address_to_equipment_type(row.source_address),
-                        engine_rpm_avg=row.avg_engine_rpm,
-                        engine_rpm_max=row.max_engine_rpm,
-                        avg_speed=row.avg_speed,
-                        max_speed=row.max_speed,
-                        message_count=row.message_count,
-                        data_quality_score=self._calculate_data_quality(row.message_count),  # type: ignore
-                    )
-                    metrics_records.append(metric_record)
+            def add(row: Row[Any]) -> None:
+                message = can.Message(
+                    arbitration_id=row.arbitration_id,
+                    data=row.data,
+                    is_extended_id=row.is_extended_id,
+                )
+                decoded = self._codec.decode_message(message)
+                aggregator.add(row.source_address, row.timestamp, row.pgn, decoded)
 
-                # Store computed metrics
-                if metrics_records:
-                    session.add_all(metrics_records)
-                    await session.commit()
+            async with self._get_async_session() as session:
+                connection = await session.connection()
+                if self._raw_shards is not None:
+                    async for row in self._raw_shards.select(
+                        connection, query, period_start, period_end
+                    ):
+                        add(row)
+                else:
+                    for row in await connection.execute(query(_RAW_TABLE)):
+                        add(row)
 
-                logger.info(
-                    f"Computed {len(metrics_records)} metric records for {time_window} window"
+                windows = {
+                    key: aggregate
+                    for key, aggregate in aggregator.rollup().items()
+                    if key[0] == time_window
+                }
+                # Windows of the period that no longer have data are removed
+                await connection.execute(
+                    delete(_METRICS_TABLE).where(
+                        _METRICS_TABLE.c.time_window == time_window,
+                        _METRICS_TABLE.c.timestamp >= period_start,
+                        _METRICS_TABLE.c.timestamp < period_end,
+                    )
                 )
+                await self._upsert_metric_windows(connection, windows, replace=True)
+                await session.commit()
+
+                logger.info(f"Computed {len(windows)} metric records for {time_window} window")
                 return True
 
         except Exception as e:
             logger.error(f"Failed to compute agricultural metrics: {e}")
             return False
 
+    async def _upsert_metric_windows(
+        self,
+        connection: AsyncConnection,
+        windows: dict[WindowKey, WindowAggregate],
+        replace: bool = False,
+    ) -> None:
+        """Upsert metric windows into ``agricultural_metrics``.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            Connection inside the current transaction
+        windows : dict[WindowKey, WindowAggregate]
+            Aggregates keyed by (time_window, source_address, window_start)
+        replace : bool, default False
+            Replace stored windows instead of merging the aggregates into them
+
+        Raises
+        ------
+        NotImplementedError
+            If the database dialect has no upsert support
+        """
+        if not windows:
+            return
+
+        upsert_insert, least, greatest = self._upsert_functions(connection)
+
+        rows_by_window: dict[str, list[dict[str, Any]]] = {}
+        computation_time = datetime.now(UTC)
+        for (time_window, source_address, start), aggregate in windows.items():
+            row: dict[str, Any] = {
+                "timestamp": start,
+                "time_window": time_window,
+                "source_address": source_address,
+                "equipment_type": self._map_address_to_equipment_type(source_address),
+                "message_count": aggregate.message_count,
+                "data_quality_score": min(
+                    aggregate.message_count / METRIC_WINDOWS[time_window], 1.0
+                ),
+                "computation_time": computation_time,
+            }
+            for attribute, columns in _AGGREGATE_COLUMNS.items():
+                running: RunningAggregate = getattr(aggregate, attribute)
+                samples, total, minimum, maximum, mean = columns
+                row[samples] = running.count
+                row[total] = running.total
+                row[minimum] = running.minimum
+                row[maximum] = running.maximum
+                row[mean] = running.mean
+            rows_by_window.setdefault(time_window, []).append(row)
+
+        table = AgriculturalMetrics.__table__
+        for time_window, rows in rows_by_window.items():
+            statement = upsert_insert(table)
+            excluded = statement.excluded
+            if replace:
+                set_: dict[str, ColumnElement[Any]] = {
+                    column: excluded[column]
+                    for column in rows[0]
+                    if column not in ("timestamp", "time_window", "source_address")
+                }
+            else:
+                message_count = table.c.message_count + excluded.message_count
+                set_ = {
+                    "equipment_type": excluded.equipment_type,
+                    "message_count": message_count,
+                    # Expected rate is one message per second
+                    "data_quality_score": least(
+                        message_count * 1.0 / METRIC_WINDOWS[time_window], 1.0
+                    ),
+                    "computation_time": excluded.computation_time,
+                }
+                for samples, total, minimum, maximum, mean in _AGGREGATE_COLUMNS.values():
+                    merged_samples = table.c[samples] + excluded[samples]
+                    merged_total = func.coalesce(table.c[total], 0.0) + excluded[total]
+                    set_[samples] = merged_samples
+                    set_[total] = merged_total
+                    set_[minimum] = func.coalesce(
+                        least(table.c[minimum], excluded[minimum]),
+                        table.c[minimum],
+                        excluded[minimum],
+                    )
+                    set_[maximum] = func.coalesce(
+                        greatest(table.c[maximum], excluded[maximum]),
+                        table.c[maximum],
+                        excluded[maximum],
+                    )
+                    set_[mean] = merged_total / func.nullif(merged_samples, 0)
+
+            await connection.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["timestamp", "time_window", "source_address"], set_=set_
+                ),
+                rows,
+            )
+
+    @staticmethod
+    def _upsert_functions(connection: AsyncConnection) -> tuple[Any, Any, Any]:
+        """Return the dialect's upsert-capable insert and two-argument min/max functions.
+
+        Raises
+        ------
+        NotImplementedError
+            If the database dialect has no upsert support
+        """
+        dialect = connection.dialect.name
+        if dialect not in _UPSERT_DIALECTS:
+            raise NotImplementedError(f"Upserts are not supported on {dialect}")
+        if dialect == "postgresql":
+            return postgresql.insert, func.least, func.greatest
+        return sqlite.insert, func.min, func.max
+
     async def update_network_health(self, interface_id: str, time_window: str = "5min") -> bool:
         """Update network health metrics for an interface.
 
+        Health is accumulated in memory as batches are stored and written when
+        a window closes; this also writes the interface's open window so far
+        and closes windows that ended without new traffic.
+
         Parameters
         ----------
         interface_id : str
             CAN interface identifier
         time_window : str, default "5min"
-            Health monitoring window
+            Health monitoring window (must match the configured window)
 
         Returns
         -------
         bool
             True if update was successful
         """
-        try:
-            async with self._get_async_session() as session:
-                current_time = datetime.now(UTC)
-                window_start = current_time.replace(
-                    minute=(current_time.minute // 5) * 5, second=0, microsecond=0
-                )
+        if time_window != self._network_health.time_window:
+            logger.warning(
+                f"Network health is accumulated over {self._network_health.time_window} "
+                f"windows, not {time_window}"
+            )
+            return False
 
-                # Query network statistics
-                query = text(
-                    """
-                    SELECT
-                        COUNT(*) as total_messages,
-                        COUNT(DISTINCT source_address) as unique_sources,
-                        COUNT(DISTINCT pgn) as unique_pgns,
-                        SUM(CASE WHEN is_error_frame THEN 1 ELSE 0 END) as error_frames,
-                        AVG(EXTRACT(EPOCH FROM (ingestion_time - timestamp))) as avg_latency
-                    FROM can_messages_raw
-                    WHERE interface_id = :interface_id
-                        AND timestamp >= :window_start
-                        AND timestamp < :window_end
-                """
-                )
+        snapshots = self._network_health.close_expired(datetime.now(UTC))
+        has_data = any(snapshot.interface_id == interface_id for snapshot in snapshots)
+        current = self._network_health.snapshot(interface_id)
+        if current is not None:
+            snapshots.append(current)
+            has_data = True
 
-                result = await session.execute(
-                    query,
-                    {
-                        "interface_id": interface_id,
-                        "window_start": window_start,
-                        "window_end": window_start + timedelta(minutes=5),
-                    },
-                )
+        if not await self._write_network_health(snapshots):
+            return False
+        if not has_data:
+            logger.warning(f"No network health data found for {interface_id}")
+            return False
 
-                row = result.first()
-                if row:
-                    # Calculate derived metrics
-                    messages_per_second = row.total_messages / 300.0  # 5 minutes = 300 seconds
-                    error_rate = (row.error_frames / max(row.total_messages, 1)) * 100
-                    health_score = max(0.0, 1.0 - (error_rate / 100.0))
-
-                    # Create health record
-                    health_record = CANNetworkHealth(
-                        timestamp=window_start,
-                        time_window=time_window,
-                        interface_id=interface_id,
-                        total_messages=row.total_messages,
-                        messages_per_second=messages_per_second,
-                        unique_source_count=row.unique_sources,
-                        unique_pgn_count=row.unique_pgns,
-                        error_frames=row.error_frames,
-                        error_rate=error_rate,
-                        overall_health_score=health_score,
-                        latency_avg=row.avg_latency,
-                        device_count=row.unique_sources,
-                    )
+        if current is not None:
+            logger.debug(f"Updated network health for {interface_id}: {current.health_score:.2f}")
+        return True
 
-                    session.add(health_record)
-                    await session.commit()
+    async def _write_network_health(self, snapshots: list[NetworkHealthSnapshot]) -> bool:
+        """Upsert network health snapshots as ``can_network_health`` rows.
 
-                    logger.debug(f"Updated network health for {interface_id}: {health_score:.2f}")
-                    return True
-                else:
-                    logger.warning(
-                        f"No network health data found for {interface_id} in the last 5 minutes."
-                    )
-                    return False
+        Parameters
+        ----------
+        snapshots : list[NetworkHealthSnapshot]
+            Window snapshots; a window written before is replaced
+
+        Returns
+        -------
+        bool
+            True if the snapshots were written
+        """
+        if not snapshots:
+            return True
+
+        rows = [
+            {
+                "timestamp": snapshot.window_start,
+                "time_window": snapshot.time_window,
+                "interface_id": snapshot.interface_id,
+                "total_messages": snapshot.total_messages,
+                "messages_per_second": snapshot.messages_per_second,
+                "unique_source_count": snapshot.unique_source_count,
+                "unique_pgn_count": snapshot.unique_pgn_count,
+                "error_frames": snapshot.error_frames,
+                "decoding_failures": snapshot.decoding_failures,
+                "error_rate": snapshot.error_rate,
+                "active_devices": snapshot.active_devices,
+                "device_count": snapshot.unique_source_count,
+                "new_devices": snapshot.new_devices,
+                "offline_devices": snapshot.offline_devices,
+                "overall_health_score": snapshot.health_score,
+                "latency_avg": snapshot.latency_avg_ms,
+                "latency_max": snapshot.latency_max_ms,
+                "latency_p50": snapshot.latency_p50_ms,
+                "latency_p95": snapshot.latency_p95_ms,
+                "latency_p99": snapshot.latency_p99_ms,
+            }
+            for snapshot in snapshots
+        ]
+        key_columns = ("timestamp", "time_window", "interface_id")
+
+        try:
+            async with self._get_async_session() as session:
+                connection = await session.connection()
+                upsert_insert, _, _ = self._upsert_functions(connection)
+                statement = upsert_insert(CANNetworkHealth.__table__)
+                await connection.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=list(key_columns),
+                        set_={
+                            column: statement.excluded[column]
+                            for column in rows[0]
+                            if column not in key_columns
+                        },
+                    ),
+                    rows,
+                )
+                await session.commit()
+                return True
 
         except Exception as e:
-            logger.error(f"Failed to update network health: {e}")
+            logger.error(f"Failed to write network health: {e}")
             return False
 
     async def query_metrics(
@@ -508,6 +1013,12 @@ class CANTimeSeriesStorage:
             finally:
                 await session.close()
 
+    def _extract_source_address(self, message: can.Message) -> int | None:
+        """Extract J1939 source address from CAN message."""
+        if message.is_extended_id:
+            return message.arbitration_id & 0xFF
+        return None
+
     def _extract_pgn(self, message: can.Message) -> int | None:  # type: ignore
         """Extract PGN from CAN message."""
         if not message.is_extended_id:
@@ -521,11 +1032,44 @@ class CANTimeSeriesStorage:
             return pdu_format << 8
 
     async def _initialize_schema(self) -> None:
-        """Initialize database schema and tables."""
+        """Initialize database schema and tables.
+
+        On PostgreSQL ``can_messages_raw`` is created range partitioned by
+        timestamp (a hypertable when TimescaleDB is installed and enabled)
+        and the partitions of the next ``premake_partitions`` intervals are
+        created ahead of time.
+        """
         if self._sync_engine:
             assert self._sync_engine is not None  # Assert for mypy
             with self._sync_engine.begin() as conn:
-                TimeSeriesBase.metadata.create_all(conn)
+                mode = detect_partition_mode(conn, self.config.enable_timescaledb)
+                if mode is PartitionMode.NONE:
+                    TimeSeriesBase.metadata.create_all(conn)
+                else:
+                    self._partitions = PostgresPartitionManager(
+                        mode,
+                        {
+                            name: column
+                            for name, column in PARTITIONED_TABLES.items()
+                            if name in TimeSeriesBase.metadata.tables
+                        },
+                        self.config.partition_interval,
+                    )
+                    self._partitions.create_schema(conn, TimeSeriesBase.metadata)
+
+                    now = datetime.now(UTC)
+                    ahead = partition_start(now, self.config.partition_interval)
+                    for _ in range(self.config.premake_partitions):
+                        ahead = partition_end(ahead, self.config.partition_interval)
+                    for table_name in self._partitions.tables:
+                        self._partitions.ensure_partitions(conn, table_name, now, ahead)
+
+            if self._sync_engine.dialect.name == "sqlite" and self.config.sqlite_shard_directory:
+                self._raw_shards = SQLiteDayShardRouter(
+                    self.config.sqlite_shard_directory,
+                    _RAW_TABLE,
+                    interval=self.config.partition_interval,
+                )
 
         logger.info("Database schema initialized")
 
@@ -589,7 +1133,33 @@ class CANTimeSeriesStorage:
         return ratio
 
     async def _setup_timescaledb(self) -> None:
-        """Setup TimescaleDB specific features like hypertables and compression policies."""
-        logger.info("Setting up TimescaleDB features (placeholder)")
-        # Placeholder for actual TimescaleDB setup logic
-        pass
+        """Setup TimescaleDB specific features like hypertables and compression policies.
+
+        Hypertables are created with the schema; this enables native
+        compression of chunks older than ``TIMESCALEDB_COMPRESS_AFTER``.
+        """
+        if self._partitions is None:
+            return  # Not PostgreSQL
+        if self._partitions.mode is not PartitionMode.TIMESCALEDB:
+            logger.info("TimescaleDB is not installed; using native partitioning")
+            return
+        if not self.config.enable_compression:
+            return
+
+        assert self._sync_engine is not None  # Assert for mypy
+        with self._sync_engine.begin() as conn:
+            for table_name, time_column in self._partitions.tables.items():
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table_name} SET (timescaledb.compress, "
+                        f"timescaledb.compress_orderby = '{time_column} DESC')"
+                    )
+                )
+                conn.execute(
+                    text(
+                        "SELECT add_compression_policy(:table, CAST(:after AS INTERVAL), "
+                        "if_not_exists => TRUE)"
+                    ),
+                    {"table": table_name, "after": TIMESCALEDB_COMPRESS_AFTER},
+                )
+        logger.info("TimescaleDB compression policies configured")
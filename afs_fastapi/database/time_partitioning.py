@@ -0,0 +1,772 @@
+"""Time partitioning of the agricultural time-series tables.
+
+On PostgreSQL the high-volume tables are range partitioned by their
+timestamp: natively, with declarative partitions created ahead of time, or
+as TimescaleDB hypertables when the extension is installed. Queries bounded
+by the timestamp only touch the partitions of their range, and expired data
+is removed by dropping whole partitions (or chunks) instead of deleting rows.
+
+SQLite has no partitioning, so local deployments can shard a table into one
+database file per partition instead. The files are attached on demand to the
+connection that reads or writes them, and expired files are deleted.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import (
+    Connection,
+    Executable,
+    MetaData,
+    PrimaryKeyConstraint,
+    Row,
+    Select,
+    Table,
+    func,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+# Configure logging for partition management
+logger = logging.getLogger(__name__)
+
+PARTITION_INTERVALS = ("1 day", "1 week", "1 month")
+
+# Time-partitioned tables and their partition key
+PARTITIONED_TABLES: dict[str, str] = {
+    "can_messages_raw": "timestamp",
+    "isobus_messages": "timestamp",
+    "tractor_telemetry": "timestamp",
+    "agricultural_sensor_data": "timestamp",
+}
+
+
+def as_utc(timestamp: datetime) -> datetime:
+    """Return a timezone-aware timestamp; naive values are taken as UTC."""
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
+
+
+def partition_start(timestamp: datetime, interval: str = "1 day") -> datetime:
+    """Return the UTC start of the partition containing a timestamp.
+
+    Parameters
+    ----------
+    timestamp : datetime
+        Point in time; naive values are taken as UTC
+    interval : str, default "1 day"
+        Partition interval (1 day, 1 week, 1 month)
+
+    Returns
+    -------
+    datetime
+        Timezone-aware partition start (midnight, Monday or first of month)
+
+    Raises
+    ------
+    ValueError
+        If the interval is unknown
+    """
+    day = as_utc(timestamp).astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "1 day":
+        return day
+    if interval == "1 week":
+        return day - timedelta(days=day.weekday())
+    if interval == "1 month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown partition interval: {interval}")
+
+
+def partition_end(start: datetime, interval: str = "1 day") -> datetime:
+    """Return the exclusive end of the partition starting at ``start``."""
+    if interval == "1 day":
+        return start + timedelta(days=1)
+    if interval == "1 week":
+        return start + timedelta(weeks=1)
+    if interval == "1 month":
+        return (start + timedelta(days=32)).replace(day=1)
+    raise ValueError(f"Unknown partition interval: {interval}")
+
+
+def partition_starts(start: datetime, end: datetime, interval: str = "1 day") -> list[datetime]:
+    """Return the starts of all partitions overlapping [start, end]."""
+    current = partition_start(start, interval)
+    last = partition_start(end, interval)
+    starts = []
+    while current <= last:
+        starts.append(current)
+        current = partition_end(current, interval)
+    return starts
+
+
+def partition_name(table_name: str, start: datetime) -> str:
+    """Return the name of a table's partition starting at ``start``."""
+    return f"{table_name}_p{start:%Y%m%d}"
+
+
+@dataclass(frozen=True, slots=True)
+class TimePartition:
+    """One time partition of a table."""
+
+    table_name: str
+    name: str
+    start: datetime
+    end: datetime
+    schema: str | None = None  # Schema holding the partition, if not the table's
+
+
+class PartitionMode(Enum):
+    """How time-series tables are partitioned."""
+
+    NONE = "none"  # Single tables (or SQLite day shards)
+    NATIVE = "native"  # PostgreSQL declarative range partitions
+    TIMESCALEDB = "timescaledb"  # TimescaleDB hypertables
+
+
+def detect_partition_mode(connection: Connection, prefer_timescaledb: bool = True) -> PartitionMode:
+    """Return the partitioning a database supports.
+
+    Parameters
+    ----------
+    connection : Connection
+        Database connection
+    prefer_timescaledb : bool, default True
+        Use hypertables when the TimescaleDB extension is installed
+
+    Returns
+    -------
+    PartitionMode
+        TIMESCALEDB or NATIVE on PostgreSQL, NONE otherwise
+    """
+    if connection.dialect.name != "postgresql":
+        return PartitionMode.NONE
+    if prefer_timescaledb:
+        installed = connection.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+        ).first()
+        if installed is not None:
+            return PartitionMode.TIMESCALEDB
+    return PartitionMode.NATIVE
+
+
+class PostgresPartitionManager:
+    """Creates, lists and drops the time partitions of PostgreSQL tables.
+
+    Partitioned tables are created with their timestamp added to the primary
+    key, as PostgreSQL and TimescaleDB require of unique constraints on
+    partitioned tables; foreign keys referencing them are left out for the
+    same reason. Tables that already exist unpartitioned are left as they
+    are and treated as single tables.
+    """
+
+    __slots__ = ("mode", "tables", "interval", "_created")
+
+    def __init__(
+        self,
+        mode: PartitionMode,
+        tables: Mapping[str, str] | None = None,
+        interval: str = "1 day",
+    ) -> None:
+        """Initialize the manager.
+
+        Parameters
+        ----------
+        mode : PartitionMode
+            NATIVE or TIMESCALEDB
+        tables : Mapping[str, str], optional
+            Partitioned tables and their timestamp column
+            (defaults to ``PARTITIONED_TABLES``)
+        interval : str, default "1 day"
+            Partition (or chunk) interval
+
+        Raises
+        ------
+        ValueError
+            If the interval is unknown
+        """
+        if interval not in PARTITION_INTERVALS:
+            raise ValueError(f"Unknown partition interval: {interval}")
+        self.mode = mode
+        self.tables = dict(PARTITIONED_TABLES if tables is None else tables)
+        self.interval = interval
+        self._created: set[tuple[str, datetime]] = set()
+
+    def schema_statements(self, metadata: MetaData) -> list[Executable]:
+        """Return the statements creating a metadata's tables, partitioned.
+
+        Parameters
+        ----------
+        metadata : MetaData
+            Tables to create; partitioned tables not in it are ignored
+
+        Returns
+        -------
+        list[Executable]
+            ``CREATE TABLE``/``CREATE INDEX`` statements (``IF NOT EXISTS``),
+            followed by ``create_hypertable`` calls in TimescaleDB mode
+        """
+        copy = MetaData()
+        for table in metadata.sorted_tables:
+            table.to_metadata(copy)
+        partitioned = {name: column for name, column in self.tables.items() if name in copy.tables}
+
+        for name, time_column in partitioned.items():
+            table = copy.tables[name]
+            primary_key = [column.name for column in table.primary_key.columns]
+            table.c[time_column].primary_key = True
+            options: dict[str, Any] = (
+                {"postgresql_partition_by": f"RANGE ({time_column})"}
+                if self.mode is PartitionMode.NATIVE
+                else {}
+            )
+            Table(
+                name,
+                copy,
+                PrimaryKeyConstraint(*primary_key, time_column),
+                extend_existing=True,
+                **options,
+            )
+
+        statements: list[Executable] = []
+        for table in copy.sorted_tables:
+            foreign_keys = [
+                constraint
+                for constraint in table.foreign_key_constraints
+                if constraint.referred_table.name not in partitioned
+            ]
+            statements.append(
+                CreateTable(table, include_foreign_key_constraints=foreign_keys, if_not_exists=True)
+            )
+            partition_column = partitioned.get(table.name)
+            for index in sorted(table.indexes, key=lambda index: str(index.name)):
+                if partition_column and index.unique and partition_column not in index.columns:
+                    logger.warning(
+                        f"Skipping unique index {index.name} of partitioned {table.name}"
+                    )
+                    continue
+                statements.append(CreateIndex(index, if_not_exists=True))
+
+        if self.mode is PartitionMode.TIMESCALEDB:
+            for name, time_column in partitioned.items():
+                statements.append(
+                    text(
+                        "SELECT create_hypertable(:table, :column, "
+                        "chunk_time_interval => CAST(:interval AS INTERVAL), "
+                        "if_not_exists => TRUE)"
+                    ).bindparams(table=name, column=time_column, interval=self.interval)
+                )
+        return statements
+
+    def create_schema(self, connection: Connection, metadata: MetaData) -> None:
+        """Create a metadata's tables with the partitioned ones partitioned.
+
+        Parameters
+        ----------
+        connection : Connection
+            PostgreSQL connection inside a transaction
+        metadata : MetaData
+            Tables to create
+        """
+        existing = self._unpartitioned_tables(connection, metadata)
+        for name in existing:
+            logger.warning(f"Table {name} exists unpartitioned; leaving it as a single table")
+            del self.tables[name]
+
+        for statement in self.schema_statements(metadata):
+            connection.execute(statement)
+
+    def ensure_partitions(
+        self, connection: Connection, table_name: str, start: datetime, end: datetime
+    ) -> list[str]:
+        """Create the missing partitions of a table covering [start, end].
+
+        TimescaleDB creates chunks as rows arrive, so this only acts in
+        NATIVE mode.
+
+        Parameters
+        ----------
+        connection : Connection
+            PostgreSQL connection
+        table_name : str
+            Partitioned table
+        start, end : datetime
+            Time range that must be covered
+
+        Returns
+        -------
+        list[str]
+            Names of the partitions created
+        """
+        if self.mode is not PartitionMode.NATIVE or table_name not in self.tables:
+            return []
+
+        created = []
+        for partition in partition_starts(start, end, self.interval):
+            if (table_name, partition) in self._created:
+                continue
+            name = partition_name(table_name, partition)
+            upper = partition_end(partition, self.interval)
+            connection.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table_name}" '
+                    f"FOR VALUES FROM ('{partition:%Y-%m-%d %H:%M:%S}+00') "
+                    f"TO ('{upper:%Y-%m-%d %H:%M:%S}+00')"
+                )
+            )
+            self._created.add((table_name, partition))
+            created.append(name)
+
+        if created:
+            logger.info(f"Created partitions {', '.join(created)}")
+        return created
+
+    def is_covered(self, table_name: str, start: datetime, end: datetime) -> bool:
+        """Return whether partitions covering [start, end] are known to exist."""
+        if self.mode is not PartitionMode.NATIVE or table_name not in self.tables:
+            return True
+        return all(
+            (table_name, partition) in self._created
+            for partition in partition_starts(start, end, self.interval)
+        )
+
+    def list_partitions(self, connection: Connection, table_name: str) -> list[TimePartition]:
+        """Return the partitions (or chunks) of a table in time order.
+
+        Parameters
+        ----------
+        connection : Connection
+            PostgreSQL connection
+        table_name : str
+            Partitioned table
+
+        Returns
+        -------
+        list[TimePartition]
+            Partitions; native partitions not named by this manager are skipped
+        """
+        if table_name not in self.tables:
+            return []
+
+        if self.mode is PartitionMode.TIMESCALEDB:
+            result = connection.execute(
+                text(
+                    "SELECT chunk_schema, chunk_name, range_start, range_end "
+                    "FROM timescaledb_information.chunks WHERE hypertable_name = :table "
+                    "ORDER BY range_start"
+                ),
+                {"table": table_name},
+            )
+            return [
+                TimePartition(table_name, row.chunk_name, row.range_start, row.range_end, row[0])
+                for row in result
+            ]
+
+        result = connection.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = :table"
+            ),
+            {"table": table_name},
+        )
+        prefix = f"{table_name}_p"
+        partitions = []
+        for (name,) in result:
+            if not name.startswith(prefix):
+                continue
+            try:
+                start = datetime.strptime(name[len(prefix) :], "%Y%m%d").replace(tzinfo=UTC)
+            except ValueError:
+                continue
+            partitions.append(
+                TimePartition(table_name, name, start, partition_end(start, self.interval))
+            )
+        return sorted(partitions, key=lambda partition: partition.start)
+
+    def drop_partitions_before(
+        self, connection: Connection, table_name: str, cutoff: datetime
+    ) -> int:
+        """Drop the partitions of a table that end at or before a cutoff.
+
+        Rows of the partition containing the cutoff are kept; delete them
+        with a timestamp-bounded statement, which only scans that partition.
+
+        Parameters
+        ----------
+        connection : Connection
+            PostgreSQL connection inside a transaction
+        table_name : str
+            Partitioned table
+        cutoff : datetime
+            Data older than this is expired
+
+        Returns
+        -------
+        int
+            Number of rows in the dropped partitions
+        """
+        if cutoff.tzinfo is None:
+            cutoff = cutoff.replace(tzinfo=UTC)
+        expired = [
+            partition
+            for partition in self.list_partitions(connection, table_name)
+            if partition.end <= cutoff
+        ]
+
+        removed = 0
+        for partition in expired:
+            qualified = (
+                f'"{partition.schema}"."{partition.name}"'
+                if partition.schema
+                else f'"{partition.name}"'
+            )
+            removed += connection.execute(text(f"SELECT count(*) FROM {qualified}")).scalar_one()
+            if self.mode is PartitionMode.NATIVE:
+                connection.execute(text(f"DROP TABLE IF EXISTS {qualified}"))
+                self._created.discard((table_name, partition.start))
+
+        if expired and self.mode is PartitionMode.TIMESCALEDB:
+            connection.execute(
+                text("SELECT drop_chunks(:table, older_than => :cutoff)"),
+                {"table": table_name, "cutoff": cutoff},
+            )
+
+        if expired:
+            logger.info(f"Dropped {len(expired)} expired partitions of {table_name}")
+        return removed
+
+    def _unpartitioned_tables(self, connection: Connection, metadata: MetaData) -> list[str]:
+        """Return partitioned tables of the metadata that already exist as plain tables."""
+        names = [name for name in self.tables if name in metadata.tables]
+        if not names:
+            return []
+
+        if self.mode is PartitionMode.TIMESCALEDB:
+            partitioned_query = (
+                "SELECT hypertable_name FROM timescaledb_information.hypertables "
+                "WHERE hypertable_name = ANY(:names)"
+            )
+        else:
+            partitioned_query = (
+                "SELECT c.relname FROM pg_partitioned_table p "
+                "JOIN pg_class c ON p.partrelid = c.oid WHERE c.relname = ANY(:names)"
+            )
+        existing = {
+            row[0]
+            for row in connection.execute(
+                text(
+                    "SELECT tablename FROM pg_tables "
+                    "WHERE schemaname = current_schema() AND tablename = ANY(:names)"
+                ),
+                {"names": names},
+            )
+        }
+        partitioned = {
+            row[0] for row in connection.execute(text(partitioned_query), {"names": names})
+        }
+        return sorted(existing - partitioned)
+
+
+class SQLiteDayShardRouter:
+    """Routes a SQLite table into one database file per time partition.
+
+    Shards are attached to the connection that uses them, as
+    ``<table>_<YYYYMMDD>``, and stay attached (at most ``MAX_ATTACHED`` per
+    connection, least recently used detached first). SQLite refuses to
+    attach or detach inside a transaction, so shards must be attached before
+    the transaction's first write: ``insert`` does this itself when it is the
+    first write of the transaction, as in batch ingestion. One transaction
+    can therefore write at most ``MAX_ATTACHED`` shards; ``split_batch``
+    splits larger batches into one batch per transaction.
+
+    Row ids stay unique across shards: the ids of a shard start at its
+    partition's day number shifted left by 32 bits.
+    """
+
+    MAX_ATTACHED = 8  # SQLite's default limit is 10 attached databases
+
+    __slots__ = ("directory", "table", "time_column", "interval", "_shard_tables")
+
+    def __init__(
+        self,
+        directory: str | Path,
+        table: Table,
+        time_column: str = "timestamp",
+        interval: str = "1 day",
+    ) -> None:
+        """Initialize the router.
+
+        Parameters
+        ----------
+        directory : str | Path
+            Directory holding the shard files
+        table : Table
+            Table to shard (its foreign keys are not created in shards)
+        time_column : str, default "timestamp"
+            Partition key
+        interval : str, default "1 day"
+            Shard interval
+
+        Raises
+        ------
+        ValueError
+            If the interval is unknown
+        """
+        if interval not in PARTITION_INTERVALS:
+            raise ValueError(f"Unknown partition interval: {interval}")
+        self.directory = Path(directory)
+        self.table = table
+        self.time_column = time_column
+        self.interval = interval
+        self._shard_tables: dict[str, Table] = {}
+
+    def alias(self, start: datetime) -> str:
+        """Return the schema name a shard is attached as."""
+        return f"{self.table.name}_{start:%Y%m%d}"
+
+    def shard_path(self, start: datetime) -> Path:
+        """Return the database file of the shard starting at ``start``."""
+        return self.directory / f"{self.alias(start)}.db"
+
+    def shard_table(self, start: datetime) -> Table:
+        """Return the table of an attached shard, for building statements."""
+        alias = self.alias(start)
+        table = self._shard_tables.get(alias)
+        if table is None:
+            table = self._shard_tables[alias] = self.table.to_metadata(MetaData(), schema=alias)
+        return table
+
+    def shards(self) -> list[TimePartition]:
+        """Return the shards on disk in time order."""
+        prefix = f"{self.table.name}_"
+        shards = []
+        for path in self.directory.glob(f"{prefix}*.db"):
+            try:
+                start = datetime.strptime(path.stem[len(prefix) :], "%Y%m%d").replace(tzinfo=UTC)
+            except ValueError:
+                continue
+            shards.append(
+                TimePartition(
+                    self.table.name,
+                    path.stem,
+                    start,
+                    partition_end(start, self.interval),
+                    schema=path.stem,
+                )
+            )
+        return sorted(shards, key=lambda shard: shard.start)
+
+    async def attach(self, connection: AsyncConnection, starts: Iterable[datetime]) -> None:
+        """Attach (creating if needed) the shards starting at ``starts``.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            SQLite connection without a write transaction in progress
+        starts : Iterable[datetime]
+            Partition starts
+
+        Raises
+        ------
+        ValueError
+            If more shards are requested than can be attached at once
+        """
+        starts = list(dict.fromkeys(starts))
+        if len(starts) > self.MAX_ATTACHED:
+            raise ValueError(f"Cannot attach {len(starts)} shards at once")
+
+        attached: OrderedDict[str, None] = connection.info.setdefault(
+            "attached_shards", OrderedDict()
+        )
+        wanted = {self.alias(start) for start in starts}
+        for start in starts:
+            alias = self.alias(start)
+            if alias in attached:
+                attached.move_to_end(alias)
+                continue
+
+            while len(attached) >= self.MAX_ATTACHED:
+                oldest = next(alias for alias in attached if alias not in wanted)
+                await connection.exec_driver_sql(f'DETACH DATABASE "{oldest}"')
+                del attached[oldest]
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            await connection.exec_driver_sql(
+                f'ATTACH DATABASE ? AS "{alias}"', (str(self.shard_path(start)),)
+            )
+            attached[alias] = None
+
+            table = self.shard_table(start)
+            await connection.execute(
+                CreateTable(table, include_foreign_key_constraints=[], if_not_exists=True)
+            )
+            for index in table.indexes:
+                await connection.execute(CreateIndex(index, if_not_exists=True))
+
+    async def detach(self, connection: AsyncConnection, start: datetime) -> None:
+        """Detach a shard from a connection if it is attached."""
+        attached: OrderedDict[str, None] = connection.info.setdefault(
+            "attached_shards", OrderedDict()
+        )
+        alias = self.alias(start)
+        if alias in attached:
+            await connection.exec_driver_sql(f'DETACH DATABASE "{alias}"')
+            del attached[alias]
+
+    def split_batch(
+        self, items: Sequence[Any], timestamp: Callable[[Any], datetime]
+    ) -> list[list[Any]]:
+        """Split a batch into batches of at most ``MAX_ATTACHED`` shards each.
+
+        Parameters
+        ----------
+        items : Sequence[Any]
+            Batch items (rows, messages)
+        timestamp : Callable[[Any], datetime]
+            Returns the partition key of an item
+
+        Returns
+        -------
+        list[list[Any]]
+            Batches in shard time order, each to be written in its own
+            transaction; items keep their input order within a batch
+        """
+        groups: dict[datetime, list[Any]] = {}
+        for item in items:
+            groups.setdefault(partition_start(timestamp(item), self.interval), []).append(item)
+        if len(groups) <= self.MAX_ATTACHED:
+            return [list(items)]
+
+        shard_starts = sorted(groups)
+        batches = []
+        for offset in range(0, len(shard_starts), self.MAX_ATTACHED):
+            group_starts = set(shard_starts[offset : offset + self.MAX_ATTACHED])
+            batches.append(
+                [
+                    item
+                    for item in items
+                    if partition_start(timestamp(item), self.interval) in group_starts
+                ]
+            )
+        return batches
+
+    async def insert(
+        self, connection: AsyncConnection, rows: Sequence[dict[str, Any]]
+    ) -> list[int]:
+        """Insert rows into their shards, assigning their ids.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            SQLite connection; the insert must be the first write of its
+            transaction unless the shards are already attached
+        rows : Sequence[dict[str, Any]]
+            Row parameters (ids are added)
+
+        Returns
+        -------
+        list[int]
+            Row ids in input order
+
+        Raises
+        ------
+        ValueError
+            If the rows span more than ``MAX_ATTACHED`` shards (see
+            ``split_batch``)
+        """
+        groups: dict[datetime, list[dict[str, Any]]] = {}
+        for row in rows:
+            start = partition_start(row[self.time_column], self.interval)
+            groups.setdefault(start, []).append(row)
+
+        # All shards are attached up front: detaching after the first write
+        # fails while the transaction is open
+        await self.attach(connection, sorted(groups))
+        for start, shard_rows in sorted(groups.items()):
+            table = self.shard_table(start)
+            last_id = (await connection.execute(select(func.max(table.c.id)))).scalar_one_or_none()
+            next_id = (
+                last_id + 1 if last_id is not None else (int(start.timestamp()) // 86400) << 32
+            )
+            for row in shard_rows:
+                row["id"] = next_id
+                next_id += 1
+            await connection.execute(insert(table), shard_rows)
+
+        return [row["id"] for row in rows]
+
+    async def select(
+        self,
+        connection: AsyncConnection,
+        build: Callable[[Table], Select[Any]],
+        start: datetime,
+        end: datetime,
+    ) -> AsyncIterator[Row[Any]]:
+        """Run a query against every shard overlapping [start, end) in time order.
+
+        Only the shards of the range are attached and queried; the query
+        itself should still bound the partition key for the edge shards.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            SQLite connection without a write transaction in progress
+        build : Callable[[Table], Select[Any]]
+            Builds the query from a shard's table
+        start, end : datetime
+            Time range
+
+        Yields
+        ------
+        Row[Any]
+            Result rows, shard by shard
+        """
+        existing = {shard.start for shard in self.shards()}
+        for shard_start in partition_starts(start, end, self.interval):
+            if shard_start not in existing or shard_start >= as_utc(end):
+                continue
+            await self.attach(connection, [shard_start])
+            result = await connection.execute(build(self.shard_table(shard_start)))
+            for row in result:
+                yield row
+
+    async def drop_before(self, connection: AsyncConnection, cutoff: datetime) -> int:
+        """Delete shard files that end at or before a cutoff.
+
+        Parameters
+        ----------
+        connection : AsyncConnection
+            SQLite connection without a write transaction in progress
+        cutoff : datetime
+            Data older than this is expired
+
+        Returns
+        -------
+        int
+            Number of rows in the deleted shards
+        """
+        removed = 0
+        for shard in self.shards():
+            if shard.end > as_utc(cutoff):
+                break
+            await self.attach(connection, [shard.start])
+            table = self.shard_table(shard.start)
+            removed += (
+                await connection.execute(select(func.count()).select_from(table))
+            ).scalar_one()
+            await self.detach(connection, shard.start)
+            self._shard_tables.pop(shard.name, None)
+            self.shard_path(shard.start).unlink()
+            logger.info(f"Dropped expired shard {shard.name}")
+        return removed
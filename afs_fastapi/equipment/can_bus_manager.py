@@ -24,7 +24,11 @@ try:
 except ImportError:
     can = None  # type: ignore
 
-from afs_fastapi.core.can_frame_codec import CANFrameCodec, DecodedPGN
+from afs_fastapi.core.can_frame_codec import (
+    CANFrameCodec,
+    CANFrameEnvelope,
+    DecodedPGN,
+)
 from afs_fastapi.equipment.can_error_handling import CANErrorHandler, ISOBUSErrorLogger
 from afs_fastapi.equipment.physical_can_interface import (
     InterfaceConfiguration,
@@ -99,6 +103,10 @@ class ManagerStatistics:
     failover_events: int = 0
     active_interfaces: int = 0
     failed_interfaces: int = 0
+    batches_processed: int = 0
+    messages_in_batches: int = 0
+    largest_batch: int = 0
+    queue_high_watermark: int = 0
     last_health_check: datetime = field(default_factory=datetime.now)
     performance_metrics: dict[str, float] = field(default_factory=dict)
 
@@ -151,24 +159,33 @@ class MessageRouter:
         return False
 
     def route_message(
-        self, message: can.Message, available_interfaces: list[str]
+        self, message: can.Message | CANFrameEnvelope, available_interfaces: list[str]
     ) -> tuple[list[str], MessagePriority]:
         """Route a CAN message to appropriate interfaces.
 
         Parameters
         ----------
-        message : can.Message
-            CAN message to route
+        message : can.Message | CANFrameEnvelope
+            CAN message to route (routed on its identifier without decoding)
         available_interfaces : list[str]
             Available interface names
 
         Returns
         -------
         tuple[list[str], MessagePriority]
-            (target_interfaces, message_priority)
+            (target_interfaces, message_priority); standard frames and unknown
+            PGNs go to all interfaces at LOW priority, Transport Protocol
+            frames are routed by their TP.CM/TP.DT PGN
         """
-        decoded: DecodedPGN | None = self.codec.decode_message(message)
-        if not decoded:
+        # Routing only needs identifier fields, so the payload is never decoded
+        # here and TP frames never reach the stateful reassembler
+        if isinstance(message, CANFrameEnvelope):
+            decoded = message
+        else:
+            decoded = self.codec.create_envelope(message)
+        if not decoded.is_extended_id or not (
+            decoded.is_transport_protocol or self.codec.get_pgn_definition(decoded.pgn)
+        ):
             return available_interfaces, MessagePriority.LOW
 
         pgn: int = decoded.pgn
@@ -528,6 +545,8 @@ class CANBusConnectionManager:
         pool_config: ConnectionPoolConfig,
         error_handler: CANErrorHandler | None = None,
         error_logger: ISOBUSErrorLogger | None = None,
+        queue_size: int = 1000,
+        batch_limit: int = 256,
     ) -> None:
         """Initialize CAN bus connection manager.
 
@@ -539,6 +558,10 @@ class CANBusConnectionManager:
             Error handling system
         error_logger : ISOBUSErrorLogger | None
             Error logging system
+        queue_size : int, default 1000
+            Maximum frames queued between reception and processing
+        batch_limit : int, default 256
+            Maximum frames drained from the queue per processing wakeup
         """
         self.pool_config = pool_config
         self.error_handler = error_handler or CANErrorHandler()
@@ -562,7 +585,10 @@ class CANBusConnectionManager:
 
         # Message handling
         self._message_callbacks: list[Callable[[DecodedPGN, str], None]] = []
-        self._message_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._envelope_callbacks: list[Callable[[CANFrameEnvelope], None]] = []
+        self._batch_callbacks: list[Callable[[list[CANFrameEnvelope]], None]] = []
+        self._message_queue: asyncio.Queue[CANFrameEnvelope] = asyncio.Queue(maxsize=queue_size)
+        self._batch_limit = max(1, batch_limit)
         self._processing_task: asyncio.Task | None = None
 
         # Monitoring
@@ -644,6 +670,55 @@ class CANBusConnectionManager:
         if callback in self._message_callbacks:
             self._message_callbacks.remove(callback)
 
+    def add_envelope_callback(self, callback: Callable[[CANFrameEnvelope], None]) -> None:
+        """Add callback receiving each frame's decode-once envelope.
+
+        Envelope consumers (storage buffers, safety validation) share the
+        frame's single decode with the decoded-message callbacks.
+
+        Parameters
+        ----------
+        callback : Callable[[CANFrameEnvelope], None]
+            Callback function (envelope)
+        """
+        self._envelope_callbacks.append(callback)
+
+    def remove_envelope_callback(self, callback: Callable[[CANFrameEnvelope], None]) -> None:
+        """Remove envelope callback.
+
+        Parameters
+        ----------
+        callback : Callable[[CANFrameEnvelope], None]
+            Callback function to remove
+        """
+        if callback in self._envelope_callbacks:
+            self._envelope_callbacks.remove(callback)
+
+    def add_batch_callback(self, callback: Callable[[list[CANFrameEnvelope]], None]) -> None:
+        """Add callback receiving frames in batches.
+
+        Each processing wakeup drains every queued frame (up to the batch
+        limit) and hands the list to batch callbacks once, before per-frame
+        callbacks run. Envelopes share their decode with other consumers.
+
+        Parameters
+        ----------
+        callback : Callable[[list[CANFrameEnvelope]], None]
+            Callback function (envelopes in reception order)
+        """
+        self._batch_callbacks.append(callback)
+
+    def remove_batch_callback(self, callback: Callable[[list[CANFrameEnvelope]], None]) -> None:
+        """Remove batch callback.
+
+        Parameters
+        ----------
+        callback : Callable[[list[CANFrameEnvelope]], None]
+            Callback function to remove
+        """
+        if callback in self._batch_callbacks:
+            self._batch_callbacks.remove(callback)
+
     def _handle_incoming_message(self, message: can.Message, interface_id: str) -> None:
         """Handle incoming CAN message.
 
@@ -655,32 +730,38 @@ class CANBusConnectionManager:
             Interface that received the message
         """
         try:
-            # Queue message for processing
-            self._message_queue.put_nowait((message, interface_id))
+            # Wrap once at reception; every consumer shares the envelope
+            self._message_queue.put_nowait(self.codec.create_envelope(message, interface_id))
             self._statistics.total_messages_processed += 1
 
+            depth = self._message_queue.qsize()
+            if depth > self._statistics.queue_high_watermark:
+                self._statistics.queue_high_watermark = depth
+
         except asyncio.QueueFull:
             logger.warning("Message queue full, dropping message")
             self._statistics.messages_dropped += 1
 
     async def _message_processing_loop(self) -> None:
-        """Background message processing loop."""
+        """Background message processing loop.
+
+        Drains everything already queued up to the batch limit with
+        ``get_nowait`` and waits (with a timeout) only while the queue is
+        empty, so a busy bus never pays for ``wait_for`` and costs one wakeup
+        per batch instead of one per frame.
+        """
         while self._state in [ManagerState.RUNNING, ManagerState.DEGRADED, ManagerState.FAILOVER]:
             try:
-                # Get message from queue
-                message, interface_id = await asyncio.wait_for(
-                    self._message_queue.get(), timeout=1.0
-                )
+                batch: list[CANFrameEnvelope] = []
+                self._drain_message_queue(batch)
+                if not batch:
+                    # Queue is empty: wait for the first frame of the next batch
+                    batch.append(await asyncio.wait_for(self._message_queue.get(), timeout=1.0))
+                    self._drain_message_queue(batch)
+                self._process_message_batch(batch)
 
-                # Decode message
-                decoded: DecodedPGN | None = self.codec.decode_message(message)
-                if decoded:
-                    # Call registered callbacks
-                    for callback in self._message_callbacks:
-                        try:
-                            callback(decoded, interface_id)
-                        except Exception as e:
-                            logger.error(f"Message callback error: {e}")
+                # Let reception and other tasks run between batches
+                await asyncio.sleep(0)
 
             except TimeoutError:
                 continue
@@ -689,6 +770,64 @@ class CANBusConnectionManager:
             except Exception as e:
                 logger.error(f"Message processing error: {e}")
 
+    def _drain_message_queue(self, batch: list[CANFrameEnvelope]) -> None:
+        """Move already queued frames into a batch without waiting.
+
+        Parameters
+        ----------
+        batch : list[CANFrameEnvelope]
+            Batch to extend, up to the batch limit
+        """
+        queue = self._message_queue
+        limit = self._batch_limit
+        while len(batch) < limit:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+    def _process_message_batch(self, batch: list[CANFrameEnvelope]) -> None:
+        """Deliver a batch of frames to batch, envelope and message callbacks.
+
+        Parameters
+        ----------
+        batch : list[CANFrameEnvelope]
+            Frames in reception order
+        """
+        stats = self._statistics
+        stats.batches_processed += 1
+        stats.messages_in_batches += len(batch)
+        if len(batch) > stats.largest_batch:
+            stats.largest_batch = len(batch)
+
+        for batch_callback in self._batch_callbacks:
+            try:
+                batch_callback(batch)
+            except Exception as e:
+                logger.error(f"Batch callback error: {e}")
+
+        envelope_callbacks = self._envelope_callbacks
+        message_callbacks = self._message_callbacks
+        for envelope in batch:
+            for envelope_callback in envelope_callbacks:
+                try:
+                    envelope_callback(envelope)
+                except Exception as e:
+                    logger.error(f"Envelope callback error: {e}")
+
+            if not message_callbacks:
+                continue
+
+            # Decode message (cached on the envelope)
+            decoded: DecodedPGN | None = envelope.decode()
+            if decoded:
+                # Call registered callbacks
+                for callback in message_callbacks:
+                    try:
+                        callback(decoded, envelope.interface_id)
+                    except Exception as e:
+                        logger.error(f"Message callback error: {e}")
+
     async def _monitoring_loop(self) -> None:
         """Background monitoring and state management loop."""
         while self._state != ManagerState.STOPPED:
@@ -789,9 +928,11 @@ class CANBusConnectionManager:
                 "total_messages": self._statistics.total_messages_processed,
                 "messages_routed": self._statistics.messages_routed,
                 "messages_dropped": self._statistics.messages_dropped,
+                "messages_decoded": self.codec.messages_decoded,
                 "active_interfaces": self._statistics.active_interfaces,
                 "failed_interfaces": self._statistics.failed_interfaces,
             },
+            "backpressure": self._get_backpressure_metrics(),
             "connection_pool": {
                 "primary_interfaces": dict(self.connection_pool.primary_connections),
                 "backup_interfaces": dict(self.connection_pool.backup_connections),
@@ -800,6 +941,33 @@ class CANBusConnectionManager:
             "routing": self.message_router.get_routing_statistics(),
         }
 
+    def _get_backpressure_metrics(self) -> dict[str, Any]:
+        """Get reception queue and batch drain metrics.
+
+        Returns
+        -------
+        dict[str, Any]
+            Queue depth, utilization, high watermark, drops and batch sizes
+        """
+        stats = self._statistics
+        depth = self._message_queue.qsize()
+        capacity = self._message_queue.maxsize
+        return {
+            "queue_depth": depth,
+            "queue_capacity": capacity,
+            "queue_utilization": depth / capacity if capacity else 0.0,
+            "queue_high_watermark": stats.queue_high_watermark,
+            "messages_dropped": stats.messages_dropped,
+            "batch_limit": self._batch_limit,
+            "batches_processed": stats.batches_processed,
+            "average_batch_size": (
+                stats.messages_in_batches / stats.batches_processed
+                if stats.batches_processed
+                else 0.0
+            ),
+            "largest_batch": stats.largest_batch,
+        }
+
     def get_active_interfaces(self) -> list[str]:
         """Get list of currently active interfaces.
 
@@ -18,7 +18,7 @@ from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Any
 
-from afs_fastapi.core.can_frame_codec import CANFrameCodec, DecodedPGN
+from afs_fastapi.core.can_frame_codec import CANFrameCodec, CANFrameEnvelope, DecodedPGN
 from afs_fastapi.equipment.can_error_handling import CANErrorHandler, CANErrorType
 
 # Configure logging for critical data handlers
@@ -1050,13 +1050,17 @@ class CriticalDataAggregator:
         self.fuel_handler.add_alert_callback(self._handle_alert)
         self.gps_handler.add_alert_callback(self._handle_alert)
 
-    def process_message(self, decoded_msg: DecodedPGN) -> bool:
+    # PGNs carrying critical data: WVS, LFE, VP
+    CRITICAL_PGNS = frozenset({0xFEF1, 0xFEF2, 0xFEF3})
+
+    def process_message(self, decoded_msg: DecodedPGN | CANFrameEnvelope) -> bool:
         """Process a decoded CAN message for critical data extraction.
 
         Parameters
         ----------
-        decoded_msg : DecodedPGN
-            Decoded CAN message
+        decoded_msg : DecodedPGN | CANFrameEnvelope
+            Decoded CAN message, or a frame envelope which is only decoded
+            (once, shared with other consumers) if it carries critical data
 
         Returns
         -------
@@ -1064,6 +1068,14 @@ class CriticalDataAggregator:
             True if message was processed
         """
         try:
+            if isinstance(decoded_msg, CANFrameEnvelope):
+                if not decoded_msg.is_extended_id or decoded_msg.pgn not in self.CRITICAL_PGNS:
+                    return False
+                envelope_decoded = decoded_msg.decode()
+                if envelope_decoded is None:
+                    return False
+                decoded_msg = envelope_decoded
+
             processed = False
             source_address = decoded_msg.source_address
 
@@ -0,0 +1,752 @@
+"""
+Binary wire codec for fleet coordination messages on ISOBUS.
+
+Fleet coordination messages (heartbeats, section claims, state sync and
+emergency stops) are dicts with a fixed envelope: ``msg_type``,
+``sender_id``, ``vector_clock`` and ``payload``. This module encodes them in
+a compact, versioned binary format that the receiver can parse safely, and
+splits the encoded bytes into J1939 frames: a single frame up to 8 bytes,
+the Transport Protocol (TP) up to 1785 bytes and the Extended Transport
+Protocol (ETP, destination-specific only) beyond that.
+
+Wire format (version 1)::
+
+    byte 0    version
+    byte 1    flags (bit 0: zstd body, bit 1: zlib body)
+    body      (compressed if flagged)
+      type    u8 message type code; 0 is followed by the type name (string)
+      sender  string
+      clock   varint count, then (string, varint) pairs
+      payload tagged value
+      extra   tagged value: other envelope keys (dict), or None
+
+Strings are interned per message, starting from a fixed table of the
+envelope and payload keys the fleet services use (part of the version). The
+first occurrence of any other string is sent literally, or as prefix plus
+varint number when it ends in digits (as section and tractor IDs do), and
+repeats as a varint back-reference, so the per-section entries of a state
+sync cost a few bytes each.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import struct
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+import can
+
+from afs_fastapi.core.can_frame_codec import (
+    TP_CM_PDU_FORMAT,
+    TP_DT_PDU_FORMAT,
+    TransportProtocolReassembler,
+)
+
+try:
+    import zstandard
+except ImportError:  # Optional: compressed bodies fall back to zlib
+    zstandard = None  # type: ignore
+
+# Configure logging for fleet message encoding
+logger = logging.getLogger(__name__)
+
+WIRE_VERSION = 1
+FLAG_ZSTD = 0x01
+FLAG_ZLIB = 0x02
+COMPRESSION_THRESHOLD = 128  # Bodies shorter than this are never compressed
+MAX_DECODED_SIZE = 1 << 20  # Bound on decompressed bodies
+MAX_NESTING = 32
+MAX_VARINT = (1 << 64) - 1  # Largest value a varint (at most 10 bytes) carries
+
+MESSAGE_TYPE_CODES: dict[str, int] = {
+    "HEARTBEAT": 1,
+    "TASK_CLAIM": 2,
+    "STATE_SYNC_REQUEST": 3,
+    "STATE_SYNC_RESPONSE": 4,
+    "EMERGENCY_STOP": 5,
+    "EMERGENCY_ACKNOWLEDGMENT": 6,
+}
+_MESSAGE_TYPE_NAMES = {code: name for name, code in MESSAGE_TYPE_CODES.items()}
+_ENVELOPE_KEYS = frozenset({"msg_type", "sender_id", "vector_clock", "payload"})
+
+# Strings every version 1 message table starts with; append only in a new version
+_STATIC_STRINGS: tuple[str, ...] = (
+    "vector_clock",
+    "timestamp",
+    "status",
+    "position",
+    "lat",
+    "lon",
+    "speed",
+    "health_metric",
+    "action",
+    "section_id",
+    "field_id",
+    "sections",
+    "owner",
+    "crdt_clock",
+    "crdt_delta",
+    "crdt_payload",
+    "since_clock",
+    "emergency_id",
+    "reason_code",
+    "severity",
+    "source_position",
+    "acknowledging_tractor",
+    "claim",
+    "release",
+)
+_STATIC_INDEX = {value: index for index, value in enumerate(_STATIC_STRINGS)}
+
+# Tagged value type codes
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_UINT = 3
+_NEGATIVE_INT = 4  # Stores -value - 1
+_FLOAT32 = 5
+_FLOAT64 = 6
+_STRING = 7
+_BYTES = 8
+_LIST = 9
+_DICT = 10
+
+# String heads: literal, numbered, or back-reference (head - 2)
+_LITERAL = 0
+_NUMBERED = 1
+
+# Trailing decimal number without leading zeros, so prefix + str(number) round-trips
+_NUMBER_SUFFIX = re.compile(r"(.*?)([1-9][0-9]{0,17}|0)", re.DOTALL)
+
+_FLOAT32_STRUCT = struct.Struct("<f")
+_FLOAT64_STRUCT = struct.Struct("<d")
+
+# J1939-21 transport PGNs
+TP_CM_PGN = TP_CM_PDU_FORMAT << 8
+TP_DT_PGN = TP_DT_PDU_FORMAT << 8
+ETP_CM_PGN = 0xC800
+ETP_DT_PGN = 0xC700
+TP_MAX_SIZE = 1785  # 255 packets * 7 bytes
+ETP_MAX_SIZE = 117_440_505  # (2**24 - 1) packets * 7 bytes
+
+TP_RTS = 16
+TP_BAM = 32
+ETP_RTS = 20
+ETP_DPO = 22
+
+
+class FleetCodecError(ValueError):
+    """Raised for messages that cannot be encoded or malformed wire data."""
+
+
+def encode_fleet_message(message: dict[str, Any], compress: bool = True) -> bytes:
+    """Encode a fleet coordination message.
+
+    Parameters
+    ----------
+    message : dict[str, Any]
+        Message with ``msg_type``, ``sender_id``, ``vector_clock`` and
+        ``payload``; other keys are carried as extras. Values may be None,
+        bool, int, float, str, bytes, lists/tuples and dicts with str keys.
+    compress : bool, default True
+        Compress bodies of at least ``COMPRESSION_THRESHOLD`` bytes when that
+        makes them smaller (zstd if installed, otherwise zlib)
+
+    Returns
+    -------
+    bytes
+        Encoded message
+
+    Raises
+    ------
+    FleetCodecError
+        If the message holds values the format cannot represent
+    """
+    writer = _Writer()
+    msg_type = str(message.get("msg_type", ""))
+    code = MESSAGE_TYPE_CODES.get(msg_type, 0)
+    writer.buffer.append(code)
+    if code == 0:
+        writer.write_string(msg_type)
+    writer.write_string(str(message.get("sender_id", "")))
+
+    clock = message.get("vector_clock") or {}
+    writer.write_varint(len(clock))
+    for process_id, counter in clock.items():
+        writer.write_string(process_id)
+        writer.write_varint(counter)
+
+    writer.write_value(message.get("payload"), 0)
+    extra = {key: value for key, value in message.items() if key not in _ENVELOPE_KEYS}
+    writer.write_value(extra or None, 0)
+
+    body = bytes(writer.buffer)
+    flags = 0
+    if compress and len(body) >= COMPRESSION_THRESHOLD:
+        if zstandard is not None:
+            compressed, candidate_flags = zstandard.ZstdCompressor().compress(body), FLAG_ZSTD
+        else:
+            compressed, candidate_flags = zlib.compress(body, 6), FLAG_ZLIB
+        if len(compressed) < len(body):
+            body, flags = compressed, candidate_flags
+
+    return bytes((WIRE_VERSION, flags)) + body
+
+
+def decode_fleet_message(data: bytes | bytearray) -> dict[str, Any]:
+    """Decode a fleet coordination message.
+
+    Parameters
+    ----------
+    data : bytes | bytearray
+        Output of ``encode_fleet_message``
+
+    Returns
+    -------
+    dict[str, Any]
+        Message with ``msg_type``, ``sender_id``, ``vector_clock``,
+        ``payload`` and any extra envelope keys
+
+    Raises
+    ------
+    FleetCodecError
+        If the data is truncated, malformed, of an unknown version or
+        compressed with an unavailable algorithm
+    """
+    if len(data) < 2:
+        raise FleetCodecError("Fleet message shorter than its header")
+    version, flags = data[0], data[1]
+    if version != WIRE_VERSION:
+        raise FleetCodecError(f"Unsupported fleet message version {version}")
+
+    body = bytes(data[2:])
+    if flags & FLAG_ZSTD:
+        if zstandard is None:
+            raise FleetCodecError("zstd-compressed fleet message, zstandard is not installed")
+        try:
+            body = zstandard.ZstdDecompressor().decompress(body, max_output_size=MAX_DECODED_SIZE)
+        except zstandard.ZstdError as e:
+            raise FleetCodecError(f"Corrupt zstd body: {e}") from e
+    elif flags & FLAG_ZLIB:
+        decompressor = zlib.decompressobj()
+        try:
+            body = decompressor.decompress(body, MAX_DECODED_SIZE)
+        except zlib.error as e:
+            raise FleetCodecError(f"Corrupt zlib body: {e}") from e
+        if decompressor.unconsumed_tail:
+            raise FleetCodecError("Fleet message body exceeds the decoded size limit")
+
+    reader = _Reader(body)
+    try:
+        code = reader.read_byte()
+        msg_type = reader.read_string() if code == 0 else _MESSAGE_TYPE_NAMES.get(code)
+        if msg_type is None:
+            raise FleetCodecError(f"Unknown fleet message type code {code}")
+        message: dict[str, Any] = {"msg_type": msg_type, "sender_id": reader.read_string()}
+
+        clock: dict[str, int] = {}
+        for _ in range(reader.read_varint()):
+            process_id = reader.read_string()
+            clock[process_id] = reader.read_varint()
+        message["vector_clock"] = clock
+
+        message["payload"] = reader.read_value(0)
+        extra = reader.read_value(0)
+    except IndexError as e:
+        raise FleetCodecError("Truncated fleet message") from e
+
+    if isinstance(extra, dict):
+        message.update(extra)
+    if reader.position != len(body):
+        raise FleetCodecError("Trailing bytes after fleet message")
+    return message
+
+
+@lru_cache(maxsize=4096)
+def _split_number(value: str) -> tuple[str, int] | None:
+    """Split a string ending in a decimal number into prefix and number."""
+    match = _NUMBER_SUFFIX.fullmatch(value)
+    if match is None:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+class _Writer:
+    """Append-only encoder state: output buffer and interned strings."""
+
+    __slots__ = ("buffer", "strings")
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.strings: dict[str, int] = dict(_STATIC_INDEX)
+
+    def write_varint(self, value: int) -> None:
+        if not 0 <= value <= MAX_VARINT:
+            raise FleetCodecError(f"Varint out of range: {value}")
+        buffer = self.buffer
+        while value > 0x7F:
+            buffer.append((value & 0x7F) | 0x80)
+            value >>= 7
+        buffer.append(value)
+
+    def write_string(self, value: str) -> None:
+        index = self.strings.get(value)
+        if index is not None:
+            self.write_varint(index + 2)
+            return
+
+        numbered = _split_number(value)
+        if numbered is not None:
+            self.buffer.append(_NUMBERED)
+            self.write_string(numbered[0])
+            self.write_varint(numbered[1])
+        else:
+            encoded = value.encode()
+            self.buffer.append(_LITERAL)
+            self.write_varint(len(encoded))
+            self.buffer += encoded
+        self.strings[value] = len(self.strings)
+
+    def write_value(self, value: Any, depth: int) -> None:
+        if depth > MAX_NESTING:
+            raise FleetCodecError("Fleet message nested too deeply")
+        buffer = self.buffer
+        if value is None:
+            buffer.append(_NONE)
+        elif value is True:
+            buffer.append(_TRUE)
+        elif value is False:
+            buffer.append(_FALSE)
+        elif isinstance(value, int):
+            if value >= 0:
+                buffer.append(_UINT)
+                self.write_varint(value)
+            else:
+                buffer.append(_NEGATIVE_INT)
+                self.write_varint(-value - 1)
+        elif isinstance(value, float):
+            try:
+                packed = _FLOAT32_STRUCT.pack(value)
+            except OverflowError:
+                packed = b""
+            if packed and _FLOAT32_STRUCT.unpack(packed)[0] == value:
+                buffer.append(_FLOAT32)
+                buffer += packed
+            else:
+                buffer.append(_FLOAT64)
+                buffer += _FLOAT64_STRUCT.pack(value)
+        elif isinstance(value, str):
+            buffer.append(_STRING)
+            self.write_string(value)
+        elif isinstance(value, bytes | bytearray):
+            buffer.append(_BYTES)
+            self.write_varint(len(value))
+            buffer += value
+        elif isinstance(value, list | tuple):
+            buffer.append(_LIST)
+            self.write_varint(len(value))
+            for item in value:
+                self.write_value(item, depth + 1)
+        elif isinstance(value, dict):
+            buffer.append(_DICT)
+            self.write_varint(len(value))
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    raise FleetCodecError(f"Cannot encode dict key of type {type(key).__name__}")
+                self.write_string(key)
+                self.write_value(item, depth + 1)
+        else:
+            raise FleetCodecError(f"Cannot encode value of type {type(value).__name__}")
+
+
+class _Reader:
+    """Decoder state: input body, read position and interned strings."""
+
+    __slots__ = ("data", "position", "strings")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.position = 0
+        self.strings: list[str] = list(_STATIC_STRINGS)
+
+    def read_byte(self) -> int:
+        value = self.data[self.position]
+        self.position += 1
+        return value
+
+    def read_varint(self) -> int:
+        data = self.data
+        result = 0
+        shift = 0
+        while True:
+            byte = data[self.position]
+            self.position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+            if shift == 63:
+                # Tenth byte: only bit 63 is left, and it must end the varint
+                byte = data[self.position]
+                self.position += 1
+                if byte > 1:
+                    raise FleetCodecError("Varint too long")
+                return result | (byte << 63)
+
+    def read_bytes(self, length: int) -> bytes:
+        end = self.position + length
+        if end > len(self.data):
+            raise IndexError("read past end")
+        value = self.data[self.position : end]
+        self.position = end
+        return value
+
+    def read_string(self) -> str:
+        head = self.read_varint()
+        if head >= 2:
+            try:
+                return self.strings[head - 2]
+            except IndexError:
+                raise FleetCodecError(f"Invalid string reference {head - 2}") from None
+
+        if head == _NUMBERED:
+            value = self.read_string() + str(self.read_varint())
+        else:
+            try:
+                value = self.read_bytes(self.read_varint()).decode()
+            except UnicodeDecodeError as e:
+                raise FleetCodecError(f"Invalid UTF-8 string: {e}") from e
+        self.strings.append(value)
+        return value
+
+    def read_value(self, depth: int) -> Any:
+        if depth > MAX_NESTING:
+            raise FleetCodecError("Fleet message nested too deeply")
+        tag = self.read_byte()
+        if tag == _NONE:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _UINT:
+            return self.read_varint()
+        if tag == _NEGATIVE_INT:
+            return -self.read_varint() - 1
+        if tag == _FLOAT32:
+            return _FLOAT32_STRUCT.unpack(self.read_bytes(4))[0]
+        if tag == _FLOAT64:
+            return _FLOAT64_STRUCT.unpack(self.read_bytes(8))[0]
+        if tag == _STRING:
+            return self.read_string()
+        if tag == _BYTES:
+            return self.read_bytes(self.read_varint())
+        if tag == _LIST:
+            return [self.read_value(depth + 1) for _ in range(self.read_varint())]
+        if tag == _DICT:
+            result = {}
+            for _ in range(self.read_varint()):
+                key = self.read_string()
+                result[key] = self.read_value(depth + 1)
+            return result
+        raise FleetCodecError(f"Unknown value tag {tag}")
+
+
+def j1939_frames(
+    pgn: int,
+    data: bytes,
+    source_address: int,
+    destination_address: int = 0xFF,
+    priority: int = 6,
+) -> list[can.Message]:
+    """Split a message into J1939 frames, using TP or ETP when it exceeds 8 bytes.
+
+    Broadcasts of up to 1785 bytes use TP BAM, destination-specific
+    messages TP RTS/CTS, and destination-specific messages beyond that
+    ETP. Frames are returned in transmission order; with RTS/CTS the
+    sender paces the data frames by the responder's CTS.
+
+    Parameters
+    ----------
+    pgn : int
+        Parameter Group Number of the message
+    data : bytes
+        Message data
+    source_address : int
+        Sender address
+    destination_address : int, default 0xFF
+        Destination address (0xFF for broadcast)
+    priority : int, default 6
+        J1939 priority (0-7) of the frames
+
+    Returns
+    -------
+    list[can.Message]
+        Extended CAN frames
+
+    Raises
+    ------
+    FleetCodecError
+        If the message is too large for the transport (ETP cannot broadcast),
+        or the PGN is PDU1 (PDU format below 240) with a non-zero low byte,
+        which a single frame cannot carry as that byte is the destination
+    """
+    if (pgn >> 8) & 0xFF < 240 and pgn & 0xFF:
+        raise FleetCodecError(f"PDU1 PGN {pgn:04X} must have a zero destination byte")
+
+    size = len(data)
+    if size <= 8:
+        return [_frame(pgn, priority, source_address, destination_address, data)]
+
+    pgn_bytes = pgn.to_bytes(3, "little")
+    frames: list[can.Message] = []
+
+    if size <= TP_MAX_SIZE:
+        packets = (size + 6) // 7
+        control = TP_BAM if destination_address == 0xFF else TP_RTS
+        frames.append(
+            _frame(
+                TP_CM_PGN,
+                priority,
+                source_address,
+                destination_address,
+                bytes((control, size & 0xFF, size >> 8, packets, 0xFF)) + pgn_bytes,
+            )
+        )
+        frames.extend(
+            _frame(
+                TP_DT_PGN,
+                priority,
+                source_address,
+                destination_address,
+                bytes((sequence,)) + _packet(data, sequence - 1),
+            )
+            for sequence in range(1, packets + 1)
+        )
+        return frames
+
+    if destination_address == 0xFF:
+        raise FleetCodecError(f"Broadcast of {size} bytes exceeds the TP limit of {TP_MAX_SIZE}")
+    if size > ETP_MAX_SIZE:
+        raise FleetCodecError(f"Message of {size} bytes exceeds the ETP limit of {ETP_MAX_SIZE}")
+
+    packets = (size + 6) // 7
+    frames.append(
+        _frame(
+            ETP_CM_PGN,
+            priority,
+            source_address,
+            destination_address,
+            bytes((ETP_RTS,)) + size.to_bytes(4, "little") + pgn_bytes,
+        )
+    )
+    for offset in range(0, packets, 255):
+        count = min(255, packets - offset)
+        frames.append(
+            _frame(
+                ETP_CM_PGN,
+                priority,
+                source_address,
+                destination_address,
+                bytes((ETP_DPO, count)) + offset.to_bytes(3, "little") + pgn_bytes,
+            )
+        )
+        frames.extend(
+            _frame(
+                ETP_DT_PGN,
+                priority,
+                source_address,
+                destination_address,
+                bytes((sequence,)) + _packet(data, offset + sequence - 1),
+            )
+            for sequence in range(1, count + 1)
+        )
+    return frames
+
+
+def _packet(data: bytes, index: int) -> bytes:
+    """Return the 7 data bytes of a transport packet, padded with 0xFF."""
+    chunk = data[index * 7 : index * 7 + 7]
+    return chunk + b"\xff" * (7 - len(chunk))
+
+
+def _frame(
+    pgn: int, priority: int, source_address: int, destination_address: int, data: bytes
+) -> can.Message:
+    """Build an extended J1939 frame."""
+    pdu_format = (pgn >> 8) & 0xFF
+    pdu_specific = pgn & 0xFF if pdu_format >= 240 else destination_address
+    arbitration_id = (
+        (priority << 26)
+        | (((pgn >> 16) & 0x01) << 24)
+        | (pdu_format << 16)
+        | (pdu_specific << 8)
+        | source_address
+    )
+    return can.Message(arbitration_id=arbitration_id, data=data, is_extended_id=True)
+
+
+@dataclass(frozen=True, slots=True)
+class TransportedMessage:
+    """A message received in one frame or reassembled from TP/ETP frames."""
+
+    pgn: int
+    source_address: int
+    destination_address: int
+    data: bytes
+
+
+class _ExtendedTransportSession:
+    """Reassembly state of one ETP connection."""
+
+    __slots__ = ("pgn", "data_buffer", "total_packets", "packet_offset", "next_sequence", "count")
+
+    def __init__(self, pgn: int, total_size: int) -> None:
+        self.pgn = pgn
+        self.data_buffer = bytearray(total_size)
+        self.total_packets = (total_size + 6) // 7
+        self.packet_offset = 0  # Packets received before the current DPO block
+        self.next_sequence = 1
+        self.count = 0  # Packets announced by the current DPO
+
+
+class FleetTransportReceiver:
+    """Reassembles J1939 frames into complete messages.
+
+    TP (BAM and RTS/CTS) is handled by the codec's
+    ``TransportProtocolReassembler``; ETP connections are reassembled here,
+    with at most ``max_sessions`` sessions of at most ``max_message_size``
+    bytes so bogus announcements cannot grow memory.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 32,
+        max_message_size: int = MAX_DECODED_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the receiver.
+
+        Parameters
+        ----------
+        max_sessions : int, default 32
+            Maximum concurrent TP and ETP sessions (each)
+        max_message_size : int, default 1 MiB
+            Largest ETP message accepted
+        clock : Callable[[], float], default time.monotonic
+            Monotonic time source for TP timeouts
+        """
+        self.max_sessions = max_sessions
+        self.max_message_size = max_message_size
+        self.transport = TransportProtocolReassembler(max_sessions, clock)
+        self._extended: dict[tuple[int, int], _ExtendedTransportSession] = {}
+
+    def feed(self, frame: can.Message) -> TransportedMessage | None:
+        """Process one received frame.
+
+        Parameters
+        ----------
+        frame : can.Message
+            Extended J1939 frame
+
+        Returns
+        -------
+        TransportedMessage | None
+            The message the frame completes, or None
+        """
+        if not frame.is_extended_id:
+            return None
+        can_id = frame.arbitration_id
+        pdu_format = (can_id >> 16) & 0xFF
+        pdu_specific = (can_id >> 8) & 0xFF
+        source_address = can_id & 0xFF
+        destination_address = pdu_specific if pdu_format < 240 else 0xFF
+        data = frame.data
+
+        if pdu_format == TP_CM_PDU_FORMAT:
+            self.transport.handle_connection_management(data, source_address, destination_address)
+            return None
+        if pdu_format == TP_DT_PDU_FORMAT:
+            session = self.transport.handle_data_transfer(data, source_address, destination_address)
+            if session is None:
+                return None
+            return TransportedMessage(
+                session.pgn,
+                session.source_address,
+                session.destination_address,
+                bytes(session.data_buffer),
+            )
+        if pdu_format == ETP_CM_PGN >> 8:
+            self._handle_extended_connection_management(data, source_address, destination_address)
+            return None
+        if pdu_format == ETP_DT_PGN >> 8:
+            return self._handle_extended_data_transfer(data, source_address, destination_address)
+
+        pgn = (((can_id >> 24) & 0x01) << 16) | (pdu_format << 8)
+        if pdu_format >= 240:
+            pgn |= pdu_specific
+        return TransportedMessage(pgn, source_address, destination_address, bytes(data))
+
+    def _handle_extended_connection_management(
+        self, data: bytes | bytearray, source_address: int, destination_address: int
+    ) -> None:
+        """Process an ETP.CM frame (RTS or DPO; CTS and aborts end nothing here)."""
+        if len(data) < 8:
+            return
+        key = (source_address, destination_address)
+        control = data[0]
+        pgn = data[5] | (data[6] << 8) | (data[7] << 16)
+
+        if control == ETP_RTS:
+            total_size = int.from_bytes(data[1:5], "little")
+            if not TP_MAX_SIZE < total_size <= min(ETP_MAX_SIZE, self.max_message_size):
+                logger.debug(f"Rejected ETP RTS of {total_size} bytes from {source_address:02X}")
+                return
+            if key not in self._extended and len(self._extended) >= self.max_sessions:
+                logger.warning(f"ETP session table full, rejecting PGN {pgn:04X}")
+                return
+            self._extended[key] = _ExtendedTransportSession(pgn, total_size)
+
+        elif control == ETP_DPO:
+            session = self._extended.get(key)
+            if session is None or session.pgn != pgn:
+                return
+            offset = data[2] | (data[3] << 8) | (data[4] << 16)
+            received = session.packet_offset + session.next_sequence - 1
+            if offset != received or offset + data[1] > session.total_packets:
+                # Out-of-order data cannot be recovered without CTS retransmission
+                del self._extended[key]
+                return
+            session.packet_offset = offset
+            session.next_sequence = 1
+            session.count = data[1]
+
+    def _handle_extended_data_transfer(
+        self, data: bytes | bytearray, source_address: int, destination_address: int
+    ) -> TransportedMessage | None:
+        """Process an ETP.DT frame."""
+        key = (source_address, destination_address)
+        session = self._extended.get(key)
+        if session is None or len(data) < 2:
+            return None
+        if data[0] != session.next_sequence or data[0] > session.count:
+            del self._extended[key]
+            return None
+
+        offset = (session.packet_offset + data[0] - 1) * 7
+        chunk_length = min(7, len(session.data_buffer) - offset)
+        session.data_buffer[offset : offset + chunk_length] = data[1 : 1 + chunk_length]
+        session.next_sequence += 1
+
+        if session.packet_offset + session.next_sequence - 1 < session.total_packets:
+            return None
+        del self._extended[key]
+        return TransportedMessage(
+            session.pgn, source_address, destination_address, bytes(session.data_buffer)
+        )
@@ -117,6 +117,9 @@ class CANMessageCallback(Protocol):
 class PhysicalCANInterface(ABC):
     """Abstract base class for physical CAN interfaces."""
 
+    # Frames dispatched per reception pass before yielding to the event loop
+    RECEPTION_BATCH_SIZE = 64
+
     def __init__(
         self,
         interface_id: str,
@@ -262,6 +265,76 @@ class PhysicalCANInterface(ABC):
                 logger.warning(f"Heartbeat error for {self.interface_id}: {e}")
                 await asyncio.sleep(5.0)
 
+    def _create_reception_reader(self, bus: can.BusABC) -> can.AsyncBufferedReader:
+        """Attach an asyncio-aware listener to the connected bus.
+
+        The notifier is bound to the running event loop: buses exposing a
+        file descriptor (SocketCAN) are read via ``loop.add_reader``, other
+        buses use python-can's reader thread, which hands frames to the
+        loop with ``call_soon_threadsafe``. Neither path blocks the loop.
+
+        Parameters
+        ----------
+        bus : can.BusABC
+            Bus just opened by ``connect``
+
+        Returns
+        -------
+        can.AsyncBufferedReader
+            Listener whose queue feeds the message reception loop
+        """
+        reader = can.AsyncBufferedReader()
+        self._listeners.append(reader)
+        self._notifier = can.Notifier(bus, [reader], loop=asyncio.get_running_loop())
+        return reader
+
+    async def _message_reception_loop(self, reader: can.AsyncBufferedReader) -> None:
+        """Background task for receiving messages.
+
+        Waits for the next frame without blocking the event loop, then drains
+        up to ``RECEPTION_BATCH_SIZE`` already-queued frames before yielding,
+        so a saturated bus cannot starve other tasks. An unexpected error
+        is reported and moves the interface to the error state, so the
+        failure is visible to health checks instead of ending the task
+        silently.
+
+        Parameters
+        ----------
+        reader : can.AsyncBufferedReader
+            Listener attached to the bus notifier
+        """
+        queue: asyncio.Queue[can.Message] = reader.buffer
+        while self._state == InterfaceState.CONNECTED:
+            try:
+                message = await reader.get_message()
+                self._handle_received_message(message)
+
+                for _ in range(self.RECEPTION_BATCH_SIZE - 1):
+                    try:
+                        message = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    self._handle_received_message(message)
+
+                # Yield after each batch so a busy bus cannot starve other tasks
+                await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                break
+            except can.CanError as e:
+                self.error_handler.handle_error(
+                    CANErrorType.DATA_CORRUPTION,
+                    f"Message reception error: {e}",
+                )
+            except Exception as e:
+                logger.exception(f"Message reception failed on {self.interface_id}: {e}")
+                self._state = InterfaceState.ERROR
+                self._status.state = self._state
+                self.error_handler.handle_error(
+                    CANErrorType.DATA_CORRUPTION,
+                    f"Message reception failed: {e}",
+                    metadata={"channel": self.config.channel},
+                )
+
     def _handle_received_message(self, message: can.Message) -> None:
         """Handle received CAN message.
 
@@ -307,10 +380,8 @@ class SocketCANInterface(PhysicalCANInterface):
                     can_filters=None,  # Accept all messages initially
                 )
 
-                # Set up message listener
-                listener: can.BufferedReader = can.BufferedReader()
-                self._listeners.append(listener)
-                self._notifier = can.Notifier(self._bus, [listener])
+                # Set up non-blocking message listener
+                reader = self._create_reception_reader(self._bus)
 
                 # Start heartbeat monitoring
                 self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
@@ -322,7 +393,7 @@ class SocketCANInterface(PhysicalCANInterface):
 
                 # Start message reception task
                 self._message_reception_task = asyncio.create_task(
-                    self._message_reception_loop(listener)
+                    self._message_reception_loop(reader)
                 )
 
                 return True
@@ -402,22 +473,6 @@ class SocketCANInterface(PhysicalCANInterface):
             "driver": "socketcan",
         }
 
-    async def _message_reception_loop(self, listener: can.BufferedReader) -> None:
-        """Background task for receiving messages."""
-        while self._state == InterfaceState.CONNECTED:
-            try:
-                message: can.Message | None = listener.get_message(timeout=1.0)
-                if message:
-                    self._handle_received_message(message)
-            except can.CanError as e:
-                self.error_handler.handle_error(
-                    CANErrorType.DATA_CORRUPTION,
-                    f"Message reception error: {e}",
-                )
-            except Exception:
-                # Timeout or other non-critical error
-                continue
-
 
 class VirtualCANInterface(PhysicalCANInterface):
     """Virtual CAN interface implementation for testing and simulation."""
@@ -441,10 +496,8 @@ class VirtualCANInterface(PhysicalCANInterface):
                     can_filters=None,  # Accept all messages initially
                 )
 
-                # Set up message listener
-                listener: can.BufferedReader = can.BufferedReader()
-                self._listeners.append(listener)
-                self._notifier = can.Notifier(self._bus, [listener])
+                # Set up non-blocking message listener
+                reader = self._create_reception_reader(self._bus)
 
                 # Start heartbeat monitoring
                 self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
@@ -456,7 +509,7 @@ class VirtualCANInterface(PhysicalCANInterface):
 
                 # Start message reception task
                 self._message_reception_task = asyncio.create_task(
-                    self._message_reception_loop(listener)
+                    self._message_reception_loop(reader)
                 )
 
                 return True
@@ -535,22 +588,6 @@ class VirtualCANInterface(PhysicalCANInterface):
             "driver": "python-can-virtual",
         }
 
-    async def _message_reception_loop(self, listener: can.BufferedReader) -> None:
-        """Background task for receiving messages."""
-        while self._state == InterfaceState.CONNECTED:
-            try:
-                message: can.Message | None = listener.get_message(timeout=1.0)
-                if message:
-                    self._handle_received_message(message)
-            except can.CanError as e:
-                self.error_handler.handle_error(
-                    CANErrorType.DATA_CORRUPTION,
-                    f"Message reception error: {e}",
-                )
-            except Exception:
-                # Timeout or other non-critical error
-                continue
-
 
 class PhysicalCANManager:
     """Manages multiple physical CAN interfaces for tractor connectivity."""
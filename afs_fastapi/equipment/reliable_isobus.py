@@ -17,12 +17,28 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
+import can
+
 from afs_fastapi.equipment.farm_tractors import ISOBUSMessage
+from afs_fastapi.equipment.fleet_wire_codec import (
+    FleetCodecError,
+    FleetTransportReceiver,
+    decode_fleet_message,
+    encode_fleet_message,
+    j1939_frames,
+)
 
 # Configure logging for agricultural ISOBUS operations
 logger = logging.getLogger(__name__)
 
 
+# Fleet coordination PGNs: broadcast, emergency broadcast and direct messages.
+# They are PDU1, whose low byte carries the destination on the bus, so all
+# three travel as FLEET_TRANSPORT_PGN and the message type tells them apart.
+FLEET_PGNS = frozenset({0xE000, 0xE001, 0xE002})
+FLEET_TRANSPORT_PGN = 0xE000
+
+
 # Agricultural priority constants for safety-critical operations
 class ISOBUSPriority:
     """ISOBUS message priority levels for agricultural operations."""
@@ -360,6 +376,7 @@ class ReliableISOBUSDevice:
         self._outbound_queue: list[ReliableISOBUSMessage] = []
         self._inbound_queue: list[ReliableISOBUSMessage] = []
         self._received_message_ids: set[str] = set()
+        self._transport_receiver = FleetTransportReceiver()
 
     def send_reliable_message(
         self,
@@ -524,7 +541,7 @@ class ReliableISOBUSDevice:
             pgn=0xE000,  # Fleet coordination PGN
             source_address=self.device_address,
             destination_address=0xFF,  # Broadcast
-            data=str(message).encode(),
+            data=encode_fleet_message(message),
             timestamp=datetime.now(),
         )
 
@@ -550,7 +567,7 @@ class ReliableISOBUSDevice:
             pgn=0xE001,  # Emergency broadcast PGN
             source_address=self.device_address,
             destination_address=0xFF,  # Broadcast
-            data=str(message).encode(),
+            data=encode_fleet_message(message),
             timestamp=datetime.now(),
         )
 
@@ -580,7 +597,7 @@ class ReliableISOBUSDevice:
             pgn=0xE002,  # Direct message PGN
             source_address=self.device_address,
             destination_address=target_address,
-            data=str(message).encode(),
+            data=encode_fleet_message(message),
             timestamp=datetime.now(),
         )
 
@@ -588,3 +605,59 @@ class ReliableISOBUSDevice:
         self.send_reliable_message(
             isobus_msg, priority=ISOBUSPriority.FIELD_COORDINATION, requires_ack=True
         )
+
+    def transport_frames(self, message: ReliableISOBUSMessage) -> list[can.Message]:
+        """Split a queued message into J1939 frames for transmission.
+
+        Messages longer than 8 bytes use TP (BAM for broadcasts, RTS/CTS
+        otherwise) or, beyond 1785 bytes, ETP. Fleet coordination messages
+        are sent as ``FLEET_TRANSPORT_PGN``.
+
+        Parameters
+        ----------
+        message : ReliableISOBUSMessage
+            Message from the outbound queue.
+
+        Returns
+        -------
+        list[can.Message]
+            Frames in transmission order.
+        """
+        base = message.base_message
+        return j1939_frames(
+            FLEET_TRANSPORT_PGN if base.pgn in FLEET_PGNS else base.pgn,
+            bytes(base.data),
+            base.source_address,
+            base.destination_address,
+            priority=min(message.priority, 7),
+        )
+
+    def receive_frame(self, frame: can.Message) -> dict[str, Any] | None:
+        """Receive one J1939 frame of a fleet coordination message.
+
+        Parameters
+        ----------
+        frame : can.Message
+            Received frame.
+
+        Returns
+        -------
+        dict | None
+            The decoded fleet message once the frame completes one addressed
+            to this device or broadcast, otherwise None.
+        """
+        transported = self._transport_receiver.feed(frame)
+        if (
+            transported is None
+            or transported.pgn != FLEET_TRANSPORT_PGN
+            or transported.destination_address not in (self.device_address, 0xFF)
+        ):
+            return None
+
+        try:
+            return decode_fleet_message(transported.data)
+        except FleetCodecError as e:
+            logger.warning(
+                f"Dropped malformed fleet message from {transported.source_address:02X}: {e}"
+            )
+            return None
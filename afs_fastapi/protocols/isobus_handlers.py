@@ -12,8 +12,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import struct
 import time
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -104,6 +106,52 @@ class TPSession:
     complete: bool = False
 
 
+class _SessionTable(dict[str, TPSession]):
+    """Session table that counts its mutations.
+
+    The handler compares ``version`` with the version it last indexed, so
+    sessions added or removed directly in ``active_sessions`` are noticed in
+    O(1) instead of by comparing key sets on every packet.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.version = 0
+
+    def __setitem__(self, key: str, value: TPSession) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other: Any) -> _SessionTable:  # type: ignore[override,misc]
+        super().__ior__(other)
+        self.version += 1
+        return self
+
+    def pop(self, key: str, *default: Any) -> Any:
+        self.version += 1
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[str, TPSession]:
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(self, key: str, default: TPSession) -> TPSession:
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: TPSession) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+
 @dataclass
 class TaskControllerObject:
     """Task Controller object definition."""
@@ -323,7 +371,16 @@ class AddressClaimHandler:
 class TransportProtocolHandler:
     """Handles ISOBUS Transport Protocol for multi-frame messages."""
 
-    def __init__(self, codec: CANFrameCodec, error_handler: CANErrorHandler) -> None:
+    # Hashed timer wheel used for session expiry
+    _WHEEL_SLOTS = 64
+    _WHEEL_RESOLUTION = 1.0  # seconds per slot
+
+    def __init__(
+        self,
+        codec: CANFrameCodec,
+        error_handler: CANErrorHandler,
+        completed_history: int = 100,
+    ) -> None:
         """Initialize transport protocol handler.
 
         Parameters
@@ -332,18 +389,33 @@ class TransportProtocolHandler:
             CAN frame codec
         error_handler : CANErrorHandler
             Error handling system
+        completed_history : int, default 100
+            Number of completed payloads kept in ``completed_messages``
+            (0 for callback-only mode)
         """
         self.codec = codec
         self.error_handler = error_handler
 
-        self.active_sessions: dict[str, TPSession] = {}  # session_id -> session
-        self.completed_messages: list[tuple[int, bytes, datetime]] = []  # (pgn, data, timestamp)
+        self.active_sessions: _SessionTable = _SessionTable()  # session_id -> session
+        self.completed_messages: deque[tuple[int, bytes, datetime]] = deque(
+            maxlen=completed_history
+        )  # (pgn, data, timestamp)
 
         self._message_callbacks: list[Callable[[int, bytes, int], None]] = (
             []
         )  # (pgn, data, source_address)
         self._session_timeout = 30.0  # seconds
 
+        # Session indexes for O(1) TP.DT lookup
+        self._connection_index: dict[tuple[int, int], str] = {}  # (source, destination)
+        self._bam_index: dict[int, str] = {}  # source -> BAM session
+        self._indexed_sessions: set[str] = set()
+        self._indexed_version = self.active_sessions.version
+
+        # Expiry timer wheel: slot -> session ids due in that slot
+        self._expiry_wheel: list[set[str]] = [set() for _ in range(self._WHEEL_SLOTS)]
+        self._wheel_tick = self._current_tick(time.time())
+
     def add_message_callback(self, callback: Callable[[int, bytes, int], None]) -> None:
         """Add callback for completed multi-frame messages.
 
@@ -395,7 +467,7 @@ class TransportProtocolHandler:
                     data_buffer=bytearray(total_size),
                 )
 
-                self.active_sessions[session_id] = session
+                self._add_session(session)
                 logger.debug(f"TP RTS: PGN={pgn:04X}, size={total_size}, packets={total_packets}")
 
                 # Send CTS response (simplified - send all packets)
@@ -423,7 +495,7 @@ class TransportProtocolHandler:
                     is_bam=True,
                 )
 
-                self.active_sessions[session_id] = session
+                self._add_session(session)
                 logger.debug(f"TP BAM: PGN={pgn:04X}, size={total_size}, packets={total_packets}")
                 return session_id
 
@@ -435,8 +507,7 @@ class TransportProtocolHandler:
                 # Connection abort
                 pgn = struct.unpack("<I", message.data[5:8] + b"\x00")[0]
                 session_id = f"{source_address:02X}_{destination_address:02X}_{pgn:04X}"
-                if session_id in self.active_sessions:
-                    del self.active_sessions[session_id]
+                self._remove_session(session_id)
                 logger.warning(f"TP session aborted: {session_id}")
 
             return None
@@ -468,13 +539,7 @@ class TransportProtocolHandler:
             destination_address = (message.arbitration_id >> 8) & 0xFF
 
             # Find matching session
-            session = None
-            for sess in self.active_sessions.values():
-                if sess.source_address == source_address and (
-                    sess.destination_address == destination_address or sess.is_bam
-                ):
-                    session = sess
-                    break
+            session = self._find_session(source_address, destination_address)
 
             if not session:
                 logger.warning(f"No TP session found for data from {source_address:02X}")
@@ -512,7 +577,7 @@ class TransportProtocolHandler:
                         logger.error(f"TP message callback error: {e}")
 
                 # Clean up session
-                del self.active_sessions[session.session_id]
+                self._remove_session(session.session_id)
 
                 # Store in completed messages
                 self.completed_messages.append((session.pgn, completed_data, datetime.now()))
@@ -560,17 +625,143 @@ class TransportProtocolHandler:
         return can.Message(arbitration_id=can_id, data=bytes(data), is_extended_id=True)
 
     async def cleanup_expired_sessions(self) -> None:
-        """Clean up expired TP sessions."""
-        current_time = datetime.now()
-        expired_sessions = []
+        """Clean up expired TP sessions.
 
-        for session_id, session in self.active_sessions.items():
-            if (current_time - session.last_packet_time).total_seconds() > self._session_timeout:
-                expired_sessions.append(session_id)
+        Only the timer-wheel slots that came due since the previous call are
+        visited. Sessions whose deadline moved (new packets arrived) are
+        rescheduled instead of expired.
+        """
+        self._index_external_sessions()
+
+        now = time.time()
+        now_tick = self._current_tick(now)
+        # The current cursor slot is revisited so overdue sessions added since
+        # the previous pass are expired without waiting for the next tick
+        due_ticks = min(now_tick - self._wheel_tick + 1, self._WHEEL_SLOTS)
+
+        for tick in range(now_tick - due_ticks + 1, now_tick + 1):
+            slot = tick % self._WHEEL_SLOTS
+            due_sessions = self._expiry_wheel[slot]
+            self._expiry_wheel[slot] = set()
+
+            for session_id in due_sessions:
+                session = self.active_sessions.get(session_id)
+                if session is None:
+                    continue
+                deadline = session.last_packet_time.timestamp() + self._session_timeout
+                if deadline < now:
+                    logger.warning(f"TP session expired: {session_id}")
+                    self._remove_session(session_id)
+                else:
+                    self._schedule_expiry(session_id, deadline)
+
+        self._wheel_tick = max(self._wheel_tick, now_tick)
+
+    def _current_tick(self, timestamp: float) -> int:
+        """Convert a POSIX timestamp to a timer-wheel tick."""
+        return int(timestamp // self._WHEEL_RESOLUTION)
+
+    def _schedule_expiry(self, session_id: str, deadline: float) -> None:
+        """Place a session in the timer-wheel slot of its deadline.
+
+        Deadlines more than one wheel rotation ahead land in an earlier slot
+        and are simply rescheduled when that slot comes due.
+        """
+        tick = max(
+            math.ceil(deadline / self._WHEEL_RESOLUTION),
+            self._wheel_tick,
+        )
+        self._expiry_wheel[tick % self._WHEEL_SLOTS].add(session_id)
+
+    def _add_session(self, session: TPSession) -> None:
+        """Register a session in the session table, indexes and timer wheel.
+
+        J1939 allows one connection per address pair and one BAM per source,
+        so an announcement on an occupied connection replaces the old session.
+        """
+        self._index_external_sessions()
+        if session.is_bam:
+            previous = self._bam_index.get(session.source_address)
+        else:
+            previous = self._connection_index.get(
+                (session.source_address, session.destination_address)
+            )
+        if previous is not None and previous != session.session_id:
+            self._remove_session(previous)
+
+        self.active_sessions[session.session_id] = session
+        self._index_session(session)
+        self._indexed_version = self.active_sessions.version
+
+    def _index_session(self, session: TPSession) -> None:
+        """Add a session to the lookup indexes and timer wheel."""
+        if session.is_bam:
+            self._bam_index[session.source_address] = session.session_id
+        else:
+            self._connection_index[(session.source_address, session.destination_address)] = (
+                session.session_id
+            )
+        self._indexed_sessions.add(session.session_id)
+        self._schedule_expiry(
+            session.session_id, session.last_packet_time.timestamp() + self._session_timeout
+        )
+
+    def _remove_session(self, session_id: str) -> None:
+        """Remove a session from the session table and lookup indexes."""
+        self._index_external_sessions()
+        session = self.active_sessions.pop(session_id, None)
+        self._indexed_version = self.active_sessions.version
+        self._indexed_sessions.discard(session_id)
+        if session is None:
+            return
+        if session.is_bam:
+            if self._bam_index.get(session.source_address) == session_id:
+                del self._bam_index[session.source_address]
+        else:
+            key = (session.source_address, session.destination_address)
+            if self._connection_index.get(key) == session_id:
+                del self._connection_index[key]
+
+    def _find_session(self, source_address: int, destination_address: int) -> TPSession | None:
+        """Find the session a TP.DT packet belongs to in O(1).
+
+        Parameters
+        ----------
+        source_address : int
+            Source address of the TP.DT packet
+        destination_address : int
+            Destination address of the TP.DT packet
+
+        Returns
+        -------
+        TPSession | None
+            Matching session or None
+        """
+        self._index_external_sessions()
+
+        session_id = self._connection_index.get((source_address, destination_address))
+        if session_id is None:
+            session_id = self._bam_index.get(source_address)
+        if session_id is None:
+            return None
+        return self.active_sessions.get(session_id)
+
+    def _index_external_sessions(self) -> None:
+        """Rebuild the indexes after direct changes to ``active_sessions``.
+
+        Changes made through ``_add_session`` and ``_remove_session`` keep the
+        indexes current, so this is a version check on every packet and a
+        rebuild only after sessions were added, replaced or deleted directly.
+        """
+        if self.active_sessions.version == self._indexed_version:
+            return
 
-        for session_id in expired_sessions:
-            logger.warning(f"TP session expired: {session_id}")
-            del self.active_sessions[session_id]
+        self._bam_index = {}
+        self._connection_index = {}
+        self._indexed_sessions = set()
+        for session in self.active_sessions.values():
+            self._index_session(session)
+        self._indexed_version = self.active_sessions.version
 
 
 class DiagnosticHandler:
@@ -20,6 +20,8 @@ from dataclasses import dataclass
 from enum import IntEnum
 from typing import Any
 
+from afs_fastapi.core.j1939_registry import get_default_registry
+
 
 class J1939Priority(IntEnum):
     """J1939 message priority levels for agricultural equipment."""
@@ -243,12 +245,11 @@ class J1939PGNParser:
 
     def __init__(self) -> None:
         """Initialize PGN parser with agricultural message definitions."""
+        # PGN names come from the shared J1939 registry
         self.pgn_definitions = {
-            0xFEEE: "Engine Temperature 1",
-            0xF004: "Electronic Engine Controller 1",
-            0xFEF3: "Vehicle Position",
-            0xAC00: "Agricultural Guidance System",  # Custom agricultural PGN
+            pgn: pgn_def.name for pgn, pgn_def in get_default_registry().pgn_definitions.items()
         }
+        self.pgn_definitions[0xAC00] = "Agricultural Guidance System"  # Custom agricultural PGN
 
     def parse_pgn(self, pgn: int, data: bytes) -> ParsedPGNData:
         """
@@ -17,6 +17,7 @@ from typing import Any
 
 import can
 
+from afs_fastapi.core.can_frame_codec import CANFrameEnvelope
 from afs_fastapi.protocols.sae_j1939 import J1939DTC
 from afs_fastapi.safety.iso25119 import (
     DynamicSafetyMonitor,
@@ -238,12 +239,15 @@ class CrossLayerSafetyValidator:
         for function in safety_functions:
             self.heartbeat_monitor.register_safety_function(function)
 
-    def validate_safety_critical_message(self, message: can.Message) -> SafetyValidationResult:
+    def validate_safety_critical_message(
+        self, message: can.Message | CANFrameEnvelope
+    ) -> SafetyValidationResult:
         """
         Validate safety-critical J1939 message against ISO 25119 requirements.
 
         Args:
-            message: J1939 CAN message to validate
+            message: J1939 CAN message to validate, or its reception envelope
+                (identifier fields are then reused instead of re-parsed)
 
         Returns:
             Safety validation result
@@ -252,7 +256,11 @@ class CrossLayerSafetyValidator:
 
         try:
             # Extract PGN from message
-            pgn = self._extract_pgn(message)
+            if isinstance(message, CANFrameEnvelope):
+                pgn = message.pgn
+                message = message.message
+            else:
+                pgn = self._extract_pgn(message)
 
             # Get safety mapping
             safety_mapping = self.protocol_mapper.get_safety_mapping(pgn)
@@ -14,10 +14,11 @@ from .ai_processing_pipeline import (
     PipelineResult,
     ProcessingStage,
 )
-from .synchronization import VectorClock
+from .synchronization import ProcessIndex, VectorClock
 
 __all__ = [
     "VectorClock",
+    "ProcessIndex",
     "AIProcessingPipeline",
     "AIProcessingManager",
     "ai_processing_manager",
@@ -28,8 +28,22 @@ import math
 from enum import Enum
 from typing import Any
 
+import numpy as np
+import numpy.typing as npt
+
+from afs_fastapi.services.spatial_index import METERS_PER_DEGREE
+
 logger = logging.getLogger(__name__)
 
+# Heading cone (degrees) within which a track counts as moving toward another
+CONVERGING_HEADING_LIMIT = 60.0
+# Closest approach assumed for converging moving tracks, as a fraction of range
+CONVERGING_APPROACH_FACTOR = 0.09
+
+# Slack the vectorized gate adds so it never rejects a pair the detailed check flags
+GATE_ANGLE_TOLERANCE = 1.0  # degrees
+GATE_DISTANCE_TOLERANCE = 1.01
+
 
 class CollisionRisk(Enum):
     """Risk levels for collision threats in agricultural operations."""
@@ -585,6 +599,28 @@ class CollisionAvoidanceSystem:
         equipment dimensions, and field boundaries to prevent false alarms
         while ensuring comprehensive safety coverage.
         """
+        threat = self._assess_collision_threat(
+            own_position, own_velocity, other_position, other_velocity, prediction_horizon
+        )
+
+        if threat.collision_detected:
+            logger.warning(
+                f"Collision threat detected: risk={threat.risk_level.value}, "
+                f"distance={threat.closest_approach_distance:.1f}m, "
+                f"time={threat.time_to_collision:.1f}s"
+            )
+
+        return threat
+
+    def _assess_collision_threat(
+        self,
+        own_position: PositionVector,
+        own_velocity: VelocityVector,
+        other_position: PositionVector,
+        other_velocity: VelocityVector,
+        prediction_horizon: float,
+    ) -> CollisionThreat:
+        """Assess a pair for ``detect_collision_threat`` without logging the threat."""
         # Get trajectory predictions for both objects (used for more complex collision detection in REFACTOR phase)
         # own_trajectory = self.predict_trajectory(own_position, own_velocity, prediction_horizon)
         # other_trajectory = self.predict_trajectory(other_position, other_velocity, prediction_horizon)
@@ -612,8 +648,9 @@ class CollisionAvoidanceSystem:
 
             # If both are heading toward collision OR stationary obstacle
             is_converging = (
-                own_direction_diff < 60 and other_direction_diff < 60
-            ) and direction_similarity > 60
+                own_direction_diff < CONVERGING_HEADING_LIMIT
+                and other_direction_diff < CONVERGING_HEADING_LIMIT
+            ) and direction_similarity > CONVERGING_HEADING_LIMIT
             is_stationary_obstacle = other_velocity.speed == 0 and own_direction_diff < 45
 
             if is_converging or is_stationary_obstacle:
@@ -630,7 +667,7 @@ class CollisionAvoidanceSystem:
                         closest_time = current_distance / max(own_velocity.speed, 1.0)
                 else:
                     # Both moving - converging scenario
-                    closest_distance = current_distance * 0.09  # Slightly smaller factor
+                    closest_distance = current_distance * CONVERGING_APPROACH_FACTOR
                     closest_time = current_distance / max(
                         own_velocity.speed + other_velocity.speed, 1.0
                     )
@@ -645,13 +682,13 @@ class CollisionAvoidanceSystem:
         # Determine collision risk based on scenario type
         if other_velocity.speed == 0:
             # Stationary obstacle - use larger detection range
-            collision_threshold = max(self.base_safety_radius * 5, 100.0)
+            collision_threshold = self._stationary_threshold()
         elif abs(own_velocity.direction - other_velocity.direction) < 30:
             # Parallel movement - use much smaller threshold to avoid false positives
             collision_threshold = max(self.base_safety_radius * 2, 20.0)
         else:
             # Converging or diverging - use moderate threshold
-            collision_threshold = max(self.base_safety_radius * 3, 60.0)
+            collision_threshold = self._converging_threshold()
 
         collision_detected = closest_distance < collision_threshold
 
@@ -674,7 +711,7 @@ class CollisionAvoidanceSystem:
         else:
             risk_level = CollisionRisk.LOW
 
-        threat = CollisionThreat(
+        return CollisionThreat(
             collision_detected=collision_detected,
             time_to_collision=closest_time,
             closest_approach_distance=closest_distance,
@@ -683,14 +720,6 @@ class CollisionAvoidanceSystem:
             relative_bearing=relative_bearing,
         )
 
-        if collision_detected:
-            logger.warning(
-                f"Collision threat detected: risk={risk_level.value}, "
-                f"distance={closest_distance:.1f}m, time={closest_time:.1f}s"
-            )
-
-        return threat
-
     async def generate_avoidance_action(
         self, threat: CollisionThreat, own_tractor_id: str, other_tractor_id: str
     ) -> CollisionAvoidanceAction:
@@ -858,33 +887,31 @@ class CollisionAvoidanceSystem:
         Multi-tractor coordination prevents excessive safety zone overlap
         while maintaining required safety margins for agricultural operations.
         """
-        coordinated_zones = {}
-
-        for state in tractor_states:
-            tractor_id = state["id"]
-            position = state["position"]
-            velocity = state["velocity"]
-            status = state["status"]
-
-            # Calculate base zone
-            base_zone = self.calculate_dynamic_safety_zone(position, velocity, status)
+        coordinated_zones: dict[str, DynamicSafetyZone] = {}
+        if not tractor_states:
+            return coordinated_zones
 
-            # Check for overlaps with other tractors and adjust
-            overlap_adjustment = 1.0
-            coordination_applied = False
+        base_zones = [
+            self.calculate_dynamic_safety_zone(
+                state["position"], state["velocity"], state["status"]
+            )
+            for state in tractor_states
+        ]
 
-            for other_state in tractor_states:
-                if other_state["id"] == tractor_id:
-                    continue
+        # All pairwise distances at once (row i measured from tractor i, as distance_to)
+        distances = self._pairwise_distances([state["position"] for state in tractor_states])
+        tractor_ids = np.array([state["id"] for state in tractor_states], dtype=object)
+        radii = np.array([zone.radius for zone in base_zones])[:, np.newaxis]
 
-                other_position = other_state["position"]
-                distance = position.distance_to(other_position)
+        close = (distances < radii * 2.5) & (tractor_ids[:, np.newaxis] != tractor_ids)
+        # Reduce zone size to prevent excessive overlap with close tractors
+        overlap_factors = np.where(close, np.maximum(0.7, distances / (radii * 3.0)), 1.0)
+        overlap_adjustments = overlap_factors.min(axis=1)
+        coordination_applied = close.any(axis=1)
 
-                if distance < (base_zone.radius * 2.5):  # Close proximity
-                    # Reduce zone size to prevent excessive overlap
-                    overlap_factor = max(0.7, distance / (base_zone.radius * 3.0))
-                    overlap_adjustment = min(overlap_adjustment, overlap_factor)
-                    coordination_applied = True
+        for index, state in enumerate(tractor_states):
+            base_zone = base_zones[index]
+            overlap_adjustment = float(overlap_adjustments[index])
 
             # Apply coordination adjustments
             coordinated_zone = DynamicSafetyZone(
@@ -896,15 +923,213 @@ class CollisionAvoidanceSystem:
                 stopping_distance=base_zone.stopping_distance,
                 expansion_factor=base_zone.expansion_factor * overlap_adjustment,
                 multi_tractor_coordination=True,
-                coordination_adjustment_applied=coordination_applied,
+                coordination_adjustment_applied=bool(coordination_applied[index]),
             )
 
-            coordinated_zones[tractor_id] = coordinated_zone
+            coordinated_zones[state["id"]] = coordinated_zone
 
         logger.debug(f"Multi-tractor safety zones coordinated for {len(tractor_states)} tractors")
 
         return coordinated_zones
 
+    def screen_fleet_collisions(
+        self,
+        tracks: list[dict[str, Any]],
+        prediction_horizon: float = 30.0,
+        screening_distance: float | None = None,
+    ) -> list[tuple[str, str, CollisionThreat]]:
+        """Screen every pair of tracked objects for collision threats.
+
+        Projects all positions into one local east/north frame, computes the
+        closest point of approach (CPA) of every pair of constant-velocity
+        tracks within the prediction horizon in a single vectorized pass,
+        and runs ``detect_collision_threat`` on pairs whose CPA falls within
+        the screening distance. Pairs the detailed check can flag through
+        its heading and current-distance rules are always checked as well,
+        whatever their CPA.
+
+        Parameters
+        ----------
+        tracks : list[dict[str, Any]]
+            Tractors and tracked obstacles, each with "id", "position"
+            (PositionVector) and "velocity" (VelocityVector)
+        prediction_horizon : float, default 30.0
+            Time horizon for the closest approach (seconds)
+        screening_distance : float | None
+            CPA distance below which a pair gets the detailed check; defaults
+            to the largest threshold ``detect_collision_threat`` applies
+
+        Returns
+        -------
+        list[tuple[str, str, CollisionThreat]]
+            (own_id, other_id, threat) for pairs with a detected collision,
+            soonest closest approach first; a moving track is always "own"
+            when paired with a stationary one
+
+        Agricultural Context
+        --------------------
+        With dozens of machines and obstacles in a field, checking every
+        pair in detail each control cycle is too slow; the vectorized screen
+        keeps the full fleet inside the cycle budget while never discarding a
+        pair that ``detect_collision_threat`` would report.
+        """
+        count = len(tracks)
+        if count < 2:
+            return []
+        if screening_distance is None:
+            screening_distance = self._stationary_threshold()
+
+        positions = self._enu_positions([track["position"] for track in tracks])
+        speeds = np.array([track["velocity"].speed for track in tracks], dtype=np.float64)
+        directions = np.radians([track["velocity"].direction for track in tracks])
+        velocities = np.column_stack((speeds * np.sin(directions), speeds * np.cos(directions)))
+
+        # Relative position and velocity of j with respect to i: (n, n, 2)
+        relative_positions = positions[np.newaxis, :, :] - positions[:, np.newaxis, :]
+        relative_velocities = velocities[np.newaxis, :, :] - velocities[:, np.newaxis, :]
+
+        closing = np.einsum("ijk,ijk->ij", relative_positions, relative_velocities)
+        relative_speed_squared = np.einsum("ijk,ijk->ij", relative_velocities, relative_velocities)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cpa_times = np.where(
+                relative_speed_squared > 1e-12, -closing / relative_speed_squared, 0.0
+            )
+        cpa_times = np.clip(cpa_times, 0.0, prediction_horizon)
+        cpa_offsets = relative_positions + relative_velocities * cpa_times[:, :, np.newaxis]
+        cpa_distances = np.sqrt(np.einsum("ijk,ijk->ij", cpa_offsets, cpa_offsets))
+
+        # The detailed check treats a moving track as "own" against a
+        # stationary one, so read its rules from that side of the pair
+        detection_gate = self._detection_gate(tracks, speeds)
+        swap = (speeds[:, np.newaxis] == 0) & (speeds[np.newaxis, :] > 0)
+        detection_gate = np.where(swap, detection_gate.T, detection_gate)
+
+        candidates = (cpa_distances < screening_distance) | detection_gate
+        candidate_i, candidate_j = np.nonzero(np.triu(candidates, k=1))
+        order = np.argsort(cpa_times[candidate_i, candidate_j], kind="stable")
+
+        threats = []
+        for i, j in zip(candidate_i[order].tolist(), candidate_j[order].tolist(), strict=True):
+            own, other = tracks[i], tracks[j]
+            if own["velocity"].speed == 0 and other["velocity"].speed > 0:
+                own, other = other, own
+            threat = self._assess_collision_threat(
+                own["position"],
+                own["velocity"],
+                other["position"],
+                other["velocity"],
+                prediction_horizon,
+            )
+            if threat.collision_detected:
+                threats.append((own["id"], other["id"], threat))
+
+        if threats:
+            own_id, other_id, soonest = threats[0]
+            logger.warning(
+                f"Fleet collision screening: {len(threats)} threats, soonest "
+                f"{own_id}/{other_id} risk={soonest.risk_level.value}, "
+                f"distance={soonest.closest_approach_distance:.1f}m, "
+                f"time={soonest.time_to_collision:.1f}s"
+            )
+        logger.debug(
+            f"Fleet collision screening: {count} tracks, {count * (count - 1) // 2} pairs, "
+            f"{len(candidate_i)} checked in detail, {len(threats)} threats"
+        )
+
+        return threats
+
+    def _detection_gate(
+        self, tracks: list[dict[str, Any]], speeds: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.bool_]:
+        """Pairs ``detect_collision_threat`` may flag with row i as "own", shape (n, n).
+
+        Mirrors the heuristic branches of the detailed check with a small
+        tolerance so that it never rejects a pair the check would report:
+        any pair within the largest detection threshold, a moving track
+        heading toward a stationary one at any distance, and converging
+        moving tracks within the converging threshold over the closest
+        approach factor.
+        """
+        positions = [track["position"] for track in tracks]
+        directions = np.array([track["velocity"].direction for track in tracks], dtype=np.float64)
+        distances = self._pairwise_distances(positions)
+        bearings = self._pairwise_bearings(positions)
+
+        def heading_toward(
+            direction: npt.NDArray[np.float64], bearing: npt.NDArray[np.float64]
+        ) -> npt.NDArray[np.bool_]:
+            # The detailed check compares angles without wrapping, so a bearing
+            # next to 0/360 may land on either side of the wrap there
+            near_wrap = (bearing < GATE_ANGLE_TOLERANCE) | (bearing > 360 - GATE_ANGLE_TOLERANCE)
+            wrapped = np.where(bearing < 180, bearing + 360, bearing - 360)
+            limit = CONVERGING_HEADING_LIMIT + GATE_ANGLE_TOLERANCE
+            return (np.abs(direction - bearing) < limit) | (
+                near_wrap & (np.abs(direction - wrapped) < limit)
+            )
+
+        own_heading_toward = heading_toward(directions[:, np.newaxis], bearings)
+        other_heading_toward = heading_toward(directions[np.newaxis, :], (bearings + 180) % 360)
+
+        own_moving = (speeds > 0)[:, np.newaxis]
+        other_moving = (speeds > 0)[np.newaxis, :]
+        within_threshold = distances < self._stationary_threshold() * GATE_DISTANCE_TOLERANCE
+        toward_stationary = own_moving & ~other_moving & own_heading_toward
+        converging_range = (
+            self._converging_threshold() / CONVERGING_APPROACH_FACTOR * GATE_DISTANCE_TOLERANCE
+        )
+        converging = (
+            own_moving
+            & other_moving
+            & own_heading_toward
+            & other_heading_toward
+            & (distances < converging_range)
+        )
+        return within_threshold | toward_stationary | converging
+
+    def _stationary_threshold(self) -> float:
+        """Detection threshold for a stationary obstacle, the largest one used."""
+        return max(self.base_safety_radius * 5, 100.0)
+
+    def _converging_threshold(self) -> float:
+        """Detection threshold for converging or diverging moving tracks."""
+        return max(self.base_safety_radius * 3, 60.0)
+
+    @staticmethod
+    def _pairwise_bearings(positions: list[PositionVector]) -> npt.NDArray[np.float64]:
+        """Bearings between all positions, row i measured as ``_calculate_bearing`` from i."""
+        lats = np.radians(np.array([position.lat for position in positions], dtype=np.float64))
+        lons = np.radians(np.array([position.lon for position in positions], dtype=np.float64))
+        lon_diff = lons[np.newaxis, :] - lons[:, np.newaxis]
+        y = np.sin(lon_diff) * np.cos(lats)[np.newaxis, :]
+        x = np.cos(lats)[:, np.newaxis] * np.sin(lats)[np.newaxis, :] - np.sin(lats)[
+            :, np.newaxis
+        ] * np.cos(lats)[np.newaxis, :] * np.cos(lon_diff)
+        bearings: npt.NDArray[np.float64] = (np.degrees(np.arctan2(y, x)) + 360) % 360
+        return bearings
+
+    @staticmethod
+    def _pairwise_distances(positions: list[PositionVector]) -> npt.NDArray[np.float64]:
+        """Distances between all positions, row i measured as ``positions[i].distance_to``."""
+        lats = np.array([position.lat for position in positions], dtype=np.float64)
+        lons = np.array([position.lon for position in positions], dtype=np.float64)
+        north = (lats[np.newaxis, :] - lats[:, np.newaxis]) * METERS_PER_DEGREE
+        east = (
+            (lons[np.newaxis, :] - lons[:, np.newaxis])
+            * METERS_PER_DEGREE
+            * np.cos(np.radians(lats))[:, np.newaxis]
+        )
+        return np.sqrt(north**2 + east**2)
+
+    @staticmethod
+    def _enu_positions(positions: list[PositionVector]) -> npt.NDArray[np.float64]:
+        """Project positions to east/north meters around their centroid, shape (n, 2)."""
+        lats = np.array([position.lat for position in positions], dtype=np.float64)
+        lons = np.array([position.lon for position in positions], dtype=np.float64)
+        origin_lat = lats.mean()
+        east = (lons - lons.mean()) * METERS_PER_DEGREE * math.cos(math.radians(origin_lat))
+        north = (lats - origin_lat) * METERS_PER_DEGREE
+        return np.column_stack((east, north))
+
     def _calculate_bearing(self, from_pos: PositionVector, to_pos: PositionVector) -> float:
         """Calculate bearing from one position to another.
 
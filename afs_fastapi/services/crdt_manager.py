@@ -1,16 +1,29 @@
 import time
 
 from ..models.field_segment import FieldSegment
+from .spatial_index import SegmentSpatialIndex
 
 
 class FieldAllocationCRDT:
     """
     An Operation-based CRDT for managing field segment allocations.
     Uses a last-write-wins strategy for conflict resolution.
+
+    Status, tractor and spatial indexes are maintained on every mutation so
+    planner queries cost O(result) rather than a scan of every segment.
+    Segments must therefore only be changed through this class.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, cell_size_m: float = 50.0) -> None:
         self._segments: dict[str, FieldSegment] = {}
+        # Secondary indexes: status -> segments, tractor -> assigned segments
+        self._by_status: dict[str, dict[str, FieldSegment]] = {
+            "unassigned": {},
+            "assigned": {},
+            "completed": {},
+        }
+        self._by_tractor: dict[str, dict[str, FieldSegment]] = {}
+        self._spatial = SegmentSpatialIndex(cell_size_m)
 
     def add_segment(self, segment: FieldSegment) -> None:
         """
@@ -19,9 +32,47 @@ class FieldAllocationCRDT:
         if segment.segment_id in self._segments:
             # Only update if the new segment is more recent
             if segment.last_updated > self._segments[segment.segment_id].last_updated:
-                self._segments[segment.segment_id] = segment
+                self._store(segment)
         else:
-            self._segments[segment.segment_id] = segment
+            self._store(segment)
+
+    def _store(self, segment: FieldSegment) -> None:
+        """
+        Stores a copy of a segment, replacing any previous version, and updates the indexes.
+
+        Segments are mutated in place on assignment, so a segment shared with
+        the caller or another replica would leave the indexes stale.
+        """
+        segment = segment.model_copy()
+        previous = self._segments.get(segment.segment_id)
+        if previous is not None:
+            self._unindex(previous)
+        self._segments[segment.segment_id] = segment
+        self._index(segment)
+        if previous is None or previous.coordinates != segment.coordinates:
+            self._spatial.insert(segment.segment_id, segment.coordinates)
+
+    def _index(self, segment: FieldSegment) -> None:
+        """
+        Adds a segment to the status and tractor indexes.
+        """
+        self._by_status.setdefault(segment.status, {})[segment.segment_id] = segment
+        if segment.status == "assigned" and segment.assigned_to_tractor_id is not None:
+            self._by_tractor.setdefault(segment.assigned_to_tractor_id, {})[
+                segment.segment_id
+            ] = segment
+
+    def _unindex(self, segment: FieldSegment) -> None:
+        """
+        Removes a segment from the status and tractor indexes.
+        """
+        self._by_status.get(segment.status, {}).pop(segment.segment_id, None)
+        tractor_id = segment.assigned_to_tractor_id
+        if tractor_id is not None and tractor_id in self._by_tractor:
+            assigned = self._by_tractor[tractor_id]
+            assigned.pop(segment.segment_id, None)
+            if not assigned:
+                del self._by_tractor[tractor_id]
 
     def assign_segment(self, segment_id: str, tractor_id: str) -> FieldSegment | None:
         """
@@ -33,10 +84,11 @@ class FieldAllocationCRDT:
 
         segment = self._segments[segment_id]
         if segment.status == "unassigned" or segment.assigned_to_tractor_id == tractor_id:
+            self._unindex(segment)
             segment.status = "assigned"
             segment.assigned_to_tractor_id = tractor_id
             segment.last_updated = time.time()
-            self._segments[segment_id] = segment
+            self._index(segment)
             return segment
         return None  # Segment already assigned to another tractor
 
@@ -50,10 +102,11 @@ class FieldAllocationCRDT:
 
         segment = self._segments[segment_id]
         if segment.status == "assigned" and segment.assigned_to_tractor_id == tractor_id:
+            self._unindex(segment)
             segment.status = "unassigned"
             segment.assigned_to_tractor_id = None
             segment.last_updated = time.time()
-            self._segments[segment_id] = segment
+            self._index(segment)
             return segment
         return None  # Segment not assigned to this tractor or already unassigned
 
@@ -67,10 +120,11 @@ class FieldAllocationCRDT:
 
         segment = self._segments[segment_id]
         if segment.status == "assigned" and segment.assigned_to_tractor_id == tractor_id:
+            self._unindex(segment)
             segment.status = "completed"
             segment.assigned_to_tractor_id = None  # No longer assigned after completion
             segment.last_updated = time.time()
-            self._segments[segment_id] = segment
+            self._index(segment)
             return segment
         return None  # Segment not assigned to this tractor or already completed/unassigned
 
@@ -78,23 +132,45 @@ class FieldAllocationCRDT:
         """
         Returns a list of segments currently allocated to a specific tractor.
         """
-        return [
-            s
-            for s in self._segments.values()
-            if s.assigned_to_tractor_id == tractor_id and s.status == "assigned"
-        ]
+        return list(self._by_tractor.get(tractor_id, {}).values())
 
     def get_unallocated_segments(self) -> list[FieldSegment]:
         """
         Returns a list of segments not currently allocated.
         """
-        return [s for s in self._segments.values() if s.status == "unassigned"]
+        return list(self._by_status["unassigned"].values())
 
     def get_completed_segments(self) -> list[FieldSegment]:
         """
         Returns a list of segments that have been completed.
         """
-        return [s for s in self._segments.values() if s.status == "completed"]
+        return list(self._by_status["completed"].values())
+
+    def get_segments_containing(self, latitude: float, longitude: float) -> list[FieldSegment]:
+        """
+        Returns the segments whose boundary contains a GPS position.
+        """
+        return [
+            self._segments[segment_id]
+            for segment_id in self._spatial.containing(latitude, longitude)
+        ]
+
+    def get_segments_within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_m: float,
+        status: str | None = None,
+    ) -> list[FieldSegment]:
+        """
+        Returns the segments within radius_m metres of a GPS position, nearest first,
+        optionally only those with the given status.
+        """
+        among = None if status is None else self._by_status.get(status, {})
+        return [
+            self._segments[segment_id]
+            for segment_id, _distance in self._spatial.within(latitude, longitude, radius_m, among)
+        ]
 
     def get_segment_by_id(self, segment_id: str) -> FieldSegment | None:
         """
@@ -109,11 +185,11 @@ class FieldAllocationCRDT:
         """
         for segment_id, other_segment in other_crdt._segments.items():
             if segment_id not in self._segments:
-                self._segments[segment_id] = other_segment
+                self._store(other_segment)
             else:
                 current_segment = self._segments[segment_id]
                 if other_segment.last_updated > current_segment.last_updated:
-                    self._segments[segment_id] = other_segment
+                    self._store(other_segment)
 
     def get_state(self) -> dict[str, FieldSegment]:
         """
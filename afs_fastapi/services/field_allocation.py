@@ -17,6 +17,9 @@ CRDT Design
 - Conflict Resolution: Vector clock → LWW timestamp → lexicographic owner_id
 - Data Structure: Each section stores (owner_id, vector_clock, lww_timestamp)
 - Properties: Convergence, commutativity, associativity, idempotence
+- Delta-state sync: replicas ship only the entries a peer's causal context
+  (its replica clock) does not dominate, and apply received deltas in
+  O(delta)
 """
 
 from __future__ import annotations
@@ -59,6 +62,14 @@ class FieldAllocationCRDT:
         # Section allocation state: section_id -> (owner_id, vector_clock, lww_timestamp)
         # None owner_id indicates unallocated section
         self._sections: dict[str, tuple[str | None, VectorClock, float]] = {}
+        # Secondary index maintained by _set_entry: owner_id -> owned section ids
+        self._owner_sections: dict[str, set[str]] = {}
+
+        # Change log for delta-state sync: (replica clock after the change, section_id)
+        # in change order. Replica clocks only grow, so the changes a peer has seen
+        # are a prefix of the log; _change_index holds each section's latest position.
+        self._changes: list[tuple[VectorClock, str]] = []
+        self._change_index: dict[str, int] = {}
 
     # Mutation API
     def claim(self, section_id: str, owner_id: str) -> None:
@@ -91,16 +102,12 @@ class FieldAllocationCRDT:
 
         # Create section entry with current state
         current_time = time.time()
-        section_clock = VectorClock(self._vector_clock.get_process_ids())
-
-        # Copy current vector clock state
-        for process_id in self._vector_clock.get_process_ids():
-            section_clock_time = self._vector_clock.get_time(process_id)
-            for _ in range(section_clock_time):
-                section_clock.increment(process_id)
+        # Snapshot the replica clock (O(1), shared until the replica ticks again)
+        section_clock = self._vector_clock.copy()
 
         # Store the allocation entry
-        self._sections[section_id] = (owner_id, section_clock, current_time)
+        self._set_entry(section_id, (owner_id, section_clock, current_time))
+        self._record_change(section_id, section_clock)
 
     def release(self, section_id: str, owner_id: str) -> None:
         """Release a previously claimed section.
@@ -138,16 +145,12 @@ class FieldAllocationCRDT:
 
         # Create section entry with released state (None owner)
         current_time = time.time()
-        section_clock = VectorClock(self._vector_clock.get_process_ids())
-
-        # Copy current vector clock state
-        for process_id in self._vector_clock.get_process_ids():
-            section_clock_time = self._vector_clock.get_time(process_id)
-            for _ in range(section_clock_time):
-                section_clock.increment(process_id)
+        # Snapshot the replica clock (O(1), shared until the replica ticks again)
+        section_clock = self._vector_clock.copy()
 
         # Store the release entry (None indicates released/unallocated)
-        self._sections[section_id] = (None, section_clock, current_time)
+        self._set_entry(section_id, (None, section_clock, current_time))
+        self._record_change(section_id, section_clock)
 
     def merge(self, other: FieldAllocationCRDT) -> None:
         """Merge another replica into this one deterministically.
@@ -173,39 +176,106 @@ class FieldAllocationCRDT:
             raise ValueError(msg)
 
         # Merge vector clocks deterministically (take max of each process time)
-        for process_id in other._vector_clock.get_process_ids():
-            if process_id not in self._vector_clock.get_process_ids():
-                self._vector_clock.add_process(process_id)
-
-        # Update vector clock by taking max of each process time (idempotent merge)
-        for process_id in self._vector_clock.get_process_ids():
-            our_time = self._vector_clock.get_time(process_id)
-            other_time = (
-                other._vector_clock.get_time(process_id)
-                if process_id in other._vector_clock.get_process_ids()
-                else 0
-            )
-            max_time = max(our_time, other_time)
-
-            # Set clock to max time without incrementing
-            self._vector_clock._clocks[process_id] = max_time
+        self._vector_clock.merge(other._vector_clock)
 
         # Merge section allocations using deterministic conflict resolution
-        for section_id, (other_owner, other_clock, other_timestamp) in other._sections.items():
-            if section_id not in self._sections:
-                # We don't have this section, adopt their allocation
-                self._sections[section_id] = (other_owner, other_clock, other_timestamp)
-            else:
-                # We both have this section, apply conflict resolution
-                our_owner, our_clock, our_timestamp = self._sections[section_id]
+        context = self._vector_clock.copy()
+        for section_id, other_entry in other._sections.items():
+            self._merge_entry(section_id, other_entry, context)
 
-                # Deterministic conflict resolution hierarchy
-                winner_entry = self._resolve_conflict(
-                    (our_owner, our_clock, our_timestamp),
-                    (other_owner, other_clock, other_timestamp),
-                )
+    def merge_delta(self, delta: dict[str, Any]) -> None:
+        """Merge a serialized delta (or full state) into this replica.
 
-                self._sections[section_id] = winner_entry
+        Parameters
+        ----------
+        delta : dict
+            Output of ``serialize_delta`` (or ``serialize``) from a replica
+            of the same field.
+
+        Raises
+        ------
+        ValueError
+            If the delta belongs to a different field.
+
+        Notes
+        -----
+        Cost is proportional to the number of entries in the delta, not to
+        the size of either replica.
+
+        A delta only holds the entries its ``since_clock`` had not seen, so
+        the sender's replica clock is adopted only when this replica's clock
+        dominates that context. Otherwise (a delta computed for another
+        replica) the entries are merged but the clock is left unchanged, so
+        the next request still covers whatever the delta omitted.
+        """
+        if self._field_id != delta["field_id"]:
+            msg = f"Cannot merge different fields: {self._field_id} != {delta['field_id']}"
+            raise ValueError(msg)
+
+        since_data = delta.get("since_clock")
+        if since_data is None or VectorClock.from_dict(
+            since_data, list(since_data)
+        ).is_dominated_by(self._vector_clock):
+            clock_data = delta["vector_clock"]
+            self._vector_clock.merge(VectorClock.from_dict(clock_data, list(clock_data)))
+
+        context = self._vector_clock.copy()
+        for section_id, section_data in delta["sections"].items():
+            self._merge_entry(section_id, self._deserialize_entry(section_data), context)
+
+    def _merge_entry(
+        self,
+        section_id: str,
+        other_entry: tuple[str | None, VectorClock, float],
+        context: VectorClock,
+    ) -> None:
+        """Merge one remote section entry, recording it if it wins."""
+        our_entry = self._sections.get(section_id)
+        if our_entry is None:
+            # We don't have this section, adopt their allocation
+            winner_entry = other_entry
+        else:
+            # We both have this section, apply conflict resolution
+            winner_entry = self._resolve_conflict(our_entry, other_entry)
+            if winner_entry is our_entry:
+                return
+
+        self._set_entry(section_id, winner_entry)
+        self._record_change(section_id, context)
+
+    def _set_entry(self, section_id: str, entry: tuple[str | None, VectorClock, float]) -> None:
+        """Store a section entry and keep the owner index in step."""
+        previous = self._sections.get(section_id)
+        if previous is not None and previous[0] is not None and previous[0] != entry[0]:
+            owned = self._owner_sections[previous[0]]
+            owned.discard(section_id)
+            if not owned:
+                del self._owner_sections[previous[0]]
+        if entry[0] is not None:
+            self._owner_sections.setdefault(entry[0], set()).add(section_id)
+        self._sections[section_id] = entry
+
+    def _record_change(self, section_id: str, context: VectorClock) -> None:
+        """Append a section change to the delta log.
+
+        Parameters
+        ----------
+        section_id : str
+            Section whose entry changed.
+        context : VectorClock
+            Replica clock after the change (a snapshot, never mutated).
+        """
+        self._change_index[section_id] = len(self._changes)
+        self._changes.append((context, section_id))
+
+        # Drop superseded log records once they outnumber the live ones
+        if len(self._changes) > 2 * len(self._sections) + 64:
+            self._changes = [
+                (clock, sid)
+                for position, (clock, sid) in enumerate(self._changes)
+                if self._change_index[sid] == position
+            ]
+            self._change_index = {sid: position for position, (_, sid) in enumerate(self._changes)}
 
     def _resolve_conflict(
         self,
@@ -292,11 +362,7 @@ class FieldAllocationCRDT:
         tractor is responsible for, enabling efficient work coordination
         and progress monitoring.
         """
-        assigned = set()
-        for section_id, (owner, _, _) in self._sections.items():
-            if owner == owner_id:
-                assigned.add(section_id)
-        return assigned
+        return set(self._owner_sections.get(owner_id, ()))
 
     # Serialization API
     def serialize(self) -> dict[str, Any]:
@@ -316,20 +382,91 @@ class FieldAllocationCRDT:
         message size constraints while preserving causal ordering information.
         """
         # Serialize section allocations
+        sections_data = {
+            section_id: self._serialize_entry(entry) for section_id, entry in self._sections.items()
+        }
+
+        return {
+            "field_id": self._field_id,
+            "vector_clock": self._vector_clock.to_dict(),
+            "sections": sections_data,
+        }
+
+    def causal_context(self) -> dict[str, int]:
+        """Return this replica's clock, to request a delta from a peer.
+
+        Returns
+        -------
+        dict
+            Replica vector clock; every entry it dominates has been merged.
+        """
+        return self._vector_clock.to_dict()
+
+    def serialize_delta(self, since_clock: VectorClock | dict[str, int] | None) -> dict[str, Any]:
+        """Serialize only the entries a peer has not seen.
+
+        Parameters
+        ----------
+        since_clock : VectorClock | dict | None
+            The peer's causal context (``causal_context()`` of its replica).
+            None serializes the full state.
+
+        Returns
+        -------
+        dict
+            Same structure as ``serialize``, with ``sections`` limited to the
+            entries whose vector clock ``since_clock`` does not dominate and
+            ``since_clock`` recorded for ``merge_delta``.
+
+        Agricultural Context
+        --------------------
+        A tractor rejoining after a radio dropout only needs the sections
+        claimed or released while it was away, which keeps resynchronization
+        within the bandwidth of the ISOBUS and field radio links.
+        """
+        if since_clock is None:
+            return self.serialize()
+        if isinstance(since_clock, dict):
+            since_clock = VectorClock.from_dict(since_clock, list(since_clock))
+
+        # Binary search for the first change the peer has not seen
+        low, high = 0, len(self._changes)
+        while low < high:
+            middle = (low + high) // 2
+            if self._changes[middle][0].is_dominated_by(since_clock):
+                low = middle + 1
+            else:
+                high = middle
+
         sections_data = {}
-        for section_id, (owner, clock, timestamp) in self._sections.items():
-            sections_data[section_id] = {
-                "owner": owner,
-                "vector_clock": clock.to_dict(),
-                "timestamp": timestamp,
-            }
+        for position in range(low, len(self._changes)):
+            section_id = self._changes[position][1]
+            if self._change_index[section_id] != position:
+                continue  # Superseded by a later change
+            entry = self._sections[section_id]
+            if not entry[1].is_dominated_by(since_clock):
+                sections_data[section_id] = self._serialize_entry(entry)
 
         return {
             "field_id": self._field_id,
             "vector_clock": self._vector_clock.to_dict(),
+            "since_clock": since_clock.to_dict(),
             "sections": sections_data,
         }
 
+    @staticmethod
+    def _serialize_entry(entry: tuple[str | None, VectorClock, float]) -> dict[str, Any]:
+        """Serialize one section entry."""
+        owner, clock, timestamp = entry
+        return {"owner": owner, "vector_clock": clock.to_dict(), "timestamp": timestamp}
+
+    @staticmethod
+    def _deserialize_entry(section_data: dict[str, Any]) -> tuple[str | None, VectorClock, float]:
+        """Reconstruct one section entry."""
+        clock_data = section_data["vector_clock"]
+        section_clock = VectorClock.from_dict(clock_data, list(clock_data.keys()))
+        return (section_data["owner"], section_clock, section_data["timestamp"])
+
     @classmethod
     def deserialize(cls, data: dict[str, Any]) -> FieldAllocationCRDT:
         """Create a replica from serialized data.
@@ -360,15 +497,9 @@ class FieldAllocationCRDT:
         crdt._vector_clock = VectorClock.from_dict(vector_clock_data, process_ids)
 
         # Reconstruct section allocations
+        context = crdt._vector_clock.copy()
         for section_id, section_data in sections_data.items():
-            owner = section_data["owner"]
-            clock_data = section_data["vector_clock"]
-            timestamp = section_data["timestamp"]
-
-            # Reconstruct section vector clock
-            section_process_ids = list(clock_data.keys())
-            section_clock = VectorClock.from_dict(clock_data, section_process_ids)
-
-            crdt._sections[section_id] = (owner, section_clock, timestamp)
+            crdt._set_entry(section_id, cls._deserialize_entry(section_data))
+            crdt._record_change(section_id, context)
 
         return crdt
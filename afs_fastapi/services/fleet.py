@@ -28,6 +28,7 @@ from __future__ import annotations
 import asyncio
 import copy
 import logging
+import time
 from collections.abc import Callable
 from enum import Enum
 from typing import Any
@@ -38,6 +39,10 @@ from afs_fastapi.services.synchronization import VectorClock
 
 logger = logging.getLogger(__name__)
 
+# Seconds without a heartbeat after which a peer is no longer asked to
+# answer state synchronization requests
+PEER_HEARTBEAT_TIMEOUT = 5.0
+
 
 class TractorState(Enum):
     """Tractor state machine states for fleet coordination."""
@@ -107,6 +112,7 @@ class FleetCoordinationEngine:
 
         # Fleet status tracking
         self._fleet_status: dict[str, dict[str, Any]] = {}
+        self._peer_heartbeats: dict[str, float] = {}  # Monotonic time of last heartbeat
 
         # Current operational data
         self._current_position = {"lat": 0.0, "lon": 0.0}
@@ -381,31 +387,86 @@ class FleetCoordinationEngine:
                 except Exception as e:
                     logger.error(f"Error in emergency callback: {e}")
 
+        elif msg_type == "STATE_SYNC_REQUEST":
+            # Answer with the allocations the requester has not seen yet; only
+            # the designated responder answers (any peer for older requesters)
+            sender_id = message.get("sender_id")
+            responder_id = message.get("responder_id")
+            if sender_id != self.tractor_id and responder_id in (None, self.tractor_id):
+                await self._respond_state_sync(sender_id, message["payload"].get("crdt_clock"))
+
         elif msg_type == "STATE_SYNC_RESPONSE":
-            # Handle state synchronization response
-            crdt_data = message["payload"]["crdt_payload"]
-            other_crdt = FieldAllocationCRDT.deserialize(crdt_data)
-            self.merge_field_allocation_state(other_crdt)
+            # Deltas are computed for the requester only, bystanders ignore them
+            recipient_id = message.get("recipient_id")
+            if recipient_id is not None and recipient_id != self.tractor_id:
+                return
+
+            # Handle state synchronization response (delta, or full state)
+            payload = message["payload"]
+            if "crdt_delta" in payload:
+                self._field_allocation.merge_delta(payload["crdt_delta"])
+            else:
+                other_crdt = FieldAllocationCRDT.deserialize(payload["crdt_payload"])
+                self.merge_field_allocation_state(other_crdt)
 
         elif msg_type == "HEARTBEAT":
             # Update fleet status
             sender_id = message["sender_id"]
             self._fleet_status[sender_id] = message["payload"]
+            self._peer_heartbeats[sender_id] = time.monotonic()
 
     async def _request_state_sync(self) -> None:
         """Request state synchronization from fleet.
 
         Broadcasts STATE_SYNC_REQUEST to obtain current field allocation
-        state from other tractors in the fleet.
+        state from other tractors in the fleet. One live peer (the lowest
+        tractor ID with a heartbeat in the last ``PEER_HEARTBEAT_TIMEOUT``
+        seconds) is designated to answer, so the request costs a single
+        response rather than one per tractor; when no peer is live, every
+        tractor answers.
         """
+        cutoff = time.monotonic() - PEER_HEARTBEAT_TIMEOUT
+        peers = (
+            tractor_id
+            for tractor_id, seen in self._peer_heartbeats.items()
+            if tractor_id != self.tractor_id and seen >= cutoff
+        )
         sync_request = {
             "msg_type": "STATE_SYNC_REQUEST",
             "sender_id": self.tractor_id,
+            "responder_id": min(peers, default=None),
             "vector_clock": self._vector_clock.to_dict(),
-            "payload": {},
+            "payload": {"crdt_clock": self._field_allocation.causal_context()},
         }
         await self.isobus_interface.broadcast_message(sync_request)
 
+    async def _respond_state_sync(
+        self, requester_id: str | None, since_clock: dict[str, int] | None
+    ) -> None:
+        """Answer a state synchronization request with a CRDT delta.
+
+        Parameters
+        ----------
+        requester_id : str | None
+            Tractor that requested the sync; the response is addressed to it.
+        since_clock : dict | None
+            Causal context of the requester's field allocation replica;
+            None (older requesters) sends the full state.
+
+        Agricultural Context
+        --------------------
+        Only the sections changed since the requester last synchronized
+        are sent, keeping resynchronization small on the ISOBUS link.
+        """
+        sync_response = {
+            "msg_type": "STATE_SYNC_RESPONSE",
+            "sender_id": self.tractor_id,
+            "recipient_id": requester_id,
+            "vector_clock": self._vector_clock.to_dict(),
+            "payload": {"crdt_delta": self._field_allocation.serialize_delta(since_clock)},
+        }
+        await self.isobus_interface.broadcast_message(sync_response)
+
     async def _broadcast_heartbeat(self) -> None:
         """Broadcast heartbeat message with current status.
 
@@ -0,0 +1,271 @@
+"""Grid spatial index over field segment boundaries.
+
+Field planners ask, every second for every tractor, which segments lie
+within some distance of the tractor and which segment contains its GPS fix.
+Scanning every segment polygon for that is linear in the field size; this
+index buckets segment bounding boxes into a uniform grid of square cells so
+a query only tests the few segments registered in the cells it touches.
+
+Agricultural Context
+--------------------
+Segments tile a field and have similar sizes, and fields span a few
+kilometres at most, so a uniform grid over a local equirectangular
+projection (metres east/north of the first indexed vertex) matches an
+R-tree for these queries without its rebalancing cost or a native
+dependency.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Container, Sequence
+
+METERS_PER_DEGREE = 111_320.0  # ~meters per degree latitude
+
+_Bounds = tuple[float, float, float, float]
+_Point = tuple[float, float]
+
+
+class SegmentSpatialIndex:
+    """Uniform grid index of segment polygons given as (lat, lon) vertices.
+
+    Parameters
+    ----------
+    cell_size_m : float, default 50.0
+        Grid cell edge in metres; about the typical segment size works best.
+
+    Notes
+    -----
+    Segments are registered in every cell their bounding box overlaps.
+    Queries test bounding boxes first and run exact point-in-polygon or
+    point-to-polygon distance only on the remaining candidates. The
+    projection is anchored at the first indexed vertex, so distances are
+    accurate for segments within a few tens of kilometres of it (one index
+    per farm or field).
+    """
+
+    def __init__(self, cell_size_m: float = 50.0) -> None:
+        if cell_size_m <= 0:
+            raise ValueError(f"cell_size_m must be positive, got {cell_size_m}")
+        self._cell_size = cell_size_m
+        self._origin: _Point | None = None
+        self._meters_per_degree_lon = METERS_PER_DEGREE
+
+        # segment_id -> projected vertices and bounding box (min_x, min_y, max_x, max_y)
+        self._polygons: dict[str, tuple[_Point, ...]] = {}
+        self._bounds: dict[str, _Bounds] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._polygons)
+
+    def __contains__(self, segment_id: object) -> bool:
+        return segment_id in self._polygons
+
+    def insert(self, segment_id: str, coordinates: Sequence[tuple[float, float]]) -> None:
+        """Index (or re-index) a segment boundary.
+
+        Parameters
+        ----------
+        segment_id : str
+            Segment identifier.
+        coordinates : Sequence[tuple[float, float]]
+            Boundary vertices as (latitude, longitude); segments without
+            coordinates are not indexed.
+        """
+        self.remove(segment_id)
+        if not coordinates:
+            return
+
+        if self._origin is None:
+            self._origin = (coordinates[0][0], coordinates[0][1])
+            self._meters_per_degree_lon = METERS_PER_DEGREE * math.cos(
+                math.radians(self._origin[0])
+            )
+
+        polygon = tuple(self._project(lat, lon) for lat, lon in coordinates)
+        xs = [x for x, _ in polygon]
+        ys = [y for _, y in polygon]
+        bounds = (min(xs), min(ys), max(xs), max(ys))
+
+        self._polygons[segment_id] = polygon
+        self._bounds[segment_id] = bounds
+        for cell in self._cells_overlapping(*bounds):
+            self._cells.setdefault(cell, set()).add(segment_id)
+
+    def remove(self, segment_id: str) -> None:
+        """Remove a segment from the index (no-op if absent).
+
+        Parameters
+        ----------
+        segment_id : str
+            Segment identifier.
+        """
+        bounds = self._bounds.pop(segment_id, None)
+        if bounds is None:
+            return
+        del self._polygons[segment_id]
+        for cell in self._cells_overlapping(*bounds):
+            members = self._cells[cell]
+            members.discard(segment_id)
+            if not members:
+                del self._cells[cell]
+
+    def containing(self, lat: float, lon: float) -> list[str]:
+        """Return the segments whose boundary contains a position.
+
+        Parameters
+        ----------
+        lat : float
+            Latitude in degrees.
+        lon : float
+            Longitude in degrees.
+
+        Returns
+        -------
+        list[str]
+            Containing segment identifiers, sorted (several only where
+            boundaries overlap or the point lies on a shared edge).
+        """
+        if self._origin is None:
+            return []
+        x, y = self._project(lat, lon)
+        candidates = self._cells.get(self._cell_of(x, y), ())
+        return sorted(
+            segment_id
+            for segment_id in candidates
+            if _in_bounds(self._bounds[segment_id], x, y)
+            and _contains(self._polygons[segment_id], x, y)
+        )
+
+    def within(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        among: Container[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Return the segments within a distance of a position.
+
+        Parameters
+        ----------
+        lat : float
+            Latitude in degrees.
+        lon : float
+            Longitude in degrees.
+        radius_m : float
+            Search radius in metres.
+        among : Container[str] | None
+            Only consider these segment identifiers (e.g. a status index),
+            skipping the geometry of all others.
+
+        Returns
+        -------
+        list[tuple[str, float]]
+            (segment_id, distance in metres) pairs, nearest first; the
+            distance is 0 for segments containing the position.
+        """
+        if self._origin is None or radius_m < 0:
+            return []
+        x, y = self._project(lat, lon)
+
+        min_col, min_row = self._cell_of(x - radius_m, y - radius_m)
+        max_col, max_row = self._cell_of(x + radius_m, y + radius_m)
+        if (max_col - min_col + 1) * (max_row - min_row + 1) > len(self._cells):
+            # Radius covers most of the grid, scan occupied cells instead
+            candidates: set[str] = set(self._polygons)
+        else:
+            candidates = set()
+            for col in range(min_col, max_col + 1):
+                for row in range(min_row, max_row + 1):
+                    members = self._cells.get((col, row))
+                    if members:
+                        candidates.update(members)
+
+        radius_squared = radius_m * radius_m
+        bounds = self._bounds
+        polygons = self._polygons
+        results = []
+        for segment_id in candidates:
+            if among is not None and segment_id not in among:
+                continue
+            # Reject by bounding box distance before the exact polygon test
+            min_x, min_y, max_x, max_y = bounds[segment_id]
+            dx = min_x - x if x < min_x else (x - max_x if x > max_x else 0.0)
+            dy = min_y - y if y < min_y else (y - max_y if y > max_y else 0.0)
+            if dx * dx + dy * dy > radius_squared:
+                continue
+            inside, distance_squared = _locate(polygons[segment_id], x, y)
+            if inside:
+                results.append((segment_id, 0.0))
+            elif distance_squared <= radius_squared:
+                results.append((segment_id, math.sqrt(distance_squared)))
+        results.sort(key=lambda item: (item[1], item[0]))
+        return results
+
+    def _project(self, lat: float, lon: float) -> _Point:
+        """Project a position to metres east/north of the index origin."""
+        assert self._origin is not None
+        return (
+            (lon - self._origin[1]) * self._meters_per_degree_lon,
+            (lat - self._origin[0]) * METERS_PER_DEGREE,
+        )
+
+    def _cell_of(self, x: float, y: float) -> tuple[int, int]:
+        return (math.floor(x / self._cell_size), math.floor(y / self._cell_size))
+
+    def _cells_overlapping(
+        self, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> list[tuple[int, int]]:
+        min_col, min_row = self._cell_of(min_x, min_y)
+        max_col, max_row = self._cell_of(max_x, max_y)
+        return [
+            (col, row) for col in range(min_col, max_col + 1) for row in range(min_row, max_row + 1)
+        ]
+
+
+def _in_bounds(bounds: _Bounds, x: float, y: float) -> bool:
+    return bounds[0] <= x <= bounds[2] and bounds[1] <= y <= bounds[3]
+
+
+def _contains(polygon: tuple[_Point, ...], x: float, y: float) -> bool:
+    """Point-in-polygon test; points on an edge count as inside."""
+    inside, distance_squared = _locate(polygon, x, y)
+    return inside or distance_squared == 0.0
+
+
+def _locate(polygon: tuple[_Point, ...], x: float, y: float) -> tuple[bool, float]:
+    """Ray-cast a point against a polygon in one pass over its edges.
+
+    Returns
+    -------
+    tuple[bool, float]
+        Whether the point is inside (always False below three vertices) and
+        its squared distance to the nearest edge.
+    """
+    inside = False
+    best = math.inf
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+
+        # Squared distance to the edge (x1, y1)-(x2, y2)
+        dx = x2 - x1
+        dy = y2 - y1
+        px = x - x1
+        py = y - y1
+        length_squared = dx * dx + dy * dy
+        if length_squared > 0.0:
+            t = (px * dx + py * dy) / length_squared
+            if t > 1.0:
+                t = 1.0
+            elif t < 0.0:
+                t = 0.0
+            px -= t * dx
+            py -= t * dy
+        distance_squared = px * px + py * py
+        if distance_squared < best:
+            best = distance_squared
+        x1, y1 = x2, y2
+    return inside and len(polygon) >= 3, best
@@ -14,7 +14,59 @@ Agricultural Context:
 - ISOBUS protocol constraints require efficient timestamp encoding
 """
 
-import copy
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from weakref import WeakValueDictionary
+
+
+class ProcessIndex:
+    """Interned, immutable mapping of process IDs to counter slots.
+
+    Clocks over the same ordered set of processes share one index, so a
+    clock is just an index reference plus a flat array of counters and
+    clocks of the same fleet are compared slot by slot without lookups.
+
+    Obtain instances with :meth:`intern`; the constructor does not intern.
+    """
+
+    __slots__ = ("ids", "slots", "__weakref__")
+
+    _interned: WeakValueDictionary[tuple[str, ...], ProcessIndex] = WeakValueDictionary()
+
+    def __init__(self, ids: tuple[str, ...]) -> None:
+        self.ids = ids
+        self.slots = {process_id: slot for slot, process_id in enumerate(ids)}
+
+    @classmethod
+    def intern(cls, ids: Iterable[str]) -> ProcessIndex:
+        """Return the shared index for an ordered set of process IDs.
+
+        Parameters
+        ----------
+        ids : Iterable[str]
+            Process IDs in slot order, without duplicates
+
+        Returns
+        -------
+        ProcessIndex
+            Index shared by every clock over the same processes
+        """
+        key = tuple(ids)
+        index = cls._interned.get(key)
+        if index is None:
+            index = cls._interned[key] = cls(key)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, process_id: object) -> bool:
+        return process_id in self.slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
 
 
 class VectorClock:
@@ -29,12 +81,22 @@ class VectorClock:
     operations like "tractor A finished section 1" → "tractor B started section 2"
     are properly ordered even if messages arrive out of order due to network delays.
 
+    Representation:
+    Process IDs live in an interned ``ProcessIndex`` shared between clocks
+    of the same fleet, and the timestamps in an ``array('Q')`` aligned with
+    it. ``copy()`` shares the counter array copy-on-write, so snapshots (such
+    as the clock stored with every CRDT section entry) cost O(1) and a
+    mutation after a snapshot costs O(processes), never O(timestamp value).
+
     Attributes:
-        _clocks: Dictionary mapping process IDs to logical timestamps
-        _process_ids: Set of all known process IDs in the system
+        _index: Interned process index (process ID -> counter slot)
+        _counters: Logical timestamps, one per slot of the index
+        _shared: Whether ``_counters`` may be shared with another clock
 
     """
 
+    __slots__ = ("_index", "_counters", "_shared")
+
     def __init__(self, process_ids: list[str]) -> None:
         """Initialize vector clock for given set of processes.
 
@@ -58,9 +120,10 @@ class VectorClock:
             msg = "Process IDs list contains duplicates"
             raise ValueError(msg)
 
-        self._process_ids: set[str] = set(unique_ids)
         # Preserve insertion order for deterministic serialization/debugging
-        self._clocks: dict[str, int] = {pid: 0 for pid in unique_ids}
+        self._index = ProcessIndex.intern(unique_ids)
+        self._counters = array("Q", bytes(8 * len(unique_ids)))
+        self._shared = False
 
     def get_time(self, process_id: str) -> int:
         """Get logical timestamp for specified process.
@@ -75,10 +138,11 @@ class VectorClock:
             ValueError: If process_id is not known to this clock
 
         """
-        if process_id not in self._process_ids:
+        slot = self._index.slots.get(process_id)
+        if slot is None:
             msg = f"Process ID '{process_id}' not found in clock"
             raise ValueError(msg)
-        return self._clocks[process_id]
+        return self._counters[slot]
 
     def get_process_ids(self) -> list[str]:
         """Get list of all process IDs tracked by this clock.
@@ -87,7 +151,7 @@ class VectorClock:
             List of process identifiers (tractor IDs)
 
         """
-        return list(self._process_ids)
+        return list(self._index.ids)
 
     def increment(self, process_id: str) -> None:
         """Increment logical clock for local event.
@@ -105,13 +169,16 @@ class VectorClock:
         - Completing a planting/harvesting task
 
         """
-        if process_id not in self._process_ids:
+        slot = self._index.slots.get(process_id)
+        if slot is None:
             msg = f"Process ID '{process_id}' not found in clock"
             raise ValueError(msg)
-        self._clocks[process_id] += 1
+        if self._shared:
+            self._unshare()
+        self._counters[slot] += 1
 
     def update_with_received_message(
-        self, receiving_process: str, sender_clock: "VectorClock"
+        self, receiving_process: str, sender_clock: VectorClock
     ) -> None:
         """Update clock when receiving message from another process.
 
@@ -129,27 +196,60 @@ class VectorClock:
         causal ordering across the fleet.
 
         """
-        if receiving_process not in self._process_ids:
+        if receiving_process not in self._index:
             msg = f"Process ID '{receiving_process}' not found in clock"
             raise ValueError(msg)
 
-        # Ensure we are aware of any processes present in sender but unknown locally
-        for process_id in sender_clock._clocks.keys():
-            if process_id not in self._process_ids:
-                # Adopt unknown processes with their observed timestamp
-                self._process_ids.add(process_id)
-                self._clocks[process_id] = 0
-
-        # Update rule: take max of current and received time for each known process
-        for process_id in self._process_ids:
-            received_time = sender_clock._clocks.get(process_id, 0)
-            current_time = self._clocks.get(process_id, 0)
-            self._clocks[process_id] = max(current_time, received_time)
+        # Adopt processes unknown locally, then take the max of each timestamp
+        self.merge(sender_clock)
 
         # Increment receiving process's clock (local event)
-        self._clocks[receiving_process] += 1
+        self._counters[self._index.slots[receiving_process]] += 1
+
+    def merge(self, other: VectorClock) -> None:
+        """Take the element-wise maximum with another clock, without a local event.
+
+        Parameters
+        ----------
+        other : VectorClock
+            Clock to merge; processes unknown to this clock are adopted.
 
-    def happens_before(self, other: "VectorClock") -> bool:
+        Notes
+        -----
+        - Idempotent, commutative and associative, as CRDT merges require.
+        - Clocks over the same fleet merge slot by slot in a single pass.
+        """
+        index = self._index
+        if other._index is not index:
+            missing = [pid for pid in other._index.ids if pid not in index]
+            if missing:
+                index = ProcessIndex.intern(index.ids + tuple(missing))
+                self._counters = self._counters + array("Q", bytes(8 * len(missing)))
+                self._index = index
+                self._shared = False
+        self._counters = array("Q", map(max, self._counters, other._aligned_to(index)))
+        self._shared = False
+
+    def copy(self) -> VectorClock:
+        """Return an independent snapshot of this clock in O(1).
+
+        Returns
+        -------
+        VectorClock
+            Clock with the same processes and timestamps.
+
+        Notes
+        -----
+        - The snapshot shares the process index and, until either clock is
+          mutated, the counter array.
+        """
+        clone = VectorClock.__new__(VectorClock)
+        clone._index = self._index
+        clone._counters = self._counters
+        clone._shared = self._shared = True
+        return clone
+
+    def happens_before(self, other: VectorClock) -> bool:
         """Determine if this clock's events happen before other clock's events.
 
         Vector clock A happens before B if:
@@ -167,21 +267,10 @@ class VectorClock:
         another's. Critical for maintaining proper work sequencing.
 
         """
-        # Check if all timestamps are <= corresponding timestamps in other
-        all_less_equal = all(
-            self._clocks.get(pid, 0) <= other._clocks.get(pid, 0)
-            for pid in self._process_ids.union(other._process_ids)
-        )
-
-        # Check if at least one timestamp is strictly less
-        at_least_one_less = any(
-            self._clocks.get(pid, 0) < other._clocks.get(pid, 0)
-            for pid in self._process_ids.union(other._process_ids)
-        )
-
-        return all_less_equal and at_least_one_less
+        less, greater = self._compare(other)
+        return less and not greater
 
-    def is_concurrent_with(self, other: "VectorClock") -> bool:
+    def is_concurrent_with(self, other: VectorClock) -> bool:
         """Determine if events are concurrent (no causal relationship).
 
         Events are concurrent if neither happens before the other.
@@ -198,7 +287,28 @@ class VectorClock:
         tractors working different field sections.
 
         """
-        return not self.happens_before(other) and not other.happens_before(self)
+        less, greater = self._compare(other)
+        return less == greater
+
+    def is_dominated_by(self, other: VectorClock) -> bool:
+        """Determine if every timestamp of this clock is <= the other's.
+
+        Parameters
+        ----------
+        other : VectorClock
+            Vector clock to compare against
+
+        Returns
+        -------
+        bool
+            True if this clock happens before or equals the other clock.
+
+        Notes
+        -----
+        - A replica whose clock dominates an event's clock has seen that event;
+          delta-state sync uses this to skip entries the receiver already has.
+        """
+        return not self._compare(other)[1]
 
     def to_dict(self) -> dict[str, int]:
         """Serialize vector clock to dictionary for transmission.
@@ -212,22 +322,30 @@ class VectorClock:
         ISO 11783 message size constraints.
 
         """
-        return copy.deepcopy(self._clocks)
+        return dict(zip(self._index.ids, self._counters, strict=True))
 
     @classmethod
-    def from_dict(cls, data: dict[str, int], process_ids: list[str]) -> "VectorClock":
-        """Create a VectorClock instance from a dictionary."""
-        instance = cls(process_ids)
-        instance._clocks = data
+    def from_dict(cls, data: dict[str, int], process_ids: list[str]) -> VectorClock:
+        """Create a VectorClock instance from a dictionary.
+
+        Processes in ``data`` but not in ``process_ids`` are appended; those
+        missing from ``data`` start at 0.
+        """
+        ids = list(dict.fromkeys(process_ids))
+        ids.extend(pid for pid in data if pid not in ids)
+        instance = cls.__new__(cls)
+        instance._index = ProcessIndex.intern(ids)
+        instance._counters = array("Q", [data.get(pid, 0) for pid in ids])
+        instance._shared = False
         return instance
 
     def __str__(self) -> str:
         """Return string representation of vector clock."""
-        return f"VectorClock({dict(sorted(self._clocks.items()))})"
+        return f"VectorClock({dict(sorted(self.to_dict().items()))})"
 
     def __repr__(self) -> str:
         """Detailed string representation for debugging."""
-        return f"VectorClock(process_ids={sorted(self._process_ids)}, clocks={self._clocks})"
+        return f"VectorClock(process_ids={sorted(self._index.ids)}, clocks={self.to_dict()})"
 
     # Dynamic composition API
     def add_process(self, process_id: str) -> None:
@@ -251,11 +369,12 @@ class VectorClock:
         if not process_id:
             msg = "Process ID cannot be empty"
             raise ValueError(msg)
-        if process_id in self._process_ids:
+        if process_id in self._index:
             msg = f"Process ID '{process_id}' already exists"
             raise ValueError(msg)
-        self._process_ids.add(process_id)
-        self._clocks[process_id] = 0
+        self._index = ProcessIndex.intern((*self._index.ids, process_id))
+        self._counters = self._counters + array("Q", [0])
+        self._shared = False
 
     def remove_process(self, process_id: str) -> None:
         """Remove a process from the vector clock.
@@ -275,9 +394,65 @@ class VectorClock:
         - Removes the process from tracked IDs and serialization output.
         - Lookups for removed IDs will raise ValueError.
         """
-        if process_id not in self._process_ids:
+        slot = self._index.slots.get(process_id)
+        if slot is None:
             msg = f"Process ID '{process_id}' not found in clock"
             raise ValueError(msg)
-        self._process_ids.remove(process_id)
-        if process_id in self._clocks:
-            del self._clocks[process_id]
+        ids = self._index.ids
+        self._index = ProcessIndex.intern(ids[:slot] + ids[slot + 1 :])
+        counters = array("Q", self._counters)
+        del counters[slot]
+        self._counters = counters
+        self._shared = False
+
+    def _unshare(self) -> None:
+        """Give this clock its own counter array before mutating it."""
+        self._counters = array("Q", self._counters)
+        self._shared = False
+
+    def _aligned_to(self, index: ProcessIndex) -> Iterable[int]:
+        """Return this clock's timestamps in the slot order of another index."""
+        if index is self._index:
+            return self._counters
+        slots = self._index.slots
+        counters = self._counters
+        return [counters[slots[pid]] if pid in slots else 0 for pid in index.ids]
+
+    def _compare(self, other: VectorClock) -> tuple[bool, bool]:
+        """Compare with another clock in a single pass.
+
+        Returns:
+            (less, greater): whether some timestamp of this clock is lower,
+            and whether some timestamp is higher, than in ``other``.
+            Processes unknown to a clock count as 0.
+
+        """
+        if other._index is self._index:
+            pairs: Iterable[tuple[int, int]] = zip(self._counters, other._counters, strict=True)
+        else:
+            pairs = zip(self._counters, other._aligned_to(self._index), strict=True)
+            # Processes only the other clock knows are ahead of our implicit 0
+            other_slots = other._index.slots
+            other_counters = other._counters
+            if any(
+                other_counters[other_slots[pid]]
+                for pid in other._index.ids
+                if pid not in self._index
+            ):
+                return self._compare_pairs(pairs, less=True)
+        return self._compare_pairs(pairs, less=False)
+
+    @staticmethod
+    def _compare_pairs(pairs: Iterable[tuple[int, int]], less: bool) -> tuple[bool, bool]:
+        """Scan timestamp pairs, stopping once the clocks are known concurrent."""
+        greater = False
+        for ours, theirs in pairs:
+            if ours < theirs:
+                less = True
+            elif ours > theirs:
+                greater = True
+            else:
+                continue
+            if less and greater:
+                break
+        return less, greater
@@ -509,9 +509,14 @@ class TestFleetCoordinationIntegration:
                     for _ in range(time_val):
                         clearing_vc.increment(process_id)
 
-            for process_id, time_val in final_clocks["TRACTOR_TILLING_002"].items():
-                if process_id in tilling_vc.get_process_ids():
-                    tilling_vc._clocks[process_id] = time_val
+            tilling_vc = VectorClock.from_dict(
+                {
+                    process_id: time_val
+                    for process_id, time_val in final_clocks["TRACTOR_TILLING_002"].items()
+                    if process_id in tilling_vc.get_process_ids()
+                },
+                tilling_vc.get_process_ids(),
+            )
 
             # Validate causal relationships exist
             assert len(final_clocks) == 4, "All four tractors should have vector clock states"
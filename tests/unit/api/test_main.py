@@ -59,3 +59,40 @@ def test_get_water_status(mock_water_quality: Mock):
     assert data["sensor_id"] == sensor_id
     assert "readings" in data
     assert data["readings"]["ph"] == 7.0
+
+
+def test_crdt_nearby_and_containing_segments():
+    base_lat, base_lon = -33.0, 151.0
+    for index in range(3):
+        lon = base_lon + index * 0.001
+        segment = {
+            "segment_id": f"api_seg_{index}",
+            "coordinates": [
+                [base_lat, lon],
+                [base_lat, lon + 0.001],
+                [base_lat + 0.001, lon + 0.001],
+                [base_lat + 0.001, lon],
+            ],
+            "last_updated": 1.0,
+        }
+        assert client.post("/crdt/segments", json=segment).status_code == 200
+    client.post("/crdt/assign", params={"segment_id": "api_seg_1", "tractor_id": "TR_API"})
+
+    response = client.get(
+        "/crdt/segments/containing",
+        params={"latitude": base_lat + 0.0005, "longitude": base_lon + 0.0015},
+    )
+    assert response.status_code == 200
+    assert [s["segment_id"] for s in response.json()] == ["api_seg_1"]
+
+    response = client.get(
+        "/crdt/segments/nearby",
+        params={
+            "latitude": base_lat + 0.0005,
+            "longitude": base_lon + 0.0005,
+            "radius_m": 200,
+            "status": "unassigned",
+        },
+    )
+    assert response.status_code == 200
+    assert [s["segment_id"] for s in response.json()] == ["api_seg_0", "api_seg_2"]
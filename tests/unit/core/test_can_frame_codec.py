@@ -7,16 +7,23 @@ equipment communication, following Test-First Development (TDD) methodology.
 
 from __future__ import annotations
 
+import random
 import struct
+import time
 
 import can
+import numpy as np
 import pytest
 
 from afs_fastapi.core.can_frame_codec import (
     CANFrameCodec,
+    CANFrameEnvelope,
+    DecodedPGN,
+    DecodedPGNView,
     J1939DataType,
     J1939Decoder,
     J1939Encoder,
+    PGNDecodePlan,
     PGNDefinition,
     SPNDefinition,
 )
@@ -662,3 +669,728 @@ class TestAgriculturalMessageScenarios:
         assert engine_speed is not None and engine_speed.is_valid
         assert pressure is not None and pressure.is_not_available
         assert torque is not None and torque.is_valid
+
+
+class TestPGNDecodePlan:
+    """Test compiled per-PGN decode plans."""
+
+    @pytest.fixture
+    def decoder(self) -> J1939Decoder:
+        """Create J1939 decoder for testing."""
+        return J1939Decoder()
+
+    @staticmethod
+    def _random_frames(decoder: J1939Decoder, count: int) -> list[can.Message]:
+        """Build random frames for every registered PGN."""
+        rng = random.Random(1939)
+        encoder = J1939Encoder()
+        frames: list[can.Message] = []
+        pgns = list(decoder.pgn_definitions)
+        for i in range(count):
+            pgn = pgns[i % len(pgns)]
+            can_id = encoder._construct_j1939_id(pgn, 6, rng.randrange(256), 255)
+            data = bytes(rng.randrange(256) for _ in range(8))
+            frames.append(can.Message(arbitration_id=can_id, data=data, is_extended_id=True))
+        return frames
+
+    def test_plans_compiled_at_registration(self, decoder: J1939Decoder) -> None:
+        """Test every registered PGN has a compiled plan."""
+        assert set(decoder.decode_plans) == set(decoder.pgn_definitions)
+
+        plan = decoder.decode_plans[0xF004]
+        engine_speed = next(spn for spn in plan.spns if spn.definition.spn == 190)
+        assert engine_speed.shift == 24
+        assert engine_speed.mask == 0xFFFF
+        assert engine_speed.sign_bit == 0
+
+        latitude = next(
+            spn for spn in decoder.decode_plans[0xFEF3].spns if spn.definition.spn == 584
+        )
+        assert latitude.sign_bit == 1 << 31
+
+    def test_compiled_decode_matches_reference(self, decoder: J1939Decoder) -> None:
+        """Test compiled decode produces the same SPNs as the per-SPN reference path."""
+        for message in self._random_frames(decoder, 500):
+            decoded = decoder.decode_can_message(message)
+            assert decoded is not None
+
+            pgn_def = decoder.pgn_definitions[decoded.pgn]
+            expected = [
+                decoder._decode_spn(spn_def, message.data) for spn_def in pgn_def.spn_definitions
+            ]
+            assert decoded.spn_values == expected
+
+    def test_short_payload_skips_out_of_range_spns(self, decoder: J1939Decoder) -> None:
+        """Test SPNs beyond a truncated payload are skipped, not mis-decoded."""
+        message = can.Message(
+            arbitration_id=0x18F00400, data=bytes([0, 0x64, 0xAF]), is_extended_id=True
+        )
+
+        decoded = decoder.decode_can_message(message)
+
+        assert decoded is not None
+        assert [spn.spn for spn in decoded.spn_values] == [102, 61]
+
+    def test_registered_signed_pgn(self, decoder: J1939Decoder) -> None:
+        """Test PGNs registered at runtime get sign extension and scaling compiled in."""
+        pgn_def = PGNDefinition(
+            pgn=0xFF10,
+            name="Implement Steering",
+            description="Proprietary steering angle",
+            data_length=8,
+            spn_definitions=[
+                SPNDefinition(
+                    spn=520000,
+                    name="Steering Angle",
+                    description="Signed steering angle",
+                    data_type=J1939DataType.INT16,
+                    start_bit=0,
+                    bit_length=16,
+                    scale=0.01,
+                    units="deg",
+                ),
+            ],
+        )
+        plan = decoder.register_pgn(pgn_def)
+        assert isinstance(plan, PGNDecodePlan)
+
+        message = can.Message(
+            arbitration_id=0x18FF1080,
+            data=struct.pack("<h", -1234) + bytes(6),
+            is_extended_id=True,
+        )
+        decoded = decoder.decode_can_message(message)
+
+        assert decoded is not None
+        assert decoded.spn_values[0].raw_value == -1234
+        assert abs(decoded.spn_values[0].value - (-12.34)) < 1e-9
+
+    def test_direct_definition_assignment_is_compiled_lazily(self, decoder: J1939Decoder) -> None:
+        """Test definitions replaced in the dict are recompiled on next decode."""
+        original = decoder.pgn_definitions[0xFEF1]
+        replacement = PGNDefinition(
+            pgn=0xFEF1,
+            name="Wheel-Based Vehicle Speed",
+            description="Speed only",
+            data_length=8,
+            spn_definitions=original.spn_definitions[:1],
+        )
+        decoder.pgn_definitions[0xFEF1] = replacement
+
+        plan = decoder.get_decode_plan(0xFEF1)
+
+        assert plan is not None
+        assert plan.definition is replacement
+
+    @pytest.mark.slow
+    @pytest.mark.serial
+    def test_decode_throughput_before_and_after(self, decoder: J1939Decoder) -> None:
+        """Benchmark SPN decode frames/sec of the compiled plan against the per-SPN path."""
+        frames = self._random_frames(decoder, 2000)
+        work = [
+            (decoder.pgn_definitions[(m.arbitration_id >> 8) & 0x3FFFF], m.data) for m in frames
+        ]
+
+        start = time.perf_counter()
+        for pgn_def, data in work:
+            # Pre-compilation path: per-SPN bit extraction and signedness lookup
+            [decoder._decode_spn(spn_def, data) for spn_def in pgn_def.spn_definitions]
+        before_fps = len(work) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for pgn_def, data in work:
+            decoder.decode_plans[pgn_def.pgn].decode(data)
+        after_fps = len(work) / (time.perf_counter() - start)
+
+        # Decoded values are checked by test_compiled_decode_matches_reference
+        assert after_fps > before_fps
+
+
+class TestBatchDecoding:
+    """Test vectorized batch decoding of CAN frame arrays."""
+
+    @pytest.fixture
+    def codec(self) -> CANFrameCodec:
+        """Create CAN frame codec for testing."""
+        return CANFrameCodec()
+
+    @staticmethod
+    def _mixed_messages(codec: CANFrameCodec, count: int) -> list[can.Message]:
+        """Build a mix of known, unknown, TP, standard and short frames."""
+        rng = random.Random(2002)
+        encoder = codec.encoder
+        pgns = codec.list_supported_pgns() + [0xFECA]  # DM1 is not a single-frame definition
+        messages: list[can.Message] = []
+        for i in range(count):
+            data = bytes(rng.randrange(256) for _ in range(8))
+            if i % 17 == 0:
+                messages.append(can.Message(arbitration_id=0x123, data=data, is_extended_id=False))
+            elif i % 23 == 0:
+                messages.append(
+                    can.Message(arbitration_id=0x1CEBFF00, data=data, is_extended_id=True)
+                )
+            else:
+                pgn = pgns[i % len(pgns)]
+                can_id = encoder._construct_j1939_id(pgn, rng.randrange(8), rng.randrange(256), 255)
+                if i % 11 == 0:
+                    data = data[: rng.randrange(1, 8)]
+                messages.append(
+                    can.Message(
+                        arbitration_id=can_id,
+                        data=data,
+                        is_extended_id=True,
+                        timestamp=1_700_000_000.0 + i,
+                    )
+                )
+        return messages
+
+    def test_batch_matches_single_frame_decoding(self, codec: CANFrameCodec) -> None:
+        """Test every column value agrees with decode_message for the same frame."""
+        messages = self._mixed_messages(codec, 600)
+
+        batch = codec.decode_messages_batch(messages)
+
+        assert batch.frame_count == len(messages)
+        covered = set(batch.undecoded_indices.tolist())
+        for pgn_batch in batch.pgn_batches.values():
+            covered.update(pgn_batch.row_indices.tolist())
+            for position, row in enumerate(pgn_batch.row_indices.tolist()):
+                single = codec.decode_message(messages[row])
+                assert single is not None
+                assert single.pgn == pgn_batch.pgn
+                assert single.source_address == pgn_batch.source_addresses[position]
+                assert single.priority == pgn_batch.priorities[position]
+                assert single.destination_address == pgn_batch.destination_addresses[position]
+
+                single_spns = {spn.spn: spn for spn in single.spn_values}
+                for spn, column in pgn_batch.spn_columns.items():
+                    expected = single_spns.get(spn)
+                    if expected is None:  # SPN outside a short payload
+                        assert not column.is_valid[position]
+                        continue
+                    assert column.raw_values[position] == expected.raw_value
+                    assert column.is_valid[position] == expected.is_valid
+                    assert column.is_not_available[position] == expected.is_not_available
+                    assert column.is_error[position] == expected.is_error
+                    if expected.value is None:
+                        assert np.isnan(column.values[position])
+                    else:
+                        assert column.values[position] == pytest.approx(expected.value)
+
+        for row in batch.undecoded_indices.tolist():
+            assert codec.decode_message(messages[row]) is None
+        assert covered == set(range(len(messages)))
+
+    def test_decode_batch_from_parallel_arrays(self, codec: CANFrameCodec) -> None:
+        """Test decoding directly from an id vector and uint8[N, 8] payload matrix."""
+        payloads = np.full((3, 8), 0xFF, dtype=np.uint8)
+        payloads[0, 3:5] = [0x40, 0x38]  # 1800 rpm
+        payloads[1, 3:5] = [0x00, 0x7D]  # 4000 rpm
+        payloads[2, 1:3] = [0x00, 0x19]  # 25 km/h
+
+        batch = codec.decode_batch(
+            np.array([0x0CF00400, 0x0CF00401, 0x18FEF100]),
+            payloads,
+            timestamps=np.array([1.0, 2.0, 3.0]),
+        )
+
+        engine_speed = batch.get_spn_column(190)
+        assert engine_speed is not None
+        assert engine_speed.values.tolist() == [1800.0, 4000.0]
+        assert batch.pgn_batches[0xF004].source_addresses.tolist() == [0x00, 0x01]
+        assert batch.pgn_batches[0xF004].timestamps.tolist() == [1.0, 2.0]
+
+        manifold = batch.pgn_batches[0xF004].spn_columns[102]
+        assert manifold.is_not_available.all()
+        assert np.isnan(manifold.values).all()
+
+        speed = batch.get_spn_column(84)
+        assert speed is not None
+        assert speed.values.tolist() == [25.0]
+        assert batch.undecoded_indices.size == 0
+
+    def test_signed_values_in_batch(self, codec: CANFrameCodec) -> None:
+        """Test latitude/longitude sign extension in column decoding."""
+        message = codec.encoder.encode_gps_position(0x1C, latitude=-33.8688, longitude=151.2093)
+        assert message is not None
+
+        batch = codec.decode_messages_batch([message])
+
+        latitude = batch.get_spn_column(584)
+        longitude = batch.get_spn_column(585)
+        assert latitude is not None and longitude is not None
+        assert latitude.values[0] == pytest.approx(-33.8688, abs=1e-6)
+        assert longitude.values[0] == pytest.approx(151.2093, abs=1e-6)
+
+    def test_integer_scale_with_not_available_frame(self, codec: CANFrameCodec) -> None:
+        """Test an int-scaled SPN still yields NaN for a not-available frame."""
+        codec.decoder.register_pgn(
+            PGNDefinition(
+                pgn=0xFF11,
+                name="Implement Counter",
+                description="Proprietary counter with integer scaling",
+                data_length=8,
+                spn_definitions=[
+                    SPNDefinition(
+                        spn=520001,
+                        name="Bale Count",
+                        description="Bales produced",
+                        data_type=J1939DataType.UINT16,
+                        start_bit=0,
+                        bit_length=16,
+                        scale=1,
+                        offset=0,
+                        not_available_value=0xFFFF,
+                    ),
+                ],
+            )
+        )
+        payloads = np.full((2, 8), 0xFF, dtype=np.uint8)
+        payloads[0, 0:2] = [0x2A, 0x00]
+
+        batch = codec.decode_batch(np.array([0x18FF1180, 0x18FF1180]), payloads)
+
+        column = batch.get_spn_column(520001)
+        assert column is not None
+        assert column.values[0] == 42.0
+        assert np.isnan(column.values[1])
+        assert column.is_not_available.tolist() == [False, True]
+
+    def test_payload_shape_validation(self, codec: CANFrameCodec) -> None:
+        """Test mismatched payload matrix shape is rejected."""
+        with pytest.raises(ValueError):
+            codec.decode_batch(np.array([0x0CF00400, 0x0CF00401]), np.zeros((1, 8)))
+
+    def test_empty_batch(self, codec: CANFrameCodec) -> None:
+        """Test empty input produces an empty result."""
+        batch = codec.decode_messages_batch([])
+
+        assert batch.frame_count == 0
+        assert batch.pgn_batches == {}
+        assert batch.undecoded_indices.size == 0
+
+
+class TestDecodedPGNView:
+    """Test lazily evaluated decoded-frame views."""
+
+    @pytest.fixture
+    def codec(self) -> CANFrameCodec:
+        """Create CAN frame codec for testing."""
+        return CANFrameCodec()
+
+    @pytest.fixture
+    def eec1_message(self, codec: CANFrameCodec) -> can.Message:
+        """Create an EEC1 frame with engine speed, pressure and torque."""
+        message = codec.encoder.encode_engine_data(
+            0x00, engine_speed=1800.0, manifold_pressure=150.0, torque_percent=50.0
+        )
+        assert message is not None
+        message.timestamp = 1_700_000_000.0
+        return message
+
+    def test_view_exposes_identifier_fields_without_decoding(
+        self, codec: CANFrameCodec, eec1_message: can.Message
+    ) -> None:
+        """Test identifier fields are available and no SPN is decoded up front."""
+        view = codec.decode_message_view(eec1_message)
+
+        assert isinstance(view, DecodedPGNView)
+        assert view.pgn == 0xF004
+        assert view.source_address == 0x00
+        assert view.destination_address == 255
+        assert view.priority == 6
+        assert view.name == "Electronic Engine Controller 1"
+        assert view._spn_values is None
+        assert view._bit_array is None
+        assert view.raw_data is eec1_message.data
+        assert not hasattr(view, "__dict__")
+
+    def test_single_spn_access(self, codec: CANFrameCodec, eec1_message: can.Message) -> None:
+        """Test accessing one SPN decodes only that SPN."""
+        view = codec.decode_message_view(eec1_message)
+        assert isinstance(view, DecodedPGNView)
+
+        engine_speed = view.get_spn(190)
+
+        assert engine_speed is not None
+        assert engine_speed.value == pytest.approx(1800.0)
+        assert view.get_value(61) == pytest.approx(50.0)
+        assert view.get_spn(84) is None  # Not carried by EEC1
+        assert view._spn_values is None
+
+    def test_materialize_matches_eager_decode(
+        self, codec: CANFrameCodec, eec1_message: can.Message
+    ) -> None:
+        """Test materialized view equals the eager DecodedPGN."""
+        view = codec.decode_message_view(eec1_message)
+        assert isinstance(view, DecodedPGNView)
+
+        assert view.materialize() == codec.decode_message(eec1_message)
+        assert view.spn_values is view.spn_values  # Decoded once and cached
+
+    def test_view_rejects_undecodable_frames(self, codec: CANFrameCodec) -> None:
+        """Test standard frames and unknown PGNs produce no view."""
+        standard = can.Message(arbitration_id=0x123, data=bytes(8), is_extended_id=False)
+        unknown = can.Message(arbitration_id=0x18DEAD00, data=bytes(8), is_extended_id=True)
+
+        assert codec.decode_message_view(standard) is None
+        assert codec.decode_message_view(unknown) is None
+
+
+class TestTransportProtocolReassembly:
+    """Test J1939 Transport Protocol (BAM and RTS/CTS) reassembly in the decoder."""
+
+    class FakeClock:
+        """Manually advanced monotonic clock."""
+
+        def __init__(self) -> None:
+            self.now = 0.0
+
+        def __call__(self) -> float:
+            return self.now
+
+    @pytest.fixture
+    def clock(self) -> TestTransportProtocolReassembly.FakeClock:
+        """Create a controllable clock."""
+        return self.FakeClock()
+
+    @pytest.fixture
+    def decoder(self, clock: TestTransportProtocolReassembly.FakeClock) -> J1939Decoder:
+        """Create decoder whose reassembler uses the fake clock."""
+        decoder = J1939Decoder()
+        decoder.transport_reassembler.clock = clock
+        return decoder
+
+    @staticmethod
+    def _cm(source: int, destination: int, payload: bytes) -> can.Message:
+        return can.Message(
+            arbitration_id=0x1CEC0000 | (destination << 8) | source,
+            data=payload,
+            is_extended_id=True,
+        )
+
+    @staticmethod
+    def _dt(source: int, destination: int, sequence: int, chunk: bytes) -> can.Message:
+        return can.Message(
+            arbitration_id=0x1CEB0000 | (destination << 8) | source,
+            data=bytes([sequence]) + chunk.ljust(7, b"\xff"),
+            is_extended_id=True,
+        )
+
+    @staticmethod
+    def _announce(control: int, size: int, pgn: int, max_packets: int = 0xFF) -> bytes:
+        packets = (size + 6) // 7
+        return bytes([control, size & 0xFF, size >> 8, packets, max_packets]) + pgn.to_bytes(
+            3, "little"
+        )
+
+    def _send_packets(
+        self, decoder: J1939Decoder, source: int, destination: int, payload: bytes, first: int = 1
+    ) -> list[object]:
+        results = []
+        packets = (len(payload) + 6) // 7
+        for sequence in range(first, packets + 1):
+            chunk = payload[(sequence - 1) * 7 : sequence * 7]
+            results.append(
+                decoder.decode_can_message(self._dt(source, destination, sequence, chunk))
+            )
+        return results
+
+    def test_bam_reassembly_of_dm1(self, decoder: J1939Decoder) -> None:
+        """Test a broadcast DM1 with several DTCs is reassembled into one DecodedPGN."""
+        payload = bytes(range(1, 27))  # 26 bytes -> 4 packets
+        assert (
+            decoder.decode_can_message(self._cm(0x80, 0xFF, self._announce(32, 26, 0xFECA))) is None
+        )
+
+        results = self._send_packets(decoder, 0x80, 0xFF, payload)
+
+        assert results[:-1] == [None, None, None]
+        decoded = results[-1]
+        assert isinstance(decoded, DecodedPGN)
+        assert decoded.pgn == 0xFECA
+        assert decoded.is_multi_frame
+        assert decoded.frame_count == 4
+        assert decoded.raw_data == payload
+        assert decoded.source_address == 0x80
+        assert decoded.destination_address == 0xFF
+        assert decoded.spn_values == []
+        assert decoder.transport_sessions == {}
+
+    def test_rts_cts_reassembly_decodes_known_pgn(self, decoder: J1939Decoder) -> None:
+        """Test a destination-specific RTS/CTS transfer with two CTS windows."""
+        payload = bytearray(b"\xff" * 10)
+        payload[3:5] = (14400).to_bytes(2, "little")  # 1800 rpm
+        payload = bytes(payload)
+
+        decoder.decode_can_message(self._cm(0x00, 0x25, self._announce(16, 10, 0xF004, 1)))
+        decoder.decode_can_message(
+            self._cm(0x25, 0x00, bytes([17, 1, 1, 0xFF, 0xFF, 0x04, 0xF0, 0]))
+        )
+        assert decoder.decode_can_message(self._dt(0x00, 0x25, 1, payload[:7])) is None
+        decoder.decode_can_message(
+            self._cm(0x25, 0x00, bytes([17, 1, 2, 0xFF, 0xFF, 0x04, 0xF0, 0]))
+        )
+        decoded = decoder.decode_can_message(self._dt(0x00, 0x25, 2, payload[7:]))
+
+        assert isinstance(decoded, DecodedPGN)
+        assert decoded.pgn == 0xF004
+        assert decoded.destination_address == 0x25
+        assert decoded.raw_data == payload
+        engine_speed = next(spn for spn in decoded.spn_values if spn.spn == 190)
+        assert engine_speed.value == pytest.approx(1800.0)
+
+    def test_cts_requests_retransmission(self, decoder: J1939Decoder) -> None:
+        """Test a CTS with an earlier next-packet number rewinds the sequence."""
+        payload = bytes(range(20))
+        decoder.decode_can_message(self._cm(0x00, 0x25, self._announce(16, 20, 0xFECA)))
+        self._send_packets(decoder, 0x00, 0x25, payload[:14])
+        decoder.decode_can_message(
+            self._cm(0x25, 0x00, bytes([17, 2, 2, 0xFF, 0xFF, 0xCA, 0xFE, 0]))
+        )
+
+        results = self._send_packets(decoder, 0x00, 0x25, payload, first=2)
+
+        assert isinstance(results[-1], DecodedPGN)
+        assert results[-1].raw_data == payload
+
+    def test_abort_discards_session(self, decoder: J1939Decoder) -> None:
+        """Test a connection abort from the responder drops the session."""
+        decoder.decode_can_message(self._cm(0x00, 0x25, self._announce(16, 20, 0xFECA)))
+        decoder.decode_can_message(
+            self._cm(0x25, 0x00, bytes([255, 1, 0xFF, 0xFF, 0xFF, 0xCA, 0xFE, 0]))
+        )
+
+        assert decoder.transport_sessions == {}
+        assert self._send_packets(decoder, 0x00, 0x25, bytes(20)) == [None, None, None]
+        assert decoder.transport_reassembler.statistics["sessions_aborted"] == 1
+
+    def test_bam_timeout_between_packets(
+        self, decoder: J1939Decoder, clock: TestTransportProtocolReassembly.FakeClock
+    ) -> None:
+        """Test exceeding T1 between packets drops the session."""
+        decoder.decode_can_message(self._cm(0x80, 0xFF, self._announce(32, 20, 0xFECA)))
+        decoder.decode_can_message(self._dt(0x80, 0xFF, 1, bytes(7)))
+        clock.now += 0.8
+
+        assert decoder.decode_can_message(self._dt(0x80, 0xFF, 2, bytes(7))) is None
+        assert decoder.transport_sessions == {}
+        assert decoder.transport_reassembler.statistics["sessions_timed_out"] == 1
+
+    def test_bam_sequence_gap_drops_session(self, decoder: J1939Decoder) -> None:
+        """Test a missing BAM packet loses the message instead of corrupting it."""
+        decoder.decode_can_message(self._cm(0x80, 0xFF, self._announce(32, 20, 0xFECA)))
+        decoder.decode_can_message(self._dt(0x80, 0xFF, 1, bytes(7)))
+
+        assert decoder.decode_can_message(self._dt(0x80, 0xFF, 3, bytes(7))) is None
+        assert decoder.transport_sessions == {}
+
+    def test_invalid_announcements_rejected(self, decoder: J1939Decoder) -> None:
+        """Test oversize, inconsistent and misaddressed announcements are rejected."""
+        oversize = bytes([16, 0xFF, 0xFF, 255, 255, 0xCA, 0xFE, 0])
+        inconsistent = bytes([16, 20, 0, 9, 255, 0xCA, 0xFE, 0])
+        bam_to_node = self._announce(32, 20, 0xFECA)
+
+        decoder.decode_can_message(self._cm(0x00, 0x25, oversize))
+        decoder.decode_can_message(self._cm(0x00, 0x25, inconsistent))
+        decoder.decode_can_message(self._cm(0x00, 0x25, bam_to_node))
+
+        assert decoder.transport_sessions == {}
+        assert decoder.transport_reassembler.statistics["sessions_rejected"] == 3
+
+    def test_session_table_bounded_under_rts_flood(
+        self, decoder: J1939Decoder, clock: TestTransportProtocolReassembly.FakeClock
+    ) -> None:
+        """Test a flood of bogus RTS frames never exceeds the session cap."""
+        reassembler = decoder.transport_reassembler
+        for source in range(256):
+            for destination in range(0, 250, 10):
+                decoder.decode_can_message(
+                    self._cm(source, destination, self._announce(16, 1785, 0xFECA))
+                )
+
+        assert len(decoder.transport_sessions) == reassembler.max_sessions
+        assert reassembler.statistics["sessions_rejected"] > 0
+
+        # Once the stale sessions time out, genuine transfers are accepted again
+        clock.now += 2.0
+        decoder.decode_can_message(self._cm(0x80, 0xFF, self._announce(32, 9, 0xFECA)))
+        assert (0x80, 0xFF) in decoder.transport_sessions
+        assert len(decoder.transport_sessions) == 1
+
+
+class TestPGNEncodeTemplate:
+    """Test compiled encode templates and batch encoding."""
+
+    @pytest.fixture
+    def encoder(self) -> J1939Encoder:
+        """Create J1939 encoder for testing."""
+        return J1939Encoder()
+
+    @staticmethod
+    def _reference_encode(
+        encoder: J1939Encoder, pgn: int, spn_values: dict[int, float | None]
+    ) -> bytes:
+        """Encode with the per-SPN bit insertion path."""
+        pgn_def = encoder.decoder.pgn_definitions[pgn]
+        data = bytearray(pgn_def.data_length)
+        for spn_def in pgn_def.spn_definitions:
+            if spn_def.spn in spn_values:
+                raw_value = encoder._encode_spn_value(spn_def, spn_values[spn_def.spn])
+                if raw_value is not None:
+                    encoder._insert_bits(data, spn_def.start_bit, spn_def.bit_length, raw_value)
+        return bytes(data)
+
+    @staticmethod
+    def _random_values(
+        encoder: J1939Encoder, pgn: int, rng: random.Random
+    ) -> dict[int, float | None]:
+        """Build random in- and out-of-range values for every SPN of a PGN."""
+        values: dict[int, float | None] = {}
+        for spn_def in encoder.decoder.pgn_definitions[pgn].spn_definitions:
+            low = spn_def.min_value if spn_def.min_value is not None else spn_def.offset
+            high = spn_def.max_value if spn_def.max_value is not None else low + 1000.0
+            span = high - low
+            values[spn_def.spn] = (
+                None if rng.random() < 0.1 else rng.uniform(low - 0.1 * span, high + 0.1 * span)
+            )
+        return values
+
+    def test_template_matches_reference_encoding(self, encoder: J1939Encoder) -> None:
+        """Test templates produce the same payload as per-SPN bit insertion."""
+        rng = random.Random(6)
+        for pgn in encoder.decoder.pgn_definitions:
+            for _ in range(50):
+                values = self._random_values(encoder, pgn, rng)
+                message = encoder.encode_pgn_message(pgn, 0x25, values)
+                assert message is not None
+                assert message.data == self._reference_encode(encoder, pgn, values)
+
+    def test_template_caches_arbitration_id(self, encoder: J1939Encoder) -> None:
+        """Test templates are cached per PGN, priority and addressing."""
+        template = encoder.get_encode_template(0xF004, 0x00, priority=3)
+
+        assert template is not None
+        assert template.arbitration_id == 0x0CF00400
+        assert encoder.get_encode_template(0xF004, 0x00, priority=3) is template
+        assert encoder.get_encode_template(0xF004, 0x01, priority=3) is not template
+        assert encoder.get_encode_template(0x1234, 0x00) is None
+
+    def test_batch_encode_round_trip(self, encoder: J1939Encoder) -> None:
+        """Test batch encoded payloads decode back to the input values."""
+        codec = CANFrameCodec()
+        speeds = [{190: 800.0 + 10.0 * i, 61: float(i % 100)} for i in range(256)]
+
+        payloads = encoder.encode_batch(0xF004, 0x00, speeds)
+        template = encoder.get_encode_template(0xF004, 0x00)
+
+        assert payloads is not None and template is not None
+        assert payloads.shape == (256, 8)
+        batch = codec.decode_batch(np.full(256, template.arbitration_id), payloads)
+        engine_speed = batch.get_spn_column(190)
+        assert engine_speed is not None
+        np.testing.assert_allclose(engine_speed.values, [v[190] for v in speeds], atol=0.125)
+
+    def test_batch_encode_into_preallocated_buffer(self, encoder: J1939Encoder) -> None:
+        """Test batch encoding fills a caller-provided buffer in place."""
+        buffer = np.full((4, 8), 0xAA, dtype=np.uint8)
+        values = [{84: 10.0}, {84: 20.0}]
+
+        result = encoder.encode_batch(0xFEF1, 0x0B, values, out=buffer)
+
+        assert result is buffer
+        for row, spn_values in enumerate(values):
+            assert bytes(buffer[row]) == self._reference_encode(encoder, 0xFEF1, spn_values)
+        assert bytes(buffer[2]) == b"\xaa" * 8  # Rows beyond the batch untouched
+
+        assert encoder.encode_batch(0xFEF1, 0x0B, values, out=np.zeros((1, 8), np.uint8)) is None
+
+    @pytest.mark.slow
+    @pytest.mark.serial
+    def test_encode_throughput_before_and_after(self, encoder: J1939Encoder) -> None:
+        """Benchmark frames/sec of template encoding against per-SPN bit insertion."""
+        rng = random.Random(7)
+        work = [(0xF004, self._random_values(encoder, 0xF004, rng)) for _ in range(2000)]
+
+        start = time.perf_counter()
+        for pgn, values in work:
+            self._reference_encode(encoder, pgn, values)
+            encoder._construct_j1939_id(pgn, 6, 0x00, 255)
+        before_fps = len(work) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        template = encoder.get_encode_template(0xF004, 0x00)
+        assert template is not None
+        for _, values in work:
+            template.pack(values)
+        after_fps = len(work) / (time.perf_counter() - start)
+
+        # Encoded bytes are checked by test_template_matches_reference_encoding
+        assert after_fps > before_fps
+
+
+class TestCANFrameEnvelope:
+    """Test decode-once frame envelopes."""
+
+    @pytest.fixture
+    def codec(self) -> CANFrameCodec:
+        """Create CAN frame codec for testing."""
+        return CANFrameCodec()
+
+    def test_identifier_fields_parsed_at_creation(self, codec: CANFrameCodec) -> None:
+        """Test envelopes expose J1939 identifier fields without decoding."""
+        broadcast = codec.create_envelope(
+            can.Message(arbitration_id=0x0CFEF10B, data=bytes(8), is_extended_id=True), "can0"
+        )
+        addressed = codec.create_envelope(
+            can.Message(arbitration_id=0x18EA2580, data=bytes(3), is_extended_id=True)
+        )
+
+        assert isinstance(broadcast, CANFrameEnvelope)
+        assert (broadcast.pgn, broadcast.priority, broadcast.source_address) == (0xFEF1, 3, 0x0B)
+        assert broadcast.destination_address == 255
+        assert broadcast.interface_id == "can0"
+        assert (addressed.pgn, addressed.destination_address) == (0xEA00, 0x25)
+        assert not broadcast.is_decoded
+        assert codec.messages_decoded == 0
+
+    def test_decode_is_cached(self, codec: CANFrameCodec) -> None:
+        """Test repeated decode calls reuse the first result."""
+        message = codec.encoder.encode_vehicle_speed(0x0B, 25.5)
+        assert message is not None
+        envelope = codec.create_envelope(message)
+
+        first = envelope.decode()
+        second = envelope.decode()
+
+        assert first is not None
+        assert first is second
+        assert envelope.decode_count == 1
+        assert codec.messages_decoded == 1
+
+    def test_transport_frames_fed_to_reassembler_once(self, codec: CANFrameCodec) -> None:
+        """Test TP frames are not replayed into the reassembler by later consumers."""
+        bam = can.Message(
+            arbitration_id=0x1CECFF00,
+            data=bytes([0x20, 10, 0, 2, 0xFF, 0xCA, 0xFE, 0x00]),
+            is_extended_id=True,
+        )
+        first_packet = can.Message(
+            arbitration_id=0x1CEBFF00, data=bytes([1]) + bytes(7), is_extended_id=True
+        )
+        last_packet = can.Message(
+            arbitration_id=0x1CEBFF00,
+            data=bytes([2, 1, 2, 3, 0xFF, 0xFF, 0xFF, 0xFF]),
+            is_extended_id=True,
+        )
+
+        envelopes = [codec.create_envelope(m) for m in (bam, first_packet, last_packet)]
+        assert all(envelope.is_transport_protocol for envelope in envelopes)
+        for envelope in envelopes:
+            envelope.decode()
+            envelope.decode()  # A second consumer must not repeat the packet
+
+        completed = envelopes[-1].decode()
+        assert completed is not None
+        assert completed.is_multi_frame
+        assert completed.pgn == 0xFECA
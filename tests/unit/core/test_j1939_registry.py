@@ -0,0 +1,147 @@
+"""
+Test suite for the shared J1939 PGN/SPN definition registry.
+
+Tests loading definitions from data files, the process-wide cache and
+sharing of definitions and compiled decode plans between codecs.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import can
+import pytest
+
+from afs_fastapi.core.can_frame_codec import CANFrameCodec, J1939Decoder, J1939Encoder
+from afs_fastapi.core.j1939_registry import (
+    REGISTRY_PATH_ENV,
+    J1939Registry,
+    J1939RegistryError,
+    get_default_registry,
+    load_registry,
+)
+
+HITCH_REGISTRY = {
+    "format_version": 1,
+    "pgns": [
+        {
+            "pgn": 0xFE45,
+            "name": "Rear Hitch",
+            "description": "Rear hitch position",
+            "data_length": 8,
+            "spns": [
+                {
+                    "spn": 1873,
+                    "name": "Rear Hitch Position",
+                    "data_type": "percentage",
+                    "start_bit": 0,
+                    "bit_length": 8,
+                    "scale": 0.4,
+                    "units": "%",
+                    "min_value": 0,
+                    "max_value": 100,
+                    "not_available_value": 255,
+                    "error_value": 254,
+                }
+            ],
+        }
+    ],
+}
+
+
+class TestJ1939Registry:
+    """Test J1939 registry loading and sharing."""
+
+    @pytest.fixture
+    def hitch_file(self, tmp_path: Path) -> Path:
+        """Write a single-PGN registry data file."""
+        path = tmp_path / "hitch.json"
+        path.write_text(json.dumps(HITCH_REGISTRY), encoding="utf-8")
+        return path
+
+    def test_default_registry_loaded_once(self) -> None:
+        """Test the default registry is cached for the process."""
+        registry = get_default_registry()
+
+        assert get_default_registry() is registry
+        assert 0xF004 in registry.pgn_definitions
+        assert 190 in registry.spn_definitions
+        assert set(registry.decode_plans) == set(registry.pgn_definitions)
+
+    def test_registry_is_read_only(self) -> None:
+        """Test registry lookup tables cannot be modified."""
+        registry = get_default_registry()
+
+        with pytest.raises(TypeError):
+            registry.pgn_definitions[0x1234] = registry.pgn_definitions[0xF004]  # type: ignore[index]
+
+    def test_codecs_share_definitions_and_plans(self) -> None:
+        """Test codecs reuse registry definitions instead of rebuilding them."""
+        first = J1939Decoder()
+        second = J1939Decoder()
+
+        assert first.pgn_definitions[0xF004] is second.pgn_definitions[0xF004]
+        assert first.decode_plans[0xF004] is second.decode_plans[0xF004]
+
+        codec = CANFrameCodec()
+        assert codec.encoder.decoder is codec.decoder
+
+    def test_decoder_registration_stays_local(self) -> None:
+        """Test PGNs registered on one decoder do not leak into the registry."""
+        registry = J1939Registry.from_dict(HITCH_REGISTRY)
+        decoder = J1939Decoder()
+        decoder.register_pgn(registry.pgn_definitions[0xFE45])
+
+        assert 0xFE45 in decoder.pgn_definitions
+        assert 0xFE45 not in get_default_registry().pgn_definitions
+        assert 0xFE45 not in J1939Decoder().pgn_definitions
+
+    def test_codec_from_custom_registry_file(self, hitch_file: Path) -> None:
+        """Test a codec built from a data file decodes and encodes its PGNs."""
+        codec = CANFrameCodec(J1939Registry.from_file(hitch_file))
+
+        message = codec.encode_message(0xFE45, 0x80, {1873: 50.0})
+        assert message is not None
+
+        decoded = codec.decode_message(message)
+        assert decoded is not None
+        assert decoded.name == "Rear Hitch"
+        hitch = next(spn for spn in decoded.spn_values if spn.spn == 1873)
+        assert hitch.value == pytest.approx(50.0)
+        assert codec.get_pgn_definition(0xF004) is None
+
+    def test_registry_path_from_environment(
+        self, hitch_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the default registry path can be overridden without code changes."""
+        monkeypatch.setenv(REGISTRY_PATH_ENV, str(hitch_file))
+
+        registry = get_default_registry()
+
+        assert registry is load_registry(str(hitch_file))
+        assert set(registry.pgn_definitions) == {0xFE45}
+
+    def test_malformed_registry_rejected(self, tmp_path: Path) -> None:
+        """Test malformed data files raise a registry error."""
+        bad_version = tmp_path / "bad_version.json"
+        bad_version.write_text(json.dumps({"format_version": 99, "pgns": []}), encoding="utf-8")
+        missing_field = tmp_path / "missing_field.json"
+        missing_field.write_text(
+            json.dumps({"format_version": 1, "pgns": [{"pgn": 1}]}), encoding="utf-8"
+        )
+
+        for path in (bad_version, missing_field, tmp_path / "absent.json"):
+            with pytest.raises(J1939RegistryError):
+                J1939Registry.from_file(path)
+
+    def test_standalone_encoder_uses_shared_registry(self) -> None:
+        """Test encoders built without a decoder still encode registry PGNs."""
+        encoder = J1939Encoder()
+
+        message = encoder.encode_vehicle_speed(0x0B, 25.5)
+
+        assert isinstance(message, can.Message)
+        assert encoder.decoder.pgn_definitions[0xFEF1] is (
+            get_default_registry().pgn_definitions[0xFEF1]
+        )
@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the database test suites.
+
+Provides time-series storage backed by a temporary SQLite database; test
+modules override ``storage_options`` to configure it differently.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+
+from afs_fastapi.database.can_time_series_storage import (
+    CANTimeSeriesStorage,
+    TimeSeriesStorageConfig,
+)
+
+
+@pytest.fixture
+def storage_options() -> dict[str, Any]:
+    """Extra TimeSeriesStorageConfig options for the ``storage`` fixture."""
+    return {}
+
+
+@pytest_asyncio.fixture
+async def storage(
+    tmp_path: Path, storage_options: dict[str, Any]
+) -> AsyncGenerator[CANTimeSeriesStorage, None]:
+    """Create storage backed by a temporary SQLite database."""
+    storage = CANTimeSeriesStorage(
+        TimeSeriesStorageConfig(
+            database_url=f"sqlite+aiosqlite:///{tmp_path / 'timeseries.db'}",
+            max_connections=1,
+            **storage_options,
+        )
+    )
+    assert await storage.initialize()
+    yield storage
+    await storage.shutdown()
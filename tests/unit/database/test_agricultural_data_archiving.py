@@ -10,7 +10,11 @@ Implementation follows Test-First Development (TDD) RED phase.
 
 from __future__ import annotations
 
+import gzip
+import io
+import json
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 
 import pytest
 from sqlalchemy import create_engine
@@ -18,9 +22,11 @@ from sqlalchemy.orm import sessionmaker
 
 from afs_fastapi.database.agricultural_archiving import (
     ArchivalManager,
+    _CompressedArchiveStream,
     ArchivalStatus,
     DataLifecycleStage,
     DataRetentionPolicy,
+    LocalArchiveStore,
     RetentionPeriod,
 )
 from afs_fastapi.database.agricultural_schemas import (
@@ -232,7 +238,7 @@ class TestAgriculturalDataArchiving:
         assert len(expired_data) == 20  # All old messages
         assert all(msg.timestamp < datetime.now() - timedelta(days=30) for msg in expired_data)
 
-    def test_data_archival_process(self, db_session, sample_equipment) -> None:
+    def test_data_archival_process(self, db_session, sample_equipment, tmp_path) -> None:
         """Test complete data archival process for agricultural records."""
         # RED: Test end-to-end archival workflow
 
@@ -241,6 +247,7 @@ class TestAgriculturalDataArchiving:
             database_session=db_session,
             storage_backend="local",  # Use local for testing
             compression_algorithm="gzip",
+            archive_root=tmp_path,
         )
 
         # Create field for sensor data
@@ -291,6 +298,7 @@ class TestAgriculturalDataArchiving:
         assert archival_result.records_archived == 50
         assert archival_result.compression_ratio > 0.1  # Some compression achieved
         assert archival_result.archive_location is not None
+        assert list(Path(archival_result.archive_location).glob("segment_*.seg"))
 
         # Verify records were removed from active database
         remaining_records = (
@@ -406,16 +414,35 @@ class TestAgriculturalDataArchiving:
         assert compliance_check.compliance_category == "safety_critical"
         assert compliance_check.regulatory_basis == "agricultural_safety_regulations"
 
-    def test_archival_recovery_process(self, db_session) -> None:
+    def test_archival_recovery_process(self, db_session, sample_equipment, tmp_path) -> None:
         """Test recovery of archived agricultural data when needed."""
-        # RED: Test data recovery from archival storage
+        archival_manager = ArchivalManager(
+            database_session=db_session, batch_size=10, archive_root=tmp_path
+        )
 
-        # Create archival manager
-        archival_manager = ArchivalManager(database_session=db_session)
+        # 30 readings 5 days apart from 2024-01-01, alternating between two tractors
+        for i in range(30):
+            db_session.add(
+                AgriculturalSensorRecord(
+                    timestamp=datetime(2024, 1, 1) + timedelta(days=5 * i),
+                    equipment_id="TEST_TRACTOR_ARCHIVE" if i % 2 == 0 else "OTHER_TRACTOR",
+                    sensor_type=SensorType.SOIL_MOISTURE.value,
+                    sensor_value=40.0 + i,
+                    unit="percent",
+                )
+            )
+        db_session.commit()
+        policy = DataRetentionPolicy(
+            policy_id="SENSOR_DATA_2024",
+            table_name="agricultural_sensor_data",
+            retention_period=RetentionPeriod.DAYS_365,
+            lifecycle_stage=DataLifecycleStage.DAILY_AGGREGATION,
+        )
+        assert archival_manager.archive_expired_data(policy).records_archived == 30
+        db_session.commit()
 
-        # Simulate archived data recovery request
         recovery_request = {
-            "archive_id": "SENSOR_DATA_2024_Q1",
+            "archive_id": "SENSOR_DATA_2024",
             "table_name": "agricultural_sensor_data",
             "date_range": {"start": datetime(2024, 1, 1), "end": datetime(2024, 3, 31)},
             "equipment_ids": ["TEST_TRACTOR_ARCHIVE"],
@@ -423,17 +450,202 @@ class TestAgriculturalDataArchiving:
             "restore_location": "temporary_restoration_table",
         }
 
+        # Index selects 2 of 6 blocks (3 chunks x 2 tractors)
+        store = LocalArchiveStore(tmp_path)
+        assert len(store.find_blocks()) == 6
+        assert (
+            len(
+                store.find_blocks(
+                    "SENSOR_DATA_2024",
+                    "agricultural_sensor_data",
+                    datetime(2024, 1, 1),
+                    datetime(2024, 3, 31),
+                    ["TEST_TRACTOR_ARCHIVE"],
+                )
+            )
+            == 2
+        )
+
         # Test recovery process
         recovery_result = archival_manager.restore_archived_data(recovery_request)
 
-        # Test recovery result structure
-        assert recovery_result.status in [ArchivalStatus.SUCCESS, ArchivalStatus.IN_PROGRESS]
-        assert recovery_result.restoration_id is not None
-        assert recovery_result.estimated_records > 0
-        assert recovery_result.estimated_completion_time is not None
+        # Days 0, 10, ..., 90 of the first tractor
+        assert recovery_result.status == ArchivalStatus.SUCCESS
+        assert recovery_result.estimated_records == 10
+        restored = db_session.query(AgriculturalSensorRecord).order_by("timestamp").all()
+        assert [record.sensor_value for record in restored] == [40.0 + i for i in range(0, 19, 2)]
+        assert restored[-1].timestamp == datetime(2024, 3, 31)
 
         # Test recovery status monitoring
         status = archival_manager.get_recovery_status(recovery_result.restoration_id)
         assert status.restoration_id == recovery_result.restoration_id
-        assert status.progress_percentage >= 0
-        assert status.current_stage in ["decompression", "validation", "restoration", "completed"]
+        assert status.progress_percentage == 100.0
+        assert status.current_stage == "completed"
+        assert archival_manager.get_recovery_status("restore_unknown").error_message
+
+    def test_restore_is_idempotent_and_atomic(
+        self, db_session, sample_equipment, tmp_path, monkeypatch
+    ) -> None:
+        """Test restoring twice adds nothing and a failed restore leaves no rows behind."""
+        archival_manager = ArchivalManager(
+            database_session=db_session, batch_size=10, archive_root=tmp_path
+        )
+        for i in range(30):
+            db_session.add(
+                AgriculturalSensorRecord(
+                    timestamp=datetime(2024, 1, 1) + timedelta(days=5 * i),
+                    equipment_id="TEST_TRACTOR_ARCHIVE",
+                    sensor_type=SensorType.SOIL_MOISTURE.value,
+                    sensor_value=40.0 + i,
+                    unit="percent",
+                )
+            )
+        db_session.commit()
+        policy = DataRetentionPolicy(
+            policy_id="SENSOR_DATA_2024",
+            table_name="agricultural_sensor_data",
+            retention_period=RetentionPeriod.DAYS_365,
+            lifecycle_stage=DataLifecycleStage.DAILY_AGGREGATION,
+        )
+        assert archival_manager.archive_expired_data(policy).records_archived == 30
+        db_session.commit()
+        request = {"archive_id": "SENSOR_DATA_2024"}
+
+        assert archival_manager.restore_archived_data(request).estimated_records == 30
+        again = archival_manager.restore_archived_data(request)
+        assert again.status == ArchivalStatus.SUCCESS
+        assert again.estimated_records == 0
+        assert db_session.query(AgriculturalSensorRecord).count() == 30
+
+        db_session.query(AgriculturalSensorRecord).delete()
+        db_session.commit()
+        store = archival_manager._archive_store
+        read_block = store.read_block
+        reads = []
+
+        def fail_third_block(*args):
+            reads.append(args)
+            if len(reads) == 3:
+                raise OSError("archive segment unreadable")
+            return read_block(*args)
+
+        monkeypatch.setattr(store, "read_block", fail_third_block)
+        failed = archival_manager.restore_archived_data(request)
+
+        assert failed.status == ArchivalStatus.FAILED
+        assert db_session.query(AgriculturalSensorRecord).count() == 0
+
+    def test_restore_requires_local_backend(self, db_session) -> None:
+        """Test remote backends report a failed restore instead of simulating one."""
+        archival_manager = ArchivalManager(database_session=db_session, storage_backend="s3")
+
+        recovery_result = archival_manager.restore_archived_data({"archive_id": "ANY"})
+
+        assert recovery_result.status == ArchivalStatus.FAILED
+        status = archival_manager.get_recovery_status(recovery_result.restoration_id)
+        assert status.error_message is not None
+
+    def test_archive_segments_roll_over(self, tmp_path) -> None:
+        """Test blocks are appended across segments and read back by offset."""
+        store = LocalArchiveStore(tmp_path, max_segment_bytes=200)
+        start = datetime(2024, 6, 1, tzinfo=UTC)
+        for i in range(6):
+            payload = "".join(
+                json.dumps({"timestamp": start.isoformat(), "data": {"value": i * 10 + j}}) + "\n"
+                for j in range(10)
+            ).encode()
+            store.append_block(
+                "ARCHIVE", "tractor_telemetry", f"T{i % 2}", start, start, 10, payload, "gzip"
+            )
+        store.close()
+
+        blocks = store.find_blocks("ARCHIVE", equipment_ids=["T1"])
+        assert len({block.segment for _, block in store.find_blocks()}) > 1
+        assert [
+            record["data"]["value"]
+            for archive_id, block in blocks
+            for record in store.read_block(archive_id, block)
+        ] == [value for i in (1, 3, 5) for value in range(i * 10, i * 10 + 10)]
+
+    def test_chunked_archival_deletes_only_expired_rows(
+        self, db_session, sample_equipment, tmp_path
+    ) -> None:
+        """Test expired rows are archived chunk by chunk and newer rows are kept."""
+        archival_manager = ArchivalManager(
+            database_session=db_session, batch_size=7, archive_root=tmp_path
+        )
+        now = datetime.now(UTC)
+        db_session.add_all(
+            TractorTelemetryRecord(
+                timestamp=now - timedelta(days=400 if i < 20 else 10, minutes=i),
+                equipment_id="TEST_TRACTOR_ARCHIVE",
+                vehicle_speed=10.0 + i,
+                fuel_level=80.0,
+                engine_temperature=85.0,
+                operational_mode="testing",
+            )
+            for i in range(25)
+        )
+        db_session.commit()
+        policy = DataRetentionPolicy(
+            policy_id="TEST_TELEMETRY_RETENTION",
+            table_name="tractor_telemetry",
+            retention_period=RetentionPeriod.DAYS_365,
+            lifecycle_stage=DataLifecycleStage.DAILY_AGGREGATION,
+        )
+
+        result = archival_manager.archive_expired_data(policy)
+
+        assert result.status == ArchivalStatus.SUCCESS
+        assert result.records_archived == 20
+        assert result.metadata is not None
+        assert result.metadata["chunks"] == 3  # 7 + 7 + 6
+        assert result.metadata["compressed_size"] < result.metadata["original_size"]
+        assert db_session.query(TractorTelemetryRecord).count() == 5
+
+        # Nothing left to archive
+        assert archival_manager.archive_expired_data(policy).records_archived == 0
+
+    def test_uncompressed_archival(self, db_session, sample_equipment, tmp_path) -> None:
+        """Test policies without compression report no compression gain."""
+        archival_manager = ArchivalManager(database_session=db_session, archive_root=tmp_path)
+        db_session.add(
+            ISOBUSMessageRecord(
+                timestamp=datetime.now(UTC) - timedelta(days=60),
+                equipment_id="TEST_TRACTOR_ARCHIVE",
+                pgn=0xF004,
+                source_address=0x70,
+                destination_address=0xFF,
+                data_payload={"engine_speed": 1800.0},
+            )
+        )
+        db_session.commit()
+        policy = DataRetentionPolicy(
+            policy_id="TEST_ISOBUS_RETENTION",
+            table_name="isobus_messages",
+            retention_period=RetentionPeriod.DAYS_30,
+            lifecycle_stage=DataLifecycleStage.REAL_TIME,
+            compression_enabled=False,
+        )
+
+        result = archival_manager.archive_expired_data(policy)
+
+        assert result.status == ArchivalStatus.SUCCESS
+        assert result.records_archived == 1
+        assert result.compression_ratio == 0.0
+        assert result.metadata is not None
+        assert result.metadata["compression"] is None
+
+    def test_compressed_archive_stream(self) -> None:
+        """Test streamed chunks decompress to the written data and sizes are exact."""
+        sink = io.BytesIO()
+        stream = _CompressedArchiveStream("gzip", sink)
+        lines = [json.dumps({"id": i, "value": i * 0.5}) + "\n" for i in range(200)]
+
+        for start in range(0, len(lines), 50):
+            stream.write("".join(lines[start : start + 50]).encode())
+        stream.close()
+
+        assert gzip.decompress(sink.getvalue()).decode() == "".join(lines)
+        assert stream.original_size == len("".join(lines))
+        assert stream.compressed_size == len(sink.getvalue())
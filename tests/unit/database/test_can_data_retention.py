@@ -0,0 +1,272 @@
+"""
+Test suite for CAN data retention and archival.
+
+Tests keyset-paginated streaming archival into per-partition archive files
+and removal of the archived rows on the SQLite fallback.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import can
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import Delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from afs_fastapi.database.can_data_retention import (
+    ArchivalStrategy,
+    CANDataRetentionManager,
+    CompressionFormat,
+    RetentionPolicy,
+    RetentionRule,
+)
+from afs_fastapi.database.can_message_buffer import BufferedCANMessage
+from afs_fastapi.database.can_time_series_schema import CANMessageRaw
+from afs_fastapi.database.can_time_series_storage import (
+    CANTimeSeriesStorage,
+)
+
+DAY_ONE = datetime(2025, 3, 1, 20, 0, tzinfo=UTC)
+
+
+def _messages(start: datetime, count: int, step: timedelta) -> list[BufferedCANMessage]:
+    """Create raw frames received ``step`` apart."""
+    return [
+        BufferedCANMessage(
+            raw_message=can.Message(
+                arbitration_id=0x18FEF100 | index % 4,
+                data=index.to_bytes(2, "little") * 4,
+                is_extended_id=True,
+            ),
+            interface_id="can0",
+            reception_time=start + step * index,
+            retention_policy="diagnostic" if index % 2 else "standard",
+        )
+        for index in range(count)
+    ]
+
+
+def _rule(compression_format: CompressionFormat = CompressionFormat.PARQUET) -> RetentionRule:
+    return RetentionRule(
+        name="raw_archive",
+        policy=RetentionPolicy.OPERATIONAL,
+        retention_period=timedelta(days=365),
+        archival_strategy=ArchivalStrategy.COMPRESSED,
+        compression_format=compression_format,
+        table_pattern="can_messages_raw",
+        archive_after=timedelta(days=30),
+        batch_size=7,
+    )
+
+
+async def _raw_count(storage: CANTimeSeriesStorage) -> int:
+    async with storage._get_async_session() as session:
+        return (await session.execute(select(func.count()).select_from(CANMessageRaw))).scalar_one()
+
+
+class TestStreamingArchival:
+    """Test streaming archival of old rows."""
+
+    @pytest.mark.asyncio
+    async def test_pages_stream_into_one_file_per_partition(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path
+    ) -> None:
+        """Test every page lands in its day's file and archived rows are removed."""
+        # 30 frames 10 minutes apart span two UTC days; 5 newer frames stay
+        assert await storage.store_messages_batch(_messages(DAY_ONE, 30, timedelta(minutes=10)))
+        assert await storage.store_messages_batch(
+            _messages(DAY_ONE + timedelta(days=60), 5, timedelta(minutes=1))
+        )
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+        archive_cutoff = DAY_ONE + timedelta(days=30)
+
+        archived = await manager._archive_table_data(
+            "can_messages_raw", _rule(), archive_cutoff, DAY_ONE - timedelta(days=365)
+        )
+
+        assert archived == 30
+        assert await _raw_count(storage) == 5
+        files = sorted((tmp_path / "archives").rglob("*.parquet"))
+        assert [file.name for file in files] == [
+            "can_messages_raw_20250301_20250331T200000.parquet",
+            "can_messages_raw_20250302_20250331T200000.parquet",
+        ]
+
+        tables = [pq.read_table(file) for file in files]
+        assert [table.num_rows for table in tables] == [24, 6]
+        # 24 rows in pages of 7 (7, 7, 7, 3): one row group per page run
+        assert pq.ParquetFile(files[0]).num_row_groups == 4
+        payloads = [
+            int.from_bytes(data[:2], "little")
+            for table in tables
+            for data in table.column("data").to_pylist()
+        ]
+        assert payloads == list(range(30))
+        assert tables[0].schema.field("timestamp").type.tz == "UTC"
+        assert manager.stats["archive_size_mb"] > 0
+
+    @pytest.mark.asyncio
+    async def test_large_partition_rotates_files_and_deletes_as_it_goes(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a partition spills into several files, each deleted once it is complete."""
+        assert await storage.store_messages_batch(_messages(DAY_ONE, 30, timedelta(minutes=10)))
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+        rule = _rule()
+        rule.pages_per_archive_file = 2
+        close_archive_file = manager._close_archive_file
+        pending_pages: list[int] = []
+        remaining_rows: list[int] = []
+
+        async def record_close(*args: Any) -> int:
+            pending_pages.append(len(args[2]))
+            archived = await close_archive_file(*args)
+            remaining_rows.append(await _raw_count(storage))
+            return archived
+
+        monkeypatch.setattr(manager, "_close_archive_file", record_close)
+
+        archived = await manager._archive_table_data(
+            "can_messages_raw", rule, DAY_ONE + timedelta(days=30), DAY_ONE - timedelta(days=1)
+        )
+
+        assert archived == 30
+        files = sorted((tmp_path / "archives").rglob("*.parquet"))
+        assert [file.name for file in files] == [
+            "can_messages_raw_20250301_20250331T200000.parquet",
+            "can_messages_raw_20250301_20250331T200000_1.parquet",
+            "can_messages_raw_20250302_20250331T200000.parquet",
+        ]
+        assert [pq.read_table(file).num_rows for file in files] == [14, 10, 6]
+        assert pending_pages == [2, 2, 2]
+        assert remaining_rows == [16, 6, 0]
+
+    @pytest.mark.asyncio
+    async def test_where_clause_limits_archived_rows(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path
+    ) -> None:
+        """Test only rows matching the rule are archived and deleted."""
+        assert await storage.store_messages_batch(_messages(DAY_ONE, 20, timedelta(minutes=1)))
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+        rule = _rule(CompressionFormat.GZIP_CSV)
+        rule.where_clause = "retention_policy = 'diagnostic'"
+
+        archived = await manager._archive_table_data(
+            "can_messages_raw", rule, DAY_ONE + timedelta(days=30), DAY_ONE - timedelta(days=1)
+        )
+
+        assert archived == 10
+        assert await _raw_count(storage) == 10
+        (archive_file,) = (tmp_path / "archives").rglob("*.csv.gz")
+        table = pa_csv.read_csv(archive_file)
+        assert table.num_rows == 10
+        assert set(table.column("retention_policy").to_pylist()) == {"diagnostic"}
+
+    @pytest.mark.asyncio
+    async def test_rows_inserted_during_archival_kept(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a late row landing inside an archived key range is not deleted unarchived."""
+        assert await storage.store_messages_batch(_messages(DAY_ONE, 20, timedelta(minutes=1)))
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+        close_archive_file = manager._close_archive_file
+
+        async def insert_late_row(*args: Any) -> int:
+            assert await storage.store_messages_batch(
+                _messages(DAY_ONE + timedelta(seconds=30), 1, timedelta(0))
+            )
+            return await close_archive_file(*args)
+
+        monkeypatch.setattr(manager, "_close_archive_file", insert_late_row)
+
+        archived = await manager._archive_table_data(
+            "can_messages_raw", _rule(), DAY_ONE + timedelta(days=30), DAY_ONE - timedelta(days=1)
+        )
+
+        assert archived == 20
+        assert await _raw_count(storage) == 1
+
+    @pytest.mark.asyncio
+    async def test_error_reports_partitions_already_archived(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a failure in a later partition still counts the archived ones."""
+        assert await storage.store_messages_batch(_messages(DAY_ONE, 30, timedelta(minutes=10)))
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+        close_archive_file = manager._close_archive_file
+        calls = []
+
+        async def fail_second_partition(*args: Any) -> int:
+            calls.append(args)
+            if len(calls) == 2:
+                raise OSError("disk full")
+            return await close_archive_file(*args)
+
+        monkeypatch.setattr(manager, "_close_archive_file", fail_second_partition)
+
+        archived = await manager._archive_table_data(
+            "can_messages_raw", _rule(), DAY_ONE + timedelta(days=30), DAY_ONE - timedelta(days=1)
+        )
+
+        assert archived == 24
+        assert await _raw_count(storage) == 6
+        # The failed file is removed so its rows are archived once, by the next run
+        files = sorted((tmp_path / "archives").rglob("*.parquet"))
+        assert [file.name for file in files] == [
+            "can_messages_raw_20250301_20250331T200000.parquet"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_row_deletion_keeps_rows_and_drops_file(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a deletion failing after some pages leaves every row of the file in the table."""
+        assert await storage.store_messages_batch(_messages(DAY_ONE, 20, timedelta(minutes=1)))
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+        get_session = storage._get_async_session
+        deleted_pages: list[Any] = []
+
+        @asynccontextmanager
+        async def session_failing_second_delete() -> AsyncIterator[AsyncSession]:
+            async with get_session() as session:
+                execute = session.execute
+
+                async def execute_statement(statement: Any, *args: Any, **kwargs: Any) -> Any:
+                    if isinstance(statement, Delete):
+                        if deleted_pages:
+                            raise OSError("connection lost")
+                        deleted_pages.append(statement)
+                    return await execute(statement, *args, **kwargs)
+
+                session.execute = execute_statement  # type: ignore[method-assign]
+                yield session
+
+        monkeypatch.setattr(storage, "_get_async_session", session_failing_second_delete)
+        archived = await manager._archive_table_data(
+            "can_messages_raw", _rule(), DAY_ONE + timedelta(days=30), DAY_ONE - timedelta(days=1)
+        )
+        monkeypatch.undo()
+
+        assert archived == 0
+        assert len(deleted_pages) == 1
+        assert await _raw_count(storage) == 20
+        assert not list((tmp_path / "archives").rglob("*.parquet"))
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_archive(self, storage: CANTimeSeriesStorage, tmp_path: Path) -> None:
+        """Test an empty range writes no files."""
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+
+        archived = await manager._archive_table_data(
+            "can_messages_raw", _rule(), DAY_ONE, DAY_ONE - timedelta(days=1)
+        )
+
+        assert archived == 0
+        assert not (tmp_path / "archives").exists()
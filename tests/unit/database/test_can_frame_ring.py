@@ -0,0 +1,243 @@
+"""
+Test suite for columnar CAN frame ring storage.
+
+Tests preallocated ring capacity, byte budgets, wraparound, zero-copy
+batches and vectorized decoding of buffered frames.
+"""
+
+from __future__ import annotations
+
+import can
+import numpy as np
+import pytest
+
+from afs_fastapi.core.can_frame_codec import CANFrameCodec
+from afs_fastapi.database.can_frame_ring import CANFrameRing
+from afs_fastapi.database.can_time_series_schema import CANMessagePriority
+
+
+def _frame(index: int) -> can.Message:
+    """Create an extended frame whose first payload bytes encode its index."""
+    return can.Message(
+        timestamp=1000.0 + index,
+        arbitration_id=0x18FEF100 | (index & 0xFF),
+        data=index.to_bytes(2, "little") + b"\xff" * 6,
+        is_extended_id=True,
+    )
+
+
+class TestCANFrameRing:
+    """Test the columnar frame ring."""
+
+    def test_capacity_from_memory_budget(self) -> None:
+        """Test ring capacity is derived from the byte budget."""
+        ring = CANFrameRing.for_memory_budget(1024 * 1024)
+
+        assert CANFrameRing.frame_bytes() == 25
+        assert ring.capacity == 1024 * 1024 // 25
+        assert ring.nbytes <= 1024 * 1024
+        assert CANFrameRing.for_memory_budget(1024 * 1024, max_frames=100).capacity == 100
+        assert CANFrameRing.for_memory_budget(1024 * 1024, payload_bytes=64).capacity == (
+            1024 * 1024 // 81
+        )
+
+    def test_append_rejects_when_full_or_too_wide(self) -> None:
+        """Test a full ring and oversized payloads are rejected."""
+        ring = CANFrameRing(2)
+        fd_frame = can.Message(arbitration_id=0x123, data=bytes(12), is_fd=True)
+
+        assert ring.append(fd_frame, "can0", CANMessagePriority.NORMAL) is False
+        assert ring.append(_frame(0), "can0", CANMessagePriority.NORMAL) is True
+        assert ring.append(_frame(1), "can0", CANMessagePriority.NORMAL) is True
+        assert ring.is_full
+        assert ring.append(_frame(2), "can0", CANMessagePriority.NORMAL) is False
+
+    def test_batches_are_views_and_round_trip(self) -> None:
+        """Test batches share ring memory and rebuild the original frames."""
+        ring = CANFrameRing(8)
+        ring.append(_frame(0), "can0", CANMessagePriority.HIGH)
+        ring.append(_frame(1), "can1", CANMessagePriority.LOW)
+
+        batch = ring.peek(10)
+
+        assert len(batch) == 2
+        assert np.shares_memory(batch.payloads, ring._payloads)
+        message = batch.message(1)
+        assert message.arbitration_id == 0x18FEF101
+        assert message.is_extended_id
+        assert bytes(message.data) == _frame(1).data
+        assert message.timestamp == pytest.approx(1001.0)
+        assert batch.interface_id(0) == "can0"
+        assert batch.interface_id(1) == "can1"
+        assert batch.priority(0) == CANMessagePriority.HIGH
+
+    def test_wraparound_yields_contiguous_batches(self) -> None:
+        """Test frames are returned in order across the end of the arrays."""
+        ring = CANFrameRing(4)
+        for index in range(3):
+            ring.append(_frame(index), "can0", CANMessagePriority.NORMAL)
+        ring.consume(2)
+        for index in range(3, 6):
+            ring.append(_frame(index), "can0", CANMessagePriority.CRITICAL)
+
+        first = ring.peek(10)
+        ring.consume(len(first))
+        second = ring.peek(10)
+
+        order = [
+            int(batch.payloads[row, 0]) for batch in (first, second) for row in range(len(batch))
+        ]
+        assert order == [2, 3, 4, 5]
+        assert len(first) == 2
+
+    def test_count_priority_across_wrap(self) -> None:
+        """Test priority counts include frames on both sides of the wrap."""
+        ring = CANFrameRing(4)
+        for index in range(4):
+            ring.append(_frame(index), "can0", CANMessagePriority.NORMAL)
+        ring.consume(3)
+        ring.append(_frame(4), "can0", CANMessagePriority.CRITICAL)
+        ring.append(_frame(5), "can0", CANMessagePriority.CRITICAL)
+
+        assert ring.count_priority(CANMessagePriority.CRITICAL) == 2
+        assert ring.count_priority(CANMessagePriority.NORMAL) == 1
+
+    def test_evict_lowest_priority_across_wrap(self) -> None:
+        """Test eviction releases the oldest lowest priority frame across the wrap."""
+        ring = CANFrameRing(4)
+        for index in range(2):
+            ring.append(_frame(index), "can0", CANMessagePriority.NORMAL)
+        ring.consume(2)
+        priorities = [
+            CANMessagePriority.CRITICAL,
+            CANMessagePriority.HIGH,
+            CANMessagePriority.LOW,
+            CANMessagePriority.LOW,
+        ]
+        for index, priority in enumerate(priorities, start=2):
+            ring.append(_frame(index), "can0", priority)
+
+        assert ring.evict_lowest_priority(CANMessagePriority.LOW)
+        assert ring.evict_lowest_priority(CANMessagePriority.CRITICAL)
+
+        order = []
+        while len(ring):
+            batch = ring.peek(4)
+            order.extend(int(batch.payloads[row, 0]) for row in range(len(batch)))
+            ring.consume(len(batch))
+        assert order == [2, 3]
+        assert ring.count_priority(CANMessagePriority.LOW) == 0
+
+    def test_evicted_slot_takes_the_oldest_frame(self) -> None:
+        """Test the oldest frame moves into the evicted slot instead of shifting the ring."""
+        ring = CANFrameRing(4)
+        priorities = [
+            CANMessagePriority.CRITICAL,
+            CANMessagePriority.HIGH,
+            CANMessagePriority.LOW,
+            CANMessagePriority.NORMAL,
+        ]
+        for index, priority in enumerate(priorities):
+            ring.append(_frame(index), "can0", priority)
+
+        assert ring.evict_lowest_priority(CANMessagePriority.NORMAL)
+
+        batch = ring.peek(4)
+        assert [int(batch.payloads[row, 0]) for row in range(len(batch))] == [1, 0, 3]
+        assert [batch.priority(row) for row in range(len(batch))] == [
+            CANMessagePriority.HIGH,
+            CANMessagePriority.CRITICAL,
+            CANMessagePriority.NORMAL,
+        ]
+
+    def test_eviction_matches_a_full_scan(self) -> None:
+        """Test counts and victims stay exact through mixed appends, flushes and prepends."""
+        rng = np.random.default_rng(7)
+        levels = list(CANMessagePriority)
+        ring = CANFrameRing(16)
+        expected: list[tuple[int, CANMessagePriority]] = []
+
+        for index in range(2000):
+            action = rng.integers(10)
+            priority = levels[int(rng.integers(len(levels)))]
+            if action < 6:
+                if ring.is_full:
+                    lowest = max(value.value for _, value in expected)
+                    evicted = ring.evict_lowest_priority(priority)
+                    assert evicted == (lowest >= priority.value)
+                    if not evicted:
+                        continue
+                    victim = next(
+                        row for row, (_, value) in enumerate(expected) if value.value == lowest
+                    )
+                    if victim:
+                        expected[victim] = expected[0]
+                    del expected[0]
+                assert ring.append(_frame(index), "can0", priority)
+                expected.append((index & 0xFF, priority))
+            elif action < 9:
+                batch = ring.peek(int(rng.integers(1, 6))).copy()
+                ring.consume(len(batch))
+                if action == 8 and len(batch):
+                    stored = ring.prepend(batch)
+                    assert stored == len(batch)
+                    continue
+                del expected[: len(batch)]
+
+            for level in levels:
+                assert ring.count_priority(level) == sum(value == level for _, value in expected)
+            buffered = []
+            for offset in range(len(ring)):
+                slot = (ring._head + offset) % ring.capacity
+                buffered.append(
+                    (int(ring._payloads[slot, 0]), CANMessagePriority(int(ring._priorities[slot])))
+                )
+            assert buffered == expected
+
+    def test_evict_lowest_priority_spares_higher_priorities(self) -> None:
+        """Test nothing is evicted when every frame outranks the incoming one."""
+        ring = CANFrameRing(2)
+        ring.append(_frame(0), "can0", CANMessagePriority.CRITICAL)
+        ring.append(_frame(1), "can0", CANMessagePriority.HIGH)
+
+        assert not ring.evict_lowest_priority(CANMessagePriority.NORMAL)
+        assert len(ring) == 2
+        assert ring.evict_lowest_priority(CANMessagePriority.HIGH)
+        assert int(ring.peek(2).payloads[0, 0]) == 0
+
+    def test_batch_decodes_vectorized(self) -> None:
+        """Test a batch decodes through the codec's columnar decoder."""
+        codec = CANFrameCodec()
+        ring = CANFrameRing(8)
+        message = codec.encoder.encode_vehicle_speed(0x0B, 12.5)
+        assert message is not None
+        ring.append(message, "can0", CANMessagePriority.NORMAL)
+
+        decoded = ring.peek(8).decode(codec)
+
+        speed = decoded.get_spn_column(84)
+        assert speed is not None
+        assert speed.values[0] == pytest.approx(12.5)
+
+    def test_copied_batch_can_be_restored(self) -> None:
+        """Test a batch copied out of the ring is stored back ahead of newer frames."""
+        ring = CANFrameRing(3)
+        for index in range(3):
+            ring.append(_frame(index), f"can{index}", CANMessagePriority.NORMAL)
+
+        batch = ring.peek(2).copy()
+        ring.consume(2)
+        ring.append(_frame(3), "can3", CANMessagePriority.NORMAL)
+
+        assert not np.shares_memory(batch.payloads, ring._payloads)
+        assert ring.prepend(batch) == 1
+
+        restored = ring.peek(3)
+        ring.consume(len(restored))
+        restored_tail = ring.peek(3)
+        rows = [
+            (int(part.payloads[row, 0]), part.interface_id(row))
+            for part in (restored, restored_tail)
+            for row in range(len(part))
+        ]
+        assert rows == [(1, "can1"), (2, "can2"), (3, "can3")]
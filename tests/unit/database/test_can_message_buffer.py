@@ -0,0 +1,538 @@
+"""
+Test suite for CAN message buffering.
+
+Tests deduplication, storage modes, background writes and statistics of the
+high-throughput CAN message buffer feeding time-series storage.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tracemalloc
+
+import can
+import pytest
+
+from afs_fastapi.core.can_frame_codec import CANFrameCodec
+from afs_fastapi.database.can_frame_ring import CANFrameBatch, CANFrameRing
+from afs_fastapi.database.can_message_buffer import (
+    BufferConfiguration,
+    BufferedCANMessage,
+    BufferStorageMode,
+    BufferStrategy,
+    CANMessageBuffer,
+    DeduplicationIndex,
+)
+from afs_fastapi.database.can_time_series_schema import CANMessagePriority
+
+
+def _frame(arbitration_id: int = 0x18FEF10B, data: bytes = bytes(8)) -> can.Message:
+    """Create an extended CAN frame."""
+    return can.Message(arbitration_id=arbitration_id, data=data, is_extended_id=True)
+
+
+class TestDeduplicationIndex:
+    """Test the sliding-window deduplication index."""
+
+    def test_repeat_within_window_is_duplicate(self) -> None:
+        """Test a key repeated inside the window is reported once as duplicate."""
+        index = DeduplicationIndex(window=1.0)
+
+        assert index.check_and_add(1, now=100.0) is False
+        assert index.check_and_add(1, now=100.5) is True
+        assert index.check_and_add(2, now=100.5) is False
+        assert index.duplicates == 1
+        assert index.lookups == 3
+        assert index.duplicate_rate == pytest.approx(100 / 3)
+
+    def test_keys_expire_after_window(self) -> None:
+        """Test keys are forgotten exactly one window after first being seen."""
+        index = DeduplicationIndex(window=1.0)
+
+        index.check_and_add(1, now=100.0)
+        index.check_and_add(2, now=100.9)
+
+        # Key 1 sits in the previous generation but is older than the window
+        assert index.check_and_add(1, now=101.1) is False
+        # Key 2 sits in the previous generation and is still inside the window
+        assert index.check_and_add(2, now=101.1) is True
+
+    def test_expired_generations_discarded_in_bulk(self) -> None:
+        """Test idle periods drop every tracked key without scanning them."""
+        index = DeduplicationIndex(window=1.0)
+        for key in range(1000):
+            index.check_and_add(key, now=100.0)
+
+        assert index.check_and_add(0, now=103.0) is False
+        assert len(index) == 1
+
+    def test_message_key_distinguishes_id_and_payload(self) -> None:
+        """Test keys differ by arbitration ID and payload but not by object."""
+        key = DeduplicationIndex.message_key(_frame())
+
+        assert key == DeduplicationIndex.message_key(_frame())
+        assert key != DeduplicationIndex.message_key(_frame(arbitration_id=0x18FEF10C))
+        assert key != DeduplicationIndex.message_key(_frame(data=b"\x01" + bytes(7)))
+
+
+class TestCANMessageBufferDeduplication:
+    """Test duplicate suppression in the CAN message buffer."""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_dropped_and_rate_reported(self) -> None:
+        """Test duplicate frames are dropped and populate the deduplication rate."""
+        flushed: list[BufferedCANMessage] = []
+        buffer = CANMessageBuffer(
+            BufferConfiguration(dedup_window_seconds=60.0),
+            CANFrameCodec(),
+            lambda batch: flushed.extend(batch) or True,
+        )
+
+        for value in (1, 1, 2, 1):
+            assert await buffer.add_message(_frame(data=bytes([value]) + bytes(7)), "can0")
+
+        stats = buffer.get_statistics()
+        assert stats.total_received == 2
+        assert stats.total_duplicates == 2
+        assert stats.deduplication_rate == pytest.approx(50.0)
+
+        assert await buffer.force_flush()
+        assert [msg.raw_message.data[0] for msg in flushed] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_deduplication_disabled(self) -> None:
+        """Test identical frames are all buffered when deduplication is disabled."""
+        buffer = CANMessageBuffer(
+            BufferConfiguration(enable_deduplication=False),
+            CANFrameCodec(),
+            lambda batch: True,
+        )
+
+        for _ in range(3):
+            assert await buffer.add_message(_frame(), "can0")
+
+        stats = buffer.get_statistics()
+        assert stats.total_received == 3
+        assert stats.deduplication_rate == 0.0
+
+
+class TestCANMessageBufferColumnarRing:
+    """Test the memory-bounded columnar ring storage mode."""
+
+    @staticmethod
+    def _ring_config(**overrides: object) -> BufferConfiguration:
+        """Create a columnar ring configuration without deduplication."""
+        options: dict[str, object] = {
+            "storage_mode": BufferStorageMode.COLUMNAR_RING,
+            "enable_deduplication": False,
+        }
+        options.update(overrides)
+        return BufferConfiguration(**options)  # type: ignore[arg-type]
+
+    @pytest.mark.asyncio
+    async def test_memory_budget_enforced(self) -> None:
+        """Test the ring never grows beyond the configured byte budget."""
+        buffer = CANMessageBuffer(
+            self._ring_config(max_memory_mb=1, max_buffer_size=1_000_000),
+            CANFrameCodec(),
+            lambda batch: True,
+        )
+        capacity = 1024 * 1024 // CANFrameRing.frame_bytes()
+
+        for index in range(capacity + 10):
+            await buffer.add_message(_frame(data=index.to_bytes(8, "little")), "can0")
+
+        stats = buffer.get_statistics()
+        assert stats.current_buffer_size == capacity
+        assert stats.total_dropped == 10
+        assert stats.current_memory_usage <= 1.0
+        assert stats.buffer_utilization == pytest.approx(100.0)
+
+    @pytest.mark.asyncio
+    async def test_priority_strategy_evicts_oldest(self) -> None:
+        """Test priority-based buffers overwrite the oldest frame when full."""
+        flushed: list[BufferedCANMessage] = []
+        buffer = CANMessageBuffer(
+            self._ring_config(max_buffer_size=3, strategy=BufferStrategy.PRIORITY_BASED),
+            CANFrameCodec(),
+            lambda batch: flushed.extend(batch) or True,
+        )
+
+        for index in range(5):
+            assert await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+
+        assert await buffer.force_flush()
+        assert [msg.raw_message.data[0] for msg in flushed] == [2, 3, 4]
+        assert buffer.get_statistics().total_dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_priority_strategy_evicts_lowest_priority(self) -> None:
+        """Test a full ring evicts low priority frames and never critical ones."""
+        flushed: list[BufferedCANMessage] = []
+        buffer = CANMessageBuffer(
+            self._ring_config(max_buffer_size=3, strategy=BufferStrategy.PRIORITY_BASED),
+            CANFrameCodec(),
+            lambda batch: flushed.extend(batch) or True,
+        )
+
+        for index in range(3):
+            assert await buffer.add_message(
+                _frame(data=bytes([index]) + bytes(7)), "can0", CANMessagePriority.CRITICAL
+            )
+        assert not await buffer.add_message(
+            _frame(data=bytes([3]) + bytes(7)), "can0", CANMessagePriority.LOW
+        )
+
+        assert await buffer.force_flush()
+        assert [msg.raw_message.data[0] for msg in flushed] == [0, 1, 2]
+        assert {msg.priority for msg in flushed} == {CANMessagePriority.CRITICAL}
+        assert buffer.get_statistics().total_dropped == 1
+
+        flushed.clear()
+        priorities = [
+            CANMessagePriority.CRITICAL,
+            CANMessagePriority.LOW,
+            CANMessagePriority.NORMAL,
+        ]
+        for index, priority in enumerate(priorities):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0", priority)
+        assert await buffer.add_message(
+            _frame(data=bytes([3]) + bytes(7)), "can0", CANMessagePriority.CRITICAL
+        )
+
+        assert await buffer.force_flush()
+        assert [msg.raw_message.data[0] for msg in flushed] == [0, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_flush_materializes_decoded_messages(self) -> None:
+        """Test list-based flush callbacks still receive decoded messages."""
+        codec = CANFrameCodec()
+        flushed: list[BufferedCANMessage] = []
+        buffer = CANMessageBuffer(
+            self._ring_config(), codec, lambda batch: flushed.extend(batch) or True
+        )
+        message = codec.encoder.encode_vehicle_speed(0x0B, 12.5)
+        assert message is not None
+
+        await buffer.add_message(codec.create_envelope(message, "can1"))
+        assert await buffer.force_flush()
+
+        assert len(flushed) == 1
+        assert flushed[0].interface_id == "can1"
+        assert flushed[0].decoded_message is not None
+        assert flushed[0].decoded_message.pgn == 0xFEF1
+        assert buffer.get_statistics().current_buffer_size == 0
+
+    @pytest.mark.asyncio
+    async def test_fd_frames_stored_with_wide_payloads(self) -> None:
+        """Test a ring with 64-byte payload blocks validates and stores CAN FD frames."""
+        flushed: list[BufferedCANMessage] = []
+        buffer = CANMessageBuffer(
+            self._ring_config(ring_payload_bytes=64, drop_invalid_messages=True),
+            CANFrameCodec(),
+            lambda batch: flushed.extend(batch) or True,
+        )
+        fd_frame = can.Message(
+            arbitration_id=0x18FEF10B, data=bytes(range(64)), is_extended_id=True, is_fd=True
+        )
+        oversized = can.Message(arbitration_id=0x18FEF10B, data=bytes(12), is_extended_id=True)
+
+        assert await buffer.add_message(fd_frame, "can0")
+        assert not await buffer.add_message(oversized, "can0")
+
+        assert await buffer.force_flush()
+        assert len(flushed) == 1
+        assert flushed[0].raw_message.is_fd
+        assert bytes(flushed[0].raw_message.data) == bytes(range(64))
+        assert buffer.get_statistics().validation_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_frame_batch_flush_keeps_frames(self) -> None:
+        """Test frames stay buffered, in time order, until the columnar writer succeeds."""
+        batches: list[list[int]] = []
+        accept = False
+
+        def write(batch: CANFrameBatch) -> bool:
+            batches.append(batch.payloads[:, 0].tolist())
+            return accept
+
+        buffer = CANMessageBuffer(
+            self._ring_config(), CANFrameCodec(), lambda batch: False, frame_batch_callback=write
+        )
+        for index in range(3):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+
+        assert await buffer.force_flush() is False
+        assert buffer.get_statistics().current_buffer_size == 3
+        await buffer.add_message(_frame(data=bytes([3]) + bytes(7)), "can0")
+
+        accept = True
+        assert await buffer.force_flush() is True
+        # The failed frames go back ahead of the newer frame
+        assert batches == [[0, 1, 2], [0, 1, 2, 3]]
+        assert buffer.get_statistics().total_flushed == 4
+
+    @pytest.mark.asyncio
+    async def test_partially_stored_batch_requeues_only_the_rest(self) -> None:
+        """Test frames a message writer marked as stored are not put back in the ring."""
+        stored: list[int] = []
+
+        def store(batch: list[BufferedCANMessage]) -> bool:
+            for msg in batch:
+                if msg.raw_message.data[0] < 2:
+                    stored.append(msg.raw_message.data[0])
+                    msg.is_stored = True
+            return False
+
+        buffer = CANMessageBuffer(self._ring_config(flush_retry_attempts=1), CANFrameCodec(), store)
+        for index in range(4):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+        assert await buffer.force_flush() is False
+
+        stats = buffer.get_statistics()
+        assert stored == [0, 1]
+        assert stats.total_requeued == 2
+        assert stats.current_buffer_size == 2
+
+    @pytest.mark.asyncio
+    async def test_ring_uses_a_fraction_of_object_memory(self) -> None:
+        """Test buffered frames take at least ten times less memory than objects."""
+        frame_count = 2000
+        codec = CANFrameCodec()
+
+        tracemalloc.start()
+        try:
+            object_buffer = CANMessageBuffer(
+                BufferConfiguration(enable_deduplication=False), codec, lambda batch: True
+            )
+            baseline = tracemalloc.get_traced_memory()[0]
+            for index in range(frame_count):
+                await object_buffer.add_message(_frame(data=index.to_bytes(8, "little")), "can0")
+            object_bytes = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+
+        ring_buffer = CANMessageBuffer(
+            self._ring_config(max_buffer_size=frame_count), codec, lambda batch: True
+        )
+        for index in range(frame_count):
+            await ring_buffer.add_message(_frame(data=index.to_bytes(8, "little")), "can0")
+
+        ring_bytes = ring_buffer.get_statistics().current_memory_usage * 1024 * 1024
+        assert ring_buffer.get_statistics().current_buffer_size == frame_count
+        assert ring_bytes * 10 <= object_bytes
+
+
+class TestCANMessageBufferWritePipeline:
+    """Test background, bounded and retried batch writes."""
+
+    @staticmethod
+    def _config(**overrides: object) -> BufferConfiguration:
+        """Create a configuration with fast retries and no deduplication."""
+        options: dict[str, object] = {
+            "enable_deduplication": False,
+            "flush_retry_backoff": 0.001,
+        }
+        options.update(overrides)
+        return BufferConfiguration(**options)  # type: ignore[arg-type]
+
+    @pytest.mark.asyncio
+    async def test_ingestion_continues_during_slow_write(self) -> None:
+        """Test messages are accepted while a coroutine writer is still running."""
+        release = asyncio.Event()
+        written: list[int] = []
+
+        async def slow_store(batch: list[BufferedCANMessage]) -> bool:
+            await release.wait()
+            written.append(len(batch))
+            return True
+
+        buffer = CANMessageBuffer(self._config(), CANFrameCodec(), slow_store)
+        for index in range(3):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+
+        assert await buffer._dispatch_flush()
+        await asyncio.sleep(0)
+
+        # The lock is free while the write is pending
+        assert await asyncio.wait_for(buffer.add_message(_frame(), "can0"), timeout=0.5)
+        stats = buffer.get_statistics()
+        assert stats.inflight_flushes == 1
+        assert stats.inflight_messages == 3
+        assert stats.current_buffer_size == 1
+
+        release.set()
+        await buffer.wait_for_flushes()
+        assert written == [3]
+        assert buffer.get_statistics().total_flushed == 3
+
+    @pytest.mark.asyncio
+    async def test_inflight_writes_are_bounded(self) -> None:
+        """Test flushes are deferred and reported once every write slot is busy."""
+        release = asyncio.Event()
+
+        async def slow_store(batch: list[BufferedCANMessage]) -> bool:
+            await release.wait()
+            return True
+
+        buffer = CANMessageBuffer(
+            self._config(max_inflight_flushes=1, max_batch_size=2), CANFrameCodec(), slow_store
+        )
+        for index in range(4):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+
+        assert await buffer._dispatch_flush()
+        assert buffer.is_backpressured
+        assert await buffer._dispatch_flush() is False
+        assert buffer.get_statistics().backpressure_events == 1
+        assert buffer.get_statistics().current_buffer_size == 2
+
+        release.set()
+        assert await buffer.force_flush()
+        assert not buffer.is_backpressured
+        assert buffer.get_statistics().total_flushed == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_writes_retried_with_backoff(self) -> None:
+        """Test transient write failures are retried before succeeding."""
+        attempts: list[int] = []
+
+        def flaky_store(batch: list[BufferedCANMessage]) -> bool:
+            attempts.append(len(batch))
+            if len(attempts) < 3:
+                raise ConnectionError("database unavailable")
+            return True
+
+        buffer = CANMessageBuffer(self._config(), CANFrameCodec(), flaky_store)
+        await buffer.add_message(_frame(), "can0")
+
+        assert await buffer._dispatch_flush()
+        await buffer.wait_for_flushes()
+
+        stats = buffer.get_statistics()
+        assert attempts == [1, 1, 1]
+        assert stats.flush_retries == 2
+        assert stats.flush_failures == 0
+        assert stats.total_flushed == 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_requeue_batch(self) -> None:
+        """Test a batch that keeps failing returns to the front of the buffer."""
+        flushed: list[BufferedCANMessage] = []
+        healthy = False
+
+        async def store(batch: list[BufferedCANMessage]) -> bool:
+            if healthy:
+                flushed.extend(batch)
+            return healthy
+
+        buffer = CANMessageBuffer(self._config(flush_retry_attempts=2), CANFrameCodec(), store)
+        for index in range(2):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+
+        assert await buffer._dispatch_flush()
+        await buffer.add_message(_frame(data=bytes([2]) + bytes(7)), "can0")
+        await buffer.wait_for_flushes()
+
+        stats = buffer.get_statistics()
+        assert stats.flush_failures == 1
+        assert stats.total_requeued == 2
+        assert stats.current_buffer_size == 3
+
+        healthy = True
+        assert await buffer.force_flush()
+        assert [msg.raw_message.data[0] for msg in flushed] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_failures_requeue_in_sequence_within_limit(self) -> None:
+        """Test concurrent failed batches requeue in buffering order and respect the size limit."""
+        releases = {0: asyncio.Event(), 2: asyncio.Event()}
+
+        async def store(batch: list[BufferedCANMessage]) -> bool:
+            await releases[batch[0].raw_message.data[0]].wait()
+            return False
+
+        buffer = CANMessageBuffer(
+            self._config(max_batch_size=2, flush_retry_attempts=1, max_buffer_size=6),
+            CANFrameCodec(),
+            store,
+        )
+        for index in range(4):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+        assert await buffer._dispatch_flush()
+        assert await buffer._dispatch_flush()
+        for index in range(4, 7):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+
+        # The newer batch fails first
+        releases[2].set()
+        await asyncio.sleep(0.01)
+        releases[0].set()
+        await buffer.wait_for_flushes()
+
+        stats = buffer.get_statistics()
+        assert [msg.raw_message.data[0] for msg in buffer._buffer] == [1, 2, 3, 4, 5, 6]
+        assert stats.current_buffer_size == 6
+        assert stats.total_requeued == 3
+        assert stats.total_dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_requeue_overflow_drops_lowest_priority(self) -> None:
+        """Test a requeue over the size limit drops low priority messages first."""
+        release = asyncio.Event()
+
+        async def store(batch: list[BufferedCANMessage]) -> bool:
+            await release.wait()
+            return False
+
+        buffer = CANMessageBuffer(
+            self._config(
+                strategy=BufferStrategy.PRIORITY_BASED,
+                flush_retry_attempts=1,
+                max_buffer_size=2,
+            ),
+            CANFrameCodec(),
+            store,
+        )
+        await buffer.add_message(
+            _frame(data=bytes([0]) + bytes(7)), "can0", CANMessagePriority.CRITICAL
+        )
+        assert await buffer._dispatch_flush()
+        for index in (1, 2):
+            await buffer.add_message(
+                _frame(data=bytes([index]) + bytes(7)), "can0", CANMessagePriority.LOW
+            )
+
+        release.set()
+        await buffer.wait_for_flushes()
+
+        buffers = buffer._priority_buffers
+        assert [msg.raw_message.data[0] for msg in buffers[CANMessagePriority.CRITICAL]] == [0]
+        assert [msg.raw_message.data[0] for msg in buffers[CANMessagePriority.LOW]] == [2]
+
+    @pytest.mark.asyncio
+    async def test_partially_stored_batch_requeues_only_the_rest(self) -> None:
+        """Test messages a writer marked as stored are neither retried nor requeued."""
+        attempts: list[list[int]] = []
+        batches: list[list[BufferedCANMessage]] = []
+
+        def store(batch: list[BufferedCANMessage]) -> bool:
+            attempts.append([msg.raw_message.data[0] for msg in batch])
+            batches.append(batch)
+            for msg in batch[:2]:
+                msg.is_stored = True
+            return False
+
+        buffer = CANMessageBuffer(self._config(flush_retry_attempts=2), CANFrameCodec(), store)
+        for index in range(5):
+            await buffer.add_message(_frame(data=bytes([index]) + bytes(7)), "can0")
+
+        assert await buffer._dispatch_flush()
+        await buffer.wait_for_flushes()
+
+        stats = buffer.get_statistics()
+        assert attempts == [[0, 1, 2, 3, 4], [2, 3, 4]]
+        # The writer's list is never shrunk behind its back
+        assert [len(batch) for batch in batches] == [5, 3]
+        assert stats.total_requeued == 1
+        assert stats.current_buffer_size == 1
@@ -0,0 +1,99 @@
+"""
+Test suite for incremental agricultural metrics aggregation.
+
+Tests window alignment, running aggregates and the 1min -> 5min -> 1hour ->
+1day roll-up of per-source metric windows.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from afs_fastapi.core.can_frame_codec import CANFrameCodec, DecodedPGN
+from afs_fastapi.database.can_metrics_aggregation import (
+    AgriculturalMetricsAggregator,
+    RunningAggregate,
+    window_start,
+)
+
+BASE_TIME = datetime(2025, 6, 1, 10, 4, 30, tzinfo=UTC)
+
+
+def _engine_speed(codec: CANFrameCodec, source_address: int, rpm: float) -> DecodedPGN:
+    """Encode and decode an EEC1 frame carrying an engine speed."""
+    message = codec.encode_message(61444, source_address, {190: rpm})
+    assert message is not None
+    decoded = codec.decode_message(message)
+    assert decoded is not None
+    return decoded
+
+
+class TestAgriculturalMetricsAggregator:
+    """Test per-window running aggregates."""
+
+    def test_window_start_alignment(self) -> None:
+        """Test timestamps are aligned to UTC window boundaries."""
+        assert window_start(BASE_TIME, "1min") == datetime(2025, 6, 1, 10, 4, tzinfo=UTC)
+        assert window_start(BASE_TIME, "5min") == datetime(2025, 6, 1, 10, 0, tzinfo=UTC)
+        assert window_start(BASE_TIME, "1day") == datetime(2025, 6, 1, tzinfo=UTC)
+        assert window_start(BASE_TIME.replace(tzinfo=None), "1hour") == datetime(
+            2025, 6, 1, 10, tzinfo=UTC
+        )
+
+    def test_running_aggregate_merge(self) -> None:
+        """Test merged aggregates equal aggregating all samples at once."""
+        first, second, combined = RunningAggregate(), RunningAggregate(), RunningAggregate()
+        for value in (3.0, 9.0):
+            first.add(value)
+            combined.add(value)
+        for value in (1.0, 5.0, 7.0):
+            second.add(value)
+            combined.add(value)
+
+        first.merge(second)
+        first.merge(RunningAggregate())
+
+        assert first == combined
+        assert first.mean == pytest.approx(5.0)
+        assert RunningAggregate().mean is None
+
+    def test_rollup_merges_base_windows(self) -> None:
+        """Test coarser windows merge the base windows they contain."""
+        codec = CANFrameCodec()
+        aggregator = AgriculturalMetricsAggregator()
+        for minute, rpm in enumerate((1000.0, 1500.0, 2000.0)):
+            timestamp = BASE_TIME + timedelta(minutes=minute)
+            aggregator.add(0x80, timestamp, 61444, _engine_speed(codec, 0x80, rpm))
+        # Counted but without metric values
+        aggregator.add(0x80, BASE_TIME, 65267, None)
+        # Ignored: not a metric PGN, no source address
+        aggregator.add(0x80, BASE_TIME, 65262, None)
+        aggregator.add(None, BASE_TIME, 61444, None)
+
+        windows = aggregator.rollup()
+
+        assert len(aggregator) == 3
+        assert {key[0] for key in windows} == {"1min", "5min", "1hour", "1day"}
+        first_minute = windows[("1min", 0x80, datetime(2025, 6, 1, 10, 4, tzinfo=UTC))]
+        assert first_minute.message_count == 2
+        assert first_minute.engine_rpm.count == 1
+        # 10:04 falls in the 10:00 window, 10:05 and 10:06 in the 10:05 window
+        assert windows[("5min", 0x80, datetime(2025, 6, 1, 10, 0, tzinfo=UTC))].message_count == 2
+        day = windows[("1day", 0x80, datetime(2025, 6, 1, tzinfo=UTC))]
+        assert day.message_count == 4
+        assert day.engine_rpm.count == 3
+        assert day.engine_rpm.minimum == pytest.approx(1000.0)
+        assert day.engine_rpm.maximum == pytest.approx(2000.0)
+        assert day.engine_rpm.mean == pytest.approx(1500.0)
+
+    def test_rollup_starts_at_base_window(self) -> None:
+        """Test finer windows are not produced above the base window."""
+        aggregator = AgriculturalMetricsAggregator(base_window="1hour")
+        aggregator.add(0x88, BASE_TIME, 65265, None)
+
+        assert {key[0] for key in aggregator.rollup()} == {"1hour", "1day"}
+
+        with pytest.raises(ValueError):
+            AgriculturalMetricsAggregator(base_window="2min")
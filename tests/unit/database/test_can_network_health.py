@@ -0,0 +1,143 @@
+"""
+Test suite for in-process CAN network health accumulation.
+
+Tests per-interface window accounting, bitmap distinct counts, latency
+percentiles and device churn between windows.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import can
+import pytest
+
+from afs_fastapi.database.can_message_buffer import BufferedCANMessage
+from afs_fastapi.database.can_network_health import NetworkHealthAccumulator
+
+WINDOW_START = datetime(2025, 6, 1, 10, 0, tzinfo=UTC)
+
+
+def _message(
+    seconds: float,
+    source_address: int = 0x80,
+    pgn: int = 0xF004,
+    interface_id: str = "can0",
+    is_error_frame: bool = False,
+) -> BufferedCANMessage:
+    """Create a buffered J1939 frame received ``seconds`` after the window start."""
+    return BufferedCANMessage(
+        raw_message=can.Message(
+            arbitration_id=(3 << 26) | (pgn << 8) | source_address,
+            data=bytes(8),
+            is_extended_id=True,
+            is_error_frame=is_error_frame,
+        ),
+        interface_id=interface_id,
+        reception_time=WINDOW_START + timedelta(seconds=seconds),
+    )
+
+
+class TestNetworkHealthAccumulator:
+    """Test network health windows."""
+
+    def test_open_window_snapshot(self) -> None:
+        """Test counts, distinct sources and PGNs of the open window."""
+        accumulator = NetworkHealthAccumulator("1min")
+        messages = [
+            _message(0.0, 0x80, 0xF004),
+            _message(1.0, 0x80, 0xFEF1),
+            _message(2.0, 0x81, 0xF004),
+            _message(3.0, 0x81, 0xF004, is_error_frame=True),
+            _message(4.0, 0x82, 0xF004, interface_id="can1"),
+        ]
+        messages[1].decoding_error = "unknown PGN"
+
+        closed = accumulator.observe(messages, WINDOW_START + timedelta(seconds=10))
+
+        assert closed == []
+        snapshot = accumulator.snapshot("can0")
+        assert snapshot is not None
+        assert snapshot.window_start == WINDOW_START
+        assert snapshot.total_messages == 4
+        assert snapshot.unique_source_count == 2
+        assert snapshot.unique_pgn_count == 2
+        assert snapshot.error_frames == 1
+        assert snapshot.decoding_failures == 1
+        assert snapshot.error_rate == pytest.approx(25.0)
+        assert snapshot.messages_per_second == pytest.approx(4 / 3)
+        assert snapshot.active_devices["129"] == {
+            "message_count": 2,
+            "last_seen": pytest.approx((WINDOW_START + timedelta(seconds=3)).timestamp()),
+        }
+        assert accumulator.snapshot("can1") is not None
+        assert accumulator.snapshot("can2") is None
+
+    def test_latency_percentiles(self) -> None:
+        """Test latency percentiles are within one histogram bucket of the exact values."""
+        accumulator = NetworkHealthAccumulator("1min")
+        # Received 1..100 ms before ingestion
+        messages = [_message(10.0 - latency / 1000.0) for latency in range(1, 101)]
+
+        accumulator.observe(messages, WINDOW_START + timedelta(seconds=10))
+
+        snapshot = accumulator.snapshot("can0")
+        assert snapshot is not None
+        assert snapshot.latency_avg_ms == pytest.approx(50.5)
+        assert snapshot.latency_max_ms == pytest.approx(100.0)
+        assert snapshot.latency_p50_ms == pytest.approx(50.0, rel=0.06)
+        assert snapshot.latency_p95_ms == pytest.approx(95.0, rel=0.06)
+        assert snapshot.latency_p99_ms == pytest.approx(99.0, rel=0.06)
+
+    def test_window_closes_on_later_frame(self) -> None:
+        """Test a batch spanning a boundary closes the window and tracks device churn."""
+        accumulator = NetworkHealthAccumulator("1min")
+        accumulator.observe([_message(5.0, 0x80), _message(6.0, 0x81)], WINDOW_START)
+
+        closed = accumulator.observe(
+            [_message(50.0, 0x80), _message(65.0, 0x80), _message(70.0, 0x90)],
+            WINDOW_START + timedelta(seconds=70),
+        )
+
+        assert len(closed) == 1
+        assert closed[0].window_start == WINDOW_START
+        assert closed[0].total_messages == 3
+        assert closed[0].messages_per_second == pytest.approx(3 / 60)
+        current = accumulator.snapshot("can0")
+        assert current is not None
+        assert current.window_start == WINDOW_START + timedelta(minutes=1)
+        assert current.total_messages == 2
+        assert current.new_devices == [0x90]
+        assert current.offline_devices == [0x81]
+
+    def test_late_frames_count_in_current_window(self) -> None:
+        """Test frames older than the current window do not reopen a closed one."""
+        accumulator = NetworkHealthAccumulator("1min")
+        accumulator.observe([_message(5.0), _message(65.0)], WINDOW_START)
+
+        closed = accumulator.observe([_message(30.0)], WINDOW_START)
+
+        assert closed == []
+        snapshot = accumulator.snapshot("can0")
+        assert snapshot is not None
+        assert snapshot.total_messages == 2
+
+    def test_close_expired_windows(self) -> None:
+        """Test idle interfaces are closed, reported offline once and then dropped."""
+        accumulator = NetworkHealthAccumulator("1min")
+        accumulator.observe([_message(5.0, 0x80)], WINDOW_START)
+
+        assert accumulator.close_expired(WINDOW_START + timedelta(seconds=30)) == []
+        first = accumulator.close_expired(WINDOW_START + timedelta(minutes=1, seconds=5))
+        second = accumulator.close_expired(WINDOW_START + timedelta(minutes=2, seconds=5))
+
+        assert [snapshot.total_messages for snapshot in first] == [1]
+        assert [snapshot.total_messages for snapshot in second] == [0]
+        assert second[0].offline_devices == [0x80]
+        assert accumulator.interfaces == []
+        assert accumulator.close_expired(WINDOW_START + timedelta(minutes=5)) == []
+
+    def test_unknown_window_rejected(self) -> None:
+        """Test window names must be known aggregation windows."""
+        with pytest.raises(ValueError):
+            NetworkHealthAccumulator("7min")
@@ -0,0 +1,395 @@
+"""
+Test suite for CAN time-series storage.
+
+Tests bulk ingest of raw and decoded CAN messages on the SQLite fallback,
+including the raw-to-decoded linkage and batch write round trips.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import can
+import pytest
+from sqlalchemy import delete, event, func, select
+
+from afs_fastapi.core.can_frame_codec import CANFrameCodec
+from afs_fastapi.database import can_time_series_storage
+from afs_fastapi.database.can_message_buffer import BufferedCANMessage
+from afs_fastapi.database.can_metrics_aggregation import window_start
+from afs_fastapi.database.can_network_health import NetworkHealthAccumulator
+from afs_fastapi.database.can_time_series_schema import (
+    AgriculturalMetrics,
+    CANMessageDecoded,
+    CANMessageRaw,
+    CANNetworkHealth,
+)
+from afs_fastapi.database.can_time_series_storage import (
+    CANTimeSeriesStorage,
+    TimeSeriesStorageConfig,
+)
+
+BENCHMARK_BATCH_SIZE = 10_000
+
+
+def _buffered_messages(
+    codec: CANFrameCodec, count: int, decode_every: int = 1
+) -> list[BufferedCANMessage]:
+    """Create buffered vehicle speed frames, decoding every ``decode_every``-th one."""
+    messages = []
+    for index in range(count):
+        message = codec.encoder.encode_vehicle_speed(0x80 + index % 8, float(index % 250))
+        assert message is not None
+        messages.append(
+            BufferedCANMessage(
+                raw_message=message,
+                interface_id=f"can{index % 2}",
+                reception_time=datetime.fromtimestamp(1_700_000_000 + index * 0.01, UTC),
+                decoded_message=(
+                    codec.decode_message(message) if index % decode_every == 0 else None
+                ),
+            )
+        )
+    return messages
+
+
+def _metric_messages(
+    codec: CANFrameCodec, start: datetime, rpms: list[float], speed: float
+) -> list[BufferedCANMessage]:
+    """Create one engine speed and one vehicle speed frame per minute from tractor 0x80."""
+    messages = []
+    for minute, rpm in enumerate(rpms):
+        timestamp = start + timedelta(minutes=minute)
+        engine = codec.encode_message(61444, 0x80, {190: rpm})
+        vehicle = codec.encoder.encode_vehicle_speed(0x80, speed)
+        assert engine is not None and vehicle is not None
+        messages.extend(
+            BufferedCANMessage(raw_message=frame, interface_id="can0", reception_time=timestamp)
+            for frame in (engine, vehicle)
+        )
+    return messages
+
+
+class TestCANTimeSeriesStorageIngest:
+    """Test bulk ingest on the SQLite fallback."""
+
+    @pytest.mark.asyncio
+    async def test_decoded_rows_reference_their_raw_rows(
+        self, storage: CANTimeSeriesStorage
+    ) -> None:
+        """Test decoded rows link to the right raw row when some frames are not decoded."""
+        codec = CANFrameCodec()
+        # Store a first batch so raw ids of the second batch do not start at 1
+        assert await storage.store_messages_batch(_buffered_messages(codec, 5))
+        messages = _buffered_messages(codec, 30, decode_every=3)
+
+        assert await storage.store_messages_batch(messages)
+
+        async with storage._get_async_session() as session:
+            raw_rows = (
+                await session.execute(select(CANMessageRaw).order_by(CANMessageRaw.id))
+            ).scalars()
+            raw_by_id = {row.id: row for row in raw_rows}
+            decoded_rows = (
+                (await session.execute(select(CANMessageDecoded).order_by(CANMessageDecoded.id)))
+                .scalars()
+                .all()
+            )
+
+        assert len(raw_by_id) == 35
+        assert len(decoded_rows) == 5 + 10
+        for decoded in decoded_rows:
+            raw = raw_by_id[decoded.raw_message_id]
+            assert raw.timestamp == decoded.timestamp
+            assert raw.source_address == decoded.source_address
+            assert raw.pgn == decoded.pgn == 0xFEF1
+        assert decoded_rows[-1].spn_values["84"]["value"] == pytest.approx(27.0)
+
+    @pytest.mark.asyncio
+    async def test_raw_rows_keep_frame_fields(self, storage: CANTimeSeriesStorage) -> None:
+        """Test raw rows carry the frame, the extracted J1939 fields and retention policy."""
+        message = can.Message(arbitration_id=0x0CF00403, data=b"\x01\x02\x03", is_extended_id=True)
+        buffered = BufferedCANMessage(
+            raw_message=message,
+            interface_id="can0",
+            reception_time=datetime.now(UTC),
+            retention_policy="extended",
+        )
+
+        assert await storage.store_messages_batch([buffered])
+
+        async with storage._get_async_session() as session:
+            row = (await session.execute(select(CANMessageRaw))).scalar_one()
+
+        assert bytes(row.data) == b"\x01\x02\x03"
+        assert row.dlc == 3
+        assert row.source_address == 0x03
+        assert row.pgn == 0xF004
+        assert row.priority == 3
+        assert row.retention_policy == "extended"
+        assert row.ingestion_time is not None
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_not_stored(self, storage: CANTimeSeriesStorage) -> None:
+        """Test an empty batch is rejected without touching the database."""
+        assert await storage.store_messages_batch([]) is False
+
+    @pytest.mark.asyncio
+    async def test_bulk_ingest_round_trips_independent_of_batch_size(
+        self, storage: CANTimeSeriesStorage
+    ) -> None:
+        """Test a 10k-message batch costs as many statements as a 10-message one."""
+        codec = CANFrameCodec()
+        assert storage._async_engine is not None
+        statements: list[tuple[str, bool]] = []
+
+        def record(*args: Any) -> None:
+            # (conn, cursor, statement, parameters, context, executemany)
+            statements.append((args[2], args[5]))
+
+        engine = storage._async_engine.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert await storage.store_messages_batch(_buffered_messages(codec, 10))
+            small_batch = list(statements)
+            statements.clear()
+            assert await storage.store_messages_batch(
+                _buffered_messages(codec, BENCHMARK_BATCH_SIZE)
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert len(statements) == len(small_batch)
+        # Raw and decoded rows go out in one executemany each, never row by row
+        inserts = [many for statement, many in statements if statement.startswith("INSERT")]
+        assert inserts.count(True) >= 2
+        async with storage._get_async_session() as session:
+            raw_count = (
+                await session.execute(select(func.count()).select_from(CANMessageRaw))
+            ).scalar_one()
+        assert raw_count == 10 + BENCHMARK_BATCH_SIZE
+
+
+class TestIncrementalAgriculturalMetrics:
+    """Test agricultural metrics maintained while batches are stored."""
+
+    @staticmethod
+    async def _metric_rows(storage: CANTimeSeriesStorage) -> list[AgriculturalMetrics]:
+        async with storage._get_async_session() as session:
+            result = await session.execute(
+                select(AgriculturalMetrics).order_by(
+                    AgriculturalMetrics.time_window, AgriculturalMetrics.timestamp
+                )
+            )
+            return list(result.scalars().all())
+
+    @pytest.mark.asyncio
+    async def test_batches_merge_into_dirty_windows(self, storage: CANTimeSeriesStorage) -> None:
+        """Test consecutive batches merge into existing windows instead of duplicating them."""
+        codec = CANFrameCodec()
+        start = datetime(2025, 6, 1, 10, 0, tzinfo=UTC)
+
+        assert await storage.store_messages_batch(
+            _metric_messages(codec, start, [1000.0, 1200.0], speed=8.0)
+        )
+        assert await storage.store_messages_batch(
+            _metric_messages(codec, start + timedelta(minutes=1), [1800.0], speed=12.0)
+        )
+
+        rows = await self._metric_rows(storage)
+        by_window = {(row.time_window, row.timestamp.replace(tzinfo=UTC)): row for row in rows}
+        assert len(rows) == 2 + 1 + 1 + 1
+        second_minute = by_window[("1min", start + timedelta(minutes=1))]
+        assert second_minute.message_count == 4
+        assert second_minute.engine_rpm_samples == 2
+        assert second_minute.engine_rpm_min == pytest.approx(1200.0)
+        assert second_minute.engine_rpm_max == pytest.approx(1800.0)
+        assert second_minute.engine_rpm_avg == pytest.approx(1500.0)
+
+        day = by_window[("1day", datetime(2025, 6, 1, tzinfo=UTC))]
+        assert day.message_count == 6
+        assert day.equipment_type == "tractor"
+        assert day.engine_rpm_avg == pytest.approx(4000.0 / 3)
+        assert day.min_speed == pytest.approx(8.0)
+        assert day.max_speed == pytest.approx(12.0)
+        assert day.avg_speed == pytest.approx(28.0 / 3)
+        assert day.fuel_rate_samples == 0
+        assert day.fuel_rate_avg is None
+
+    @pytest.mark.asyncio
+    async def test_recompute_replaces_windows(self, storage: CANTimeSeriesStorage) -> None:
+        """Test recomputing from raw messages is idempotent and matches the incremental rows."""
+        codec = CANFrameCodec()
+        start = datetime(2025, 6, 1, 10, 0, tzinfo=UTC)
+        assert await storage.store_messages_batch(
+            _metric_messages(codec, start, [1000.0, 1200.0, 1400.0], speed=10.0)
+        )
+        incremental = {
+            (row.time_window, row.timestamp): (row.message_count, row.engine_rpm_avg)
+            for row in await self._metric_rows(storage)
+        }
+
+        for _ in range(2):
+            assert await storage.compute_agricultural_metrics(
+                start, start + timedelta(minutes=2), time_window="5min"
+            )
+
+        rows = await self._metric_rows(storage)
+        assert len(rows) == len(incremental)
+        recomputed = next(row for row in rows if row.time_window == "5min")
+        assert (recomputed.message_count, recomputed.engine_rpm_avg) == incremental[
+            ("5min", recomputed.timestamp)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_recompute_removes_windows_without_data(
+        self, storage: CANTimeSeriesStorage
+    ) -> None:
+        """Test recomputing drops the windows of the period whose messages were deleted."""
+        codec = CANFrameCodec()
+        start = datetime(2025, 6, 1, 10, 0, tzinfo=UTC)
+        assert await storage.store_messages_batch(
+            _metric_messages(codec, start, [1000.0, 1200.0, 1400.0], speed=10.0)
+        )
+        async with storage._get_async_session() as session:
+            await session.execute(
+                delete(CANMessageRaw).where(CANMessageRaw.timestamp >= start + timedelta(minutes=1))
+            )
+            await session.commit()
+
+        assert await storage.compute_agricultural_metrics(
+            start, start + timedelta(minutes=2), time_window="1min"
+        )
+
+        rows = await self._metric_rows(storage)
+        assert [row.timestamp.replace(tzinfo=UTC) for row in rows if row.time_window == "1min"] == [
+            start
+        ]
+        assert sum(row.time_window == "1day" for row in rows) == 1
+
+    @pytest.mark.asyncio
+    async def test_aggregation_skipped_without_upserts(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test databases without upserts still store raw messages, without metrics."""
+        monkeypatch.setattr(can_time_series_storage, "_UPSERT_DIALECTS", frozenset({"postgresql"}))
+        storage = CANTimeSeriesStorage(
+            TimeSeriesStorageConfig(
+                database_url=f"sqlite+aiosqlite:///{tmp_path / 'timeseries.db'}",
+                max_connections=1,
+            )
+        )
+        assert await storage.initialize()
+        try:
+            codec = CANFrameCodec()
+            start = datetime(2025, 6, 1, 10, 0, tzinfo=UTC)
+            assert await storage.store_messages_batch(
+                _metric_messages(codec, start, [1000.0], speed=10.0)
+            )
+
+            assert await self._metric_rows(storage) == []
+            async with storage._get_async_session() as session:
+                raw_count = (
+                    await session.execute(select(func.count()).select_from(CANMessageRaw))
+                ).scalar_one()
+            assert raw_count == 2
+        finally:
+            await storage.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_query_metrics_reads_aggregates(self, storage: CANTimeSeriesStorage) -> None:
+        """Test metric queries return the maintained windows."""
+        codec = CANFrameCodec()
+        start = datetime(2025, 6, 1, 10, 0, tzinfo=UTC)
+        assert await storage.store_messages_batch(
+            _metric_messages(codec, start, [900.0, 1100.0], speed=6.0)
+        )
+
+        metrics = await storage.query_metrics(start, start + timedelta(hours=1), time_window="1min")
+
+        assert [row["engine_rpm_avg"] for row in metrics] == [
+            pytest.approx(900.0),
+            pytest.approx(1100.0),
+        ]
+
+
+class TestNetworkHealth:
+    """Test network health accumulated while batches are stored."""
+
+    @staticmethod
+    async def _health_rows(storage: CANTimeSeriesStorage) -> list[CANNetworkHealth]:
+        async with storage._get_async_session() as session:
+            result = await session.execute(
+                select(CANNetworkHealth).order_by(CANNetworkHealth.timestamp)
+            )
+            return list(result.scalars().all())
+
+    @pytest.mark.asyncio
+    async def test_closed_and_open_windows_written(self, storage: CANTimeSeriesStorage) -> None:
+        """Test closed windows are written on rollover and open ones on request."""
+        codec = CANFrameCodec()
+        # The second batch lands in the current 5min window, which is still open
+        start = window_start(datetime.now(UTC), "5min") - timedelta(minutes=5)
+        assert await storage.store_messages_batch(
+            _metric_messages(codec, start, [1000.0, 1100.0], speed=5.0)
+        )
+        assert await self._health_rows(storage) == []
+
+        # Minutes 5 and 6 fall into the next 5min window
+        assert await storage.store_messages_batch(
+            _metric_messages(codec, start + timedelta(minutes=5), [1200.0, 1300.0], speed=5.0)
+        )
+        rows = await self._health_rows(storage)
+        assert len(rows) == 1
+        assert rows[0].total_messages == 4
+        assert rows[0].unique_source_count == 1
+        assert rows[0].unique_pgn_count == 2
+        assert rows[0].messages_per_second == pytest.approx(4 / 300)
+        assert rows[0].latency_p99 is not None
+
+        assert await storage.update_network_health("can0")
+        assert await storage.update_network_health("can0")
+        rows = await self._health_rows(storage)
+        # The open window is written once and then replaced, never duplicated
+        assert [row.total_messages for row in rows] == [4, 4]
+        assert rows[1].timestamp.replace(tzinfo=UTC) == start + timedelta(minutes=5)
+
+        assert await storage.update_network_health("can0", time_window="1min") is False
+        assert await storage.update_network_health("can7") is False
+
+    @pytest.mark.asyncio
+    async def test_health_failure_does_not_fail_committed_batch(
+        self, storage: CANTimeSeriesStorage, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a network health error after commit still reports the batch as stored."""
+
+        def fail(*args: object) -> None:
+            raise ValueError("bad window")
+
+        monkeypatch.setattr(NetworkHealthAccumulator, "observe", fail)
+        codec = CANFrameCodec()
+
+        assert await storage.store_messages_batch(
+            _metric_messages(codec, datetime(2025, 6, 1, 10, 0, tzinfo=UTC), [900.0], 4.0)
+        )
+        async with storage._get_async_session() as session:
+            raw_count = (
+                await session.execute(select(func.count()).select_from(CANMessageRaw))
+            ).scalar_one()
+        assert raw_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_windows_closed_on_update(self, storage: CANTimeSeriesStorage) -> None:
+        """Test windows that ended without further traffic are written on update."""
+        codec = CANFrameCodec()
+        start = datetime(2025, 6, 1, 10, 0, tzinfo=UTC)
+        assert await storage.store_messages_batch(_metric_messages(codec, start, [900.0], 4.0))
+
+        assert await storage.update_network_health("can0")
+
+        rows = await self._health_rows(storage)
+        assert [(row.timestamp.replace(tzinfo=UTC), row.total_messages) for row in rows] == [
+            (start, 2)
+        ]
@@ -0,0 +1,325 @@
+"""
+Test suite for time partitioning of the time-series tables.
+
+Tests partition boundaries, the partitioned PostgreSQL schema DDL and the
+SQLite per-day shard mode of CAN time-series storage.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from afs_fastapi.core.can_frame_codec import CANFrameCodec
+from afs_fastapi.database.can_data_retention import (
+    ArchivalStrategy,
+    CANDataRetentionManager,
+    RetentionPolicy,
+    RetentionRule,
+)
+from afs_fastapi.database.can_message_buffer import BufferedCANMessage
+from afs_fastapi.database.can_time_series_schema import (
+    AgriculturalMetrics,
+    CANMessageDecoded,
+    CANMessageRaw,
+    TimeSeriesBase,
+)
+from afs_fastapi.database.can_time_series_storage import (
+    CANTimeSeriesStorage,
+)
+from afs_fastapi.database.time_partitioning import (
+    PartitionMode,
+    PostgresPartitionManager,
+    SQLiteDayShardRouter,
+    partition_end,
+    partition_name,
+    partition_start,
+    partition_starts,
+)
+
+DAY_ONE = datetime(2025, 3, 1, 20, 0, tzinfo=UTC)
+
+
+def _messages(
+    codec: CANFrameCodec, start: datetime, count: int, step: timedelta
+) -> list[BufferedCANMessage]:
+    """Create decoded vehicle speed frames received ``step`` apart."""
+    messages = []
+    for index in range(count):
+        message = codec.encoder.encode_vehicle_speed(0x80, float(index))
+        assert message is not None
+        messages.append(
+            BufferedCANMessage(
+                raw_message=message,
+                interface_id="can0",
+                reception_time=start + step * index,
+                decoded_message=codec.decode_message(message),
+            )
+        )
+    return messages
+
+
+@pytest.fixture
+def storage_options(tmp_path: Path) -> dict[str, Any]:
+    """Shard raw frames into per-day SQLite files."""
+    return {"sqlite_shard_directory": str(tmp_path / "shards")}
+
+
+class TestPartitionBoundaries:
+    """Test partition interval alignment."""
+
+    def test_intervals(self) -> None:
+        """Test partitions start at midnight, Monday or the first of the month in UTC."""
+        timestamp = datetime(2025, 3, 13, 23, 30, tzinfo=UTC)
+
+        assert partition_start(timestamp) == datetime(2025, 3, 13, tzinfo=UTC)
+        assert partition_start(timestamp, "1 week") == datetime(2025, 3, 10, tzinfo=UTC)
+        assert partition_start(timestamp, "1 month") == datetime(2025, 3, 1, tzinfo=UTC)
+        assert partition_end(datetime(2025, 12, 1, tzinfo=UTC), "1 month") == datetime(
+            2026, 1, 1, tzinfo=UTC
+        )
+        # Naive timestamps are UTC
+        assert partition_start(datetime(2025, 3, 13, 1, 0)) == datetime(2025, 3, 13, tzinfo=UTC)
+        with pytest.raises(ValueError):
+            partition_start(timestamp, "1 hour")
+
+    def test_partition_starts_and_names(self) -> None:
+        """Test the partitions overlapping a range and their names."""
+        starts = partition_starts(DAY_ONE, DAY_ONE + timedelta(days=2))
+
+        assert [partition_name("can_messages_raw", start) for start in starts] == [
+            "can_messages_raw_p20250301",
+            "can_messages_raw_p20250302",
+            "can_messages_raw_p20250303",
+        ]
+
+
+class TestPostgresSchema:
+    """Test the partitioned PostgreSQL schema DDL."""
+
+    @staticmethod
+    def _ddl(mode: PartitionMode) -> dict[str, str]:
+        """Compile the schema statements, keyed by the table they create."""
+        statements = PostgresPartitionManager(mode).schema_statements(TimeSeriesBase.metadata)
+        ddl = {}
+        for statement in statements:
+            compiled = str(statement.compile(dialect=postgresql.dialect()))
+            if compiled.lstrip().startswith("CREATE TABLE"):
+                ddl[compiled.split()[5]] = compiled
+            elif "create_hypertable" in compiled:
+                ddl.setdefault("hypertables", "")
+                ddl["hypertables"] += compiled
+        return ddl
+
+    def test_native_partitions(self) -> None:
+        """Test partitioned tables are range partitioned with the timestamp in the key."""
+        ddl = self._ddl(PartitionMode.NATIVE)
+
+        raw = ddl["can_messages_raw"]
+        assert "PARTITION BY RANGE (timestamp)" in raw
+        assert "PRIMARY KEY (id, timestamp)" in raw
+        assert "hypertables" not in ddl
+        # Foreign keys cannot reference a partitioned table
+        assert "REFERENCES can_messages_raw" not in ddl["can_messages_decoded"]
+        assert "PARTITION BY" not in ddl["can_messages_decoded"]
+        # The shared metadata is left untouched
+        assert [column.name for column in CANMessageRaw.__table__.primary_key.columns] == ["id"]
+
+    def test_timescaledb_hypertables(self) -> None:
+        """Test TimescaleDB mode creates plain tables converted to hypertables."""
+        ddl = self._ddl(PartitionMode.TIMESCALEDB)
+
+        assert "PARTITION BY" not in ddl["can_messages_raw"]
+        assert "PRIMARY KEY (id, timestamp)" in ddl["can_messages_raw"]
+        assert "create_hypertable" in ddl["hypertables"]
+
+
+class TestSQLiteDayShards:
+    """Test per-day shard files on the SQLite fallback."""
+
+    @staticmethod
+    async def _count(storage: CANTimeSeriesStorage, model: type) -> int:
+        async with storage._get_async_session() as session:
+            return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_frames_routed_to_day_files(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path
+    ) -> None:
+        """Test raw frames land in their day's file with unique ids linked to decoded rows."""
+        codec = CANFrameCodec()
+        # 30 frames 10 minutes apart span two UTC days
+        assert await storage.store_messages_batch(
+            _messages(codec, DAY_ONE, 30, timedelta(minutes=10))
+        )
+        assert await storage.store_messages_batch(
+            _messages(codec, DAY_ONE + timedelta(days=1), 5, timedelta(minutes=1))
+        )
+
+        assert sorted(path.name for path in (tmp_path / "shards").iterdir()) == [
+            "can_messages_raw_20250301.db",
+            "can_messages_raw_20250302.db",
+        ]
+        assert await self._count(storage, CANMessageRaw) == 0
+
+        async with storage._get_async_session() as session:
+            linked = (await session.execute(select(CANMessageDecoded.raw_message_id))).scalars()
+            raw_ids = list(linked)
+        assert len(raw_ids) == len(set(raw_ids)) == 35
+        assert storage._raw_shards is not None
+        shards = storage._raw_shards.shards()
+        assert [shard.start for shard in shards] == [
+            datetime(2025, 3, 1, tzinfo=UTC),
+            datetime(2025, 3, 2, tzinfo=UTC),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_spanning_more_shards_than_attachable(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path
+    ) -> None:
+        """Test a batch over 10 days is written in transactions of at most 8 shards."""
+        codec = CANFrameCodec()
+        assert await storage.store_messages_batch(
+            _messages(codec, DAY_ONE, 20, timedelta(hours=12))
+        )
+
+        assert len(list((tmp_path / "shards").iterdir())) == 11
+        async with storage._get_async_session() as session:
+            linked = (await session.execute(select(CANMessageDecoded.raw_message_id))).scalars()
+            raw_ids = list(linked)
+        assert len(raw_ids) == len(set(raw_ids)) == 20
+
+    @pytest.mark.asyncio
+    async def test_failed_shard_group_leaves_only_unstored_messages(
+        self, storage: CANTimeSeriesStorage, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a retry after a failed later transaction stores every message once."""
+        codec = CANFrameCodec()
+        messages = _messages(codec, DAY_ONE, 20, timedelta(hours=12))
+        insert = SQLiteDayShardRouter.insert
+        calls = 0
+
+        async def failing_second_insert(
+            router: SQLiteDayShardRouter, connection: AsyncConnection, rows: list[dict[str, Any]]
+        ) -> list[int]:
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise OSError("disk full")
+            return await insert(router, connection, rows)
+
+        monkeypatch.setattr(SQLiteDayShardRouter, "insert", failing_second_insert)
+        assert await storage.store_messages_batch(messages) is False
+        # The first transaction held the first 8 days (15 frames); the caller's
+        # list is left whole
+        assert len(messages) == 20
+        assert [msg.reception_time for msg in messages if not msg.is_stored] == [
+            DAY_ONE + timedelta(hours=12) * index for index in range(15, 20)
+        ]
+
+        assert await storage.store_messages_batch(messages)
+        async with storage._get_async_session() as session:
+            linked = (await session.execute(select(CANMessageDecoded.raw_message_id))).scalars()
+            raw_ids = list(linked)
+        assert len(raw_ids) == len(set(raw_ids)) == 20
+
+    @pytest.mark.asyncio
+    async def test_metrics_read_from_shards(self, storage: CANTimeSeriesStorage) -> None:
+        """Test metric backfill reads the frames of the shards in range."""
+        codec = CANFrameCodec()
+        assert await storage.store_messages_batch(
+            _messages(codec, DAY_ONE, 30, timedelta(minutes=10))
+        )
+        async with storage._get_async_session() as session:
+            await session.execute(AgriculturalMetrics.__table__.delete())
+            await session.commit()
+
+        assert await storage.compute_agricultural_metrics(
+            DAY_ONE, DAY_ONE + timedelta(hours=6), time_window="1hour"
+        )
+
+        async with storage._get_async_session() as session:
+            counts = (
+                await session.execute(
+                    select(AgriculturalMetrics.message_count)
+                    .where(AgriculturalMetrics.time_window == "1hour")
+                    .order_by(AgriculturalMetrics.timestamp)
+                )
+            ).scalars()
+            assert list(counts) == [6, 6, 6, 6, 6]
+
+    @pytest.mark.asyncio
+    async def test_retention_drops_expired_shards(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path
+    ) -> None:
+        """Test retention deletes whole expired shard files."""
+        codec = CANFrameCodec()
+        assert await storage.store_messages_batch(
+            _messages(codec, DAY_ONE, 30, timedelta(minutes=10))
+        )
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+        rule = RetentionRule(
+            name="raw_delete",
+            policy=RetentionPolicy.OPERATIONAL,
+            retention_period=timedelta(days=1),
+            archival_strategy=ArchivalStrategy.NONE,
+            table_pattern="can_messages_raw",
+        )
+
+        # The cutoff falls inside the second day: only the first day's file expires
+        deleted = await manager._delete_old_data(
+            "can_messages_raw", rule, datetime(2025, 3, 2, 12, 0, tzinfo=UTC)
+        )
+
+        assert deleted == 24
+        assert [path.name for path in (tmp_path / "shards").iterdir()] == [
+            "can_messages_raw_20250302.db"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_archival_reads_shards_before_they_expire(
+        self, storage: CANTimeSeriesStorage, tmp_path: Path
+    ) -> None:
+        """Test archiving copies the rows of the shards in range and removes them."""
+        codec = CANFrameCodec()
+        assert await storage.store_messages_batch(
+            _messages(codec, DAY_ONE, 30, timedelta(minutes=10))
+        )
+        manager = CANDataRetentionManager(storage, base_archive_path=str(tmp_path / "archives"))
+        rule = RetentionRule(
+            name="raw_archive",
+            policy=RetentionPolicy.OPERATIONAL,
+            retention_period=timedelta(days=365),
+            archival_strategy=ArchivalStrategy.COMPRESSED,
+            table_pattern="can_messages_raw",
+            archive_after=timedelta(days=30),
+            batch_size=7,
+        )
+
+        archived = await manager._archive_table_data(
+            "can_messages_raw", rule, DAY_ONE + timedelta(days=30), DAY_ONE - timedelta(days=1)
+        )
+
+        assert archived == 30
+        files = sorted((tmp_path / "archives").rglob("*.parquet"))
+        assert [pq.read_table(file).num_rows for file in files] == [24, 6]
+        router = storage._raw_shards
+        assert router is not None
+        async with storage._get_async_session() as session:
+            remaining = [
+                row
+                async for row in router.select(
+                    await session.connection(),
+                    lambda table: select(table.c.id),
+                    DAY_ONE - timedelta(days=1),
+                    DAY_ONE + timedelta(days=2),
+                )
+            ]
+        assert remaining == []
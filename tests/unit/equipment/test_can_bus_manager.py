@@ -9,13 +9,20 @@ agricultural fleet operations.
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable
 from datetime import datetime, timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import can
 import pytest
 
-from afs_fastapi.core.can_frame_codec import CANFrameCodec, DecodedPGN
+from afs_fastapi.core.can_frame_codec import CANFrameCodec, CANFrameEnvelope, DecodedPGN
+from afs_fastapi.database.can_message_buffer import (
+    BufferConfiguration,
+    BufferedCANMessage,
+    CANMessageBuffer,
+)
 from afs_fastapi.equipment.can_bus_manager import (
     CANBusConnectionManager,
     ConnectionPool,
@@ -26,6 +33,7 @@ from afs_fastapi.equipment.can_bus_manager import (
     RoutingRule,
 )
 from afs_fastapi.equipment.can_error_handling import CANErrorHandler
+from afs_fastapi.equipment.critical_tractor_data_handlers import CriticalDataAggregator
 from afs_fastapi.equipment.physical_can_interface import (
     BusSpeed,
     CANInterfaceType,
@@ -33,6 +41,13 @@ from afs_fastapi.equipment.physical_can_interface import (
     InterfaceState,
     PhysicalCANManager,
 )
+from afs_fastapi.safety.cross_layer_validation import CrossLayerSafetyValidator
+from afs_fastapi.safety.iso25119 import (
+    DynamicSafetyMonitor,
+    SafetyAuditLogger,
+    SafetyHeartbeatMonitor,
+    SafetyPerformanceMonitor,
+)
 
 
 class TestMessageRouter:
@@ -133,6 +148,40 @@ class TestMessageRouter:
         assert target_interfaces == available_interfaces
         assert priority == MessagePriority.LOW
 
+    def test_messages_and_envelopes_route_alike(self, router: MessageRouter) -> None:
+        """Test unknown PGNs and TP frames route the same for messages and envelopes."""
+        router.add_routing_rule(
+            RoutingRule(
+                name="Implement Source",
+                pgn_filters=[],
+                source_filters=[0x25],
+                destination_filters=[],
+                priority=MessagePriority.HIGH,
+                target_interfaces=["can0"],
+            )
+        )
+        unknown = can.Message(
+            arbitration_id=0x18DEAD25, data=b"\x01\x02\x03\x04", is_extended_id=True
+        )
+        tp_announce = can.Message(
+            arbitration_id=0x1CECFF25,
+            data=b"\x20\x0E\x00\x02\xFF\xCA\xFE\x00",
+            is_extended_id=True,
+        )
+        available_interfaces = ["can0", "can1"]
+
+        for message, expected in (
+            (unknown, (available_interfaces, MessagePriority.LOW)),
+            (tp_announce, (["can0"], MessagePriority.HIGH)),
+        ):
+            envelope = router.codec.create_envelope(message)
+            assert router.route_message(message, available_interfaces) == expected
+            router.route_cache.clear()
+            assert router.route_message(envelope, available_interfaces) == expected
+
+        # Routing never feeds TP frames into the reassembler
+        assert not router.codec.decoder.transport_reassembler.sessions
+
     def test_route_caching(self, router: MessageRouter) -> None:
         """Test route caching functionality."""
         rule = RoutingRule(
@@ -769,3 +818,187 @@ class TestIntegrationScenarios:
         # Should use highest priority rule
         assert priority == MessagePriority.CRITICAL
         assert "critical_can" in target_interfaces
+
+
+class TestDecodeOnceEnvelope:
+    """Test that each received frame is decoded at most once across consumers."""
+
+    @pytest.mark.asyncio
+    async def test_frame_decoded_once_across_consumers(self) -> None:
+        """Test routing, buffering, critical data and safety validation share one decode."""
+        manager = CANBusConnectionManager(
+            ConnectionPoolConfig(primary_interfaces=["can0"], backup_interfaces=[])
+        )
+        codec = manager.codec
+        flushed: list[BufferedCANMessage] = []
+        buffer = CANMessageBuffer(
+            BufferConfiguration(enable_deduplication=False),
+            codec,
+            lambda batch: flushed.extend(batch) or True,
+        )
+        aggregator = CriticalDataAggregator(codec, manager.error_handler)
+        validator = CrossLayerSafetyValidator(
+            DynamicSafetyMonitor(),
+            SafetyHeartbeatMonitor(),
+            SafetyPerformanceMonitor(),
+            SafetyAuditLogger(),
+        )
+
+        envelopes: list[CANFrameEnvelope] = []
+        decoded_messages: list[DecodedPGN] = []
+
+        def on_envelope(envelope: CANFrameEnvelope) -> None:
+            envelopes.append(envelope)
+            manager.message_router.route_message(envelope, ["can0"])
+            aggregator.process_message(envelope)
+            validator.validate_safety_critical_message(envelope)
+
+        manager.add_envelope_callback(on_envelope)
+        manager.add_message_callback(lambda decoded, _: decoded_messages.append(decoded))
+
+        frames = [
+            codec.encoder.encode_vehicle_speed(0x0B, 12.5),
+            codec.encoder.encode_gps_position(0x1C, 40.7128, -74.0060),
+            codec.encoder.encode_engine_data(0x00, engine_speed=1800.0),
+            can.Message(arbitration_id=0x18FECA00, data=b"\x40\xff" + bytes(6)),
+            can.Message(arbitration_id=0x123, data=b"\x01", is_extended_id=False),
+        ]
+        for frame in frames:
+            assert frame is not None
+            manager._handle_incoming_message(frame, "can0")
+
+        manager._state = ManagerState.RUNNING
+        processing = asyncio.create_task(manager._message_processing_loop())
+        for _ in range(100):
+            if len(envelopes) == len(frames):
+                break
+            await asyncio.sleep(0.01)
+        manager._state = ManagerState.STOPPED
+        processing.cancel()
+
+        for envelope in envelopes:
+            assert await buffer.add_message(envelope)
+        assert await buffer.force_flush()
+
+        assert len(envelopes) == len(frames)
+        assert len(flushed) == len(frames)
+        assert all(envelope.decode_count == 1 for envelope in envelopes)
+        assert codec.messages_decoded == len(frames)
+        assert manager.get_manager_status()["statistics"]["messages_decoded"] == len(frames)
+
+        # Consumers saw the shared decode result
+        assert len(decoded_messages) == 3  # Unknown DM1 and standard frames do not decode
+        assert flushed[0].decoded_message is decoded_messages[0]
+
+
+class TestBatchedMessageDrain:
+    """Test batched draining of the reception queue."""
+
+    @pytest.mark.asyncio
+    async def test_queued_frames_delivered_in_batches(self) -> None:
+        """Test one wakeup drains queued frames up to the batch limit."""
+        manager = CANBusConnectionManager(
+            ConnectionPoolConfig(primary_interfaces=["can0"], backup_interfaces=[]),
+            batch_limit=64,
+        )
+        batches: list[list[CANFrameEnvelope]] = []
+        per_frame: list[CANFrameEnvelope] = []
+        decoded_messages: list[DecodedPGN] = []
+        manager.add_batch_callback(lambda batch: batches.append(list(batch)))
+        manager.add_envelope_callback(per_frame.append)
+        manager.add_message_callback(lambda decoded, _: decoded_messages.append(decoded))
+
+        frame = manager.codec.encoder.encode_vehicle_speed(0x0B, 12.5)
+        assert frame is not None
+        for _ in range(150):
+            manager._handle_incoming_message(frame, "can0")
+
+        manager._state = ManagerState.RUNNING
+        processing = asyncio.create_task(manager._message_processing_loop())
+        for _ in range(100):
+            if len(per_frame) == 150:
+                break
+            await asyncio.sleep(0.01)
+        manager._state = ManagerState.STOPPED
+        processing.cancel()
+
+        assert [len(batch) for batch in batches] == [64, 64, 22]
+        assert [envelope for batch in batches for envelope in batch] == per_frame
+        assert len(decoded_messages) == 150
+
+        backpressure = manager.get_manager_status()["backpressure"]
+        assert backpressure["queue_depth"] == 0
+        assert backpressure["queue_capacity"] == 1000
+        assert backpressure["queue_high_watermark"] == 150
+        assert backpressure["batch_limit"] == 64
+        assert backpressure["batches_processed"] == 3
+        assert backpressure["average_batch_size"] == pytest.approx(50.0)
+        assert backpressure["largest_batch"] == 64
+
+    @pytest.mark.asyncio
+    async def test_queued_frames_drained_without_waiting(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test wait_for is used only once the queue is empty."""
+        manager = CANBusConnectionManager(
+            ConnectionPoolConfig(primary_interfaces=["can0"], backup_interfaces=[]),
+            batch_limit=16,
+        )
+        per_frame: list[CANFrameEnvelope] = []
+        manager.add_envelope_callback(per_frame.append)
+        waits: list[int] = []
+        wait_for = asyncio.wait_for
+
+        async def counting_wait_for(awaitable: Awaitable[Any], timeout: float | None) -> Any:
+            waits.append(manager._message_queue.qsize())
+            return await wait_for(awaitable, timeout)
+
+        monkeypatch.setattr(asyncio, "wait_for", counting_wait_for)
+
+        frame = manager.codec.encoder.encode_vehicle_speed(0x0B, 12.5)
+        assert frame is not None
+        for _ in range(100):
+            manager._handle_incoming_message(frame, "can0")
+
+        manager._state = ManagerState.RUNNING
+        processing = asyncio.create_task(manager._message_processing_loop())
+        for _ in range(100):
+            if len(per_frame) == 100 and waits:
+                break
+            await asyncio.sleep(0.01)
+        manager._state = ManagerState.STOPPED
+        processing.cancel()
+
+        assert len(per_frame) == 100
+        assert waits and set(waits) == {0}
+
+    def test_backpressure_reports_drops_when_saturated(self) -> None:
+        """Test a full queue is visible through backpressure metrics."""
+        manager = CANBusConnectionManager(
+            ConnectionPoolConfig(primary_interfaces=["can0"], backup_interfaces=[]),
+            queue_size=10,
+        )
+        message = can.Message(arbitration_id=0x18FEF10B, data=bytes(8), is_extended_id=True)
+
+        for _ in range(15):
+            manager._handle_incoming_message(message, "can0")
+
+        backpressure = manager.get_manager_status()["backpressure"]
+        assert backpressure["queue_depth"] == 10
+        assert backpressure["queue_utilization"] == pytest.approx(1.0)
+        assert backpressure["messages_dropped"] == 5
+
+    def test_batch_callback_removal(self) -> None:
+        """Test batch callbacks can be removed."""
+        manager = CANBusConnectionManager(
+            ConnectionPoolConfig(primary_interfaces=["can0"], backup_interfaces=[])
+        )
+
+        def callback(batch: list[CANFrameEnvelope]) -> None:
+            pass
+
+        manager.add_batch_callback(callback)
+        manager.remove_batch_callback(callback)
+        manager.remove_batch_callback(callback)
+
+        assert manager._batch_callbacks == []
@@ -0,0 +1,328 @@
+"""
+Test suite for the binary fleet coordination wire codec.
+
+Tests message round trips, malformed input handling, J1939 TP/ETP
+fragmentation and reassembly, and reports encoded sizes and throughput
+against the previous ``str()`` encoding.
+"""
+
+from __future__ import annotations
+
+import ast
+import time
+from typing import Any
+
+import pytest
+
+from afs_fastapi.equipment.fleet_wire_codec import (
+    ETP_CM_PGN,
+    ETP_DT_PGN,
+    TP_BAM,
+    TP_CM_PGN,
+    TP_DT_PGN,
+    TP_RTS,
+    MAX_VARINT,
+    FleetCodecError,
+    FleetTransportReceiver,
+    decode_fleet_message,
+    encode_fleet_message,
+    j1939_frames,
+)
+from afs_fastapi.equipment.reliable_isobus import ReliableISOBUSDevice
+
+CLOCK = {"TRACTOR_001": 42, "TRACTOR_002": 17, "TRACTOR_003": 3}
+
+
+def _heartbeat() -> dict[str, Any]:
+    return {
+        "msg_type": "HEARTBEAT",
+        "sender_id": "TRACTOR_001",
+        "vector_clock": dict(CLOCK),
+        "payload": {
+            "status": "WORKING",
+            "position": {"lat": 40.7128, "lon": -74.006},
+            "speed": 8.5,
+            "health_metric": 0.95,
+        },
+    }
+
+
+def _emergency_stop() -> dict[str, Any]:
+    return {
+        "msg_type": "EMERGENCY_STOP",
+        "sender_id": "TRACTOR_002",
+        "emergency_id": "EMERGENCY_TRACTOR_002_1700000000123",
+        "vector_clock": dict(CLOCK),
+        "payload": {
+            "reason_code": "OBSTACLE_DETECTED",
+            "severity": "CRITICAL",
+            "source_position": {"lat": 40.7128, "lon": -74.006},
+        },
+    }
+
+
+def _state_sync_response(sections: int = 40) -> dict[str, Any]:
+    entries = {
+        f"section_{index}": {
+            "owner": f"TRACTOR_00{index % 3 + 1}",
+            "vector_clock": {f"TRACTOR_00{index % 3 + 1}": index + 1},
+            "timestamp": 1700000000.0 + index * 0.25,
+        }
+        for index in range(sections)
+    }
+    return {
+        "msg_type": "STATE_SYNC_RESPONSE",
+        "sender_id": "TRACTOR_003",
+        "vector_clock": dict(CLOCK),
+        "payload": {
+            "crdt_delta": {
+                "field_id": "north_field",
+                "vector_clock": dict(CLOCK),
+                "sections": entries,
+            }
+        },
+    }
+
+
+class TestFleetMessageEncoding:
+    """Test encoding and decoding of fleet messages."""
+
+    @pytest.mark.parametrize(
+        "message",
+        [_heartbeat(), _emergency_stop(), _state_sync_response()],
+        ids=lambda m: m["msg_type"],
+    )
+    def test_round_trip(self, message: dict[str, Any]) -> None:
+        """Test messages decode to the original dict, extras included."""
+        assert decode_fleet_message(encode_fleet_message(message)) == message
+        assert decode_fleet_message(encode_fleet_message(message, compress=False)) == message
+
+    def test_value_types(self) -> None:
+        """Test every supported value type and unknown message types round-trip."""
+        message = {
+            "msg_type": "CUSTOM_EVENT",
+            "sender_id": "",
+            "vector_clock": {},
+            "payload": {
+                "none": None,
+                "flags": [True, False],
+                "ints": [0, 127, 128, 2**63, -1, -(2**40)],
+                "floats": [0.5, 0.1, 1e300, float("inf")],
+                "bytes": b"\x00\xff",
+                "ids": ["row_0", "row_007", "row_10", "42"],
+            },
+        }
+
+        decoded = decode_fleet_message(encode_fleet_message(message))
+
+        assert decoded == message
+        # Tuples decode as lists
+        assert decode_fleet_message(encode_fleet_message({**message, "payload": (1, 2)}))[
+            "payload"
+        ] == [1, 2]
+
+    def test_unsupported_values_rejected(self) -> None:
+        """Test values without a wire representation raise FleetCodecError."""
+        with pytest.raises(FleetCodecError):
+            encode_fleet_message({**_heartbeat(), "payload": {"when": object()}})
+        with pytest.raises(FleetCodecError):
+            encode_fleet_message({**_heartbeat(), "payload": [MAX_VARINT + 1]})
+        assert decode_fleet_message(
+            encode_fleet_message({**_heartbeat(), "payload": [MAX_VARINT, -MAX_VARINT - 1]})
+        )["payload"] == [MAX_VARINT, -MAX_VARINT - 1]
+        with pytest.raises(FleetCodecError):
+            encode_fleet_message({**_heartbeat(), "payload": {1: "integer key"}})
+
+    def test_malformed_data_rejected(self) -> None:
+        """Test truncated, trailing and unknown-version data raise FleetCodecError."""
+        encoded = encode_fleet_message(_emergency_stop(), compress=False)
+
+        for length in range(len(encoded)):
+            with pytest.raises(FleetCodecError):
+                decode_fleet_message(encoded[:length])
+        with pytest.raises(FleetCodecError):
+            decode_fleet_message(encoded + b"\x00")
+        with pytest.raises(FleetCodecError):
+            decode_fleet_message(b"\x02" + encoded[1:])
+        # Widen the zero varint of the unsigned payload (second to last byte) past 64 bits
+        oversized = encode_fleet_message({**_heartbeat(), "payload": 0}, compress=False)
+        with pytest.raises(FleetCodecError):
+            decode_fleet_message(oversized[:-2] + b"\xff" * 9 + b"\x02" + oversized[-1:])
+        assert (
+            decode_fleet_message(oversized[:-2] + b"\xff" * 9 + b"\x01" + oversized[-1:])["payload"]
+            == MAX_VARINT
+        )
+
+    def test_large_messages_compressed(self) -> None:
+        """Test large state syncs are compressed and small messages are not."""
+        assert encode_fleet_message(_heartbeat())[1] == 0
+        assert encode_fleet_message(_state_sync_response(400))[1] != 0
+
+
+class TestJ1939Fragmentation:
+    """Test TP/ETP fragmentation and reassembly."""
+
+    @staticmethod
+    def _pdu_format(frame: Any) -> int:
+        return (frame.arbitration_id >> 16) & 0xFF
+
+    def test_single_frame(self) -> None:
+        """Test messages of up to 8 bytes use one frame."""
+        frames = j1939_frames(0xE000, b"\x01\x02", 0x80)
+
+        assert len(frames) == 1
+        message = FleetTransportReceiver().feed(frames[0])
+        assert message is not None
+        assert (message.pgn, message.source_address, message.data) == (0xE000, 0x80, b"\x01\x02")
+
+    def test_pdu1_pgn_with_destination_byte_rejected(self) -> None:
+        """Test PDU1 PGNs must leave the destination byte to the identifier."""
+        with pytest.raises(FleetCodecError):
+            j1939_frames(0xE001, b"\x01", 0x80)
+
+        frames = j1939_frames(0xFF10, b"\x01", 0x80)
+        message = FleetTransportReceiver().feed(frames[0])
+        assert message is not None
+        assert (message.pgn, message.destination_address) == (0xFF10, 0xFF)
+
+    def test_broadcast_uses_bam(self) -> None:
+        """Test broadcasts use TP BAM with padded data packets."""
+        data = bytes(range(100))
+        frames = j1939_frames(0xE000, data, 0x80)
+
+        assert self._pdu_format(frames[0]) == TP_CM_PGN >> 8
+        assert frames[0].data[0] == TP_BAM
+        assert [self._pdu_format(frame) for frame in frames[1:]] == [TP_DT_PGN >> 8] * 15
+        assert all(len(frame.data) == 8 for frame in frames)
+
+        receiver = FleetTransportReceiver()
+        results = [receiver.feed(frame) for frame in frames]
+        assert results[:-1] == [None] * 15
+        assert results[-1] is not None
+        assert (results[-1].pgn, results[-1].destination_address) == (0xE000, 0xFF)
+        assert results[-1].data == data
+
+    def test_directed_uses_rts(self) -> None:
+        """Test destination-specific messages use TP RTS."""
+        data = bytes(range(50))
+        frames = j1939_frames(0xE000, data, 0x80, destination_address=0x81)
+
+        assert frames[0].data[0] == TP_RTS
+        assert (frames[0].arbitration_id >> 8) & 0xFF == 0x81
+
+        receiver = FleetTransportReceiver()
+        message = [receiver.feed(frame) for frame in frames][-1]
+        assert message is not None
+        assert (message.destination_address, message.data) == (0x81, data)
+
+    def test_extended_transport(self) -> None:
+        """Test messages beyond 1785 bytes use ETP with one DPO per 255 packets."""
+        data = bytes(index % 251 for index in range(4000))
+        frames = j1939_frames(0xE000, data, 0x80, destination_address=0x81)
+
+        control = [frame for frame in frames if self._pdu_format(frame) == ETP_CM_PGN >> 8]
+        assert [frame.data[0] for frame in control] == [20, 22, 22, 22]
+        assert sum(self._pdu_format(frame) == ETP_DT_PGN >> 8 for frame in frames) == 572
+
+        receiver = FleetTransportReceiver()
+        message = [receiver.feed(frame) for frame in frames][-1]
+        assert message is not None
+        assert message.data == data
+
+        with pytest.raises(FleetCodecError):
+            j1939_frames(0xE000, data, 0x80)
+
+    def test_lost_packet_discards_message(self) -> None:
+        """Test a missing data packet drops the message rather than corrupting it."""
+        frames = j1939_frames(0xE000, bytes(4000), 0x80, destination_address=0x81)
+        del frames[10]
+
+        receiver = FleetTransportReceiver()
+        assert all(receiver.feed(frame) is None for frame in frames)
+
+
+class TestReliableISOBUSTransport:
+    """Test fleet messages sent through the reliable ISOBUS device."""
+
+    @pytest.mark.asyncio
+    async def test_device_round_trip(self) -> None:
+        """Test a queued state sync reaches the fleet through TP frames."""
+        sender = ReliableISOBUSDevice(device_address=0x80)
+        receiver = ReliableISOBUSDevice(device_address=0x81)
+        message = _state_sync_response()
+
+        await sender.broadcast_message(message)
+        frames = sender.transport_frames(sender._outbound_queue[-1])
+
+        results = [receiver.receive_frame(frame) for frame in frames]
+        assert len(frames) > 1
+        assert results[-1] == message
+        assert results[:-1] == [None] * (len(frames) - 1)
+
+    @pytest.mark.asyncio
+    async def test_emergency_broadcast_round_trip(self) -> None:
+        """Test emergency broadcasts travel on the fleet transport PGN."""
+        sender = ReliableISOBUSDevice(device_address=0x80)
+        receiver = ReliableISOBUSDevice(device_address=0x81)
+        message = _emergency_stop()
+
+        await sender.broadcast_priority_message(message)
+        queued = sender._outbound_queue[-1]
+        frames = sender.transport_frames(queued)
+
+        assert queued.base_message.pgn == 0xE001
+        assert [receiver.receive_frame(frame) for frame in frames][-1] == message
+
+    @pytest.mark.asyncio
+    async def test_direct_message_for_other_device_ignored(self) -> None:
+        """Test direct messages addressed elsewhere are not delivered."""
+        sender = ReliableISOBUSDevice(device_address=0x80)
+        await sender.send_message(0x82, _emergency_stop())
+        frames = sender.transport_frames(sender._outbound_queue[-1])
+
+        bystander = ReliableISOBUSDevice(device_address=0x81)
+        assert all(bystander.receive_frame(frame) is None for frame in frames)
+
+
+class TestFleetCodecBenchmark:
+    """Compare encoded size and throughput against the ``str()`` encoding."""
+
+    @staticmethod
+    def _rate(function: Any, argument: Any, iterations: int) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function(argument)
+        return iterations / (time.perf_counter() - start)
+
+    @pytest.mark.parametrize(
+        "message",
+        [_heartbeat(), _state_sync_response(), _emergency_stop()],
+        ids=lambda m: m["msg_type"],
+    )
+    def test_binary_messages_are_smaller(self, message: dict[str, Any]) -> None:
+        """Test binary messages take under half the bytes and fewer TP frames."""
+        text = str(message).encode()
+        binary = encode_fleet_message(message)
+
+        assert len(binary) < len(text) / 2
+        assert len(j1939_frames(0xE000, binary, 0x80, 0x81)) <= len(
+            j1939_frames(0xE000, text, 0x80, 0x81)
+        )
+
+    @pytest.mark.slow
+    @pytest.mark.serial
+    @pytest.mark.parametrize(
+        "message",
+        [_heartbeat(), _state_sync_response(), _emergency_stop()],
+        ids=lambda m: m["msg_type"],
+    )
+    def test_decode_throughput(self, message: dict[str, Any]) -> None:
+        """Test binary messages decode faster than literal_eval."""
+        iterations = 300
+        text = str(message).encode()
+        binary = encode_fleet_message(message)
+
+        text_decode = self._rate(lambda d: ast.literal_eval(d.decode()), text, iterations)
+        binary_decode = self._rate(decode_fleet_message, binary, iterations)
+
+        assert binary_decode > text_decode
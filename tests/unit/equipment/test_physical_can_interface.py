@@ -9,6 +9,8 @@ Implementation follows Test-First Development (TDD) methodology.
 
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -483,6 +485,7 @@ class TestAsyncIntegrationScenarios:
 
         with (
             patch("can.interface.Bus", return_value=MagicMock()),
+            patch("can.Notifier"),
             patch("asyncio.create_task", return_value=MagicMock()),
         ):
             # Create interface
@@ -543,7 +546,7 @@ class TestAsyncIntegrationScenarios:
 
         with (
             patch("can.interface.Bus"),
-            patch("can.BufferedReader"),
+            patch("can.AsyncBufferedReader"),
             patch("can.Notifier"),
             patch("asyncio.create_task", return_value=MagicMock()),
         ):
@@ -612,7 +615,7 @@ class TestAsyncIntegrationScenarios:
 
         with (
             patch("can.interface.Bus"),
-            patch("can.BufferedReader"),
+            patch("can.AsyncBufferedReader"),
             patch("can.Notifier"),
             patch("asyncio.create_task", return_value=MagicMock()),
         ):
@@ -688,7 +691,7 @@ class TestAsyncIntegrationScenarios:
         # Test successful connection after failure
         with (
             patch("can.interface.Bus") as mock_bus,
-            patch("can.BufferedReader"),
+            patch("can.AsyncBufferedReader"),
             patch("can.Notifier"),
             patch("asyncio.create_task", return_value=MagicMock()),
             patch.object(
@@ -721,3 +724,123 @@ class TestAsyncIntegrationScenarios:
                 send_result = await interface.send_message(test_message)
                 assert send_result is True
                 assert interface.status.messages_sent == 1
+
+
+class TestReceptionLoopLatency:
+    """Test the reception loop keeps the event loop responsive."""
+
+    TICK_INTERVAL = 0.005
+
+    async def _measure_loop_lag(self, stop: asyncio.Event) -> float:
+        """Return the worst overshoot of a short periodic sleep until stopped."""
+        worst = 0.0
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(self.TICK_INTERVAL)
+            worst = max(worst, time.perf_counter() - started - self.TICK_INTERVAL)
+        return worst
+
+    async def _largest_delivery_burst(
+        self, received: list[can.Message], stop: asyncio.Event
+    ) -> int:
+        """Return the most frames delivered between two turns of a yielding task."""
+        largest = 0
+        seen = len(received)
+        while not stop.is_set():
+            await asyncio.sleep(0)
+            largest = max(largest, len(received) - seen)
+            seen = len(received)
+        return largest
+
+    async def _connect_virtual(self, channel: str) -> tuple[VirtualCANInterface, list[can.Message]]:
+        """Connect a virtual interface that records received frames."""
+        config = InterfaceConfiguration(
+            interface_type=CANInterfaceType.VIRTUAL,
+            channel=channel,
+            bitrate=BusSpeed.SPEED_250K,
+        )
+        interface = VirtualCANInterface(channel, config, CANErrorHandler())
+        received: list[can.Message] = []
+        interface.add_message_callback(lambda message, _: received.append(message))
+        assert await interface.connect() is True
+        return interface, received
+
+    @pytest.mark.serial
+    @pytest.mark.asyncio
+    async def test_idle_bus_does_not_block_event_loop(self) -> None:
+        """Test an idle bus leaves the event loop free to run other tasks."""
+        interface, received = await self._connect_virtual("latency_idle")
+        try:
+            stop = asyncio.Event()
+            probe = asyncio.create_task(self._measure_loop_lag(stop))
+            await asyncio.sleep(0.3)
+            stop.set()
+            worst_lag = await probe
+        finally:
+            await interface.disconnect()
+
+        assert received == []
+        # A blocking get_message(timeout=1.0) would stall the loop for ~1 s
+        assert worst_lag < 0.05
+
+    @pytest.mark.serial
+    @pytest.mark.asyncio
+    async def test_saturated_bus_drains_without_starving_event_loop(self) -> None:
+        """Test a saturated bus is drained in batches while the loop stays responsive."""
+        frame_count = 5000
+        interface, received = await self._connect_virtual("latency_saturated")
+        sender = can.interface.Bus(interface="virtual", channel="latency_saturated")
+
+        def flood() -> None:
+            for i in range(frame_count):
+                sender.send(
+                    can.Message(
+                        arbitration_id=0x18FEF100 | (i & 0xFF),
+                        data=i.to_bytes(4, "little") + b"\xff" * 4,
+                        is_extended_id=True,
+                    )
+                )
+
+        try:
+            stop = asyncio.Event()
+            probe = asyncio.create_task(self._largest_delivery_burst(received, stop))
+            lag_probe = asyncio.create_task(self._measure_loop_lag(stop))
+            await asyncio.to_thread(flood)
+
+            deadline = time.perf_counter() + 10.0
+            while len(received) < frame_count and time.perf_counter() < deadline:
+                await asyncio.sleep(0.01)
+            stop.set()
+            largest_burst = await probe
+            worst_lag = await lag_probe
+        finally:
+            sender.shutdown()
+            await interface.disconnect()
+
+        assert len(received) == frame_count
+        assert interface.status.messages_received == frame_count
+        assert [int.from_bytes(m.data[:4], "little") for m in received] == list(range(frame_count))
+        # Other tasks get a turn after every batch, and soon
+        assert 0 < largest_burst <= interface.RECEPTION_BATCH_SIZE
+        assert worst_lag < 0.1
+
+    @pytest.mark.asyncio
+    async def test_unexpected_reception_error_is_reported(self) -> None:
+        """Test an unexpected reader failure is reported and moves the interface to error."""
+        config = InterfaceConfiguration(
+            interface_type=CANInterfaceType.VIRTUAL,
+            channel="reception_failure",
+            bitrate=BusSpeed.SPEED_250K,
+        )
+        error_handler = MagicMock(spec=CANErrorHandler)
+        interface = VirtualCANInterface("reception_failure", config, error_handler)
+        interface._state = InterfaceState.CONNECTED
+        reader = MagicMock()
+        reader.buffer = asyncio.Queue()
+        reader.get_message = AsyncMock(side_effect=RuntimeError("reader broke"))
+
+        await asyncio.wait_for(interface._message_reception_loop(reader), timeout=1.0)
+
+        assert interface.status.state == InterfaceState.ERROR
+        error_handler.handle_error.assert_called_once()
+        assert "reader broke" in error_handler.handle_error.call_args.args[1]
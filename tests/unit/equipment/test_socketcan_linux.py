@@ -500,6 +500,7 @@ class TestEnhancedSocketCANInterface:
             patch(
                 "can.interface.Bus", return_value=mock_bus_instance
             ),  # Mock the class to return our mock instance
+            patch("can.Notifier"),  # Avoid registering the mock bus with the event loop
             patch("asyncio.create_task", mock_create_task),  # Mock create_task
         ):
             # Test connection
@@ -439,6 +439,163 @@ class TestTransportProtocolHandler:
         # Session should be removed
         assert "test_session" not in tp_handler.active_sessions
 
+    @staticmethod
+    def _bam(source: int, pgn: int, size: int) -> can.Message:
+        """Build a BAM announcement from ``source``."""
+        data = bytearray(8)
+        data[0] = TPControl.BAM.value
+        data[1:3] = struct.pack("<H", size)
+        data[3] = (size + 6) // 7
+        data[4] = 0xFF
+        data[5:8] = struct.pack("<I", pgn)[0:3]
+        return can.Message(
+            arbitration_id=0x18EBFF00 | source, data=bytes(data), is_extended_id=True
+        )
+
+    @staticmethod
+    def _dt(source: int, sequence: int, payload: bytes) -> can.Message:
+        """Build a broadcast TP.DT packet from ``source``."""
+        data = bytes([sequence]) + payload.ljust(7, b"\xff")
+        return can.Message(arbitration_id=0x18ECFF00 | source, data=data, is_extended_id=True)
+
+    def test_completed_messages_ring_is_bounded(
+        self, codec: CANFrameCodec, error_handler: CANErrorHandler
+    ) -> None:
+        """Test completed payloads are kept in a bounded ring."""
+        tp_handler = TransportProtocolHandler(codec, error_handler, completed_history=3)
+
+        for index in range(10):
+            tp_handler.handle_tp_cm_message(self._bam(0x10, 0x1000 + index, 10))
+            tp_handler.handle_tp_dt_message(self._dt(0x10, 1, b"ABCDEFG"))
+            assert tp_handler.handle_tp_dt_message(self._dt(0x10, 2, b"HIJ")) == b"ABCDEFGHIJ"
+
+        assert len(tp_handler.completed_messages) == 3
+        assert [pgn for pgn, _, _ in tp_handler.completed_messages] == [0x1007, 0x1008, 0x1009]
+
+    def test_callback_only_mode(self, codec: CANFrameCodec, error_handler: CANErrorHandler) -> None:
+        """Test completed payloads are delivered without being retained."""
+        tp_handler = TransportProtocolHandler(codec, error_handler, completed_history=0)
+        received: list[tuple[int, bytes, int]] = []
+        tp_handler.add_message_callback(lambda pgn, data, sa: received.append((pgn, data, sa)))
+
+        tp_handler.handle_tp_cm_message(self._bam(0x10, 0x1234, 10))
+        tp_handler.handle_tp_dt_message(self._dt(0x10, 1, b"ABCDEFG"))
+        tp_handler.handle_tp_dt_message(self._dt(0x10, 2, b"HIJ"))
+
+        assert received == [(0x1234, b"ABCDEFGHIJ", 0x10)]
+        assert len(tp_handler.completed_messages) == 0
+
+    def test_interleaved_sessions_from_many_sources(
+        self, tp_handler: TransportProtocolHandler
+    ) -> None:
+        """Test packets are routed to the session of their own source."""
+        sources = range(0x20, 0x60)
+        for source in sources:
+            tp_handler.handle_tp_cm_message(self._bam(source, 0x2000 + source, 10))
+        for source in sources:
+            tp_handler.handle_tp_dt_message(self._dt(source, 1, bytes([source]) * 7))
+        for source in sources:
+            result = tp_handler.handle_tp_dt_message(self._dt(source, 2, bytes([source]) * 3))
+            assert result == bytes([source]) * 10
+
+        assert len(tp_handler.active_sessions) == 0
+        assert len(tp_handler.completed_messages) == len(sources)
+
+    def test_new_announcement_replaces_session(self, tp_handler: TransportProtocolHandler) -> None:
+        """Test a new BAM from the same source supersedes the previous one."""
+        first = tp_handler.handle_tp_cm_message(self._bam(0x10, 0x1111, 10))
+        second = tp_handler.handle_tp_cm_message(self._bam(0x10, 0x2222, 10))
+
+        assert first not in tp_handler.active_sessions
+        assert second in tp_handler.active_sessions
+        assert len(tp_handler.active_sessions) == 1
+
+    def test_externally_deleted_session_unindexed(
+        self, tp_handler: TransportProtocolHandler
+    ) -> None:
+        """Test deleting a session from the table directly removes it from the indexes once."""
+        deleted_id = tp_handler.handle_tp_cm_message(self._bam(0x10, 0x1111, 10))
+        kept_id = tp_handler.handle_tp_cm_message(self._bam(0x11, 0x2222, 10))
+        assert deleted_id is not None and kept_id is not None
+
+        del tp_handler.active_sessions[deleted_id]
+
+        assert tp_handler.handle_tp_dt_message(self._dt(0x10, 1, b"ABCDEFG")) is None
+        assert tp_handler._indexed_sessions == {kept_id}
+        assert 0x10 not in tp_handler._bam_index
+        assert tp_handler.handle_tp_dt_message(self._dt(0x11, 1, b"ABCDEFG")) is None
+        assert tp_handler.handle_tp_dt_message(self._dt(0x11, 2, b"HIJ")) == b"ABCDEFGHIJ"
+
+    def test_external_swap_of_sessions_reindexed(
+        self, tp_handler: TransportProtocolHandler
+    ) -> None:
+        """Test a direct deletion paired with a direct insertion updates the indexes."""
+        deleted_id = tp_handler.handle_tp_cm_message(self._bam(0x10, 0x1111, 10))
+        assert deleted_id is not None
+
+        del tp_handler.active_sessions[deleted_id]
+        tp_handler.active_sessions["external"] = TPSession(
+            session_id="external",
+            pgn=0x3333,
+            source_address=0x12,
+            destination_address=255,
+            total_size=10,
+            total_packets=2,
+            max_packets=255,
+            data_buffer=bytearray(10),
+            is_bam=True,
+        )
+
+        assert tp_handler.handle_tp_dt_message(self._dt(0x10, 1, b"ABCDEFG")) is None
+        assert tp_handler._indexed_sessions == {"external"}
+        assert tp_handler._bam_index == {0x12: "external"}
+        assert tp_handler.handle_tp_dt_message(self._dt(0x12, 1, b"ABCDEFG")) is None
+        assert tp_handler.handle_tp_dt_message(self._dt(0x12, 2, b"HIJ")) == b"ABCDEFGHIJ"
+
+    def test_packets_do_not_rescan_sessions(
+        self, tp_handler: TransportProtocolHandler, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test TP.DT lookups reindex only after a direct change to the session table."""
+        for source in range(0x20, 0x30):
+            tp_handler.handle_tp_cm_message(self._bam(source, 0x2000 + source, 20))
+        indexed: list[str] = []
+        index_session = tp_handler._index_session
+
+        def counting_index_session(session: TPSession) -> None:
+            indexed.append(session.session_id)
+            index_session(session)
+
+        monkeypatch.setattr(tp_handler, "_index_session", counting_index_session)
+
+        tp_handler.handle_tp_dt_message(self._dt(0x20, 1, b"ABCDEFG"))
+        tp_handler.handle_tp_dt_message(self._dt(0x21, 1, b"ABCDEFG"))
+        assert indexed == []
+
+        del tp_handler.active_sessions[next(iter(tp_handler.active_sessions))]
+        tp_handler.handle_tp_dt_message(self._dt(0x22, 1, b"ABCDEFG"))
+        tp_handler.handle_tp_dt_message(self._dt(0x23, 1, b"ABCDEFG"))
+        assert len(indexed) == len(tp_handler.active_sessions) == 15
+
+    @pytest.mark.asyncio
+    async def test_cleanup_keeps_active_sessions(
+        self, tp_handler: TransportProtocolHandler
+    ) -> None:
+        """Test cleanup only expires sessions past their deadline."""
+        stale_id = tp_handler.handle_tp_cm_message(self._bam(0x10, 0x1111, 10))
+        fresh_id = tp_handler.handle_tp_cm_message(self._bam(0x11, 0x2222, 10))
+        assert stale_id is not None and fresh_id is not None
+        tp_handler.active_sessions[stale_id].last_packet_time = datetime.now() - timedelta(
+            seconds=60
+        )
+        # Move the stale deadline into the current wheel slot
+        tp_handler._schedule_expiry(stale_id, 0.0)
+
+        await tp_handler.cleanup_expired_sessions()
+
+        assert stale_id not in tp_handler.active_sessions
+        assert fresh_id in tp_handler.active_sessions
+        assert tp_handler.handle_tp_dt_message(self._dt(0x10, 1, b"ABCDEFG")) is None
+
 
 class TestDiagnosticHandler:
     """Test ISOBUS diagnostic protocol functionality."""
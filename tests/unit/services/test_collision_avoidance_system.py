@@ -29,6 +29,8 @@ These tests validate actual collision detection and avoidance logic.
 
 from __future__ import annotations
 
+import random
+import time
 from unittest.mock import AsyncMock
 
 import pytest
@@ -610,3 +612,179 @@ class TestDynamicSafetyZoneAdaptation:
         # Zones should be adjusted to prevent excessive overlap
         assert zone_a.coordination_adjustment_applied is True
         assert zone_b.coordination_adjustment_applied is True
+
+
+class TestFleetCollisionScreening:
+    """Test vectorized fleet-wide collision screening.
+
+    Tests the all-pairs closest-point-of-approach screen and the vectorized
+    safety zone coordination against the per-pair logic they replace.
+    """
+
+    @staticmethod
+    def _random_fleet(count: int, seed: int, span: float = 0.01) -> list[dict]:
+        rng = random.Random(seed)
+        return [
+            {
+                "id": f"TRACTOR_{index:03d}",
+                "position": PositionVector(
+                    lat=40.0 + rng.uniform(0, span),
+                    lon=-75.0 + rng.uniform(0, span),
+                    heading=0.0,
+                ),
+                "velocity": VelocityVector(
+                    speed=rng.choice([0.0, rng.uniform(1, 8)]), direction=rng.uniform(0, 360)
+                ),
+                "status": rng.choice(["WORKING", "TRANSPORT", "IDLE"]),
+            }
+            for index in range(count)
+        ]
+
+    def test_coordinated_zones_match_pairwise_loop(self) -> None:
+        """Test vectorized zone coordination equals the per-pair distance loop."""
+        collision_system = CollisionAvoidanceSystem(base_safety_radius=8.0)
+        states = self._random_fleet(30, seed=3)
+
+        zones = collision_system.coordinate_multi_tractor_safety_zones(states)
+
+        for state in states:
+            base = collision_system.calculate_dynamic_safety_zone(
+                state["position"], state["velocity"], state["status"]
+            )
+            adjustment = 1.0
+            for other in states:
+                if other["id"] == state["id"]:
+                    continue
+                distance = state["position"].distance_to(other["position"])
+                if distance < base.radius * 2.5:
+                    adjustment = min(adjustment, max(0.7, distance / (base.radius * 3.0)))
+            zone = zones[state["id"]]
+            assert zone.radius == pytest.approx(base.radius * adjustment)
+            assert zone.coordination_adjustment_applied is (adjustment < 1.0)
+
+    def test_screen_flags_converging_pairs_and_obstacles(self) -> None:
+        """Test converging tractors and an obstacle ahead are flagged, distant tracks are not."""
+        collision_system = CollisionAvoidanceSystem(base_safety_radius=8.0)
+        tracks = [
+            # Head-on pair 100 m apart on the same row
+            {
+                "id": "TRACTOR_A",
+                "position": PositionVector(lat=40.0, lon=-75.0, heading=90.0),
+                "velocity": VelocityVector(speed=5.0, direction=90.0),
+            },
+            {
+                "id": "TRACTOR_B",
+                "position": PositionVector(lat=40.0, lon=-74.99883, heading=270.0),
+                "velocity": VelocityVector(speed=5.0, direction=270.0),
+            },
+            # Stationary obstacle 80 m ahead of C (listed first: C must become "own")
+            {
+                "id": "OBSTACLE_1",
+                "position": PositionVector(lat=40.01072, lon=-75.0, heading=0.0),
+                "velocity": VelocityVector(speed=0.0, direction=0.0),
+            },
+            {
+                "id": "TRACTOR_C",
+                "position": PositionVector(lat=40.01, lon=-75.0, heading=0.0),
+                "velocity": VelocityVector(speed=4.0, direction=0.0),
+            },
+            # Far away, driving away from everyone
+            {
+                "id": "TRACTOR_D",
+                "position": PositionVector(lat=40.05, lon=-75.05, heading=225.0),
+                "velocity": VelocityVector(speed=6.0, direction=225.0),
+            },
+        ]
+
+        threats = collision_system.screen_fleet_collisions(tracks, prediction_horizon=30.0)
+
+        pairs = {(own, other) for own, other, _ in threats}
+        assert ("TRACTOR_A", "TRACTOR_B") in pairs
+        assert ("TRACTOR_C", "OBSTACLE_1") in pairs
+        assert not any("TRACTOR_D" in pair for pair in pairs)
+        assert all(threat.collision_detected for _, _, threat in threats)
+
+    def test_screen_agrees_with_detailed_check_on_screened_pairs(self) -> None:
+        """Test every reported threat is one detect_collision_threat reports for that pair."""
+        collision_system = CollisionAvoidanceSystem(base_safety_radius=8.0)
+        tracks = self._random_fleet(25, seed=11)
+
+        threats = collision_system.screen_fleet_collisions(tracks, prediction_horizon=20.0)
+
+        by_id = {track["id"]: track for track in tracks}
+        for own_id, other_id, threat in threats:
+            own, other = by_id[own_id], by_id[other_id]
+            expected = collision_system.detect_collision_threat(
+                own["position"], own["velocity"], other["position"], other["velocity"], 20.0
+            )
+            assert expected.collision_detected
+            assert threat.risk_level == expected.risk_level
+            assert threat.closest_approach_distance == pytest.approx(
+                expected.closest_approach_distance
+            )
+
+    def test_screen_matches_detailed_check_on_every_pair(self) -> None:
+        """Test the screen reports exactly the pairs detect_collision_threat flags."""
+        collision_system = CollisionAvoidanceSystem(base_safety_radius=8.0)
+        for seed in range(5):
+            tracks = self._random_fleet(30, seed=seed, span=0.05)
+
+            threats = collision_system.screen_fleet_collisions(tracks, prediction_horizon=30.0)
+
+            expected = set()
+            for i, own in enumerate(tracks):
+                for other in tracks[i + 1 :]:
+                    if own["velocity"].speed == 0 and other["velocity"].speed > 0:
+                        first, second = other, own
+                    else:
+                        first, second = own, other
+                    threat = collision_system.detect_collision_threat(
+                        first["position"],
+                        first["velocity"],
+                        second["position"],
+                        second["velocity"],
+                        30.0,
+                    )
+                    if threat.collision_detected:
+                        expected.add((first["id"], second["id"]))
+            assert {(own_id, other_id) for own_id, other_id, _ in threats} == expected
+
+    def test_screen_keeps_distant_obstacle_ahead(self) -> None:
+        """Test a stationary obstacle far ahead is flagged although its CPA is far away."""
+        collision_system = CollisionAvoidanceSystem(base_safety_radius=8.0)
+        tracks = [
+            {
+                "id": "TRACTOR_A",
+                "position": PositionVector(lat=40.0, lon=-75.0, heading=40.0),
+                "velocity": VelocityVector(speed=3.0, direction=40.0),
+            },
+            # 600 m due north: about 385 m CPA, beyond the screening distance
+            {
+                "id": "OBSTACLE_1",
+                "position": PositionVector(lat=40.0 + 600 / 111320, lon=-75.0, heading=0.0),
+                "velocity": VelocityVector(speed=0.0, direction=0.0),
+            },
+        ]
+
+        threats = collision_system.screen_fleet_collisions(tracks, prediction_horizon=30.0)
+
+        assert [(own, other) for own, other, _ in threats] == [("TRACTOR_A", "OBSTACLE_1")]
+        assert threats[0][2].risk_level == CollisionRisk.HIGH
+
+    @pytest.mark.slow
+    @pytest.mark.serial
+    def test_screen_fleet_within_control_cycle(self) -> None:
+        """Test 40 machines plus 60 tracked obstacles are screened within a 100 ms cycle."""
+        collision_system = CollisionAvoidanceSystem(base_safety_radius=8.0)
+        # About 3 km x 2.5 km of field
+        tracks = self._random_fleet(100, seed=5, span=0.03)
+
+        # Best of several cycles, so load from parallel test workers does not count
+        cycle_times = []
+        for _ in range(10):
+            start = time.perf_counter()
+            collision_system.screen_fleet_collisions(tracks, prediction_horizon=30.0)
+            collision_system.coordinate_multi_tractor_safety_zones(tracks[:40])
+            cycle_times.append(time.perf_counter() - start)
+
+        assert min(cycle_times) * 1000 < 100.0
@@ -14,6 +14,8 @@ Notes
 
 from __future__ import annotations
 
+import pytest
+
 # Planned API location
 from afs_fastapi.services.field_allocation import FieldAllocationCRDT
 
@@ -157,3 +159,84 @@ def test_merge_is_commutative() -> None:
     assert crdt_a.owner_of("section_2") == crdt_d.owner_of("section_2")
     assert crdt_a.assigned_sections("tractor_A") == crdt_d.assigned_sections("tractor_A")
     assert crdt_a.assigned_sections("tractor_B") == crdt_d.assigned_sections("tractor_B")
+
+
+def test_delta_ships_only_unseen_sections() -> None:
+    """Test a delta holds only sections changed since the peer's causal context.
+
+    Agricultural Context:
+    A tractor back from a radio dropout only needs the sections claimed or
+    released while it was away, not the whole field.
+    """
+    a = FieldAllocationCRDT(field_id="field_003", tractor_ids=["tractor_A", "tractor_B"])
+    for index in range(100):
+        a.claim(f"section_{index}", "tractor_A")
+    b = FieldAllocationCRDT.deserialize(a.serialize())
+
+    # b goes offline; a keeps working and b claims its own section
+    a.release("section_5", "tractor_A")
+    a.claim("section_100", "tractor_A")
+    b.claim("section_200", "tractor_B")
+
+    delta = a.serialize_delta(b.causal_context())
+
+    assert set(delta["sections"]) == {"section_5", "section_100"}
+    b.merge_delta(delta)
+    a.merge_delta(b.serialize_delta(a.causal_context()))
+
+    assert a.serialize() == b.serialize()
+    assert b.owner_of("section_5") is None
+    assert b.owner_of("section_100") == "tractor_A"
+    assert a.owner_of("section_200") == "tractor_B"
+    # Synchronized replicas have nothing left to send each other
+    assert a.serialize_delta(b.causal_context())["sections"] == {}
+    assert b.serialize_delta(a.causal_context())["sections"] == {}
+
+
+def test_delta_survives_change_log_compaction() -> None:
+    """Test deltas stay correct after a section is claimed and released many times."""
+    a = FieldAllocationCRDT(field_id="field_003", tractor_ids=["tractor_A"])
+    a.claim("section_1", "tractor_A")
+    context = a.causal_context()
+    for _ in range(200):
+        a.release("section_2", "tractor_A")
+        a.claim("section_2", "tractor_A")
+
+    assert len(a._changes) < 100
+    delta = a.serialize_delta(context)
+    assert set(delta["sections"]) == {"section_2"}
+    assert a.serialize_delta(None)["sections"].keys() == {"section_1", "section_2"}
+
+
+def test_overheard_delta_does_not_hide_missing_sections() -> None:
+    """Test a delta computed for another replica does not advance the clock.
+
+    Agricultural Context:
+    A tractor that overhears a resync meant for a peer must still receive
+    the claims that delta left out, or it could work a claimed section.
+    """
+    a = FieldAllocationCRDT(field_id="field_003", tractor_ids=["tractor_A", "tractor_B"])
+    b = FieldAllocationCRDT(field_id="field_003", tractor_ids=["tractor_A", "tractor_B"])
+    c = FieldAllocationCRDT(field_id="field_003", tractor_ids=["tractor_A", "tractor_B"])
+    b.claim("section_1", "tractor_B")
+    a.merge_delta(b.serialize_delta(a.causal_context()))
+    b.claim("section_2", "tractor_B")
+
+    delta_for_a = b.serialize_delta(a.causal_context())
+    c.merge_delta(delta_for_a)
+
+    assert set(delta_for_a["sections"]) == {"section_2"}
+    assert c.owner_of("section_2") == "tractor_B"
+    c.merge_delta(b.serialize_delta(c.causal_context()))
+    assert c.owner_of("section_1") == "tractor_B"
+    assert c.serialize() == b.serialize()
+
+
+def test_merge_delta_rejects_other_field() -> None:
+    """Test deltas of another field are rejected."""
+    a = FieldAllocationCRDT(field_id="field_003")
+    b = FieldAllocationCRDT(field_id="field_004")
+    b.claim("section_1", "tractor_B")
+
+    with pytest.raises(ValueError):
+        a.merge_delta(b.serialize_delta({}))
@@ -30,7 +30,7 @@ from unittest.mock import AsyncMock, Mock
 
 import pytest
 
-from afs_fastapi.services.fleet import FleetCoordinationEngine
+from afs_fastapi.services.fleet import PEER_HEARTBEAT_TIMEOUT, FleetCoordinationEngine
 
 
 class TestFleetCoordinationEngineCore:
@@ -418,3 +418,113 @@ class TestFleetStatusSynchronization:
         # Assert - Joining tractor should have synchronized state
         joining_field_allocation = joining_engine.get_field_allocation_state()
         assert joining_field_allocation.owner_of("ESTABLISHED_SECTION_25") == responding_tractor_id
+
+    @pytest.mark.asyncio
+    async def test_state_sync_request_answered_with_delta(self) -> None:
+        """Test sync requests are answered with only the sections the requester lacks.
+
+        Agricultural Context:
+        Full-state sync of a large field does not fit the ISOBUS link, so a
+        tractor rejoining the fleet receives only what changed while it was away.
+        """
+        # Arrange
+        mock_isobus_joining = AsyncMock()
+        mock_isobus_responding = AsyncMock()
+        joining_engine = FleetCoordinationEngine("TRACTOR_JOINING_013", mock_isobus_joining)
+        responding_engine = FleetCoordinationEngine(
+            "TRACTOR_ESTABLISHED_014", mock_isobus_responding
+        )
+        await joining_engine.start()
+        await responding_engine.start()
+        await responding_engine.claim_section("SECTION_1")
+        joining_engine.merge_field_allocation_state(responding_engine.get_field_allocation_state())
+        await responding_engine.claim_section("SECTION_2")
+
+        # Act - Relay the request and the response over the mocked buses
+        mock_isobus_joining.broadcast_message.reset_mock()
+        await joining_engine._request_state_sync()
+        sync_request = mock_isobus_joining.broadcast_message.call_args.args[0]
+        mock_isobus_responding.broadcast_message.reset_mock()
+        await responding_engine._handle_received_message(sync_request)
+        sync_response = mock_isobus_responding.broadcast_message.call_args.args[0]
+        await joining_engine._handle_received_message(sync_response)
+
+        # Assert
+        assert sync_response["msg_type"] == "STATE_SYNC_RESPONSE"
+        assert set(sync_response["payload"]["crdt_delta"]["sections"]) == {"SECTION_2"}
+        joining_field_allocation = joining_engine.get_field_allocation_state()
+        assert joining_field_allocation.owner_of("SECTION_1") == "TRACTOR_ESTABLISHED_014"
+        assert joining_field_allocation.owner_of("SECTION_2") == "TRACTOR_ESTABLISHED_014"
+
+    @pytest.mark.asyncio
+    async def test_state_sync_answered_by_designated_peer_only(self) -> None:
+        """Test one known peer answers a sync request and bystanders ignore the delta.
+
+        Agricultural Context:
+        Every tractor answering every resync floods the ISOBUS link, and a
+        delta computed for one tractor is incomplete for any other.
+        """
+        # Arrange
+        buses = {tractor_id: AsyncMock() for tractor_id in ("T_A", "T_B", "T_C")}
+        engines = {
+            tractor_id: FleetCoordinationEngine(tractor_id, bus)
+            for tractor_id, bus in buses.items()
+        }
+        for engine in engines.values():
+            await engine.start()
+        requester, responder, bystander = engines["T_C"], engines["T_A"], engines["T_B"]
+        await responder.claim_section("SECTION_1")
+        await bystander.claim_section("SECTION_2")
+        responder.merge_field_allocation_state(bystander.get_field_allocation_state())
+        requester.merge_field_allocation_state(bystander.get_field_allocation_state())
+        for tractor_id in ("T_A", "T_B"):
+            await requester._handle_received_message(
+                {"msg_type": "HEARTBEAT", "sender_id": tractor_id, "payload": {}}
+            )
+
+        # Act - Every tractor hears the request and the response
+        await requester._request_state_sync()
+        sync_request = buses["T_C"].broadcast_message.call_args.args[0]
+        buses["T_A"].broadcast_message.reset_mock()
+        buses["T_B"].broadcast_message.reset_mock()
+        await responder._handle_received_message(sync_request)
+        await bystander._handle_received_message(sync_request)
+        sync_response = buses["T_A"].broadcast_message.call_args.args[0]
+        await requester._handle_received_message(sync_response)
+        await bystander._handle_received_message(sync_response)
+
+        # Assert
+        assert sync_request["responder_id"] == "T_A"
+        buses["T_B"].broadcast_message.assert_not_called()
+        assert sync_response["recipient_id"] == "T_C"
+        assert requester.get_field_allocation_state().owner_of("SECTION_1") == "T_A"
+        assert bystander.get_field_allocation_state().owner_of("SECTION_1") is None
+
+    @pytest.mark.asyncio
+    async def test_state_sync_responder_must_have_recent_heartbeat(self) -> None:
+        """Test a peer that stopped sending heartbeats is not designated to answer.
+
+        Agricultural Context:
+        A tractor that left the field would otherwise stay the designated
+        responder, and a joining tractor would never get the allocations.
+        """
+        # Arrange
+        bus = AsyncMock()
+        engine = FleetCoordinationEngine("T_C", bus)
+        await engine.start()
+        for tractor_id in ("T_A", "T_B"):
+            await engine._handle_received_message(
+                {"msg_type": "HEARTBEAT", "sender_id": tractor_id, "payload": {}}
+            )
+
+        # Act - T_A goes silent, then every peer does
+        engine._peer_heartbeats["T_A"] -= PEER_HEARTBEAT_TIMEOUT + 1.0
+        await engine._request_state_sync()
+        live_peer_request = bus.broadcast_message.call_args.args[0]
+        engine._peer_heartbeats["T_B"] -= PEER_HEARTBEAT_TIMEOUT + 1.0
+        await engine._request_state_sync()
+        open_request = bus.broadcast_message.call_args.args[0]
+
+        # Assert
+        assert live_peer_request["responder_id"] == "T_B"
+        assert open_request["responder_id"] is None
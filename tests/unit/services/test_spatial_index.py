@@ -0,0 +1,239 @@
+"""
+Test suite for the field segment spatial and secondary indexes.
+
+Tests the grid spatial index against brute-force geometry and checks the
+status, tractor and spatial indexes of the segment allocation CRDT stay
+consistent through assignment, completion and merges.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections.abc import Callable
+
+import pytest
+
+from afs_fastapi.models.field_segment import FieldSegment
+from afs_fastapi.services.crdt_manager import FieldAllocationCRDT
+from afs_fastapi.services.field_allocation import FieldAllocationCRDT as SectionAllocationCRDT
+from afs_fastapi.services.spatial_index import METERS_PER_DEGREE, SegmentSpatialIndex
+
+ORIGIN_LAT = 40.0
+ORIGIN_LON = -95.0
+LON_SCALE = METERS_PER_DEGREE * math.cos(math.radians(ORIGIN_LAT))
+
+
+def _position(east_m: float, north_m: float) -> tuple[float, float]:
+    """Convert metres east/north of the origin to (lat, lon)."""
+    return (ORIGIN_LAT + north_m / METERS_PER_DEGREE, ORIGIN_LON + east_m / LON_SCALE)
+
+
+def _square(east_m: float, north_m: float, size_m: float) -> list[tuple[float, float]]:
+    return [
+        _position(east_m, north_m),
+        _position(east_m + size_m, north_m),
+        _position(east_m + size_m, north_m + size_m),
+        _position(east_m, north_m + size_m),
+    ]
+
+
+def _grid_segments(rows: int, columns: int, size_m: float = 20.0) -> list[FieldSegment]:
+    return [
+        FieldSegment(
+            segment_id=f"seg_{row}_{column}",
+            coordinates=_square(column * size_m, row * size_m, size_m),
+            last_updated=1.0,
+        )
+        for row in range(rows)
+        for column in range(columns)
+    ]
+
+
+class TestSegmentSpatialIndex:
+    """Test grid index queries."""
+
+    def test_containing(self) -> None:
+        """Test the segment containing a fix is found, including on a shared edge."""
+        index = SegmentSpatialIndex(cell_size_m=30.0)
+        for segment in _grid_segments(5, 5):
+            index.insert(segment.segment_id, segment.coordinates)
+
+        assert index.containing(*_position(45.0, 25.0)) == ["seg_1_2"]
+        assert index.containing(*_position(40.0, 25.0)) == ["seg_1_1", "seg_1_2"]
+        assert index.containing(*_position(-5.0, 25.0)) == []
+
+    def test_within_matches_brute_force(self) -> None:
+        """Test radius queries return the segments whose boundary is in range, nearest first."""
+        segments = _grid_segments(20, 20)
+        index = SegmentSpatialIndex(cell_size_m=25.0)
+        for segment in segments:
+            index.insert(segment.segment_id, segment.coordinates)
+
+        rng = random.Random(7)
+        for _ in range(50):
+            east, north = rng.uniform(-100, 500), rng.uniform(-100, 500)
+            radius = rng.uniform(0, 250)
+            expected = set()
+            for segment in segments:
+                row, column = (int(part) for part in segment.segment_id.split("_")[1:])
+                dx = max(column * 20.0 - east, 0.0, east - (column + 1) * 20.0)
+                dy = max(row * 20.0 - north, 0.0, north - (row + 1) * 20.0)
+                if math.hypot(dx, dy) <= radius - 1e-6:
+                    expected.add(segment.segment_id)
+
+            results = index.within(*_position(east, north), radius)
+
+            found = {segment_id for segment_id, _ in results}
+            assert expected <= found
+            assert all(distance <= radius for _, distance in results)
+            assert [distance for _, distance in results] == sorted(d for _, d in results)
+
+    def test_reinsert_and_remove(self) -> None:
+        """Test moving and removing a segment updates its cells."""
+        index = SegmentSpatialIndex(cell_size_m=10.0)
+        index.insert("a", _square(0.0, 0.0, 20.0))
+        index.insert("a", _square(100.0, 0.0, 20.0))
+
+        assert index.containing(*_position(10.0, 10.0)) == []
+        assert index.containing(*_position(110.0, 10.0)) == ["a"]
+
+        index.remove("a")
+        assert len(index) == 0
+        assert index._cells == {}
+
+    def test_invalid_cell_size(self) -> None:
+        """Test a non-positive cell size is rejected."""
+        with pytest.raises(ValueError):
+            SegmentSpatialIndex(cell_size_m=0)
+
+
+class TestSegmentAllocationIndexes:
+    """Test the secondary indexes of the segment allocation CRDT."""
+
+    def test_status_and_tractor_indexes(self) -> None:
+        """Test status and tractor queries follow assign, release and complete."""
+        crdt = FieldAllocationCRDT()
+        for segment in _grid_segments(2, 2):
+            crdt.add_segment(segment)
+
+        assert crdt.assign_segment("seg_0_0", "T1") is not None
+        assert crdt.assign_segment("seg_0_1", "T1") is not None
+        assert crdt.assign_segment("seg_1_0", "T2") is not None
+        assert crdt.assign_segment("seg_1_0", "T1") is None
+        assert crdt.complete_segment("seg_0_0", "T1") is not None
+        assert crdt.release_segment("seg_1_0", "T2") is not None
+
+        assert [s.segment_id for s in crdt.get_allocated_segments("T1")] == ["seg_0_1"]
+        assert crdt.get_allocated_segments("T2") == []
+        assert {s.segment_id for s in crdt.get_unallocated_segments()} == {"seg_1_0", "seg_1_1"}
+        assert [s.segment_id for s in crdt.get_completed_segments()] == ["seg_0_0"]
+
+    def test_merge_updates_indexes(self) -> None:
+        """Test segments replaced by a merge are re-indexed."""
+        crdt = FieldAllocationCRDT()
+        for segment in _grid_segments(1, 2):
+            crdt.add_segment(segment)
+
+        other = FieldAllocationCRDT()
+        other.add_segment(
+            FieldSegment(
+                segment_id="seg_0_0",
+                coordinates=_square(500.0, 500.0, 20.0),
+                status="assigned",
+                assigned_to_tractor_id="T3",
+                last_updated=time.time(),
+            )
+        )
+        crdt.merge(other)
+
+        assert [s.segment_id for s in crdt.get_allocated_segments("T3")] == ["seg_0_0"]
+        assert [s.segment_id for s in crdt.get_unallocated_segments()] == ["seg_0_1"]
+        assert [s.segment_id for s in crdt.get_segments_containing(*_position(510, 510))] == [
+            "seg_0_0"
+        ]
+        assert crdt.get_segments_containing(*_position(10.0, 10.0)) == []
+
+    def test_merged_segments_not_shared_between_replicas(self) -> None:
+        """Test assigning a merged segment on one replica leaves the other's indexes intact."""
+        alpha = FieldAllocationCRDT()
+        beta = FieldAllocationCRDT()
+        for segment in _grid_segments(1, 2):
+            beta.add_segment(segment)
+        alpha.merge(beta)
+
+        assert beta.assign_segment("seg_0_0", "T1") is not None
+        assert {s.segment_id for s in alpha.get_unallocated_segments()} == {"seg_0_0", "seg_0_1"}
+        assert all(s.status == "unassigned" for s in alpha.get_unallocated_segments())
+
+        assert alpha.assign_segment("seg_0_0", "T2") is not None
+        assert [s.segment_id for s in alpha.get_unallocated_segments()] == ["seg_0_1"]
+        assert [s.segment_id for s in beta.get_unallocated_segments()] == ["seg_0_1"]
+        assert [s.segment_id for s in beta.get_allocated_segments("T1")] == ["seg_0_0"]
+
+    @pytest.mark.slow
+    @pytest.mark.serial
+    def test_nearby_unallocated_query_time(self) -> None:
+        """Test nearby and containing queries on a 10,000-segment field beat a linear scan."""
+        crdt = FieldAllocationCRDT(cell_size_m=40.0)
+        segments = _grid_segments(100, 100, size_m=40.0)
+        for segment in segments:
+            crdt.add_segment(segment)
+        for column in range(0, 100, 2):
+            crdt.assign_segment(f"seg_50_{column}", "T1")
+
+        # A single cell covering the whole field makes every query a linear scan
+        linear = SegmentSpatialIndex(cell_size_m=1e6)
+        for segment in segments:
+            linear.insert(segment.segment_id, segment.coordinates)
+        unassigned = {s.segment_id for s in crdt.get_unallocated_segments()}
+
+        def best_ms(query: Callable[[], None], repeats: int) -> float:
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                query()
+                timings.append(time.perf_counter() - start)
+            return min(timings) * 1000
+
+        def grid_query() -> None:
+            crdt.get_segments_within(*_position(2000.0, 2020.0), 200.0, "unassigned")
+            crdt.get_segments_containing(*_position(2010.0, 2010.0))
+
+        def linear_query() -> None:
+            linear.within(*_position(2000.0, 2020.0), 200.0, unassigned)
+            linear.containing(*_position(2010.0, 2010.0))
+
+        nearby = crdt.get_segments_within(*_position(2000.0, 2020.0), 200.0, "unassigned")
+        containing = crdt.get_segments_containing(*_position(2010.0, 2010.0))
+        assert [s.segment_id for s in containing] == ["seg_50_50"]
+        assert nearby[0].segment_id == "seg_50_49"
+        assert "seg_50_50" not in {s.segment_id for s in nearby}
+        assert all(s.status == "unassigned" for s in nearby)
+        # Best-of timings compared on the same machine, so load from
+        # parallel test workers affects both sides
+        assert best_ms(grid_query, 50) * 5 < best_ms(linear_query, 5)
+
+
+class TestSectionOwnerIndex:
+    """Test the owner index of the section allocation CRDT."""
+
+    def test_assigned_sections_follow_mutations(self) -> None:
+        """Test assigned_sections tracks claims, releases, merges and deserialization."""
+        alpha = SectionAllocationCRDT("field_001", ["T1", "T2"])
+        beta = SectionAllocationCRDT("field_001", ["T1", "T2"])
+        alpha.claim("s1", "T1")
+        alpha.claim("s2", "T1")
+        alpha.release("s2", "T1")
+        beta.claim("s3", "T2")
+
+        alpha.merge(beta)
+
+        assert alpha.assigned_sections("T1") == {"s1"}
+        assert alpha.assigned_sections("T2") == {"s3"}
+        restored = SectionAllocationCRDT.deserialize(alpha.serialize())
+        assert restored.assigned_sections("T2") == {"s3"}
+        # Returned sets are copies
+        alpha.assigned_sections("T1").add("s9")
+        assert alpha.assigned_sections("T1") == {"s1"}
@@ -16,7 +16,7 @@ Agricultural Context:
 import unittest
 
 # Import VectorClock - now available after TDD Green phase completion
-from afs_fastapi.services.synchronization import VectorClock
+from afs_fastapi.services.synchronization import ProcessIndex, VectorClock
 
 
 class TestVectorClock(unittest.TestCase):
@@ -372,3 +372,70 @@ class TestVectorClockDynamicComposition(unittest.TestCase):
         self.assertIn("tractor_004", set(receiver.get_process_ids()))
         self.assertEqual(receiver.get_time("tractor_004"), 1)
         self.assertEqual(receiver.get_time("tractor_001"), 1)
+
+
+class TestVectorClockCompactRepresentation(unittest.TestCase):
+    """
+    Interned process index, O(1) snapshots and single-pass comparison.
+
+    Agricultural Context: Every CRDT section entry stores a snapshot of the
+    replica clock, so snapshots must stay cheap over a whole harvest season.
+    """
+
+    def test_clocks_share_interned_index(self):
+        """Clocks over the same fleet share one process index."""
+        clock_a = VectorClock(["tractor_001", "tractor_002"])
+        clock_b = VectorClock(["tractor_001", "tractor_002"])
+
+        self.assertIs(clock_a._index, clock_b._index)
+        self.assertIs(clock_a._index, ProcessIndex.intern(["tractor_001", "tractor_002"]))
+
+        clock_a.add_process("tractor_003")
+        self.assertIsNot(clock_a._index, clock_b._index)
+        self.assertEqual(clock_b.get_process_ids(), ["tractor_001", "tractor_002"])
+
+    def test_copy_is_independent_snapshot(self):
+        """Snapshots share counters until either clock changes."""
+        clock = VectorClock(["tractor_001", "tractor_002"])
+        for _ in range(5000):
+            clock.increment("tractor_001")
+
+        snapshot = clock.copy()
+        self.assertIs(snapshot._counters, clock._counters)
+
+        clock.increment("tractor_002")
+        snapshot_of_snapshot = snapshot.copy()
+        snapshot.increment("tractor_001")
+
+        self.assertEqual(clock.to_dict(), {"tractor_001": 5000, "tractor_002": 1})
+        self.assertEqual(snapshot.to_dict(), {"tractor_001": 5001, "tractor_002": 0})
+        self.assertEqual(snapshot_of_snapshot.to_dict(), {"tractor_001": 5000, "tractor_002": 0})
+
+    def test_merge_takes_maximum_without_local_event(self):
+        """Merging adopts unknown processes and keeps the larger timestamps."""
+        clock = VectorClock(["tractor_001", "tractor_002"])
+        clock.increment("tractor_001")
+        other = VectorClock(["tractor_002", "tractor_003"])
+        other.increment("tractor_002")
+        other.increment("tractor_003")
+
+        clock.merge(other)
+        clock.merge(other)
+
+        self.assertEqual(clock.to_dict(), {"tractor_001": 1, "tractor_002": 1, "tractor_003": 1})
+
+    def test_comparison_across_different_process_sets(self):
+        """Processes unknown to one clock compare as 0."""
+        clock_a = VectorClock(["tractor_001"])
+        clock_b = VectorClock.from_dict({"tractor_001": 0, "tractor_002": 0}, ["tractor_001"])
+
+        # Equal clocks: neither happens before the other
+        self.assertFalse(clock_a.happens_before(clock_b))
+        self.assertTrue(clock_a.is_concurrent_with(clock_b))
+
+        clock_b.increment("tractor_002")
+        self.assertTrue(clock_a.happens_before(clock_b))
+        self.assertFalse(clock_b.happens_before(clock_a))
+
+        clock_a.increment("tractor_001")
+        self.assertTrue(clock_a.is_concurrent_with(clock_b))